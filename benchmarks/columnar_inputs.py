@@ -0,0 +1,181 @@
+# Copyright 2016-2024 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the columnar input loading (*gridpath.auxiliary.columnar_inputs*)
+against the previous pandas/DataPortal loading on a synthetic
+project-timepoint input file (1,000 projects x 8,760 timepoints by default).
+
+The DataPortal tab-file reader needs several GB of memory for the full case,
+so the DataPortal comparison uses the first --n_projects_data_portal projects
+only (100 by default).
+
+Usage:
+    python benchmarks/columnar_inputs.py [--n_projects N] [--n_timepoints N]
+        [--n_projects_data_portal N]
+"""
+
+import argparse
+import numpy as np
+import os
+import pandas as pd
+from pyomo.environ import AbstractModel, DataPortal, Param, Set
+import sys
+import tempfile
+import time
+
+from gridpath.auxiliary.columnar_inputs import (
+    get_param_data,
+    isin_mask,
+    load_tab_file_params,
+    read_tab_columns,
+)
+
+
+def write_synthetic_profiles(filename, n_projects, n_timepoints):
+    """
+    Write a project-timepoint file with a capacity factor and an optional
+    ("."-padded) column, as in the GridPath profile and derate inputs.
+    """
+    rng = np.random.default_rng(seed=0)
+    n_rows = n_projects * n_timepoints
+    optional_values = np.round(rng.random(n_rows), 4).astype(str)
+    optional_values[::2] = "."
+    pd.DataFrame(
+        {
+            "project": np.repeat(
+                ["Project_{}".format(p) for p in range(n_projects)], n_timepoints
+            ),
+            "timepoint": np.tile(np.arange(1, n_timepoints + 1), n_projects),
+            "cap_factor": np.round(rng.random(n_rows), 4),
+            "optional_value": optional_values,
+        }
+    ).to_csv(filename, sep="\t", index=False)
+
+
+def pandas_profile_dict(filename, projects):
+    """The previous load_var_profile_inputs path"""
+    df = pd.read_csv(
+        filename,
+        sep="\t",
+        usecols=["project", "timepoint", "cap_factor"],
+        dtype={"cap_factor": float},
+    )
+    df = df[df["project"].isin(projects)]
+    return df.set_index(["project", "timepoint"])["cap_factor"].to_dict()
+
+
+def columnar_profile_dict(filename, projects):
+    """The current load_var_profile_inputs path"""
+    columns = read_tab_columns(
+        filename=filename,
+        columns=["project", "timepoint", "cap_factor"],
+        dtypes={"cap_factor": float},
+    )
+    return get_param_data(
+        index_columns=[columns["project"], columns["timepoint"]],
+        values=columns["cap_factor"],
+        mask=isin_mask(columns["project"], projects),
+    )
+
+
+def data_portal_load(filename):
+    """The previous DataPortal tab-file loading path"""
+    m = AbstractModel()
+    m.PRJ_TMPS = Set(dimen=2)
+    m.cap_factor = Param(m.PRJ_TMPS)
+    m.optional_value = Param(m.PRJ_TMPS)
+    data_portal = DataPortal()
+    data_portal.load(filename=filename, param=(m.cap_factor, m.optional_value))
+    return data_portal
+
+
+def columnar_load(filename):
+    """The current columnar loading path"""
+    # In GridPath, prior modules have already loaded data into the default
+    # namespace
+    data_portal = DataPortal(data_dict={None: dict()})
+    load_tab_file_params(
+        data_portal=data_portal,
+        filename=filename,
+        param_names=["cap_factor", "optional_value"],
+    )
+    return data_portal
+
+
+def time_function(f, *args):
+    start = time.perf_counter()
+    result = f(*args)
+    return time.perf_counter() - start, result
+
+
+def parse_arguments(args):
+    parser = argparse.ArgumentParser(add_help=True)
+    parser.add_argument("--n_projects", default=1000, type=int)
+    parser.add_argument("--n_timepoints", default=8760, type=int)
+    parser.add_argument("--n_projects_data_portal", default=100, type=int)
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    parsed_args = parse_arguments(args)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "variable_generator_profiles.tab")
+        write_synthetic_profiles(
+            filename=filename,
+            n_projects=parsed_args.n_projects,
+            n_timepoints=parsed_args.n_timepoints,
+        )
+        print(
+            "Synthetic case: {} projects x {} timepoints".format(
+                parsed_args.n_projects, parsed_args.n_timepoints
+            )
+        )
+
+        projects = ["Project_{}".format(p) for p in range(0, parsed_args.n_projects, 2)]
+        pandas_time, pandas_dict = time_function(
+            pandas_profile_dict, filename, projects
+        )
+        columnar_time, columnar_dict = time_function(
+            columnar_profile_dict, filename, projects
+        )
+        assert pandas_dict == columnar_dict
+        print(
+            "Profile dict (half of the projects): pandas {:.2f}s, "
+            "columnar {:.2f}s".format(pandas_time, columnar_time)
+        )
+
+        dp_filename = os.path.join(tmp_dir, "project_availability.tab")
+        write_synthetic_profiles(
+            filename=dp_filename,
+            n_projects=parsed_args.n_projects_data_portal,
+            n_timepoints=parsed_args.n_timepoints,
+        )
+        dp_time, dp = time_function(data_portal_load, dp_filename)
+        columnar_time, columnar_dp = time_function(columnar_load, dp_filename)
+        for param in ["cap_factor", "optional_value"]:
+            assert dp.data(param) == columnar_dp.data(param)
+        print(
+            "DataPortal params ({} projects, 2 columns): DataPortal.load "
+            "{:.2f}s, columnar {:.2f}s".format(
+                parsed_args.n_projects_data_portal, dp_time, columnar_time
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+# Copyright 2016-2024 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark how the model build, solve, and results export scale with the
+size of the scenario.
+
+For each of the requested --feature_sets and each of the requested --sizes
+of the --scale dimension (projects, zones, periods, timepoints per horizon,
+horizons, subproblems, or transmission lines), we write a synthetic scenario
+(see *synthetic_scenario.py*), run it with *run_scenario* and the --profile
+option in a separate process, and collect the wall time by phase and the
+peak RSS from the profiling reports:
+
+* build: add_model_components, load_model_data, create_instance,
+  fix_variables
+* solve
+* export: export_results, export_summary_results,
+  export_pass_through_inputs, save_duals, summarize_results
+
+We then report, for each feature set, the scaling exponent of each phase
+between the smallest and largest size (1 is linear, 2 quadratic), as well as
+the modules whose instance construction time scales worst (the profiler
+attributes the construction of each model component to the module that
+declared it). With --max_exponent, the benchmark exits with an error if the
+build or export exponent of any feature set exceeds the threshold, e.g. to
+catch a module that builds an index by scanning a set once per member.
+
+A feature set is a "+"-separated list of the synthetic scenario's feature
+flags (e.g. "reserves+prm"), "none" for transmission only, or "all" for all
+flags.
+
+Usage:
+    python benchmarks/scenario_scaling.py [--scale DIMENSION]
+        [--sizes N [N ...]] [--feature_sets SET [SET ...]] [--solver SOLVER]
+        [--max_exponent X] [--output CSV] [scenario size arguments]
+"""
+
+import argparse
+import glob
+import math
+import os
+import pandas as pd
+import subprocess
+import sys
+import tempfile
+import time
+
+from synthetic_scenario import (
+    FEATURE_FLAGS,
+    add_scenario_size_arguments,
+    write_synthetic_scenario,
+)
+
+from gridpath.auxiliary.profiler import PROFILING_FILENAME
+
+REPO_DIRECTORY = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# The scenario size argument for each scaling dimension
+SCALE_ARGUMENTS = {
+    "projects": "n_projects",
+    "zones": "n_zones",
+    "periods": "n_periods",
+    "timepoints": "n_timepoints_per_horizon",
+    "horizons": "n_horizons",
+    "subproblems": "n_subproblems",
+    "tx_lines": "n_tx_lines",
+}
+
+PHASE_GROUPS = {
+    "add_model_components": "build",
+    "load_model_data": "build",
+    "create_instance": "build",
+    "fix_variables": "build",
+    "solve": "solve",
+    "export_results": "export",
+    "export_summary_results": "export",
+    "export_pass_through_inputs": "export",
+    "save_duals": "export",
+    "summarize_results": "export",
+}
+
+# Don't report module exponents for modules faster than this at the largest
+# size (the timings of fast modules are mostly noise)
+MIN_MODULE_TIME_S = 0.05
+
+
+def get_feature_flags(feature_set):
+    """
+    :param feature_set: str, "+"-separated feature flags, "none", or "all"
+    :return: list of the feature flags
+    """
+    if feature_set == "none":
+        return []
+    if feature_set == "all":
+        return list(FEATURE_FLAGS.keys())
+    feature_flags = feature_set.split("+")
+    unknown_flags = [f for f in feature_flags if f not in FEATURE_FLAGS]
+    if unknown_flags:
+        raise ValueError(
+            "Unknown feature flag(s) {} in feature set {}. Supported flags: "
+            "{}.".format(
+                ", ".join(unknown_flags),
+                feature_set,
+                ", ".join(FEATURE_FLAGS.keys()),
+            )
+        )
+    return feature_flags
+
+
+def run_synthetic_scenario(scenario_location, scenario, solver):
+    """
+    :return: the wall time of the run
+
+    Run the scenario with profiling in a separate process, so that the peak
+    memory of each run is measured independently.
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [REPO_DIRECTORY] + [p for p in [env.get("PYTHONPATH")] if p]
+    )
+    start = time.perf_counter()
+    subprocess.run(
+        [
+            sys.executable,
+            os.path.join(REPO_DIRECTORY, "gridpath", "run_scenario.py"),
+            "--scenario_location",
+            scenario_location,
+            "--scenario",
+            scenario,
+            "--solver",
+            solver,
+            "--profile",
+            "--quiet",
+            "--mute_solver_output",
+        ],
+        check=True,
+        env=env,
+        cwd=os.path.join(REPO_DIRECTORY, "gridpath"),
+    )
+    return time.perf_counter() - start
+
+
+def read_profiling_reports(scenario_directory):
+    """
+    :return: DataFrame with the profiling records of all subproblems/stages
+    """
+    return pd.concat(
+        [
+            pd.read_csv(f, keep_default_na=False, na_values=[""])
+            for f in sorted(
+                glob.glob(
+                    os.path.join(scenario_directory, "**", PROFILING_FILENAME),
+                    recursive=True,
+                )
+            )
+        ],
+        ignore_index=True,
+    )
+
+
+def scaling_exponent(size_1, time_1, size_2, time_2):
+    """
+    :return: the exponent k in time ~ size^k between the two measurements
+    """
+    if time_1 <= 0 or time_2 <= 0 or size_1 == size_2:
+        return float("nan")
+    return math.log(time_2 / time_1) / math.log(size_2 / size_1)
+
+
+def parse_arguments(args):
+    parser = argparse.ArgumentParser(add_help=True)
+    parser.add_argument(
+        "--scale", default="projects", choices=sorted(SCALE_ARGUMENTS.keys())
+    )
+    parser.add_argument("--sizes", nargs="+", type=int, default=[8, 16, 32, 64])
+    parser.add_argument(
+        "--feature_sets",
+        nargs="+",
+        default=["none", "all"],
+        help="The feature sets to benchmark, each a '+'-separated list of "
+        "feature flags ({}), 'none', or 'all'. Defaults to 'none' and "
+        "'all'.".format(", ".join(FEATURE_FLAGS.keys())),
+    )
+    parser.add_argument("--solver", default="cbc")
+    parser.add_argument(
+        "--max_exponent",
+        type=float,
+        help="Exit with an error if the build or export time of any feature "
+        "set scales with a higher exponent than this.",
+    )
+    parser.add_argument("--output", help="Write the results to this CSV file.")
+    parser.add_argument(
+        "--scenario_location",
+        help="Write the synthetic scenarios here (a temporary directory that "
+        "is deleted after the run by default).",
+    )
+    add_scenario_size_arguments(parser)
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    parsed_args = parse_arguments(args)
+    scale_argument = SCALE_ARGUMENTS[parsed_args.scale]
+    sizes = sorted(parsed_args.sizes)
+    feature_sets = {
+        feature_set: get_feature_flags(feature_set)
+        for feature_set in parsed_args.feature_sets
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        scenario_location = (
+            tmp_dir
+            if parsed_args.scenario_location is None
+            else parsed_args.scenario_location
+        )
+        summary_rows = []
+        # Instance construction time by module for each feature set and size
+        module_times = dict()
+        for feature_set, feature_flags in feature_sets.items():
+            for size in sizes:
+                scenario = "synthetic_{}_{}_{}".format(
+                    feature_set.replace("+", "_"), parsed_args.scale, size
+                )
+                scenario_directory = os.path.join(scenario_location, scenario)
+                size_arguments = {
+                    a: getattr(parsed_args, a) for a in SCALE_ARGUMENTS.values()
+                }
+                size_arguments[scale_argument] = size
+                write_synthetic_scenario(
+                    scenario_directory=scenario_directory,
+                    features=feature_flags,
+                    solver=parsed_args.solver,
+                    **size_arguments,
+                )
+
+                wall_time = run_synthetic_scenario(
+                    scenario_location=scenario_location,
+                    scenario=scenario,
+                    solver=parsed_args.solver,
+                )
+                df = read_profiling_reports(scenario_directory)
+                df["phase_group"] = df["phase"].map(PHASE_GROUPS)
+                # The create_instance records by module break down the
+                # create_instance total, so leave them out of the phase times
+                is_module_construction = (df["phase"] == "create_instance") & df[
+                    "module"
+                ].notna()
+                phase_times = (
+                    df[~is_module_construction]
+                    .groupby("phase_group")["wall_time_s"]
+                    .sum()
+                )
+
+                summary_rows.append(
+                    {
+                        "feature_set": feature_set,
+                        parsed_args.scale: size,
+                        "build_s": phase_times.get("build", 0.0),
+                        "solve_s": phase_times.get("solve", 0.0),
+                        "export_s": phase_times.get("export", 0.0),
+                        "total_s": wall_time,
+                        "peak_rss_mb": df["peak_rss_mb"].max(),
+                    }
+                )
+                module_times[feature_set, size] = (
+                    df[is_module_construction].groupby("module")["wall_time_s"].sum()
+                )
+
+    summary_df = pd.DataFrame(summary_rows)
+    print(summary_df.to_string(index=False, float_format="{:.2f}".format))
+    if parsed_args.output is not None:
+        summary_df.to_csv(parsed_args.output, index=False)
+
+    if len(sizes) < 2:
+        return
+
+    too_high = []
+    for feature_set in feature_sets:
+        # Scaling exponents between the smallest and the largest size
+        feature_set_df = summary_df[summary_df["feature_set"] == feature_set]
+        first, last = feature_set_df.iloc[0], feature_set_df.iloc[-1]
+        exponents = {
+            column: scaling_exponent(
+                first[parsed_args.scale],
+                first[column],
+                last[parsed_args.scale],
+                last[column],
+            )
+            for column in ["build_s", "solve_s", "export_s", "total_s"]
+        }
+        print(
+            "\nScaling exponents ({}, {} {} -> {}): {}".format(
+                feature_set,
+                parsed_args.scale,
+                sizes[0],
+                sizes[-1],
+                ", ".join("{} {:.2f}".format(c, e) for c, e in exponents.items()),
+            )
+        )
+
+        first_times = module_times[feature_set, sizes[0]]
+        module_exponents = {
+            module: scaling_exponent(
+                sizes[0], first_times.get(module, 0.0), sizes[-1], t
+            )
+            for module, t in module_times[feature_set, sizes[-1]].items()
+            if t >= MIN_MODULE_TIME_S
+        }
+        worst_modules = sorted(
+            [(m, e) for m, e in module_exponents.items() if not math.isnan(e)],
+            key=lambda x: -x[1],
+        )[:5]
+        if worst_modules:
+            print("Instance construction time scaling by module (worst first):")
+            for module, exponent in worst_modules:
+                print("  {} {:.2f}".format(module, exponent))
+
+        if parsed_args.max_exponent is not None:
+            too_high += [
+                "{} {}".format(feature_set, c)
+                for c in ["build_s", "export_s"]
+                if exponents[c] > parsed_args.max_exponent
+            ]
+
+    if too_high:
+        sys.exit(
+            "ERROR: {} scale(s) with an exponent above {}.".format(
+                " and ".join(too_high), parsed_args.max_exponent
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
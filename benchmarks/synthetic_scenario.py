@@ -0,0 +1,906 @@
+# Copyright 2016-2024 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Write a synthetic GridPath scenario directory of configurable size that can
+be run with *run_scenario* (no database needed).
+
+The scenario has *n_zones* load zones, *n_projects* projects spread across
+the zones, *n_tx_lines* transmission lines connecting neighboring zones,
+and *n_subproblems* subproblems, each with *n_periods* periods of
+*n_horizons* daily horizons of *n_timepoints_per_horizon* timepoints. The
+projects cycle through four types:
+
+* existing thermal (gen_spec, gen_commit_cap, gas with a heat rate curve)
+* existing wind (gen_spec, gen_var)
+* new thermal (gen_new_lin, gen_commit_cap, gas with a heat rate curve)
+* existing solar (gen_spec, gen_var)
+
+The transmission feature is enabled if there are transmission lines. Other
+GridPath features can be enabled with --features (see FEATURE_FLAGS), each
+with a zone for every load zone:
+
+* reserves: load-following and regulation up and down, provided by the
+  thermal projects, with a requirement of 5% of the load
+* prm: a planning reserve margin of 15% over the peak load, with a simple
+  ELCC for each project
+* carbon_cap: a cap on the emissions of the thermal projects
+* rps: an energy target for the wind and solar projects
+
+Unserved energy and overgeneration are allowed (with a penalty) in all
+zones, as are violations of the reserve, PRM, and policy requirements, so
+the problem is always feasible. The inputs are generated with a fixed seed,
+so the same arguments always write the same scenario.
+
+Usage:
+    python benchmarks/synthetic_scenario.py --scenario_location DIR
+        [--scenario NAME] [--n_zones N] [--n_projects N] [--n_tx_lines N]
+        [--n_periods N] [--n_horizons N] [--n_timepoints_per_horizon N]
+        [--n_subproblems N] [--features FLAG [FLAG ...]] [--solver SOLVER]
+"""
+
+import argparse
+import numpy as np
+import os
+import pandas as pd
+import sys
+
+PERIOD_LENGTH_YRS = 10
+FIRST_PERIOD = 2020
+
+# The GridPath features enabled by each feature flag
+FEATURE_FLAGS = {
+    "reserves": [
+        "lf_reserves_up",
+        "lf_reserves_down",
+        "regulation_up",
+        "regulation_down",
+    ],
+    "prm": ["prm"],
+    "carbon_cap": ["carbon_cap"],
+    "rps": ["period_energy_target"],
+}
+
+# The reserve types (with their balancing areas file) of the reserves flag
+RESERVE_TYPES = [
+    ("lf_reserves_up", "load_following_up_balancing_areas.tab"),
+    ("lf_reserves_down", "load_following_down_balancing_areas.tab"),
+    ("regulation_up", "regulation_up_balancing_areas.tab"),
+    ("regulation_down", "regulation_down_balancing_areas.tab"),
+]
+RESERVE_REQUIREMENT_FRACTION = 0.05
+PRM_FRACTION = 1.15
+# Simple ELCC by technology
+ELCC_FRACTIONS = {"Gas": 1.0, "Wind": 0.1, "Solar": 0.3}
+# Carbon cap (tonnes per MWh of load) and energy target (fraction of load)
+CARBON_CAP_INTENSITY = 0.4
+RPS_FRACTION = 0.3
+# Penalty for violating the reserve, PRM, and policy requirements
+VIOLATION_PENALTY = 99999999.0
+
+UNITS = [
+    ("power", "MW"),
+    ("energy", "MWh"),
+    ("fuel_energy", "MMBtu"),
+    ("cost", "USD"),
+    ("carbon_emissions", "tonnes CO2"),
+    ("time_for_cost", "yr."),
+    ("heat_rate", "MMBtu/MWh"),
+    ("fuel_emission_intensity", "tonnes CO2/MMBtu"),
+    ("fuel_price", "USD/MMBtu"),
+    ("variable_om_cost", "USD/MWh"),
+    ("fixed_om_cost", "USD/MW-yr."),
+    ("fixed_om_cost_energy", "USD/MW-yr."),
+    ("capacity_cost", "USD/MW-yr."),
+    ("energy_capacity_cost", "USD/MWh-yr."),
+]
+
+# The projects.tab columns; the columns not set for a project are "."
+PROJECTS_COLUMNS = [
+    "project",
+    "capacity_type",
+    "availability_type",
+    "operational_type",
+    "balancing_type_project",
+    "load_modifier_flag",
+    "distribution_loss_adjustment_factor",
+    "technology",
+    "load_zone",
+    "variable_om_cost_per_mwh",
+    "min_stable_level_fraction",
+    "unit_size_mw",
+    "startup_cost_per_mw",
+    "shutdown_cost_per_mw",
+    "startup_fuel_mmbtu_per_mw",
+    "startup_plus_ramp_up_rate",
+    "shutdown_plus_ramp_down_rate",
+    "ramp_up_when_on_rate",
+    "ramp_down_when_on_rate",
+    "ramp_up_violation_penalty",
+    "ramp_down_violation_penalty",
+    "min_up_time_hours",
+    "min_up_time_violation_penalty",
+    "min_down_time_hours",
+    "min_down_time_violation_penalty",
+    "allow_startup_shutdown_power",
+    "storage_efficiency",
+    "charging_efficiency",
+    "discharging_efficiency",
+    "charging_capacity_multiplier",
+    "discharging_capacity_multiplier",
+    "minimum_duration_hours",
+    "maximum_duration_hours",
+    "aux_consumption_frac_capacity",
+    "aux_consumption_frac_power",
+    "last_commitment_stage",
+    "curtailment_cost_per_pwh",
+    "powerunithour_per_fuelunit",
+    "soc_penalty_cost_per_energyunit",
+    "soc_last_tmp_penalty_cost_per_energyunit",
+    "partial_availability_threshold",
+    "nonfuel_carbon_emissions_per_mwh",
+    "powerhouse",
+    "generator_efficiency",
+    "linked_load_component",
+    "efficiency_factor",
+]
+
+# The spec_capacity_period_params.tab columns; the columns not set are empty
+SPEC_CAPACITY_COLUMNS = [
+    "project",
+    "period",
+    "specified_capacity_mw",
+    "specified_energy_mwh",
+    "shaping_capacity_mw",
+    "hyb_gen_specified_capacity_mw",
+    "hyb_stor_specified_capacity_mw",
+    "specified_stor_capacity_mwh",
+    "fuel_production_capacity_fuelunitperhour",
+    "fuel_release_capacity_fuelunitperhour",
+    "fuel_storage_capacity_fuelunit",
+    "fixed_cost_per_mw_yr",
+    "fixed_cost_per_energy_mwh_yr",
+    "fixed_cost_per_shaping_mw_yr",
+    "hyb_gen_fixed_cost_per_mw_yr",
+    "hyb_stor_fixed_cost_per_mw_yr",
+    "fixed_cost_per_stor_mwh_yr",
+    "fuel_production_capacity_fixed_cost_per_fuelunitperhour_yr",
+    "fuel_release_capacity_fixed_cost_per_fuelunitperhour_yr",
+    "fuel_storage_capacity_fixed_cost_per_fuelunit_yr",
+]
+
+# Project type: (name, capacity_type, operational_type, technology, specific
+# projects.tab values)
+PROJECT_TYPES = [
+    (
+        "Thermal",
+        "gen_spec",
+        "gen_commit_cap",
+        "Gas",
+        {
+            "variable_om_cost_per_mwh": 2.0,
+            "min_stable_level_fraction": 0.4,
+            "unit_size_mw": 50.0,
+            "startup_cost_per_mw": 1.0,
+        },
+    ),
+    ("Wind", "gen_spec", "gen_var", "Wind", {"variable_om_cost_per_mwh": 0.0}),
+    (
+        "Thermal_New",
+        "gen_new_lin",
+        "gen_commit_cap",
+        "Gas",
+        {
+            "variable_om_cost_per_mwh": 2.0,
+            "min_stable_level_fraction": 0.4,
+            "unit_size_mw": 50.0,
+            "startup_cost_per_mw": 1.0,
+        },
+    ),
+    ("Solar", "gen_spec", "gen_var", "Solar", {"variable_om_cost_per_mwh": 0.0}),
+]
+
+
+def write_tab(df, inputs_directory, filename, na_rep="."):
+    df.to_csv(
+        os.path.join(inputs_directory, filename),
+        sep="\t",
+        index=False,
+        na_rep=na_rep,
+    )
+
+
+def get_projects(n_zones, n_projects):
+    """
+    :return: list of (project, project type index, load zone)
+
+    Projects are assigned to the zones in turn in blocks of one project of
+    each type, so that each zone gets a mix of project types.
+    """
+    return [
+        (
+            "{}_{}".format(PROJECT_TYPES[p % len(PROJECT_TYPES)][0], p + 1),
+            p % len(PROJECT_TYPES),
+            "Zone{}".format(p // len(PROJECT_TYPES) % n_zones + 1),
+        )
+        for p in range(n_projects)
+    ]
+
+
+def get_timepoints(subproblem, n_periods, n_horizons, n_timepoints_per_horizon):
+    """
+    :return: DataFrame with the period, horizon, day, hour, and timepoint of
+        the subproblem's timepoints
+
+    Days are numbered across subproblems, and horizons and timepoints are
+    numbered consecutively across subproblems, so that they are unique in
+    the scenario for any number of horizons and timepoints.
+    """
+    rows = []
+    horizon = (subproblem - 1) * n_periods * n_horizons
+    timepoint = horizon * n_timepoints_per_horizon
+    for prd_idx in range(n_periods):
+        period = FIRST_PERIOD + prd_idx * PERIOD_LENGTH_YRS
+        for h in range(n_horizons):
+            day = (subproblem - 1) * n_horizons + h + 1
+            horizon += 1
+            for hour in range(1, n_timepoints_per_horizon + 1):
+                timepoint += 1
+                rows.append([period, horizon, day, hour, timepoint])
+
+    return pd.DataFrame(rows, columns=["period", "horizon", "day", "hour", "timepoint"])
+
+
+def get_features(n_tx_lines, feature_flags):
+    """
+    :param n_tx_lines: number of transmission lines
+    :param feature_flags: list of feature flags (keys of FEATURE_FLAGS)
+    :return: list of the GridPath features of the scenario
+    """
+    unknown_flags = [f for f in feature_flags if f not in FEATURE_FLAGS]
+    if unknown_flags:
+        raise ValueError(
+            "Unknown feature flag(s) {}. Supported flags: {}.".format(
+                ", ".join(unknown_flags), ", ".join(FEATURE_FLAGS.keys())
+            )
+        )
+
+    features = ["transmission"] if n_tx_lines > 0 else []
+    for flag in FEATURE_FLAGS:
+        if flag in feature_flags:
+            features += FEATURE_FLAGS[flag]
+
+    return features
+
+
+def write_subproblem_inputs(
+    inputs_directory,
+    rng,
+    subproblem,
+    n_zones,
+    n_projects,
+    n_tx_lines,
+    n_periods,
+    n_horizons,
+    n_timepoints_per_horizon,
+    feature_flags=(),
+):
+    """
+    Write the inputs/*.tab files for a subproblem.
+    """
+    os.makedirs(inputs_directory, exist_ok=True)
+    zones = ["Zone{}".format(z + 1) for z in range(n_zones)]
+    periods = [FIRST_PERIOD + p * PERIOD_LENGTH_YRS for p in range(n_periods)]
+    projects = get_projects(n_zones=n_zones, n_projects=n_projects)
+    tmps = get_timepoints(
+        subproblem=subproblem,
+        n_periods=n_periods,
+        n_horizons=n_horizons,
+        n_timepoints_per_horizon=n_timepoints_per_horizon,
+    )
+    n_tmps_per_period = n_horizons * n_timepoints_per_horizon
+    month = (tmps["day"] - 1) % 12 + 1
+    hour_of_day = (tmps["hour"] - 1) % 24 + 1
+
+    # Temporal
+    write_tab(
+        pd.DataFrame(
+            {
+                "period": periods,
+                "discount_factor": 1.0,
+                "period_start_year": [float(p) for p in periods],
+                "period_end_year": [float(p + PERIOD_LENGTH_YRS) for p in periods],
+                "hours_in_period_timepoints": 8760.0,
+            }
+        ),
+        inputs_directory,
+        "periods.tab",
+    )
+    write_tab(
+        pd.DataFrame(
+            {
+                "timepoint": tmps["timepoint"],
+                "period": tmps["period"],
+                "timepoint_weight": 8760.0 / n_tmps_per_period,
+                "number_of_hours_in_timepoint": 1,
+                "previous_stage_timepoint_map": ".",
+                "month": month,
+                "day_of_month": ".",
+                "hour_of_day": hour_of_day.astype(float),
+            }
+        ),
+        inputs_directory,
+        "timepoints.tab",
+    )
+    write_tab(
+        pd.DataFrame(
+            {
+                "horizon": tmps["horizon"].unique(),
+                "balancing_type_horizon": "day",
+                "boundary": "circular",
+            }
+        ),
+        inputs_directory,
+        "horizons.tab",
+    )
+    write_tab(
+        pd.DataFrame(
+            {
+                "horizon": tmps["horizon"],
+                "balancing_type_horizon": "day",
+                "timepoint": tmps["timepoint"],
+            }
+        ),
+        inputs_directory,
+        "horizon_timepoints.tab",
+    )
+
+    # Load
+    write_tab(
+        pd.DataFrame(
+            {
+                "load_zone": zones,
+                "allow_overgeneration": 1,
+                "overgeneration_penalty_per_mw": 99999999.0,
+                "allow_unserved_energy": 1,
+                "unserved_energy_penalty_per_mwh": 99999999.0,
+                "unserved_energy_limit_mwh": ".",
+                "max_unserved_load_penalty_per_mw": 0.0,
+                "max_unserved_load_limit_mw": ".",
+                "export_penalty_cost_per_mwh": 0.0,
+            }
+        ),
+        inputs_directory,
+        "load_zones.tab",
+    )
+    write_tab(
+        pd.DataFrame(
+            {
+                "load_zone": zones,
+                "load_component": "all",
+                "load_level_default": ".",
+                "load_component_distribution_loss_adjustment_factor": ".",
+            }
+        ),
+        inputs_directory,
+        "load_component_params.tab",
+    )
+    # Size the load so that the zone's existing projects can (mostly) serve it
+    n_projects_per_zone = max(n_projects // n_zones, 1)
+    daily_shape = 1 + 0.3 * np.sin(2 * np.pi * (hour_of_day.to_numpy() - 6) / 24)
+    load_df = pd.DataFrame(
+        {
+            "load_zone": np.repeat(zones, len(tmps)),
+            "timepoint": np.tile(tmps["timepoint"], n_zones),
+            "load_component": "all",
+            "load_mw": np.round(
+                np.tile(daily_shape, n_zones)
+                * 25.0
+                * n_projects_per_zone
+                * (0.9 + 0.2 * rng.random(n_zones * len(tmps))),
+                3,
+            ),
+        }
+    )
+    write_tab(load_df, inputs_directory, "load_mw.tab")
+
+    # Fuels
+    write_tab(
+        pd.DataFrame(
+            {
+                "fuel": ["Gas"],
+                "co2_intensity_tons_per_mmbtu": [0.05306],
+                "fuel_group": ["Gas"],
+            }
+        ),
+        inputs_directory,
+        "fuels.tab",
+    )
+    write_tab(
+        pd.DataFrame(
+            [["Gas", period, m, 5.0] for period in periods for m in range(1, 13)],
+            columns=["fuel", "period", "month", "fuel_price_per_mmbtu"],
+        ),
+        inputs_directory,
+        "fuel_prices.tab",
+    )
+
+    # Projects
+    projects_columns = list(PROJECTS_COLUMNS)
+    if "reserves" in feature_flags:
+        for reserve_type, _ in RESERVE_TYPES:
+            projects_columns += [
+                "{}_ba".format(reserve_type),
+                "{}_derate".format(reserve_type),
+            ]
+        projects_columns += [
+            "{}_ramp_rate".format(reserve_type) for reserve_type, _ in RESERVE_TYPES
+        ]
+    if "prm" in feature_flags:
+        projects_columns += ["prm_zone", "prm_type"]
+    if "rps" in feature_flags:
+        projects_columns += ["energy_target_zone"]
+
+    project_rows = []
+    for prj, prj_type, zone in projects:
+        name, capacity_type, operational_type, technology, values = PROJECT_TYPES[
+            prj_type
+        ]
+        row = {
+            "project": prj,
+            "capacity_type": capacity_type,
+            "availability_type": "exogenous",
+            "operational_type": operational_type,
+            "balancing_type_project": "day",
+            "load_modifier_flag": 0,
+            "distribution_loss_adjustment_factor": 0.0,
+            "technology": technology,
+            "load_zone": zone,
+        }
+        row.update(values)
+        # Feature zones (one for each load zone)
+        if "reserves" in feature_flags and technology == "Gas":
+            for reserve_type, _ in RESERVE_TYPES:
+                row["{}_ba".format(reserve_type)] = zone
+        if "prm" in feature_flags:
+            row["prm_zone"] = "PRM_" + zone
+            row["prm_type"] = "fully_deliverable"
+        if "rps" in feature_flags and technology != "Gas":
+            row["energy_target_zone"] = "RPS_" + zone
+        project_rows.append(row)
+    write_tab(
+        pd.DataFrame(project_rows, columns=projects_columns),
+        inputs_directory,
+        "projects.tab",
+    )
+
+    thermal_projects = [
+        prj for prj, prj_type, zone in projects if PROJECT_TYPES[prj_type][3] == "Gas"
+    ]
+    write_tab(
+        pd.DataFrame(
+            {
+                "project": thermal_projects,
+                "fuel": "Gas",
+                "min_fraction_in_fuel_blend": ".",
+                "max_fraction_in_fuel_blend": ".",
+            }
+        ),
+        inputs_directory,
+        "project_fuels.tab",
+    )
+    write_tab(
+        pd.DataFrame(
+            [
+                [prj, 0, load_point, heat_rate]
+                for prj in thermal_projects
+                for load_point, heat_rate in [(0.4, 10.0), (1.0, 7.0)]
+            ],
+            columns=[
+                "project",
+                "period",
+                "load_point_fraction",
+                "average_heat_rate_mmbtu_per_mwh",
+            ],
+        ),
+        inputs_directory,
+        "heat_rate_curves.tab",
+    )
+
+    spec_projects = [
+        prj
+        for prj, prj_type, zone in projects
+        if PROJECT_TYPES[prj_type][1] == "gen_spec"
+    ]
+    write_tab(
+        pd.DataFrame(
+            {
+                "project": np.repeat(spec_projects, n_periods),
+                "period": np.tile(periods, len(spec_projects)),
+                "specified_capacity_mw": 40.0,
+            },
+            columns=SPEC_CAPACITY_COLUMNS,
+        ).assign(fixed_cost_per_mw_yr=0.0),
+        inputs_directory,
+        "spec_capacity_period_params.tab",
+        na_rep="",
+    )
+
+    new_projects = [
+        prj
+        for prj, prj_type, zone in projects
+        if PROJECT_TYPES[prj_type][1] == "gen_new_lin"
+    ]
+    write_tab(
+        pd.DataFrame(
+            {
+                "project": np.repeat(new_projects, n_periods),
+                "vintage": np.tile(periods, len(new_projects)),
+                "operational_lifetime_yrs": 30.0,
+                "fixed_cost_per_mw_yr": 0.0,
+                "financial_lifetime_yrs": 30.0,
+                "annualized_real_cost_per_mw_yr": 100000.0,
+            }
+        ),
+        inputs_directory,
+        "new_build_generator_vintage_costs.tab",
+    )
+
+    var_projects = [
+        (prj, PROJECT_TYPES[prj_type][0])
+        for prj, prj_type, zone in projects
+        if PROJECT_TYPES[prj_type][2] == "gen_var"
+    ]
+    solar_shape = np.clip(np.sin(np.pi * (hour_of_day.to_numpy() - 6) / 12), 0, None)
+    cap_factors = [
+        (
+            solar_shape * (0.8 + 0.2 * rng.random(len(tmps)))
+            if prj_type == "Solar"
+            else rng.random(len(tmps))
+        )
+        for prj, prj_type in var_projects
+    ]
+    write_tab(
+        pd.DataFrame(
+            {
+                "project": np.repeat([prj for prj, _ in var_projects], len(tmps)),
+                "timepoint": np.tile(tmps["timepoint"], len(var_projects)),
+                "cap_factor": np.round(
+                    np.concatenate(cap_factors) if cap_factors else [], 4
+                ),
+            }
+        ),
+        inputs_directory,
+        "variable_generator_profiles.tab",
+    )
+
+    # Transmission
+    if n_tx_lines > 0:
+        tx_lines = [
+            (
+                "Tx{}".format(tx + 1),
+                zones[tx % n_zones],
+                zones[(tx + 1) % n_zones],
+            )
+            for tx in range(n_tx_lines)
+        ]
+        write_tab(
+            pd.DataFrame(
+                {
+                    "transmission_line": [tx for tx, _, _ in tx_lines],
+                    "tx_capacity_type": "tx_spec",
+                    "tx_availability_type": "exogenous",
+                    "tx_operational_type": "tx_simple",
+                    "load_zone_from": [z_from for _, z_from, _ in tx_lines],
+                    "load_zone_to": [z_to for _, _, z_to in tx_lines],
+                    "tx_simple_loss_factor": ".",
+                    "losses_tuning_cost_per_mw": ".",
+                    "reactance_ohms": ".",
+                }
+            ),
+            inputs_directory,
+            "transmission_lines.tab",
+        )
+        write_tab(
+            pd.DataFrame(
+                {
+                    "transmission_line": np.repeat(
+                        [tx for tx, _, _ in tx_lines], n_periods
+                    ),
+                    "period": np.tile(periods, n_tx_lines),
+                    "specified_tx_min_mw": -50.0,
+                    "specified_tx_max_mw": 50.0,
+                    "fixed_cost_per_mw_yr": ".",
+                }
+            ),
+            inputs_directory,
+            "specified_transmission_line_capacities.tab",
+        )
+
+    # Reserves, PRM, and policies (requirements by zone, sized from the load)
+    load_by_zone_tmp = load_df.set_index(["load_zone", "timepoint"])["load_mw"]
+    timepoint_weight = 8760.0 / n_tmps_per_period
+    period_load_mwh = (
+        load_df.merge(tmps[["timepoint", "period"]], on="timepoint")
+        .groupby(["load_zone", "period"])["load_mw"]
+        .sum()
+        * timepoint_weight
+    )
+    if "reserves" in feature_flags:
+        for reserve_type, balancing_areas_filename in RESERVE_TYPES:
+            write_tab(
+                pd.DataFrame(
+                    {
+                        "balancing_area": zones,
+                        "allow_violation": 1,
+                        "violation_penalty_per_mw": VIOLATION_PENALTY,
+                        "reserve_to_energy_adjustment": ".",
+                    }
+                ),
+                inputs_directory,
+                balancing_areas_filename,
+            )
+            write_tab(
+                pd.DataFrame(
+                    {
+                        "ba": load_by_zone_tmp.index.get_level_values("load_zone"),
+                        "timepoint": load_by_zone_tmp.index.get_level_values(
+                            "timepoint"
+                        ),
+                        "requirement": np.round(
+                            load_by_zone_tmp.to_numpy() * RESERVE_REQUIREMENT_FRACTION,
+                            3,
+                        ),
+                    }
+                ),
+                inputs_directory,
+                "{}_tmp_requirement.tab".format(reserve_type),
+            )
+
+    if "prm" in feature_flags:
+        peak_load = (
+            load_df.merge(tmps[["timepoint", "period"]], on="timepoint")
+            .groupby(["load_zone", "period"])["load_mw"]
+            .max()
+        )
+        write_tab(
+            pd.DataFrame(
+                {
+                    "prm_zone": ["PRM_" + z for z in zones],
+                    "allow_violation": 1,
+                    "violation_penalty_per_mw": VIOLATION_PENALTY,
+                }
+            ),
+            inputs_directory,
+            "prm_zones.tab",
+        )
+        write_tab(
+            pd.DataFrame(
+                {
+                    "prm_zone": [
+                        "PRM_" + z for z in peak_load.index.get_level_values(0)
+                    ],
+                    "period": peak_load.index.get_level_values(1),
+                    "prm_requirement_mw": np.round(
+                        peak_load.to_numpy() * PRM_FRACTION, 3
+                    ),
+                }
+            ),
+            inputs_directory,
+            "prm_requirement.tab",
+        )
+        write_tab(
+            pd.DataFrame(
+                [
+                    [prj, period, ELCC_FRACTIONS[PROJECT_TYPES[prj_type][3]]]
+                    for prj, prj_type, zone in projects
+                    for period in periods
+                ],
+                columns=["project", "period", "elcc_simple_fraction"],
+            ),
+            inputs_directory,
+            "prm_projects_simple_elcc.tab",
+        )
+
+    if "carbon_cap" in feature_flags:
+        write_tab(
+            pd.DataFrame(
+                {
+                    "carbon_cap_zone": ["Carbon_" + z for z in zones],
+                    "allow_violation": 1,
+                    "violation_penalty_per_emission": VIOLATION_PENALTY,
+                }
+            ),
+            inputs_directory,
+            "carbon_cap_zones.tab",
+        )
+        write_tab(
+            pd.DataFrame(
+                {
+                    "carbon_cap_zone": [
+                        "Carbon_" + z for z in period_load_mwh.index.get_level_values(0)
+                    ],
+                    "period": period_load_mwh.index.get_level_values(1),
+                    "carbon_cap_target": np.round(
+                        period_load_mwh.to_numpy() * CARBON_CAP_INTENSITY, 3
+                    ),
+                }
+            ),
+            inputs_directory,
+            "carbon_cap.tab",
+        )
+        write_tab(
+            pd.DataFrame(
+                {
+                    "project": thermal_projects,
+                    "carbon_cap_zone": [
+                        "Carbon_" + zone
+                        for prj, prj_type, zone in projects
+                        if PROJECT_TYPES[prj_type][3] == "Gas"
+                    ],
+                }
+            ),
+            inputs_directory,
+            "project_carbon_cap_zones.tab",
+        )
+
+    if "rps" in feature_flags:
+        write_tab(
+            pd.DataFrame(
+                {
+                    "energy_target_zone": ["RPS_" + z for z in zones],
+                    "allow_violation": 1,
+                    "violation_penalty_per_mwh": VIOLATION_PENALTY,
+                }
+            ),
+            inputs_directory,
+            "energy_target_zones.tab",
+        )
+        write_tab(
+            pd.DataFrame(
+                {
+                    "energy_target_zone": [
+                        "RPS_" + z for z in period_load_mwh.index.get_level_values(0)
+                    ],
+                    "period": period_load_mwh.index.get_level_values(1),
+                    "energy_target_mwh": np.round(
+                        period_load_mwh.to_numpy() * RPS_FRACTION, 3
+                    ),
+                    "energy_target_fraction": ".",
+                }
+            ),
+            inputs_directory,
+            "period_energy_targets.tab",
+        )
+
+
+def write_synthetic_scenario(
+    scenario_directory,
+    n_zones=2,
+    n_projects=8,
+    n_tx_lines=1,
+    n_periods=1,
+    n_horizons=2,
+    n_timepoints_per_horizon=24,
+    n_subproblems=1,
+    features=(),
+    solver="cbc",
+):
+    """
+    :param scenario_directory: the directory to write the scenario to
+    :param n_zones: number of load zones
+    :param n_projects: number of projects (assigned to the zones in turn)
+    :param n_tx_lines: number of transmission lines (requires 2+ zones)
+    :param n_periods: number of periods
+    :param n_horizons: number of daily horizons per period and subproblem
+    :param n_timepoints_per_horizon: number of timepoints per horizon
+    :param n_subproblems: number of subproblems
+    :param features: list of feature flags (keys of FEATURE_FLAGS) to
+        enable in addition to transmission
+    :param solver: the solver name for solver_options.csv
+    :return:
+
+    Write the scenario's features.csv, solver_options.csv, units.csv, and
+    inputs/*.tab files (in a directory for each subproblem if there is more
+    than one subproblem).
+    """
+    if n_tx_lines > 0 and n_zones < 2:
+        raise ValueError("Transmission lines require at least 2 load zones.")
+    scenario_features = get_features(n_tx_lines=n_tx_lines, feature_flags=features)
+
+    os.makedirs(scenario_directory, exist_ok=True)
+    pd.DataFrame({"features": scenario_features}).to_csv(
+        os.path.join(scenario_directory, "features.csv"), index=False
+    )
+    pd.DataFrame([["solver_name", solver]]).to_csv(
+        os.path.join(scenario_directory, "solver_options.csv"),
+        index=False,
+        header=False,
+    )
+    pd.DataFrame(UNITS, columns=["metric", "unit"]).to_csv(
+        os.path.join(scenario_directory, "units.csv"), index=False
+    )
+
+    rng = np.random.default_rng(seed=0)
+    for subproblem in range(1, n_subproblems + 1):
+        write_subproblem_inputs(
+            inputs_directory=os.path.join(
+                scenario_directory,
+                str(subproblem) if n_subproblems > 1 else "",
+                "inputs",
+            ),
+            rng=rng,
+            subproblem=subproblem,
+            n_zones=n_zones,
+            n_projects=n_projects,
+            n_tx_lines=n_tx_lines,
+            n_periods=n_periods,
+            n_horizons=n_horizons,
+            n_timepoints_per_horizon=n_timepoints_per_horizon,
+            feature_flags=features,
+        )
+
+
+def add_scenario_size_arguments(parser):
+    """
+    Add the scenario size arguments (shared with the scaling benchmark).
+    """
+    parser.add_argument("--n_zones", default=2, type=int)
+    parser.add_argument("--n_projects", default=8, type=int)
+    parser.add_argument("--n_tx_lines", default=1, type=int)
+    parser.add_argument("--n_periods", default=1, type=int)
+    parser.add_argument("--n_horizons", default=2, type=int)
+    parser.add_argument("--n_timepoints_per_horizon", default=24, type=int)
+    parser.add_argument("--n_subproblems", default=1, type=int)
+
+
+def parse_arguments(args):
+    parser = argparse.ArgumentParser(add_help=True)
+    parser.add_argument("--scenario_location", required=True)
+    parser.add_argument("--scenario", default="synthetic")
+    parser.add_argument("--solver", default="cbc")
+    parser.add_argument(
+        "--features",
+        nargs="*",
+        default=[],
+        choices=list(FEATURE_FLAGS.keys()),
+        help="Feature flags to enable in addition to transmission.",
+    )
+    add_scenario_size_arguments(parser)
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    parsed_args = parse_arguments(args)
+
+    write_synthetic_scenario(
+        scenario_directory=os.path.join(
+            parsed_args.scenario_location, parsed_args.scenario
+        ),
+        n_zones=parsed_args.n_zones,
+        n_projects=parsed_args.n_projects,
+        n_tx_lines=parsed_args.n_tx_lines,
+        n_periods=parsed_args.n_periods,
+        n_horizons=parsed_args.n_horizons,
+        n_timepoints_per_horizon=parsed_args.n_timepoints_per_horizon,
+        n_subproblems=parsed_args.n_subproblems,
+        features=parsed_args.features,
+        solver=parsed_args.solver,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -71,7 +71,7 @@ def main(args=None):
             df = pd.read_csv(f_path, delimiter=",")
 
             spin_on_database_lock_generic(
-                command=df.to_sql(
+                command=lambda: df.to_sql(
                     name=table,
                     con=conn,
                     if_exists="append",
@@ -239,7 +239,7 @@ def create_weather_draws(
         );
     """
 
-    spin_on_database_lock_generic(command=c.execute(sql_info))
+    spin_on_database_lock_generic(command=lambda: c.execute(sql_info))
 
     sql = """
         INSERT INTO aux_weather_iterations (
@@ -262,7 +262,7 @@ def create_weather_draws(
             ?
         )
     """
-    spin_on_database_lock_generic(command=c.executemany(sql, data))
+    spin_on_database_lock_generic(command=lambda: c.executemany(sql, data))
 
     conn.commit()
 
@@ -324,7 +324,7 @@ def draw_conditions(
         ;
     """
 
-    spin_on_database_lock_generic(c.execute(update_sql))
+    spin_on_database_lock_generic(lambda: c.execute(update_sql))
 
     conn.commit()
 
@@ -360,7 +360,7 @@ def make_timeseries_draw_profiles(conn, parsed_args):
             ;
         """
 
-    spin_on_database_lock_generic(c.execute(it_seed_sql))
+    spin_on_database_lock_generic(lambda: c.execute(it_seed_sql))
 
     # Get the weather draws
     weather_draws = get_weather_draws(
@@ -393,7 +393,7 @@ def make_timeseries_draw_profiles(conn, parsed_args):
                     ADD COLUMN {column} INTEGER
                     ;
                 """
-            spin_on_database_lock_generic(c.execute(sql))
+            spin_on_database_lock_generic(lambda: c.execute(sql))
         conn.commit()
 
         # Iterate over weather iterations and draws
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from contextlib import contextmanager
 import os.path
 import sqlite3
 import sys
@@ -19,6 +20,23 @@ import time
 import traceback
 
 
+class Connection(sqlite3.Connection):
+    """
+    SQLite connection whose commits can be deferred (see *db_transaction*),
+    so that a sequence of statements, each of which would normally be
+    committed separately (e.g. by *spin_on_database_lock*), is written to
+    the database in a single transaction.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.defer_commit = False
+
+    def commit(self):
+        if not self.defer_commit:
+            super().commit()
+
+
 def connect_to_database(db_path="../db/io.db", timeout=5, detect_types=0):
     """
     :param db_path: str, the path to the database, relative to the
@@ -36,7 +54,9 @@ def connect_to_database(db_path="../db/io.db", timeout=5, detect_types=0):
             "specify a different database file?".format(os.path.abspath(db_path))
         )
 
-    conn = sqlite3.connect(db_path, timeout=timeout, detect_types=detect_types)
+    conn = sqlite3.connect(
+        db_path, timeout=timeout, detect_types=detect_types, factory=Connection
+    )
 
     # Enforce foreign keys (default = not enforced)
     conn.execute("PRAGMA foreign_keys=ON;")
@@ -90,7 +110,7 @@ def spin_on_database_lock(
                     "Database is locked, sleeping for {} seconds, "
                     "then retrying.".format(interval)
                 )
-                if i == max_attempts:
+                if i == max_attempts - 1:
                     print(
                         "Database still locked after {} seconds. "
                         "Exiting.".format(max_attempts * interval)
@@ -114,7 +134,9 @@ def spin_on_database_lock_generic(
     interval=10,
 ):
     """
-    :param command:
+    :param command: callable that runs the database command (e.g. a lambda
+        wrapping a *to_sql* or *execute* call); it is called again on each
+        retry, so it must not be executed by the caller
     :param max_attempts: how long to wait for the database lock to be
         released; the default is 600 seconds, but that can be overridden
     :param interval: how frequently to poll the database for whether
@@ -135,14 +157,14 @@ def spin_on_database_lock_generic(
         if i > 0:
             print("...retrying (attempt {} of {})...".format(i, max_attempts))
         try:
-            command
+            command()
         except sqlite3.OperationalError as e:
             if "locked" in str(e):
                 print(
                     "Database is locked, sleeping for {} seconds, "
                     "then retrying.".format(interval)
                 )
-                if i == max_attempts:
+                if i == max_attempts - 1:
                     print(
                         "Database still locked after {} seconds. "
                         "Exiting.".format(max_attempts * interval)
@@ -158,3 +180,57 @@ def spin_on_database_lock_generic(
         else:
             # print("...done.")
             break
+
+
+def set_wal_journal_mode(conn):
+    """
+    :param conn: the database connection
+
+    Switch the database to write-ahead-log journal mode, in which readers
+    don't block the writer and the writer doesn't block readers, and
+    commits are cheaper (with synchronous=NORMAL, the WAL is only synced to
+    disk on checkpoints). The journal mode persists in the database file.
+    """
+    spin_on_database_lock_generic(
+        command=lambda: conn.execute("PRAGMA journal_mode=WAL;")
+    )
+    conn.execute("PRAGMA synchronous=NORMAL;")
+
+
+@contextmanager
+def db_transaction(conn, max_attempts=61, interval=10):
+    """
+    :param conn: the database connection (see *connect_to_database*)
+    :param max_attempts: how many times to try to acquire the write lock
+    :param interval: how frequently to retry acquiring the write lock, in
+        seconds
+
+    Run the statements in the context in a single transaction: the write
+    lock is acquired up front (with BEGIN IMMEDIATE, retrying while the
+    database is locked by another writer), commits by the statements in the
+    context are deferred, and everything is committed once on exit (or
+    rolled back if an exception is raised). Connections that don't support
+    deferring commits (i.e. not created with *connect_to_database*) commit
+    as usual.
+    """
+    if not isinstance(conn, Connection) or conn.defer_commit:
+        yield conn
+        return
+
+    # Commit anything pending before starting our transaction
+    conn.commit()
+    spin_on_database_lock_generic(
+        command=lambda: conn.execute("BEGIN IMMEDIATE;"),
+        max_attempts=max_attempts,
+        interval=interval,
+    )
+    conn.defer_commit = True
+    try:
+        yield conn
+    except BaseException:
+        conn.defer_commit = False
+        conn.rollback()
+        raise
+    else:
+        conn.defer_commit = False
+        conn.commit()
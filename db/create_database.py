@@ -39,6 +39,7 @@ import sqlite3
 import sys
 
 from db.common_functions import spin_on_database_lock, spin_on_database_lock_generic
+from db.utilities.indexes import create_indexes
 
 
 def parse_arguments(arguments):
@@ -267,7 +268,7 @@ def load_aux_data(conn, data_directory, filename):
     )
     df = pd.read_csv(file_path, delimiter=",")
     spin_on_database_lock_generic(
-        command=df.to_sql(
+        command=lambda: df.to_sql(
             name=filename,
             con=conn,
             if_exists="append",
@@ -302,6 +303,9 @@ def main(args=None):
     conn.execute("PRAGMA foreign_keys=ON;")
     # Create schema
     create_database_schema(conn=conn, parsed_arguments=parsed_args)
+    # Create the secondary indexes (for the tables that exist in the schema)
+    # except for the opt-in indexes
+    create_indexes(conn=conn)
     # Load data
     if not parsed_args.omit_data:
         load_data(
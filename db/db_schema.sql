@@ -203,12 +203,37 @@ CREATE TABLE results_scenario
     stage_id                     INTEGER,
     objective_function_value     FLOAT,
     solver_termination_condition VARCHAR(128),
+    results_processed            INTEGER DEFAULT 0, -- set by process_results
     PRIMARY KEY (scenario_id, weather_iteration, hydro_iteration,
                  availability_iteration, subproblem_id,
                  stage_id),
     FOREIGN KEY (scenario_id) REFERENCES scenarios (scenario_id)
 );
 
+-- Wall time by phase (and module) of the subproblem/stage run and the peak
+-- RSS of the process during each phase (written when GridPath is run with
+-- --profile)
+DROP TABLE IF EXISTS results_scenario_profiling;
+CREATE TABLE results_scenario_profiling
+(
+    scenario_id            INTEGER,
+    weather_iteration      INTEGER,
+    hydro_iteration        INTEGER,
+    availability_iteration INTEGER,
+    subproblem_id          INTEGER,
+    stage_id               INTEGER,
+    phase_order            INTEGER,
+    phase                  VARCHAR(64),
+    module                 VARCHAR(128),
+    wall_time_s            FLOAT,
+    peak_rss_mb            FLOAT,
+    peak_rss_increase_mb   FLOAT,
+    PRIMARY KEY (scenario_id, weather_iteration, hydro_iteration,
+                 availability_iteration, subproblem_id, stage_id,
+                 phase_order),
+    FOREIGN KEY (scenario_id) REFERENCES scenarios (scenario_id)
+);
+
 
 -------------------------------------------------------------------------------
 ---- SUBSCENARIOS AND INPUTS -----
@@ -0,0 +1,359 @@
+# Copyright 2016-2024 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Create or drop the secondary indexes of the GridPath database.
+
+The primary keys of the results tables lead with the scenario and iteration
+columns, but the results processing, the visualization scripts, and the UI
+filter these tables by other column combinations (e.g. by load zone and
+stage or by timepoint, load zone, and technology). The index catalog
+(*INDEX_CATALOG*) lists the secondary indexes for these query shapes; the
+indexes are covering where the queries select a known set of columns.
+
+The indexes are created with the database (see *create_database.py*),
+except for the opt-in indexes (*OPT_IN_INDEXES*). Each index also needs to
+be updated on every insert, and a wide covering index on one of the largest
+results tables adds noticeably to every results import (e.g. 10-15% to
+the import of a 48,000-row project-timepoint results table), so it is only
+created when requested:
+
+>>> gridpath_db_indexes --database PATH/TO/DB --opt_in
+
+Dropping the indexes before a large bulk import (e.g. of many scenarios) and
+re-creating them afterwards is faster than importing with the indexes in
+place, but re-creating them after each scenario's import is slower, as the
+indexes are rebuilt for the whole table:
+
+>>> gridpath_db_indexes --database PATH/TO/DB --drop
+>>> gridpath_import_results --database PATH/TO/DB --scenario SCENARIO
+>>> gridpath_db_indexes --database PATH/TO/DB
+
+or, programmatically, import within the *indexes_dropped* context.
+"""
+
+from argparse import ArgumentParser
+from contextlib import contextmanager
+import sys
+
+from db.common_functions import connect_to_database, spin_on_database_lock
+
+# Index name: (table, indexed columns)
+INDEX_CATALOG = {
+    # Dispatch by technology aggregation in process_results
+    # (project/operations/power.py); opt-in
+    "idx_results_project_timepoint_dispatch_by_technology": (
+        "results_project_timepoint",
+        [
+            "scenario_id",
+            "weather_iteration",
+            "hydro_iteration",
+            "availability_iteration",
+            "subproblem_id",
+            "stage_id",
+            "timepoint",
+            "load_zone",
+            "technology",
+            "period",
+            "timepoint_weight",
+            "number_of_hours_in_timepoint",
+            "spinup_or_lookahead",
+            "power_mw",
+        ],
+    ),
+    # Capacity by load zone and technology (viz, UI)
+    "idx_results_project_period_load_zone_technology": (
+        "results_project_period",
+        [
+            "scenario_id",
+            "subproblem_id",
+            "stage_id",
+            "period",
+            "load_zone",
+            "technology",
+        ],
+    ),
+    # Dispatch plot (viz/dispatch_plot.py, UI)
+    "idx_results_project_dispatch_by_technology_load_zone": (
+        "results_project_dispatch_by_technology",
+        [
+            "scenario_id",
+            "load_zone",
+            "weather_iteration",
+            "hydro_iteration",
+            "availability_iteration",
+            "stage_id",
+            "timepoint",
+            "technology",
+            "power_mw",
+        ],
+    ),
+    "idx_results_system_load_zone_timepoint_load_zone": (
+        "results_system_load_zone_timepoint",
+        [
+            "scenario_id",
+            "load_zone",
+            "weather_iteration",
+            "hydro_iteration",
+            "availability_iteration",
+            "stage_id",
+            "timepoint",
+        ],
+    ),
+    "idx_results_project_curtailment_variable_periodagg_load_zone": (
+        "results_project_curtailment_variable_periodagg",
+        [
+            "scenario_id",
+            "load_zone",
+            "weather_iteration",
+            "hydro_iteration",
+            "availability_iteration",
+            "stage_id",
+            "timepoint",
+        ],
+    ),
+    "idx_results_project_curtailment_hydro_periodagg_load_zone": (
+        "results_project_curtailment_hydro_periodagg",
+        [
+            "scenario_id",
+            "load_zone",
+            "weather_iteration",
+            "hydro_iteration",
+            "availability_iteration",
+            "stage_id",
+            "timepoint",
+        ],
+    ),
+    # Energy plot (viz/energy_plot.py, UI)
+    "idx_results_project_dispatch_by_technology_period_load_zone": (
+        "results_project_dispatch_by_technology_period",
+        [
+            "scenario_id",
+            "load_zone",
+            "stage_id",
+            "spinup_or_lookahead",
+            "period",
+            "technology",
+            "energy_mwh",
+        ],
+    ),
+    # Projects of an operational type (input queries of the operational
+    # type modules)
+    "idx_inputs_project_operational_chars_operational_type": (
+        "inputs_project_operational_chars",
+        [
+            "project_operational_chars_scenario_id",
+            "operational_type",
+            "project",
+        ],
+    ),
+}
+
+
+# Catalog indexes that are only created when requested: the aggregation
+# query is served by the primary key without them (with a temporary B-tree
+# for the grouping), and maintaining them slows down the results import
+OPT_IN_INDEXES = ["idx_results_project_timepoint_dispatch_by_technology"]
+
+
+def get_catalog_indexes(conn, tables=None, opt_in=True):
+    """
+    :param conn: the database connection
+    :param tables: list of tables to limit the indexes to (all if None)
+    :param opt_in: boolean, whether to include the opt-in indexes
+    :return: dictionary of the catalog indexes (name: (table, columns)) on
+        tables that exist in the database
+    """
+    existing_tables = [
+        row[0]
+        for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table';"
+        ).fetchall()
+    ]
+
+    return {
+        index_name: (table, columns)
+        for index_name, (table, columns) in INDEX_CATALOG.items()
+        if table in existing_tables
+        and (tables is None or table in tables)
+        and (opt_in or index_name not in OPT_IN_INDEXES)
+    }
+
+
+def get_existing_indexes(conn):
+    """
+    :param conn: the database connection
+    :return: list of the names of the catalog indexes that exist in the
+        database
+    """
+    existing_indexes = [
+        row[0]
+        for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index';"
+        ).fetchall()
+    ]
+
+    return [
+        index_name for index_name in INDEX_CATALOG if index_name in existing_indexes
+    ]
+
+
+def create_indexes(conn, tables=None, opt_in=False, quiet=True, index_names=None):
+    """
+    :param conn: the database connection
+    :param tables: list of tables to create the indexes for (all if None)
+    :param opt_in: boolean, whether to also create the opt-in indexes
+    :param quiet: boolean
+    :param index_names: list of the catalog indexes to create (all, subject
+        to *tables* and *opt_in*, if None)
+
+    Create the catalog indexes (if they don't exist already) and update the
+    query planner statistics for the indexed tables.
+    """
+    c = conn.cursor()
+    indexes = {
+        index_name: table_columns
+        for index_name, table_columns in get_catalog_indexes(
+            conn=conn, tables=tables, opt_in=opt_in or index_names is not None
+        ).items()
+        if index_names is None or index_name in index_names
+    }
+    for index_name, (table, columns) in indexes.items():
+        if not quiet:
+            print(f"...creating index {index_name}")
+        spin_on_database_lock(
+            conn=conn,
+            cursor=c,
+            sql=f"CREATE INDEX IF NOT EXISTS {index_name} "
+            f"ON {table} ({', '.join(columns)});",
+            data=(),
+            many=False,
+        )
+
+    for table in sorted(set(table for table, _ in indexes.values())):
+        spin_on_database_lock(
+            conn=conn, cursor=c, sql=f"ANALYZE {table};", data=(), many=False
+        )
+
+
+def drop_indexes(conn, tables=None, quiet=True):
+    """
+    :param conn: the database connection
+    :param tables: list of tables to drop the indexes for (all if None)
+    :param quiet: boolean
+
+    Drop the catalog indexes (including the opt-in indexes).
+    """
+    c = conn.cursor()
+    for index_name in get_catalog_indexes(conn=conn, tables=tables).keys():
+        if not quiet:
+            print(f"...dropping index {index_name}")
+        spin_on_database_lock(
+            conn=conn,
+            cursor=c,
+            sql=f"DROP INDEX IF EXISTS {index_name};",
+            data=(),
+            many=False,
+        )
+
+
+@contextmanager
+def indexes_dropped(conn, tables=None, quiet=True):
+    """
+    :param conn: the database connection
+    :param tables: list of tables to drop the indexes for (all if None)
+    :param quiet: boolean
+
+    Drop the catalog indexes for the duration of the context (e.g. a bulk
+    import) and re-create the ones that existed on exit.
+    """
+    existing_indexes = get_existing_indexes(conn=conn)
+    drop_indexes(conn=conn, tables=tables, quiet=quiet)
+    try:
+        yield conn
+    finally:
+        create_indexes(
+            conn=conn, tables=tables, quiet=quiet, index_names=existing_indexes
+        )
+
+
+def parse_arguments(args):
+    """
+    :param args: the script arguments specified by the user
+    :return: the parsed known argument values (<class 'argparse.Namespace'>
+    Python object)
+
+    Parse the known arguments.
+    """
+    parser = ArgumentParser(add_help=True)
+
+    parser.add_argument(
+        "--database",
+        default="../io.db",
+        help="The database file path relative to the current "
+        "working directory. Defaults to ../io.db ",
+    )
+    parser.add_argument(
+        "--drop",
+        default=False,
+        action="store_true",
+        help="Drop the indexes instead of creating them, e.g. before a "
+        "large results import.",
+    )
+    parser.add_argument(
+        "--opt_in",
+        default=False,
+        action="store_true",
+        help="Also create the opt-in indexes ({}). These speed up results "
+        "processing but slow down every results import.".format(
+            ", ".join(OPT_IN_INDEXES)
+        ),
+    )
+    parser.add_argument(
+        "--tables",
+        nargs="+",
+        help="Only create (or drop) the indexes on these tables.",
+    )
+    parser.add_argument(
+        "--quiet", default=False, action="store_true", help="Don't print output."
+    )
+
+    parsed_arguments = parser.parse_known_args(args=args)[0]
+
+    return parsed_arguments
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+
+    parsed_args = parse_arguments(args=args)
+
+    conn = connect_to_database(db_path=parsed_args.database)
+
+    if parsed_args.drop:
+        drop_indexes(conn=conn, tables=parsed_args.tables, quiet=parsed_args.quiet)
+    else:
+        create_indexes(
+            conn=conn,
+            tables=parsed_args.tables,
+            opt_in=parsed_args.opt_in,
+            quiet=parsed_args.quiet,
+        )
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
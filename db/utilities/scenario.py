@@ -277,6 +277,94 @@ def delete_scenario_results(conn, scenario_id):
         )
 
 
+# The columns identifying the (iteration, subproblem, stage) of a result
+RESULTS_KEY_COLUMNS = [
+    "weather_iteration",
+    "hydro_iteration",
+    "availability_iteration",
+    "subproblem_id",
+    "stage_id",
+]
+
+
+def get_subproblem_stage_results_tables(conn):
+    """
+    :param conn:
+    :return: list of the names of the results tables indexed by
+        iteration, subproblem, and stage
+
+    Tables with scenario-level results (not by subproblem/stage) are
+    recomputed by process_results and are not included.
+    """
+    c = conn.cursor()
+    all_tables = c.execute(
+        "SELECT name FROM sqlite_master WHERE type='table';"
+    ).fetchall()
+
+    results_tables = []
+    for tbl in [tbl[0] for tbl in all_tables if tbl[0].startswith("results")]:
+        columns = [row[1] for row in c.execute(f"PRAGMA table_info({tbl});")]
+        if all(col in columns for col in RESULTS_KEY_COLUMNS):
+            results_tables.append(tbl)
+
+    return results_tables
+
+
+def delete_subproblem_stage_results(
+    conn,
+    results_tables,
+    scenario_id,
+    weather_iteration,
+    hydro_iteration,
+    availability_iteration,
+    subproblem,
+    stage,
+):
+    """
+    :param conn:
+    :param results_tables: list of the results tables to delete from (see
+        *get_subproblem_stage_results_tables*)
+    :param scenario_id:
+    :param weather_iteration: int
+    :param hydro_iteration: int
+    :param availability_iteration: int
+    :param subproblem: int
+    :param stage: int
+    :return:
+
+    Delete the results of a single iteration/subproblem/stage from the
+    results tables, including its row in results_scenario; the results of
+    the scenario's other subproblems and stages are left alone.
+    """
+    c = conn.cursor()
+    for tbl in results_tables:
+        sql = """
+            DELETE FROM {}
+            WHERE scenario_id = ?
+            AND weather_iteration = ?
+            AND hydro_iteration = ?
+            AND availability_iteration = ?
+            AND subproblem_id = ?
+            AND stage_id = ?;
+            """.format(
+            tbl
+        )
+        spin_on_database_lock(
+            conn=conn,
+            cursor=c,
+            sql=sql,
+            data=(
+                scenario_id,
+                weather_iteration,
+                hydro_iteration,
+                availability_iteration,
+                subproblem,
+                stage,
+            ),
+            many=False,
+        )
+
+
 def check_if_scenario_name_exists(conn, scenario_name):
     """
     :param conn: the database connection
@@ -21,6 +21,8 @@ import os.path
 import pandas as pd
 import traceback
 
+from gridpath.auxiliary.input_cache import read_cached_tab_df
+
 
 def get_required_subtype_modules(
     scenario_directory,
@@ -35,7 +37,7 @@ def get_required_subtype_modules(
     """
     Get a list of unique types from projects.tab.
     """
-    df = pd.read_csv(
+    df = read_cached_tab_df(
         os.path.join(
             scenario_directory,
             weather_iteration,
@@ -45,8 +47,7 @@ def get_required_subtype_modules(
             stage,
             "inputs",
             "{}.tab".format(filename),
-        ),
-        sep="\t",
+        )
     )
 
     required_modules = df[which_type].unique()
@@ -136,6 +137,57 @@ def subset_init_by_set_membership(mod, superset, index, membership_set):
     )
 
 
+def get_set_index(mod, index_name, set_name, key_rule, value_rule):
+    """
+    Build an inverted index over the members of a set in a single pass.
+
+    Indexed sets are initialized one index at a time, so an indexed set
+    initialized by filtering a large set (e.g. all project-timepoints) for
+    each of its indices scales quadratically. Instead, initialize rules can
+    look up their members in an index built here once per model instance
+    and cached on the instance under *index_name*.
+
+    :param mod: the Pyomo model instance
+    :param index_name: the name under which to cache the index
+    :param set_name: the name of the set to index
+    :param key_rule: function of (mod, element) returning the index key for
+        the set element; elements for which the rule returns None are skipped
+    :param value_rule: function of (mod, element) returning the value to
+        append to the list for the element's key
+    :return: dictionary {key: [values, ordered as in the indexed set]}
+    """
+
+    def index_init(instance):
+        index = dict()
+        for element in getattr(instance, set_name):
+            key = key_rule(instance, element)
+            if key is not None:
+                index.setdefault(key, []).append(value_rule(instance, element))
+        return index
+
+    return get_cached_model_data(mod, name=index_name, build_rule=index_init)
+
+
+def get_cached_model_data(mod, name, build_rule):
+    """
+    Build derived data (e.g. a lookup dictionary) from the model instance
+    once and cache it on the instance under *name*; subsequent calls return
+    the cached data.
+
+    :param mod: the Pyomo model instance
+    :param name: the name under which to cache the data
+    :param build_rule: function of (mod) returning the data
+    :return: the cached data
+    """
+    if not hasattr(mod, "_gridpath_set_indices"):
+        mod._gridpath_set_indices = dict()
+
+    if name not in mod._gridpath_set_indices:
+        mod._gridpath_set_indices[name] = build_rule(mod)
+
+    return mod._gridpath_set_indices[name]
+
+
 def check_list_has_single_item(l, error_msg):
     if len(l) > 1:
         raise ValueError(error_msg)
@@ -0,0 +1,117 @@
+# Copyright 2016-2024 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Columnar loading of tab-delimited input files into the Pyomo DataPortal.
+
+Large input files (e.g. the project-timepoint profiles) are read once with
+the pandas C parser into typed NumPy arrays; the param data are then built in
+bulk from the arrays (filtering with array masks and converting to Python
+objects with *tolist*) rather than row by row or through a pandas
+MultiIndex. As with the DataPortal's own tab-file reader, "." denotes a
+value that is not specified (the param default is used).
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def read_tab_columns(filename, columns=None, dtypes=None):
+    """
+    :param filename: str, path to the tab-delimited file
+    :param columns: list of the columns to read; all columns if None
+    :param dtypes: dictionary of column types (optional)
+    :return: dictionary {column: NumPy array} with the columns in file order
+
+    Read the requested columns of a tab-delimited file into arrays.
+    """
+    df = pd.read_csv(filename, sep="\t", usecols=columns, dtype=dtypes)
+
+    return {c: df[c].to_numpy() for c in df.columns}
+
+
+def specified_values_mask(values):
+    """
+    :param values: NumPy array of param values
+    :return: boolean array, True where a value is specified (i.e. not ".")
+    """
+    if values.dtype == object:
+        return values != "."
+    else:
+        return np.ones(len(values), dtype=bool)
+
+
+def isin_mask(values, members):
+    """
+    :param values: NumPy array
+    :param members: list-like of the values to look for
+    :return: boolean array, True where the value is in *members*
+
+    Hash-based membership check (numpy.isin sorts object arrays, which is
+    slow for large string columns).
+    """
+    return pd.Series(values).isin(members).to_numpy()
+
+
+def get_param_data(index_columns, values, cast_as_type=float, mask=None):
+    """
+    :param index_columns: list of NumPy arrays with the param index, one for
+        each index dimension
+    :param values: NumPy array with the param values; "." values are skipped
+    :param cast_as_type: the type for the param values
+    :param mask: boolean array of the rows to include (optional)
+    :return: dictionary {index: value} to load into the DataPortal
+
+    Build the param data for the DataPortal in bulk from the input columns.
+    One-dimensional indices are scalars, multi-dimensional indices tuples.
+    """
+    include = specified_values_mask(values)
+    if mask is not None:
+        include &= mask
+
+    if cast_as_type is float:
+        param_values = values[include].astype(float).tolist()
+    else:
+        param_values = [cast_as_type(v) for v in values[include].tolist()]
+
+    index_lists = [c[include].tolist() for c in index_columns]
+    if len(index_lists) == 1:
+        param_index = index_lists[0]
+    else:
+        param_index = zip(*index_lists)
+
+    return dict(zip(param_index, param_values))
+
+
+def load_tab_file_params(data_portal, filename, param_names):
+    """
+    :param data_portal: the Pyomo DataPortal
+    :param filename: str, path to the tab-delimited file
+    :param param_names: list of the names of the params to load
+    :return:
+
+    Columnar equivalent of *data_portal.load(filename=filename,
+    param=params)* for a file whose last len(param_names) columns are the
+    param values (in the order of *param_names*) and whose other columns are
+    the param index.
+    """
+    columns = read_tab_columns(filename=filename)
+    column_names = list(columns.keys())
+    n_index_columns = len(column_names) - len(param_names)
+    index_columns = [columns[c] for c in column_names[:n_index_columns]]
+
+    for param_name, column_name in zip(param_names, column_names[n_index_columns:]):
+        data_portal.data()[param_name] = get_param_data(
+            index_columns=index_columns, values=columns[column_name]
+        )
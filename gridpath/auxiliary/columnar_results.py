@@ -0,0 +1,128 @@
+# Copyright 2016-2024 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Columnar extraction of results from the solved instance.
+
+Results tables (e.g. the project-timepoint results) are built column by
+column rather than row by row: the values of each Var, Expression, or Param
+component are pulled into a NumPy array aligned to a shared index (resolving
+the component once and reading its data objects directly rather than going
+through *value()* for each index), and each table is then assembled in a
+single step from the arrays. Results added to an existing results table are
+set by position in the table's index instead of with *DataFrame.update*,
+which aligns the two indices again for every column.
+"""
+
+import numpy as np
+import pandas as pd
+from pyomo.common.numeric_types import native_types
+
+
+def get_data_value(data):
+    """
+    :param data: a Var, Expression, or Param data object (or the value of
+        an immutable Param)
+    :return: the value of the data object
+    """
+    if data.__class__ in native_types:
+        return data
+    if data.is_named_expression_type():
+        # Constants, variables, and params the expression consists of (e.g.
+        # the power provision of most operational types) are returned
+        # directly; other expressions are evaluated
+        return data()
+    return data.value
+
+
+def to_array(values):
+    """
+    :param values: list of values
+    :return: NumPy array of the values with the type pandas would infer for
+        a results column (e.g. float with NaN for missing values)
+    """
+    return pd.Series(values).to_numpy()
+
+
+def get_component_values(component, index=None, include=None):
+    """
+    :param component: the indexed Pyomo Var, Expression, or Param
+    :param index: list of the indices to get the values for; all indices of
+        the component (in order) if None
+    :param include: list of booleans aligned to *index*, whether to get the
+        value of each index (the value is None if not); all indices are
+        included if None
+    :return: NumPy array of the component values aligned to *index*
+    """
+    if index is None:
+        data = component.values()
+    elif include is None:
+        data = [component[idx] for idx in index]
+    else:
+        data = [
+            component[idx] if included else None
+            for idx, included in zip(index, include)
+        ]
+
+    return to_array([get_data_value(d) for d in data])
+
+
+def get_results_df(index_columns, index, results_columns):
+    """
+    :param index_columns: list of the names of the index columns
+    :param index: list of the index tuples (one value for each index column)
+    :param results_columns: dictionary {column: NumPy array or list} of the
+        results columns aligned to *index*
+    :return: the results DataFrame, indexed by the index columns
+
+    Assemble a results table from its columns in one step.
+    """
+    if index:
+        index_values = [list(values) for values in zip(*index)]
+    else:
+        index_values = [[] for _ in index_columns]
+
+    columns = dict(zip(index_columns, index_values))
+    columns.update(results_columns)
+
+    return pd.DataFrame(columns, columns=list(columns.keys())).set_index(index_columns)
+
+
+def update_results_df(df, results_df):
+    """
+    :param df: the results DataFrame to update (in place)
+    :param results_df: DataFrame with the results to add to *df*, indexed
+        like *df*
+
+    Add the columns of *results_df* to *df* (as empty columns if they don't
+    exist yet) and set their non-missing values in the rows of *df* with the
+    same index, like *DataFrame.update* would. Rows of *results_df* not in
+    *df* are ignored.
+    """
+    positions = df.index.get_indexer(results_df.index)
+    in_df = positions >= 0
+    # DataFrame.update aligns the results to all rows of *df*, so integer
+    # results are converted to floats unless they cover all rows
+    covers_df = np.count_nonzero(in_df) == len(df)
+    for column in results_df.columns:
+        if column in df.columns:
+            column_values = df[column].to_numpy(dtype=object, copy=True)
+        else:
+            column_values = np.full(len(df), None, dtype=object)
+        values = results_df[column].to_numpy()
+        if values.dtype.kind in "iu" and not covers_df:
+            values = values.astype(float)
+        include = in_df & pd.notna(values)
+        column_values[positions[include]] = values[include]
+        df[column] = column_values
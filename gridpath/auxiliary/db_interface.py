@@ -12,10 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import os.path
-import pandas as pd
-
-from db.common_functions import spin_on_database_lock, spin_on_database_lock_generic
+from db.common_functions import spin_on_database_lock
+from gridpath.auxiliary.results_io import read_results_df
 
 
 def get_required_capacity_types_from_database(conn, scenario_id):
@@ -151,9 +149,7 @@ def setup_results_import(
     :param subproblem:
     :param stage:
 
-    Prepare for results import: 1) delete prior results and 2) create a
-    temporary table we'll insert into first (for sorting before inserting
-    into the final table)
+    Prepare for results import: delete prior results.
     """
     # Delete prior results
     del_sql = """
@@ -182,38 +178,6 @@ def setup_results_import(
         many=False,
     )
 
-    # Create temporary table, which we'll use to sort the results before
-    # inserting them into our persistent table
-    drop_tbl_sql = """DROP TABLE IF EXISTS temp_{}{};
-        """.format(
-        table, scenario_id
-    )
-    spin_on_database_lock(
-        conn=conn, cursor=cursor, sql=drop_tbl_sql, data=(), many=False
-    )
-
-    # Get the CREATE statemnt for the persistent table
-    tbl_sql = cursor.execute(
-        """
-        SELECT sql 
-        FROM sqlite_master
-        WHERE type='table'
-        AND name='{}'
-        """.format(
-            table
-        )
-    ).fetchone()[0]
-
-    # Create a temporary table with the same structure as the persistent table
-    temp_tbl_sql = tbl_sql.replace(
-        "CREATE TABLE {}".format(table),
-        "CREATE TEMPORARY TABLE temp_{}{}".format(table, scenario_id),
-    )
-
-    spin_on_database_lock(
-        conn=conn, cursor=cursor, sql=temp_tbl_sql, data=(), many=False
-    )
-
 
 def import_csv(
     conn,
@@ -231,11 +195,10 @@ def import_csv(
     # First import the capacity_all results; the capacity type modules will
     # then update the database tables rather than insert (all projects
     # should have been inserted here)
-    # Delete prior results and create temporary import table for ordering
+    # Delete prior results
     if not quiet:
         print(which_results)
 
-    # Delete prior results and create temporary import table for ordering
     setup_results_import(
         conn=conn,
         cursor=cursor,
@@ -248,11 +211,12 @@ def import_csv(
         stage=stage,
     )
 
-    results_filepath = os.path.join(results_directory, f"{which_results}.csv")
-    if not os.path.exists(results_filepath):
+    df = read_results_df(
+        results_directory=results_directory, results_name=which_results
+    )
+    if df is None:
         print("...not found, skipping...")
     else:
-        df = pd.read_csv(results_filepath)
         df["scenario_id"] = scenario_id
 
         # TODO: DB defaults need to be specified somewhere
@@ -274,16 +238,144 @@ def import_csv(
         df["subproblem_id"] = 1 if subproblem == "" else int(subproblem)
         df["stage_id"] = 1 if stage == "" else int(stage)
 
-        spin_on_database_lock_generic(
-            command=df.to_sql(
-                name=f"results_{which_results}",
-                con=conn,
-                if_exists="append",
-                index=False,
-            )
+        insert_results_df(
+            conn=conn, cursor=cursor, table=f"results_{which_results}", df=df
         )
 
 
+def insert_results_df(conn, cursor, table, df):
+    """
+    :param conn: the connection object
+    :param cursor: the cursor object
+    :param table: the results table we'll be inserting into
+    :param df: the results dataframe; its columns must be columns of the
+        table
+
+    Insert the rows of a results dataframe with a single prepared
+    *executemany* statement. The values are converted to Python types and
+    missing values to NULL once for the whole dataframe. When called within
+    *db_transaction*, the rows are committed with the rest of the
+    subproblem's results.
+    """
+    columns = ", ".join(f'"{column}"' for column in df.columns)
+    placeholders = ", ".join(["?"] * len(df.columns))
+    insert_sql = f"INSERT INTO {table} ({columns}) VALUES ({placeholders});"
+
+    data = list(
+        df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+    )
+
+    spin_on_database_lock(conn=conn, cursor=cursor, sql=insert_sql, data=data)
+
+
+# The (iteration, subproblem, stage) keys whose results are (re-)processed
+PROCESS_RESULTS_KEYS_TABLE = "temp_process_results_keys"
+PROCESS_RESULTS_KEY_COLUMNS = [
+    "weather_iteration",
+    "hydro_iteration",
+    "availability_iteration",
+    "subproblem_id",
+    "stage_id",
+]
+
+
+def setup_process_results_keys(conn, scenario_id, reprocess_all=False):
+    """
+    :param conn: the database connection
+    :param scenario_id:
+    :param reprocess_all: boolean; if True, process the results for all
+        (iteration, subproblem, stage) keys of the scenario, otherwise only
+        for the keys imported since process_results was last run
+    :return: the number of keys to process
+
+    Create the temporary table with the (iteration, subproblem, stage) keys
+    for which to process results. The keys come from the results_scenario
+    table, which gets a row for each subproblem/stage imported and marks
+    whether its results have been processed (see *mark_results_processed*).
+    The *process_results* methods delete and re-insert their aggregations
+    for these keys only (see *get_process_results_keys_filter_sql*).
+    """
+    key_columns = ", ".join(PROCESS_RESULTS_KEY_COLUMNS)
+    conn.execute(f"DROP TABLE IF EXISTS temp.{PROCESS_RESULTS_KEYS_TABLE};")
+    conn.execute(
+        f"""CREATE TEMPORARY TABLE {PROCESS_RESULTS_KEYS_TABLE}
+        ({key_columns}, PRIMARY KEY ({key_columns}));
+        """
+    )
+
+    # Databases created before results_scenario got the results_processed
+    # column don't track which keys were processed; process all keys
+    track_processed = results_processed_column_exists(conn=conn)
+    unprocessed_filter = (
+        "AND results_processed = 0" if track_processed and not reprocess_all else ""
+    )
+    conn.execute(
+        f"""INSERT INTO {PROCESS_RESULTS_KEYS_TABLE} ({key_columns})
+        SELECT {key_columns}
+        FROM results_scenario
+        WHERE scenario_id = ?
+        {unprocessed_filter};
+        """,
+        (scenario_id,),
+    )
+
+    return conn.execute(
+        f"SELECT COUNT(*) FROM {PROCESS_RESULTS_KEYS_TABLE};"
+    ).fetchone()[0]
+
+
+def get_process_results_keys_filter_sql(columns=None):
+    """
+    :param columns: the key columns to filter by (all key columns if None);
+        aggregations that are not by iteration filter by (subproblem_id,
+        stage_id) only
+    :return: SQL condition limiting a query to the keys being processed
+
+    Use in the WHERE clause of both the DELETE and the INSERT statements of
+    a results aggregation.
+    """
+    columns = ", ".join(PROCESS_RESULTS_KEY_COLUMNS if columns is None else columns)
+
+    return f"({columns}) IN (SELECT {columns} FROM {PROCESS_RESULTS_KEYS_TABLE})"
+
+
+def mark_results_processed(conn, scenario_id):
+    """
+    :param conn: the database connection
+    :param scenario_id:
+
+    Flag the keys that were processed so they are skipped on the next run.
+    """
+    if not results_processed_column_exists(conn=conn):
+        return
+
+    key_columns = ", ".join(PROCESS_RESULTS_KEY_COLUMNS)
+    spin_on_database_lock(
+        conn=conn,
+        cursor=conn.cursor(),
+        sql=f"""UPDATE results_scenario
+        SET results_processed = 1
+        WHERE scenario_id = ?
+        AND ({key_columns}) IN (
+            SELECT {key_columns} FROM {PROCESS_RESULTS_KEYS_TABLE}
+        );
+        """,
+        data=(scenario_id,),
+        many=False,
+    )
+
+
+def results_processed_column_exists(conn):
+    """
+    :param conn: the database connection
+    :return: boolean, whether the results_scenario table has the
+        results_processed column
+    """
+    return "results_processed" in [
+        row[1] for row in conn.execute("PRAGMA table_info(results_scenario);")
+    ]
+
+
 def update_prj_zone_column(
     conn, scenario_id, subscenarios, subscenario, subsc_tbl, prj_tbl, col
 ):
@@ -296,7 +388,8 @@ def update_prj_zone_column(
     :param col:
 
     Update a column of a project table based on the scenario's relevant
-    subscenario ID.
+    subscenario ID. Only the rows of the subproblems/stages whose results are
+    being processed are updated (see *setup_process_results_keys*).
     """
     c = conn.cursor()
 
@@ -317,9 +410,12 @@ def update_prj_zone_column(
         UPDATE {}
         SET {} = ?
         WHERE scenario_id = ?
-        AND project = ?;
+        AND project = ?
+        AND {};
         """.format(
-        prj_tbl, col
+        prj_tbl,
+        col,
+        get_process_results_keys_filter_sql(columns=["subproblem_id", "stage_id"]),
     )
     spin_on_database_lock(conn=conn, cursor=c, sql=sql, data=updates)
 
@@ -67,6 +67,8 @@ fuel_burn_balance_components = "fuel_burn_balance_components"
 cost_components = "cost_components"
 revenue_components = "revenue_components"
 
+results_format = "results_format"
+
 
 class DynamicComponents(object):
     """
@@ -160,3 +162,8 @@ class DynamicComponents(object):
         # Modules will add component names to this list
         setattr(self, cost_components, list())
         setattr(self, revenue_components, list())
+
+        # ### Results export ### #
+        # The file format for the consolidated results tables (set from the
+        # run_scenario arguments before the results are exported)
+        setattr(self, results_format, "csv")
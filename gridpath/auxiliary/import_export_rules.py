@@ -15,6 +15,8 @@
 import os.path
 from pyomo.environ import value
 
+from gridpath.auxiliary.results_io import results_file_exists
+
 
 # Import-export rules
 
@@ -45,7 +47,7 @@ def summarize_results_use(
     stage,
     quiet,
 ):
-    if os.path.exists(
+    if results_file_exists(
         os.path.join(
             scenario_directory,
             weather_iteration,
@@ -54,8 +56,8 @@ def summarize_results_use(
             subproblem,
             stage,
             "results",
-            "system_load_zone_timepoint.csv",
-        )
+        ),
+        "system_load_zone_timepoint",
     ):
         return True
     else:
@@ -65,9 +67,7 @@ def summarize_results_use(
 
 
 def import_rule_use(results_directory, quiet):
-    if os.path.exists(
-        os.path.join(results_directory, "system_load_zone_timepoint.csv")
-    ):
+    if results_file_exists(results_directory, "system_load_zone_timepoint"):
         import_results = True
         if not quiet:
             print("unserved energy found -- importing")
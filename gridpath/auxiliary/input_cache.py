@@ -0,0 +1,124 @@
+# Copyright 2016-2024 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Cache of parsed input files.
+
+Several modules read the same input files (e.g. projects.tab) when the
+problem for a subproblem/stage is built and its results exported. The cache
+keeps the parsed contents of each file keyed by its path, modification
+time, and size (plus a key for the read options), so that each file is
+parsed only once as long as it has not changed on disk. Since the
+subproblem/stage input files live in their own directories, the cache is
+effectively per (scenario, subproblem, stage); it is cleared each time a new
+problem is built (see *run_scenario.create_problem*).
+
+Cached data are shared by all callers and must not be modified in place.
+
+The number of cache hits and misses by file can be retrieved with
+*get_input_cache_stats*.
+"""
+
+import os.path
+import pandas as pd
+
+from gridpath.auxiliary.columnar_inputs import read_tab_columns
+
+# {(path, modification time, size, read key): parsed data}
+_input_cache = dict()
+# {path: {"hits": int, "misses": int}}
+_input_cache_stats = dict()
+
+
+def get_cached_input(filename, read_rule, read_key=None):
+    """
+    :param filename: str, path to the input file
+    :param read_rule: function with no arguments that parses the file
+    :param read_key: hashable identifying the read options (if the same file
+        can be parsed in different ways)
+    :return: the parsed file contents
+
+    Return the parsed contents of the file from the cache if the file has not
+    changed since it was parsed; otherwise, parse the file with *read_rule*
+    and cache the result.
+    """
+    path = os.path.abspath(filename)
+    file_stat = os.stat(path)
+    key = (path, file_stat.st_mtime_ns, file_stat.st_size, read_key)
+    stats = _input_cache_stats.setdefault(path, {"hits": 0, "misses": 0})
+
+    if key in _input_cache:
+        stats["hits"] += 1
+    else:
+        stats["misses"] += 1
+        # Drop data parsed from prior versions of the file
+        for stale_key in [
+            k for k in _input_cache.keys() if k[0] == path and k[3] == read_key
+        ]:
+            del _input_cache[stale_key]
+        _input_cache[key] = read_rule()
+
+    return _input_cache[key]
+
+
+def read_cached_tab_df(filename):
+    """
+    :param filename: str, path to the tab-delimited file
+    :return: the file contents as a (read-only) pandas DataFrame
+    """
+    return get_cached_input(
+        filename=filename,
+        read_rule=lambda: pd.read_csv(filename, sep="\t"),
+        read_key="df",
+    )
+
+
+def read_cached_tab_columns(filename, columns, dtypes=None):
+    """
+    :param filename: str, path to the tab-delimited file
+    :param columns: list of the columns to read
+    :param dtypes: dictionary of column types (optional)
+    :return: dictionary {column: (read-only) NumPy array}
+
+    Cached version of *columnar_inputs.read_tab_columns*.
+    """
+    read_key = (
+        "columns",
+        tuple(columns),
+        None if dtypes is None else tuple(sorted(dtypes.items())),
+    )
+    return get_cached_input(
+        filename=filename,
+        read_rule=lambda: read_tab_columns(
+            filename=filename, columns=columns, dtypes=dtypes
+        ),
+        read_key=read_key,
+    )
+
+
+def clear_input_cache(reset_stats=False):
+    """
+    :param reset_stats: Boolean, whether to also reset the hit/miss counts
+    :return:
+    """
+    _input_cache.clear()
+    if reset_stats:
+        _input_cache_stats.clear()
+
+
+def get_input_cache_stats():
+    """
+    :return: dictionary {path: {"hits": int, "misses": int}}
+    """
+    return {path: dict(stats) for path, stats in _input_cache_stats.items()}
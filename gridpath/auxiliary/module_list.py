@@ -19,7 +19,8 @@ This module contains:
 2) the modules included in each optional feature;
 3) the 'cross-feature' modules;
 4) the method for determining the user-requested features for the scenarios;
-5) the method for loading modules.
+5) the method for loading modules;
+6) the module registry used to set up the modules once per scenario run.
 """
 
 
@@ -764,3 +765,60 @@ def load_modules(modules_to_use):
             sys.exit(1)
 
     return loaded_modules
+
+
+class ModuleRegistry(object):
+    """
+    The modules a scenario uses, determined and loaded once per scenario
+    run and then shared by all of the scenario's subproblems and stages.
+
+    In addition to the module names (*modules_to_use*) and the imported
+    modules (*loaded_modules*), the registry keeps a capability map of which
+    of the loaded modules implement a given method (e.g. *export_results* or
+    *save_duals*), so that the results-processing steps don't need to check
+    every module again for each subproblem and stage.
+
+    The registry can be sent to worker processes: it is pickled as the list
+    of module names and the modules are re-imported on unpickling.
+    """
+
+    def __init__(self, modules_to_use):
+        """
+        :param modules_to_use: a list of the names of the modules to use
+        """
+        self.modules_to_use = modules_to_use
+        self.loaded_modules = load_modules(modules_to_use)
+        self._capabilities = dict()
+
+    @classmethod
+    def from_scenario_directory(cls, scenario_directory, multi_stage):
+        """
+        :param scenario_directory: the scenario directory
+        :param multi_stage: Boolean; whether the scenario has stages
+        :return: the ModuleRegistry for the scenario
+
+        Determine the modules to use from the scenario's features and load
+        them.
+        """
+        return cls(
+            modules_to_use=determine_modules(
+                scenario_directory=scenario_directory, multi_stage=multi_stage
+            )
+        )
+
+    def modules_with(self, method_name):
+        """
+        :param method_name: the name of the module-level method
+        :return: list of (module name, loaded module) tuples for the modules
+            that implement *method_name*, in load order
+        """
+        if method_name not in self._capabilities:
+            self._capabilities[method_name] = [
+                (module_name, m)
+                for module_name, m in zip(self.modules_to_use, self.loaded_modules)
+                if hasattr(m, method_name)
+            ]
+        return self._capabilities[method_name]
+
+    def __reduce__(self):
+        return self.__class__, (self.modules_to_use,)
@@ -0,0 +1,723 @@
+# Copyright 2016-2024 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+In-place updates of the problem loaded into a persistent solver.
+
+With *--persistent_solver*, the instance of the first stage solved of a
+subproblem is loaded into the persistent solver and kept. The stages of a
+subproblem usually have the same variables and constraints and differ in the
+variables fixed by the previous stage (e.g. the commitment) and in some of
+the input data, so the following stages update the kept instance in place
+rather than loading their own instance into the solver. Each stage's
+instance is still created from its inputs (the stage's results are exported
+from it) and, if it has the same variables, constraints, and objective
+(index by index) as the kept instance:
+
+1) the variables whose fixed status, fixed value, bounds, or domain differ
+   are updated in the kept instance and in the solver;
+2) the constraints whose expression or bounds differ are replaced in the
+   kept instance and in the solver (with the named expressions they use
+   expanded);
+3) the objective is replaced if it differs.
+
+Only the constraints and objective built from input data that changed are
+compared. When the abstract model is prepared with *record_rule_reads*, we
+record the model components (e.g. the params and sets) each constraint,
+objective, and expression rule reads while the instance is created. The
+data of the params and sets of each stage are compared with those of the
+previous stage, and the constraints are only compared if their rule read
+changed data, directly or through an expression. A rule's result can only
+differ if one of the values it reads does, so this assumes the rules only
+depend on the model data (and not, e.g., on files or global variables).
+The constraints of components whose reads weren't recorded are always
+compared.
+
+Expressions are compared in prefix notation, with the variables replaced by
+their position in the instance. The other variable values (e.g. the values
+initialized for a warm start) are copied to the kept instance too. After the
+solve, the solution (the variable values and the imported suffixes, e.g. the
+duals) is copied to the stage's instance.
+
+If the stage's instance has a different structure or belongs to a different
+subproblem, it is loaded into the solver and kept instead. The Pyomo
+persistent solvers (e.g. gurobi_persistent) are told about each change; the
+APPSI solvers (e.g. appsi_highs) detect the changes when the kept instance
+is solved again.
+"""
+
+from pyomo.common.numeric_types import native_types
+from pyomo.core.expr import (
+    DivisionExpression,
+    LinearExpression,
+    MonomialTermExpression,
+    NegationExpression,
+    NPV_DivisionExpression,
+    NPV_NegationExpression,
+    NPV_PowExpression,
+    NPV_ProductExpression,
+    NPV_SumExpression,
+    PowExpression,
+    ProductExpression,
+    SumExpression,
+)
+from pyomo.core.base.initializer import ConstantInitializer
+from pyomo.core.base.set import SetOperator
+from pyomo.core.expr.visitor import replace_expressions
+from pyomo.environ import Constraint, Expression, Objective, Param, Set, Suffix, Var
+from pyomo.solvers.plugins.solvers.persistent_solver import PersistentSolver
+
+# The expression types compared by their type and arguments (other
+# expressions, e.g. functions, are always considered changed)
+COMPARED_EXPRESSION_TYPES = {
+    DivisionExpression,
+    LinearExpression,
+    MonomialTermExpression,
+    NegationExpression,
+    NPV_DivisionExpression,
+    NPV_NegationExpression,
+    NPV_PowExpression,
+    NPV_ProductExpression,
+    NPV_SumExpression,
+    PowExpression,
+    ProductExpression,
+    SumExpression,
+}
+
+# The component types whose rule reads are recorded
+RECORDED_RULE_TYPES = (Constraint, Objective, Expression)
+
+# The component types whose data are compared across stages
+COMPARED_DATA_TYPES = (Param, Set)
+
+# The component types that can't differ across stages if the instances have
+# the same structure (or whose differences are compared separately)
+STRUCTURAL_TYPES = (Var, Constraint, Objective, Suffix)
+
+# The instance kept by each persistent solver object of this process
+_persistent_models = dict()
+
+
+class BlockReadRecorder(object):
+    """
+    Stand-in for the model passed to a rule, recording the names of the
+    attributes (e.g. the model components) the rule reads. An attribute is
+    looked up on the model the first time it's read and then kept on the
+    recorder, so the following reads are as fast as reads from the model.
+    """
+
+    def __init__(self, block, reads):
+        """
+        :param block: the model (Pyomo block) the rule is called for
+        :param reads: the set to record the names of the attributes read in
+        """
+        object.__setattr__(self, "_block", block)
+        object.__setattr__(self, "_reads", reads)
+
+    def __getattr__(self, name):
+        # Only called for the attributes not read before; special
+        # attributes (e.g. the pickling methods) are the recorder's own
+        if name.startswith("__") or "_block" not in self.__dict__:
+            raise AttributeError(name)
+        # Also recorded if the model doesn't have the attribute (yet)
+        self._reads.add(name)
+        value = getattr(self._block, name)
+        object.__setattr__(self, name, value)
+        return value
+
+    def __setattr__(self, name, value):
+        # E.g. the derived data cached on the model, which the rule reads
+        # afterwards
+        self._reads.add(name)
+        setattr(self._block, name, value)
+        object.__setattr__(self, name, value)
+
+
+class RuleReadRecorder(object):
+    """
+    Wrapper around the rule (Pyomo initializer) of a component, calling the
+    rule with a BlockReadRecorder instead of the model. The names read by
+    the rule are in the *reads* attribute.
+    """
+
+    def __init__(self, rule):
+        """
+        :param rule: the Pyomo initializer of the component
+        """
+        self.rule = rule
+        self.reads = set()
+        self.block_recorder = None
+
+    def __getattr__(self, name):
+        # The other initializer attributes (e.g. whether the rule contains
+        # the indices) are the rule's; special attributes (e.g. the copy
+        # methods used when the model is cloned) are the wrapper's own
+        rule = self.__dict__.get("rule")
+        if rule is None or name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(rule, name)
+
+    def __call__(self, parent, index):
+        # The same recorder is used for all indices of the component
+        if (
+            self.block_recorder is None
+            or self.block_recorder.__dict__["_block"] is not parent
+        ):
+            self.block_recorder = BlockReadRecorder(block=parent, reads=self.reads)
+        return self.rule(self.block_recorder, index)
+
+
+class PersistentModel(object):
+    """
+    The instance loaded into a persistent solver, with its variables and
+    constraints in order, and the param and set data and the rule reads of
+    the stage the instance was last updated for.
+    """
+
+    def __init__(self, instance, subproblem_key):
+        """
+        :param instance: the problem instance loaded into the solver
+        :param subproblem_key: the (weather iteration, hydro iteration,
+            availability iteration, subproblem) directory strings of the
+            instance
+        """
+        self.instance = instance
+        self.subproblem_key = subproblem_key
+        self.variable_components = get_components(instance=instance, ctype=Var)
+        self.constraint_components = get_components(instance=instance, ctype=Constraint)
+        self.objective_components = get_components(instance=instance, ctype=Objective)
+        self.variables = get_component_data(components=self.variable_components)
+        self.constraints = get_component_data(components=self.constraint_components)
+        self.variable_positions = get_positions(data=self.variables)
+        self.constraint_positions = get_positions(data=self.constraints)
+        self.data = get_data(instance=instance)
+        self.rule_reads = get_rule_reads(instance=instance)
+
+        # The variables and constraints of the stage instance the kept
+        # instance was last updated for (None if not updated in place)
+        self.stage_variables = None
+        self.stage_constraints = None
+
+    def has_same_structure(self, instance):
+        """
+        :param instance: the problem instance of a stage
+        :return: boolean, whether the instance has the same variables,
+            constraints, and objectives as the kept instance
+        """
+        for components, ctype in [
+            (self.variable_components, Var),
+            (self.constraint_components, Constraint),
+            (self.objective_components, Objective),
+        ]:
+            stage_components = get_components(instance=instance, ctype=ctype)
+            if len(stage_components) != len(components) or any(
+                c.name != stage_c.name
+                or len(c) != len(stage_c)
+                or list(c.keys()) != list(stage_c.keys())
+                for c, stage_c in zip(components, stage_components)
+            ):
+                return False
+
+        return True
+
+    def get_changed_components(self, stage_data):
+        """
+        :param stage_data: dictionary of the param and set data of the stage
+            instance (see *get_data*)
+        :return: set of the names of the constraint, objective, and
+            expression components whose rule may give a different result for
+            the stage
+
+        A component may change if its rule read a param or set whose data
+        changed since the previous stage or an expression that may change,
+        if any data changed and its rule read an attribute of the model
+        other than a component (e.g. derived data cached on the model), or
+        if its rule reads weren't recorded.
+        """
+        changed_data = set(
+            name
+            for name in set(self.data) | set(stage_data)
+            if name not in self.data
+            or name not in stage_data
+            or self.data[name] != stage_data[name]
+        )
+
+        changed_components = set()
+        unchanged_components = set()
+
+        def may_change(component):
+            if component.name in changed_components:
+                return True
+            if component.name in unchanged_components:
+                return False
+            reads = self.rule_reads.get(component.name)
+            # Guard against cyclic reads
+            unchanged_components.add(component.name)
+            changed = reads is None or any(read_may_change(name=name) for name in reads)
+            if changed:
+                unchanged_components.discard(component.name)
+                changed_components.add(component.name)
+            return changed
+
+        def read_may_change(name):
+            if name in changed_data:
+                return True
+            read_component = self.instance.component(name)
+            if read_component is None:
+                # Methods of the model can't change; other attributes (e.g.
+                # the derived data cached on the model) are assumed to be
+                # derived from the params and sets
+                return bool(changed_data) and not hasattr(type(self.instance), name)
+            if read_component.ctype is Expression:
+                return may_change(component=read_component)
+            return read_component.ctype not in STRUCTURAL_TYPES + COMPARED_DATA_TYPES
+
+        for component in self.constraint_components + self.objective_components:
+            may_change(component=component)
+
+        return changed_components
+
+    def get_changes(self, instance):
+        """
+        :param instance: the problem instance of a stage with the same
+            structure as the kept instance
+        :return: the list of the (kept, stage) variable pairs that differ,
+            the list of the (position, stage constraint) of the constraints
+            that differ, and the stage objective if the objective differs
+            (None otherwise); None if the active constraints or objective
+            differ
+
+        Set the stage variables and constraints used to update the kept
+        instance. Only the constraints and objective that may have changed
+        (see *get_changed_components*) are compared.
+        """
+        self.stage_variables = get_component_data(
+            components=get_components(instance=instance, ctype=Var)
+        )
+        self.stage_constraints = get_component_data(
+            components=get_components(instance=instance, ctype=Constraint)
+        )
+
+        changed_variables = [
+            (var, stage_var)
+            for var, stage_var in zip(self.variables, self.stage_variables)
+            if get_variable_state(var) != get_variable_state(stage_var)
+        ]
+
+        if any(
+            c.active != stage_c.active
+            for c, stage_c in zip(self.constraints, self.stage_constraints)
+        ):
+            return None
+        objective = get_active_objective(instance=self.instance)
+        stage_objective = get_active_objective(instance=instance)
+        if objective is None or stage_objective is None:
+            return None
+        if objective.name != stage_objective.name:
+            return None
+
+        stage_data = get_data(instance=instance)
+        changed_components = self.get_changed_components(stage_data=stage_data)
+        stage_variable_positions = (
+            get_positions(data=self.stage_variables) if changed_components else None
+        )
+
+        # The data objects of each component are consecutive in the
+        # constraint lists, so skip the components that can't have changed
+        changed_constraints = []
+        start = 0
+        for component in self.constraint_components:
+            end = start + len(component)
+            if component.name in changed_components:
+                for position in range(start, end):
+                    c = self.constraints[position]
+                    if not c.active:
+                        continue
+                    signature = get_constraint_signature(
+                        constraint=c, variable_positions=self.variable_positions
+                    )
+                    stage_signature = get_constraint_signature(
+                        constraint=self.stage_constraints[position],
+                        variable_positions=stage_variable_positions,
+                    )
+                    if stage_signature is None or stage_signature != signature:
+                        changed_constraints.append(
+                            (position, self.stage_constraints[position])
+                        )
+            start = end
+
+        changed_objective = None
+        if objective.parent_component().name in changed_components:
+            objective_signature = get_objective_signature(
+                objective=objective, variable_positions=self.variable_positions
+            )
+            stage_objective_signature = get_objective_signature(
+                objective=stage_objective, variable_positions=stage_variable_positions
+            )
+            if (
+                stage_objective_signature is None
+                or stage_objective_signature != objective_signature
+            ):
+                changed_objective = stage_objective
+
+        # The next stage is compared with this stage
+        self.data = stage_data
+        self.rule_reads = get_rule_reads(instance=instance)
+
+        return changed_variables, changed_constraints, changed_objective
+
+    def update(self, optimizer, instance):
+        """
+        :param optimizer: the persistent solver object the kept instance is
+            loaded into
+        :param instance: the problem instance of a stage
+        :return: boolean, whether the kept instance was updated in place (if
+            False, the stage instance can't be solved as an update of the
+            kept instance)
+
+        Apply the differences between the stage instance and the kept
+        instance to the kept instance and to the solver.
+        """
+        if not self.has_same_structure(instance=instance):
+            return False
+        changes = self.get_changes(instance=instance)
+        if changes is None:
+            return False
+        changed_variables, changed_constraints, changed_objective = changes
+        notify_solver = isinstance(optimizer, PersistentSolver)
+
+        for var, stage_var in changed_variables:
+            set_variable_state(var=var, stage_var=stage_var)
+            if notify_solver:
+                optimizer.update_var(var)
+        # Pass the other values (e.g. a warm start) too
+        for var, stage_var in zip(self.variables, self.stage_variables):
+            if not var.fixed:
+                var.set_value(stage_var.value, skip_validation=True)
+
+        if changed_constraints or changed_objective is not None:
+            substitution_map = {
+                id(stage_var): var
+                for var, stage_var in zip(self.variables, self.stage_variables)
+            }
+        for position, stage_c in changed_constraints:
+            c = self.constraints[position]
+            if notify_solver:
+                optimizer.remove_constraint(c)
+            body = replace_expressions(stage_c.body, substitution_map=substitution_map)
+            if stage_c.equality:
+                c.set_value(body == stage_c.ub)
+            else:
+                c.set_value((stage_c.lb, body, stage_c.ub))
+            if notify_solver:
+                optimizer.add_constraint(c)
+
+        if changed_objective is not None:
+            objective = get_active_objective(instance=self.instance)
+            objective.set_value(
+                replace_expressions(
+                    changed_objective.expr, substitution_map=substitution_map
+                )
+            )
+            objective.set_sense(changed_objective.sense)
+            if notify_solver:
+                optimizer.set_objective(objective)
+
+        return True
+
+    def copy_solution(self, instance):
+        """
+        :param instance: the problem instance of the stage the kept instance
+            was updated for
+
+        Copy the variable values and the imported suffix values (e.g. the
+        duals) of the solved kept instance to the stage instance.
+        """
+        for var, stage_var in zip(self.variables, self.stage_variables):
+            stage_var.set_value(var.value, skip_validation=True)
+
+        for suffix in self.instance.component_objects(
+            ctype=Suffix, active=None, descend_into=True
+        ):
+            if not suffix.import_enabled():
+                continue
+            stage_suffix = instance.find_component(suffix.name)
+            if stage_suffix is None:
+                continue
+            stage_suffix.clear()
+            for component, suffix_value in suffix.items():
+                if id(component) in self.constraint_positions:
+                    stage_component = self.stage_constraints[
+                        self.constraint_positions[id(component)]
+                    ]
+                elif id(component) in self.variable_positions:
+                    stage_component = self.stage_variables[
+                        self.variable_positions[id(component)]
+                    ]
+                else:
+                    continue
+                stage_suffix[stage_component] = suffix_value
+
+
+def get_components(instance, ctype):
+    """
+    :param instance: the problem instance
+    :param ctype: the component type
+    :return: list of the instance's components of the type, in order
+    """
+    return list(instance.component_objects(ctype=ctype, active=None, descend_into=True))
+
+
+def get_component_data(components):
+    """
+    :param components: list of indexed or scalar components
+    :return: list of the components' data objects, in order
+    """
+    return [data for component in components for data in component.values()]
+
+
+def get_positions(data):
+    """
+    :param data: list of data objects
+    :return: dictionary of the position of each data object by its id
+    """
+    return {id(d): position for position, d in enumerate(data)}
+
+
+def get_data(instance):
+    """
+    :param instance: the problem instance
+    :return: dictionary of the data of the instance's params (default and
+        values) and sets (members), by component name
+
+    Sets derived from other sets (e.g. the cross products indexing the
+    components) are not included.
+    """
+    data = dict()
+    for component in instance.component_objects(
+        ctype=COMPARED_DATA_TYPES, active=None, descend_into=True
+    ):
+        if isinstance(component, SetOperator):
+            continue
+        if component.ctype is Set:
+            if component.is_indexed():
+                data[component.name] = {
+                    index: tuple(set_data) for index, set_data in component.items()
+                }
+            else:
+                data[component.name] = tuple(component)
+        else:
+            try:
+                values = component.extract_values_sparse()
+            except ValueError:
+                # Scalar param without a value
+                values = None
+            data[component.name] = (component.default(), values)
+
+    return data
+
+
+def record_rule_reads(model):
+    """
+    :param model: the Pyomo AbstractModel object with its components added
+
+    Record the attributes of the model (e.g. the params and sets) read by
+    the rules of the constraint, objective, and expression components when
+    creating an instance of the model (see *get_rule_reads*).
+    """
+    for component in model.component_objects(
+        ctype=RECORDED_RULE_TYPES, active=None, descend_into=True
+    ):
+        # Expressions keep their rule in a private attribute
+        rule_attribute = "_rule" if component.ctype is Expression else "rule"
+        rule = getattr(component, rule_attribute, None)
+        # Components initialized with an expression rather than a rule are
+        # left alone (their reads are unknown)
+        if rule is not None and not isinstance(
+            rule, (ConstantInitializer, RuleReadRecorder)
+        ):
+            setattr(component, rule_attribute, RuleReadRecorder(rule=rule))
+
+
+def get_rule_reads(instance):
+    """
+    :param instance: the problem instance
+    :return: dictionary of the set of the names read by the rule of each
+        constraint, objective, and expression component whose rule reads
+        were recorded (see *record_rule_reads*)
+    """
+    rule_reads = dict()
+    for component in instance.component_objects(
+        ctype=RECORDED_RULE_TYPES, active=None, descend_into=True
+    ):
+        rule_attribute = "_rule" if component.ctype is Expression else "rule"
+        rule = getattr(component, rule_attribute, None)
+        if isinstance(rule, RuleReadRecorder):
+            rule_reads[component.name] = rule.reads
+
+    return rule_reads
+
+
+def get_active_objective(instance):
+    """
+    :param instance: the problem instance
+    :return: the active objective (None if there isn't exactly one)
+    """
+    objectives = list(
+        instance.component_data_objects(ctype=Objective, active=True, descend_into=True)
+    )
+    return objectives[0] if len(objectives) == 1 else None
+
+
+def get_variable_state(var):
+    """
+    :param var: a variable data object
+    :return: tuple of the variable's fixed status and value, bounds, and
+        domain bounds and step
+    """
+    return (
+        var.fixed,
+        var.value if var.fixed else None,
+        var.lb,
+        var.ub,
+        var.domain.get_interval(),
+    )
+
+
+def set_variable_state(var, stage_var):
+    """
+    :param var: the variable data object to update
+    :param stage_var: the variable data object to update it from
+    """
+    var.domain = stage_var.domain
+    var.setlb(stage_var.lb)
+    var.setub(stage_var.ub)
+    if stage_var.fixed:
+        var.fix(stage_var.value, skip_validation=True)
+    else:
+        var.unfix()
+
+
+def get_expression_signature(expr, variable_positions):
+    """
+    :param expr: a Pyomo expression
+    :param variable_positions: dictionary of the position of each variable
+        of the instance by its id
+    :return: tuple of the expression in prefix notation (with the named
+        expressions expanded), with the variables replaced by their position
+        and the parameters by their value; None if the expression can't be
+        compared
+    """
+    signature = []
+    nodes = [expr]
+    while nodes:
+        node = nodes.pop()
+        if node.__class__ in native_types:
+            signature.append(node)
+        elif node.is_expression_type():
+            if node.is_named_expression_type():
+                nodes.append(node.expr)
+                continue
+            if node.__class__ not in COMPARED_EXPRESSION_TYPES:
+                return None
+            signature.append((node.__class__, node.nargs()))
+            nodes.extend(reversed(node.args))
+        elif node.is_variable_type():
+            if id(node) not in variable_positions:
+                return None
+            signature.append(("var", variable_positions[id(node)]))
+        elif node.is_parameter_type():
+            signature.append(("param", node.value))
+        elif node.is_constant():
+            signature.append(node.value)
+        else:
+            return None
+
+    return tuple(signature)
+
+
+def get_constraint_signature(constraint, variable_positions):
+    """
+    :param constraint: a constraint data object
+    :param variable_positions: dictionary of the position of each variable
+        of the instance by its id
+    :return: tuple of the constraint bounds and body signature (see
+        *get_expression_signature*); None if it can't be compared
+    """
+    lb, body, ub = constraint.to_bounded_expression(evaluate_bounds=True)
+    body_signature = get_expression_signature(
+        expr=body, variable_positions=variable_positions
+    )
+    if body_signature is None:
+        return None
+
+    return constraint.equality, lb, ub, body_signature
+
+
+def get_objective_signature(objective, variable_positions):
+    """
+    :param objective: an objective data object
+    :param variable_positions: dictionary of the position of each variable
+        of the instance by its id
+    :return: tuple of the objective sense and expression signature (see
+        *get_expression_signature*); None if it can't be compared
+    """
+    expr_signature = get_expression_signature(
+        expr=objective.expr, variable_positions=variable_positions
+    )
+    if expr_signature is None:
+        return None
+
+    return objective.sense, expr_signature
+
+
+def get_persistent_model(
+    optimizer, instance, subproblem_key, symbolic_solver_labels=False
+):
+    """
+    :param optimizer: the persistent solver object
+    :param instance: the problem instance of the subproblem stage to solve
+    :param subproblem_key: the (weather iteration, hydro iteration,
+        availability iteration, subproblem) directory strings of the
+        instance; None to always load the instance into the solver
+    :param symbolic_solver_labels: boolean, whether to use symbolic labels
+        when loading an instance into a Pyomo persistent solver
+    :return: the PersistentModel with the instance to solve, updated for
+        the stage if it's kept from a previous stage
+
+    Update the instance kept by the solver for the stage if it's from the
+    same subproblem and has the same structure; otherwise, keep the stage's
+    instance (loading it into the solver if it's a Pyomo persistent solver;
+    the APPSI solvers load it when solving). If the update fails, the kept
+    instance is dropped.
+    """
+    persistent_model = _persistent_models.get(optimizer)
+    if (
+        persistent_model is not None
+        and subproblem_key is not None
+        and persistent_model.subproblem_key == subproblem_key
+    ):
+        try:
+            if persistent_model.update(optimizer=optimizer, instance=instance):
+                return persistent_model
+        except Exception:
+            del _persistent_models[optimizer]
+            raise
+
+    persistent_model = PersistentModel(instance=instance, subproblem_key=subproblem_key)
+    _persistent_models[optimizer] = persistent_model
+    if isinstance(optimizer, PersistentSolver):
+        optimizer.set_instance(instance, symbolic_solver_labels=symbolic_solver_labels)
+
+    return persistent_model
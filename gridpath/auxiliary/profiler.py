@@ -0,0 +1,332 @@
+# Copyright 2016-2024 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Wall-time and memory profiling of the phases of a subproblem/stage run
+(building the model, loading data, creating the instance, solving, and
+exporting and summarizing results), by GridPath module where applicable.
+
+For each phase, we record the wall time and the peak resident set size
+(RSS) of the process during the phase, as well as how much higher the peak
+was than the RSS at the start of the phase. The RSS is sampled with psutil
+in a background thread while the phase runs (and at its start and end), so
+a phase that uses less memory than an earlier phase still reports its own
+peak; a spike shorter than the sampling interval may be missed. If the RSS
+can't be sampled, we fall back to the maximum RSS of the process so far
+(*ru_maxrss*), which is the high-water mark of the whole process rather than
+of the phase and is not available on Windows (it is reported as empty
+there).
+
+Creating the problem instance constructs the model components in the order
+the modules declared them, so its wall time is also broken down by module:
+we record which module declared each component when the modules add their
+components to the model and add up the construction times Pyomo reports for
+the components of each module. The rest of the phase (e.g. cloning the
+abstract model) is only included in the phase total. The peak RSS is not
+broken down by module.
+
+The report is written to the *scenario_profiling.csv* file in the
+subproblem/stage results directory and is imported into the
+*results_scenario_profiling* table along with the other results.
+"""
+
+import contextlib
+import csv
+import logging
+import os.path
+import psutil
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+PROFILING_FILENAME = "scenario_profiling.csv"
+
+# How often to sample the RSS of the process during a phase
+RSS_SAMPLING_INTERVAL_S = 0.01
+
+# Pyomo reports the construction time of each component to this logger
+CONSTRUCTION_LOGGER = logging.getLogger("pyomo.common.timing.construction")
+
+
+def get_max_rss_mb():
+    """
+    :return: the maximum resident set size of the process so far (the
+        *ru_maxrss* high-water mark) in MB (None if not available on the
+        platform)
+    """
+    if resource is None:
+        return None
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    if sys.platform == "darwin":
+        return peak_rss / 1024**2
+    else:
+        return peak_rss / 1024
+
+
+class PeakRSSSampler(object):
+    """
+    Sample the RSS of the process in a background thread and keep the peak.
+    """
+
+    def __init__(self, interval=RSS_SAMPLING_INTERVAL_S):
+        """
+        :param interval: float, the sampling interval in seconds
+        """
+        self.interval = interval
+        self.process = psutil.Process()
+        self.start_rss_mb = None
+        self.peak_rss_mb = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def sample(self):
+        rss_mb = self.process.memory_info().rss / 1024**2
+        if self.peak_rss_mb is None or rss_mb > self.peak_rss_mb:
+            self.peak_rss_mb = rss_mb
+
+        return rss_mb
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self):
+        self.start_rss_mb = self.sample()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+
+
+def get_module_name(module):
+    """
+    :param module: the GridPath module (Python module object) or None
+    :return: the module name to report (empty if None)
+    """
+    return "" if module is None else module.__name__.replace("gridpath.", "", 1)
+
+
+class ConstructionTimeHandler(logging.Handler):
+    """
+    Add up the construction times Pyomo reports for the model components by
+    the module that declared each component.
+    """
+
+    def __init__(self, component_modules):
+        """
+        :param component_modules: dictionary {component name: module name}
+        """
+        logging.Handler.__init__(self, level=logging.INFO)
+        self.component_modules = component_modules
+        self.module_times = {}
+
+    def emit(self, record):
+        timer = record.msg
+        component = getattr(timer, "obj", None)
+        # Only count the components declared on the model; the construction
+        # time of any other (e.g. anonymous) component is included in the
+        # time of the model component it belongs to
+        try:
+            parent_block = component.parent_block()
+            module = self.component_modules.get(component.local_name)
+        except AttributeError:
+            return
+        if (
+            module is None
+            or parent_block is None
+            or parent_block.parent_block() is not None
+        ):
+            return
+        self.module_times[module] = self.module_times.get(module, 0) + timer.timer
+
+
+class Profiler(object):
+    """
+    Record the wall time and peak RSS of the phases of a subproblem/stage
+    run.
+    """
+
+    def __init__(self):
+        self.records = []
+        # The module that declared each model component
+        self.component_modules = {}
+
+    def record_component_modules(self, model, module):
+        """
+        :param model: the Pyomo AbstractModel object
+        :param module: the GridPath module (Python module object) that just
+            added its components to the model
+
+        Record the module as the owner of the model components that don't
+        have an owner yet.
+        """
+        module_name = get_module_name(module)
+        for component_name in model.component_map():
+            if component_name not in self.component_modules:
+                self.component_modules[component_name] = module_name
+
+    @contextlib.contextmanager
+    def phase(self, phase, module=None):
+        """
+        :param phase: str, the name of the phase
+        :param module: the GridPath module (Python module object) if the
+            phase is for a single module
+
+        Context manager recording the wall time and peak RSS of the
+        enclosed code.
+        """
+        try:
+            sampler = PeakRSSSampler()
+            sampler.start()
+        except psutil.Error:
+            sampler = None
+            start_max_rss_mb = get_max_rss_mb()
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall_time = time.perf_counter() - start_time
+            if sampler is not None:
+                sampler.stop()
+                peak_rss_mb = sampler.peak_rss_mb
+                peak_rss_increase_mb = sampler.peak_rss_mb - sampler.start_rss_mb
+            else:
+                peak_rss_mb = get_max_rss_mb()
+                peak_rss_increase_mb = (
+                    None if peak_rss_mb is None else peak_rss_mb - start_max_rss_mb
+                )
+            self.add_record(
+                phase=phase,
+                module_name=get_module_name(module),
+                wall_time=wall_time,
+                peak_rss_mb=peak_rss_mb,
+                peak_rss_increase_mb=peak_rss_increase_mb,
+            )
+
+    @contextlib.contextmanager
+    def construction_phase(self, phase):
+        """
+        :param phase: str, the name of the phase
+
+        Context manager recording the wall time and peak RSS of the
+        enclosed code (the creation of the problem instance) and the
+        construction time of the model components by the module that
+        declared them (see *record_component_modules*).
+        """
+        handler = ConstructionTimeHandler(component_modules=self.component_modules)
+        level = CONSTRUCTION_LOGGER.level
+        CONSTRUCTION_LOGGER.setLevel(logging.INFO)
+        CONSTRUCTION_LOGGER.addHandler(handler)
+        try:
+            with self.phase(phase=phase):
+                yield
+        finally:
+            CONSTRUCTION_LOGGER.removeHandler(handler)
+            CONSTRUCTION_LOGGER.setLevel(level)
+            # Module records in the order the modules declared their
+            # components
+            for module_name in dict.fromkeys(self.component_modules.values()):
+                if module_name in handler.module_times:
+                    self.add_record(
+                        phase=phase,
+                        module_name=module_name,
+                        wall_time=handler.module_times[module_name],
+                        peak_rss_mb=None,
+                        peak_rss_increase_mb=None,
+                    )
+
+    def add_record(
+        self, phase, module_name, wall_time, peak_rss_mb, peak_rss_increase_mb
+    ):
+        """
+        :param phase: str, the name of the phase
+        :param module_name: str, the module name (empty if the phase is not
+            for a single module)
+        :param wall_time: float, the wall time of the phase in seconds
+        :param peak_rss_mb: float, the peak RSS of the process during the
+            phase (None if not available)
+        :param peak_rss_increase_mb: float, how much higher the peak RSS was
+            than the RSS at the start of the phase (None if not available)
+        """
+        self.records.append(
+            {
+                "phase_order": len(self.records) + 1,
+                "phase": phase,
+                "module": module_name,
+                "wall_time_s": wall_time,
+                "peak_rss_mb": peak_rss_mb,
+                "peak_rss_increase_mb": peak_rss_increase_mb,
+            }
+        )
+
+    def write_report(self, results_directory):
+        """
+        :param results_directory: the subproblem/stage results directory
+
+        Write the profiling records to the results directory.
+        """
+        with open(
+            os.path.join(results_directory, PROFILING_FILENAME), "w", newline=""
+        ) as f:
+            writer = csv.DictWriter(
+                f,
+                fieldnames=[
+                    "phase_order",
+                    "phase",
+                    "module",
+                    "wall_time_s",
+                    "peak_rss_mb",
+                    "peak_rss_increase_mb",
+                ],
+            )
+            writer.writeheader()
+            writer.writerows(self.records)
+
+
+def profile_phase(profiler, phase, module=None):
+    """
+    :param profiler: the Profiler object or None if not profiling
+    :param phase: str, the name of the phase
+    :param module: the GridPath module (Python module object) if the phase
+        is for a single module
+    :return: context manager recording the phase (a no-op if not profiling)
+    """
+    if profiler is None:
+        return contextlib.nullcontext()
+    else:
+        return profiler.phase(phase=phase, module=module)
+
+
+def profile_construction_phase(profiler, phase):
+    """
+    :param profiler: the Profiler object or None if not profiling
+    :param phase: str, the name of the phase
+    :return: context manager recording the phase and the construction time
+        by module (a no-op if not profiling)
+    """
+    if profiler is None:
+        return contextlib.nullcontext()
+    else:
+        return profiler.construction_phase(phase=phase)
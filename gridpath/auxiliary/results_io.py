@@ -0,0 +1,156 @@
+# Copyright 2016-2024 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Writing and reading the detailed results files.
+
+The consolidated results tables (e.g. project_timepoint, project_period,
+system_load_zone_timepoint) can be written either as CSV files (the
+default) or as Parquet files via DuckDB (with *--results_format parquet*).
+Parquet files are typed and columnar, so they are smaller and faster to
+write and read than the CSVs for large (e.g. 8760-timepoint) subproblems.
+The readers pick up whichever format is found in the results directory, so
+the import and summary scripts do not need to know the format used when
+solving.
+"""
+
+import os.path
+
+import duckdb
+import pandas as pd
+
+RESULTS_FORMATS = ["csv", "parquet"]
+
+
+def get_results_filepath(results_directory, results_name, results_format):
+    """
+    :param results_directory: str, the results directory
+    :param results_name: str, the name of the results table, e.g.
+        "project_timepoint"
+    :param results_format: str, "csv" or "parquet"
+    :return: str, the path to the results file
+    """
+    return os.path.join(results_directory, f"{results_name}.{results_format}")
+
+
+def find_results_file(results_directory, results_name):
+    """
+    :param results_directory: str, the results directory
+    :param results_name: str, the name of the results table
+    :return: str, the path to the results file or None if no results file
+        is found
+
+    Look for the results file in all supported formats; Parquet takes
+    precedence over CSV.
+    """
+    for results_format in reversed(RESULTS_FORMATS):
+        results_filepath = get_results_filepath(
+            results_directory, results_name, results_format
+        )
+        if os.path.exists(results_filepath):
+            return results_filepath
+
+    return None
+
+
+def results_file_exists(results_directory, results_name):
+    """
+    :param results_directory: str, the results directory
+    :param results_name: str, the name of the results table
+    :return: boolean, whether the results file exists in any supported format
+    """
+    return find_results_file(results_directory, results_name) is not None
+
+
+def write_results_df(df, results_directory, results_name, results_format="csv"):
+    """
+    :param df: the results dataframe; its index is written as columns
+    :param results_directory: str, the results directory
+    :param results_name: str, the name of the results table
+    :param results_format: str, "csv" or "parquet"
+    :return:
+
+    Write a results dataframe to the results directory in the requested
+    format. Any file for the same results table in another format (e.g.
+    from a prior run) is removed, so that the readers don't pick up stale
+    results.
+    """
+    if results_format not in RESULTS_FORMATS:
+        raise ValueError(
+            f"Unknown results format '{results_format}'; "
+            f"must be one of {RESULTS_FORMATS}."
+        )
+
+    for other_format in RESULTS_FORMATS:
+        other_filepath = get_results_filepath(
+            results_directory, results_name, other_format
+        )
+        if other_format != results_format and os.path.exists(other_filepath):
+            os.remove(other_filepath)
+
+    results_filepath = get_results_filepath(
+        results_directory, results_name, results_format
+    )
+
+    if results_format == "csv":
+        df.to_csv(results_filepath, sep=",", index=True)
+    else:
+        results_df = df.reset_index()
+        conn = duckdb.connect(database=":memory:")
+        try:
+            conn.register("results_df", results_df)
+            conn.execute(
+                f"COPY results_df TO '{escape_path(results_filepath)}' "
+                f"(FORMAT PARQUET);"
+            )
+        finally:
+            conn.close()
+
+
+def read_results_df(results_directory, results_name, columns=None):
+    """
+    :param results_directory: str, the results directory
+    :param results_name: str, the name of the results table
+    :param columns: list of the columns to read (all if None)
+    :return: the results dataframe or None if no results file is found
+
+    Read a results file into a dataframe, whichever the format it was
+    written in. For Parquet files, only the requested columns are read.
+    """
+    results_filepath = find_results_file(results_directory, results_name)
+    if results_filepath is None:
+        return None
+
+    if results_filepath.endswith(".csv"):
+        df = pd.read_csv(results_filepath, usecols=columns)
+        return df if columns is None else df[columns]
+    else:
+        select = "*" if columns is None else ", ".join(f'"{c}"' for c in columns)
+        conn = duckdb.connect(database=":memory:")
+        try:
+            return conn.execute(
+                f"SELECT {select} "
+                f"FROM read_parquet('{escape_path(results_filepath)}');"
+            ).df()
+        finally:
+            conn.close()
+
+
+def escape_path(filepath):
+    """
+    :param filepath: str
+    :return: the filepath with single quotes escaped for use in a DuckDB
+        string literal
+    """
+    return filepath.replace("'", "''")
@@ -22,6 +22,7 @@ from gridpath.auxiliary.auxiliary import (
     check_for_integer_subdirectories,
     check_for_starting_string_subdirectories,
 )
+from gridpath.common_functions import ensure_empty_string
 
 
 # TODO: conslidate use 0s and 1s to indicate no subdirectories?
@@ -288,6 +289,36 @@ def determine_iteration_directories_from_iteration_structure(scenario_structure)
     return iteration_directory_strings_dict
 
 
+def get_iteration_directories_list(iteration_directory_strings):
+    """
+    :param iteration_directory_strings: dictionary of the iteration directory
+        strings {weather_iteration_str: {hydro_iteration_str:
+        [availability_iteration_str]}} (see
+        *determine_iteration_directories_from_iteration_structure*)
+    :return: list of (weather_iteration_str, hydro_iteration_str,
+        availability_iteration_str) tuples
+
+    Flatten the iteration directory strings into the list of iterations,
+    converting "empty_string" to actual empty strings for use in the
+    directory paths. Together with the subproblems, this is the full set of
+    (weather, hydro, availability, subproblem) problems to run.
+    """
+    return [
+        (
+            ensure_empty_string(weather_iteration_str),
+            ensure_empty_string(hydro_iteration_str),
+            ensure_empty_string(availability_iteration_str),
+        )
+        for weather_iteration_str in iteration_directory_strings.keys()
+        for hydro_iteration_str in iteration_directory_strings[
+            weather_iteration_str
+        ].keys()
+        for availability_iteration_str in iteration_directory_strings[
+            weather_iteration_str
+        ][hydro_iteration_str]
+    ]
+
+
 def determine_subproblem_stage_directory_structure(scenario_structure):
     """
     The subproblem structure is the same within each iteration
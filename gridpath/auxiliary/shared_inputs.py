@@ -0,0 +1,299 @@
+# Copyright 2016-2024 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Input files shared by all (iteration, subproblem, stage) problems.
+
+Each problem has its own inputs directory, so the inputs that don't depend
+on the iteration, subproblem, or stage (e.g. projects.tab or the
+transmission lines) are normally queried from the database and written
+again for every problem. With *--deduplicate_inputs*, get_scenario_inputs
+first writes the inputs of a few detection problems (the first problem and
+problems that differ from it in each of the iteration, subproblem, and stage
+dimensions), recording for each module the database queries it runs (with
+their parameters) and the files it writes. A module's inputs are shared if:
+
+1) its queries are the same for all detection problems, i.e. they do not
+   depend on the iteration, subproblem, or stage;
+2) the files it writes are identical for all detection problems; and
+3) no module whose inputs are not shared writes to the same files (e.g.
+   adds columns to projects.tab).
+
+The shared files are written once to the *shared_inputs* directory of the
+scenario and hard-linked (copied if the file system does not support hard
+links) into the inputs directory of each problem, and the modules whose
+inputs are shared are skipped for the remaining problems. Since the linked
+files are the same file on disk, they must not be modified after they are
+written.
+"""
+
+from contextlib import contextmanager
+import filecmp
+import os
+import shutil
+
+SHARED_INPUTS_DIRECTORY = "shared_inputs"
+
+
+def get_detection_keys(keys):
+    """
+    :param keys: list of the (weather iteration, hydro iteration,
+        availability iteration, subproblem, stage) directory string tuples
+        of the problems, in order
+    :return: list of the keys for which to detect which inputs are shared
+
+    The first key plus, ideally, a key that differs from it in every
+    dimension that varies across the keys; if there's no such key, a key
+    that differs from the first in each varying dimension.
+    """
+    first_key = keys[0]
+    varying_dimensions = [
+        i for i in range(len(first_key)) if len(set(key[i] for key in keys)) > 1
+    ]
+
+    for key in reversed(keys):
+        if all(key[i] != first_key[i] for i in varying_dimensions):
+            return [first_key] if key == first_key else [first_key, key]
+
+    detection_keys = [first_key]
+    for i in varying_dimensions:
+        key = next(key for key in reversed(keys) if key[i] != first_key[i])
+        if key not in detection_keys:
+            detection_keys.append(key)
+
+    return detection_keys
+
+
+def check_query_tracing(conn):
+    """
+    :param conn: the database connection
+    :return: boolean, whether the queries traced on the connection include
+        the values of their parameters (needed to detect the shared inputs)
+    """
+    trace = []
+    conn.set_trace_callback(trace.append)
+    try:
+        conn.execute("SELECT ?;", (1,)).fetchall()
+    finally:
+        conn.set_trace_callback(None)
+
+    return trace == ["SELECT 1;"]
+
+
+def get_inputs_directory_snapshot(inputs_directory):
+    """
+    :param inputs_directory: the problem's inputs directory
+    :return: dictionary of the files in the directory with their size,
+        modification time, and inode
+    """
+    snapshot = dict()
+    for entry in os.scandir(inputs_directory):
+        if entry.is_file():
+            file_stat = entry.stat()
+            snapshot[entry.name] = (
+                file_stat.st_size,
+                file_stat.st_mtime_ns,
+                file_stat.st_ino,
+            )
+
+    return snapshot
+
+
+@contextmanager
+def record_module_inputs(conn, inputs_directory, module_name, inputs_record):
+    """
+    :param conn: the database connection the module queries
+    :param inputs_directory: the problem's inputs directory
+    :param module_name: the name of the module writing inputs
+    :param inputs_record: dictionary to record the module's queries and the
+        files it writes in (nothing is recorded if None)
+
+    Record the queries a module runs and the input files it writes (or
+    modifies or deletes) within the context.
+    """
+    if inputs_record is None:
+        yield
+        return
+
+    trace = []
+    files_before = get_inputs_directory_snapshot(inputs_directory)
+    conn.set_trace_callback(trace.append)
+    try:
+        yield
+    finally:
+        conn.set_trace_callback(None)
+    files_after = get_inputs_directory_snapshot(inputs_directory)
+
+    files_written = set(
+        f
+        for f in set(files_before) | set(files_after)
+        if files_before.get(f) != files_after.get(f)
+    )
+    inputs_record[module_name] = (trace, files_written)
+
+
+class SharedInputs(object):
+    """
+    The modules whose inputs are shared by all problems of a scenario and
+    the files they write, determined from the inputs recorded for the
+    detection problems (see *from_inputs_records*).
+    """
+
+    def __init__(self, scenario_directory, shared_modules, shared_files):
+        """
+        :param scenario_directory: the scenario directory
+        :param shared_modules: set of the names of the modules whose inputs
+            are shared (these modules are skipped when writing inputs)
+        :param shared_files: list of the shared input files
+        """
+        self.shared_directory = os.path.join(
+            scenario_directory, SHARED_INPUTS_DIRECTORY
+        )
+        self.shared_modules = shared_modules
+        self.shared_files = shared_files
+        self._file_stats = dict()
+
+    @classmethod
+    def from_inputs_records(cls, scenario_directory, inputs_records):
+        """
+        :param scenario_directory: the scenario directory
+        :param inputs_records: list of (inputs directory, inputs record)
+            tuples for the detection problems, each record a dictionary of
+            the queries and files written by module (see
+            *record_module_inputs*)
+        :return: the SharedInputs, with the shared files written to the
+            shared inputs directory
+
+        Determine the shared modules and files and move the files to the
+        shared inputs directory, linking them back into the detection
+        problems' inputs directories.
+        """
+        (first_inputs_directory, first_record) = inputs_records[0]
+
+        # The modules that query the same data and write the same files for
+        # all detection problems
+        shared_modules = set(
+            module_name
+            for module_name in first_record.keys()
+            if all(
+                record.get(module_name) == first_record[module_name]
+                for (_, record) in inputs_records[1:]
+            )
+        )
+
+        # The modules writing each file
+        file_modules = dict()
+        for _, record in inputs_records:
+            for module_name, (_, files_written) in record.items():
+                for f in files_written:
+                    file_modules.setdefault(f, set()).add(module_name)
+
+        # A file is shared if all modules writing it are shared and it's the
+        # same for all detection problems; a module is shared if all the
+        # files it writes are shared
+        while True:
+            shared_files = sorted(
+                f
+                for f, modules in file_modules.items()
+                if modules.issubset(shared_modules)
+                and all(
+                    os.path.isfile(os.path.join(inputs_directory, f))
+                    and filecmp.cmp(
+                        os.path.join(first_inputs_directory, f),
+                        os.path.join(inputs_directory, f),
+                        shallow=False,
+                    )
+                    for (inputs_directory, _) in inputs_records
+                )
+            )
+            not_shared = set(
+                module_name
+                for module_name in shared_modules
+                if not first_record[module_name][1].issubset(shared_files)
+            )
+            if not not_shared:
+                break
+            shared_modules -= not_shared
+
+        shared_inputs = cls(
+            scenario_directory=scenario_directory,
+            shared_modules=shared_modules,
+            shared_files=shared_files,
+        )
+
+        # Move the files to the shared directory
+        if os.path.exists(shared_inputs.shared_directory):
+            shutil.rmtree(shared_inputs.shared_directory)
+        os.makedirs(shared_inputs.shared_directory)
+        for f in shared_files:
+            os.replace(
+                os.path.join(first_inputs_directory, f),
+                os.path.join(shared_inputs.shared_directory, f),
+            )
+            shared_inputs._file_stats[f] = shared_inputs.get_file_stat(f)
+        for inputs_directory, _ in inputs_records:
+            for f in shared_files:
+                if os.path.exists(os.path.join(inputs_directory, f)):
+                    os.remove(os.path.join(inputs_directory, f))
+            shared_inputs.link_shared_files(inputs_directory=inputs_directory)
+
+        return shared_inputs
+
+    def get_file_stat(self, f):
+        """
+        :param f: the name of the shared file
+        :return: the size and modification time of the shared file
+        """
+        file_stat = os.stat(os.path.join(self.shared_directory, f))
+
+        return file_stat.st_size, file_stat.st_mtime_ns
+
+    def is_shared_module(self, module_name):
+        """
+        :param module_name: the name of the module
+        :return: boolean, whether the module's inputs are shared (and it can
+            be skipped)
+        """
+        return module_name in self.shared_modules
+
+    def link_shared_files(self, inputs_directory):
+        """
+        :param inputs_directory: the problem's inputs directory
+
+        Hard-link the shared files into the problem's inputs directory (copy
+        them if the file system doesn't support hard links).
+        """
+        for f in self.shared_files:
+            shared_file = os.path.join(self.shared_directory, f)
+            problem_file = os.path.join(inputs_directory, f)
+            try:
+                os.link(shared_file, problem_file)
+            except OSError:
+                shutil.copy2(shared_file, problem_file)
+
+    def check_shared_files(self):
+        """
+        Check that no shared file was modified after it was shared (e.g. by
+        a module writing inputs only for some of the problems), since this
+        would modify the inputs of all problems.
+        """
+        modified_files = [
+            f for f in self.shared_files if self.get_file_stat(f) != self._file_stats[f]
+        ]
+        if modified_files:
+            raise Exception(
+                f"The shared input files {modified_files} were modified after "
+                f"they were written. Get the inputs again without "
+                f"deduplicating inputs."
+            )
@@ -0,0 +1,498 @@
+# Copyright 2016-2024 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Load solutions written by a solver run outside of GridPath (e.g. on a
+cluster) back into the problem instance.
+
+When GridPath writes the problem file instead of solving the problem (with
+*--create_lp_problem_file_only*), it also saves a *symbol index* mapping the
+problem file symbols to the positions of the variables and constraints in
+the instance. With the default (non-symbolic) labels, the symbols are
+numbered (e.g. *x123* for a variable and *c_e_x124_* for an equality
+constraint), so the index is two arrays indexed by the symbol number: the
+component type and the component position.
+
+The positions only depend on the model components and their indices, so
+the index also serves as a solution-mapping manifest for an instance
+rebuilt from the same inputs (with *--skip_instance_pickle*): it includes
+the names, sizes, and index checksums of the variable and constraint
+components, which are checked against the instance the solution is loaded
+into.
+
+The solution files can be several GB, so they are streamed rather than
+parsed into memory at once: the CPLEX XML solution with *iterparse* (each
+element is discarded once read) and the Gurobi JSON solution with an
+incremental decoder that decodes the variables and constraints one at a
+time. The solution values are then looked up in the index and loaded into
+the instance in batches.
+"""
+
+import json
+import re
+import weakref
+import xml.etree.ElementTree as ET
+import zlib
+
+import numpy as np
+from pyomo.environ import Constraint, Var
+
+SYMBOL_INDEX_FILENAME = "symbol_index.npz"
+
+# Component types in the symbol index
+NO_COMPONENT = 0
+VARIABLE = 1
+CONSTRAINT = 2
+# Symbols whose values are not loaded (the objective and the constant
+# variable the LP writer adds)
+OTHER_COMPONENT = 3
+
+# Variable (x123) and constraint (c_e_x123_, r_l_x123_, etc.) symbols; the
+# constraint type prefix and the trailing underscore are optional since
+# solvers and older Pyomo versions may strip them
+NUMBERED_SYMBOL_PATTERN = re.compile(r"^(?:[cr]_[elu]_)?x(\d+)_?$")
+CONSTRAINT_SYMBOL_PATTERN = re.compile(r"^[cr]_[elu]_.+_$")
+
+# Solution values are looked up and loaded in batches of this size
+BATCH_SIZE = 2**16
+
+# The arrays of the component manifest in the symbol index file
+MANIFEST_ARRAYS = [
+    "component_names",
+    "component_kinds",
+    "component_sizes",
+    "component_index_checksums",
+]
+
+
+def get_component_data_objects(instance, ctype):
+    """
+    :param instance: the problem instance
+    :param ctype: Var or Constraint
+    :return: list of the variable or constraint data objects of the instance
+
+    The order is the declaration order of the components and the index order
+    of the component data, so it's the same for a pickled and unpickled
+    instance.
+    """
+    return list(
+        instance.component_data_objects(
+            ctype=ctype, active=None, descend_into=True, sort=False
+        )
+    )
+
+
+def get_component_manifest(instance):
+    """
+    :param instance: the problem instance
+    :return: arrays of the names, types, sizes (number of data objects),
+        and index checksums of the variable and constraint components of the
+        instance, in the order of *get_component_data_objects*
+    """
+    names, kinds, sizes, checksums = [], [], [], []
+    for kind, ctype in [(VARIABLE, Var), (CONSTRAINT, Constraint)]:
+        for component in instance.component_objects(
+            ctype=ctype, active=None, descend_into=True, sort=False
+        ):
+            names.append(component.name)
+            kinds.append(kind)
+            sizes.append(len(component))
+            checksums.append(zlib.crc32("\n".join(map(str, component.keys())).encode()))
+
+    return (
+        np.array(names, dtype=str),
+        np.array(kinds, dtype=np.int8),
+        np.array(sizes, dtype=np.int64),
+        np.array(checksums, dtype=np.uint32),
+    )
+
+
+class SymbolIndex(object):
+    """
+    Maps the problem file symbols to the positions of the variables and
+    constraints in the instance (see *get_component_data_objects*).
+
+    If all symbols are numbered, the component types and
+    positions are indexed by the symbol number and the symbols themselves are
+    not stored; otherwise, e.g. with symbolic solver labels, the symbols are
+    stored along with the types and positions.
+    """
+
+    def __init__(self, kinds, positions, component_manifest, symbols=None):
+        """
+        :param kinds: array of the component type for each symbol
+        :param positions: array of the component position for each symbol
+        :param component_manifest: the (names, types, sizes, index
+            checksums) arrays of the
+            variable and constraint components of the instance (see
+            *get_component_manifest*)
+        :param symbols: array of the symbols if not numbered
+        """
+        self.kinds = kinds
+        self.positions = positions
+        self.component_manifest = component_manifest
+        self.symbols = symbols
+        self._rows = None
+        if symbols is not None:
+            self._rows = dict()
+            for row, symbol in enumerate(symbols.tolist()):
+                self._rows[symbol] = row
+                # Solvers may strip the constraint type prefix and underscore
+                if CONSTRAINT_SYMBOL_PATTERN.match(symbol):
+                    self._rows.setdefault(symbol[4:-1], row)
+
+    @classmethod
+    def from_symbol_map(cls, instance, symbol_map):
+        """
+        :param instance: the problem instance
+        :param symbol_map: the Pyomo SymbolMap created when writing the
+            problem file
+        :return: the SymbolIndex
+        """
+        variables = get_component_data_objects(instance=instance, ctype=Var)
+        constraints = get_component_data_objects(instance=instance, ctype=Constraint)
+        component_kinds_positions = {
+            id(v): (VARIABLE, position) for position, v in enumerate(variables)
+        }
+        component_kinds_positions.update(
+            {id(c): (CONSTRAINT, position) for position, c in enumerate(constraints)}
+        )
+
+        symbols, kinds, positions = [], [], []
+        for symbol, component in list(symbol_map.bySymbol.items()) + list(
+            symbol_map.aliases.items()
+        ):
+            # Older Pyomo versions store weak references in the symbol map
+            if isinstance(component, weakref.ref):
+                component = component()
+            kind, position = component_kinds_positions.get(
+                id(component), (OTHER_COMPONENT, -1)
+            )
+            symbols.append(symbol)
+            kinds.append(kind)
+            positions.append(position)
+
+        # Other symbols (e.g. the default objective alias) may not be numbered
+        numbers = [NUMBERED_SYMBOL_PATTERN.match(symbol) for symbol in symbols]
+        if all(n or k == OTHER_COMPONENT for n, k in zip(numbers, kinds)):
+            numbered = [i for i, n in enumerate(numbers) if n]
+            numbers = np.array(
+                [int(numbers[i].group(1)) for i in numbered], dtype=np.int64
+            )
+            size = numbers.max() + 1 if len(numbers) else 0
+            index_kinds = np.full(size, NO_COMPONENT, dtype=np.int8)
+            index_positions = np.full(size, -1, dtype=np.int64)
+            index_kinds[numbers] = [kinds[i] for i in numbered]
+            index_positions[numbers] = [positions[i] for i in numbered]
+            index_symbols = None
+        else:
+            index_kinds = np.array(kinds, dtype=np.int8)
+            index_positions = np.array(positions, dtype=np.int64)
+            index_symbols = np.array(symbols, dtype=str)
+
+        return cls(
+            kinds=index_kinds,
+            positions=index_positions,
+            component_manifest=get_component_manifest(instance=instance),
+            symbols=index_symbols,
+        )
+
+    def save(self, path):
+        """
+        :param path: the symbol index file path
+        """
+        arrays = dict(
+            kinds=self.kinds,
+            positions=self.positions,
+            **dict(zip(MANIFEST_ARRAYS, self.component_manifest)),
+        )
+        if self.symbols is not None:
+            arrays["symbols"] = self.symbols
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """
+        :param path: the symbol index file path
+        :return: the SymbolIndex
+        """
+        with np.load(path, allow_pickle=False) as arrays:
+            return cls(
+                kinds=arrays["kinds"],
+                positions=arrays["positions"],
+                component_manifest=tuple(arrays[name] for name in MANIFEST_ARRAYS),
+                symbols=arrays["symbols"] if "symbols" in arrays.files else None,
+            )
+
+    def check_instance(self, instance):
+        """
+        :param instance: the problem instance
+
+        Check that the instance has the same variable and constraint
+        components with the same indices as the instance the index was
+        created for.
+        """
+        manifest = get_component_manifest(instance=instance)
+        if not all(
+            np.array_equal(a, b) for a, b in zip(manifest, self.component_manifest)
+        ):
+            index_components = {
+                name: (size, checksum)
+                for name, _, size, checksum in zip(
+                    *[a.tolist() for a in self.component_manifest]
+                )
+            }
+            components = {
+                name: (size, checksum)
+                for name, _, size, checksum in zip(*[a.tolist() for a in manifest])
+            }
+            mismatches = [
+                "{} (problem file: {}, instance: {})".format(
+                    name,
+                    index_components.get(name, ("missing",))[0],
+                    components.get(name, ("missing",))[0],
+                )
+                for name in dict.fromkeys(list(index_components) + list(components))
+                if index_components.get(name) != components.get(name)
+            ]
+            raise Exception(
+                "The instance does not match the problem file the solution "
+                "is for. Mismatched components (number of indices): {}. Were "
+                "the inputs changed after the problem file was written?".format(
+                    ", ".join(mismatches[:10]) if mismatches else "component order"
+                )
+            )
+
+    def get_row(self, symbol):
+        """
+        :param symbol: a problem file symbol
+        :return: the index row of the symbol (-1 if the symbol is not numbered
+            or not in the index)
+        """
+        if self._rows is not None:
+            row = self._rows.get(symbol, -1)
+            # Older Pyomo versions stored the constraint symbols stripped
+            if row == -1 and CONSTRAINT_SYMBOL_PATTERN.match(symbol):
+                row = self._rows.get(symbol[4:-1], -1)
+            return row
+        number = NUMBERED_SYMBOL_PATTERN.match(symbol)
+        return int(number.group(1)) if number else -1
+
+    def get_rows(self, symbols):
+        """
+        :param symbols: list of problem file symbols
+        :return: array of the index rows of the symbols
+        """
+        rows = np.array([self.get_row(symbol) for symbol in symbols], dtype=np.int64)
+        unknown = (rows < 0) | (rows >= len(self.kinds))
+        unknown[~unknown] = self.kinds[rows[~unknown]] == NO_COMPONENT
+        if unknown.any():
+            raise KeyError(
+                "Symbols not found in the symbol index: {}".format(
+                    [symbols[i] for i in np.flatnonzero(unknown)[:10]]
+                )
+            )
+
+        return rows
+
+
+class SolutionLoader(object):
+    """
+    Loads the variable values and constraint duals of a solution into the
+    instance in batches, looking up the components in the symbol index.
+    """
+
+    def __init__(self, instance, symbol_index):
+        """
+        :param instance: the problem instance
+        :param symbol_index: the SymbolIndex saved when writing the problem
+            file for the instance
+        """
+        symbol_index.check_instance(instance=instance)
+        self.instance = instance
+        self.symbol_index = symbol_index
+        self.variables = get_component_data_objects(instance=instance, ctype=Var)
+        self.constraints = get_component_data_objects(
+            instance=instance, ctype=Constraint
+        )
+        self._symbols = []
+        self._values = []
+        self._is_dual = []
+
+    def add_value(self, symbol, value):
+        """
+        :param symbol: the variable symbol
+        :param value: the variable value
+        """
+        self._symbols.append(symbol)
+        self._values.append(value)
+        self._is_dual.append(False)
+        if len(self._symbols) >= BATCH_SIZE:
+            self.flush()
+
+    def add_dual(self, symbol, dual):
+        """
+        :param symbol: the constraint symbol
+        :param dual: the constraint dual
+        """
+        self._symbols.append(symbol)
+        self._values.append(dual)
+        self._is_dual.append(True)
+        if len(self._symbols) >= BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        """
+        Load the batch of values and duals into the instance.
+        """
+        if not self._symbols:
+            return
+
+        rows = self.symbol_index.get_rows(self._symbols)
+        kinds = self.symbol_index.kinds[rows]
+        positions = self.symbol_index.positions[rows]
+        values = np.array(self._values, dtype=float)
+        is_dual = np.array(self._is_dual, dtype=bool)
+
+        is_value = ~is_dual & (kinds == VARIABLE)
+        for position, value in zip(
+            positions[is_value].tolist(), values[is_value].tolist()
+        ):
+            self.variables[position].set_value(value, skip_validation=True)
+
+        dual_suffix = self.instance.dual
+        is_dual &= kinds == CONSTRAINT
+        for position, dual in zip(
+            positions[is_dual].tolist(), values[is_dual].tolist()
+        ):
+            dual_suffix[self.constraints[position]] = dual
+
+        self._symbols, self._values, self._is_dual = [], [], []
+
+
+def iter_cplex_xml_solution(path):
+    """
+    :param path: the CPLEX XML (.sol) solution file path
+    :return: generator of ("header", attributes), ("variable", name, value),
+        and ("constraint", name, dual) tuples
+
+    Stream the solution file, discarding the elements once they're read.
+    """
+    containers = []
+    for event, elem in ET.iterparse(path, events=("start", "end")):
+        if event == "start":
+            if elem.tag in ("variables", "linearConstraints"):
+                containers.append(elem)
+            continue
+
+        if elem.tag == "variable":
+            yield "variable", elem.get("name"), elem.get("value")
+        elif elem.tag == "constraint":
+            yield "constraint", elem.get("name"), elem.get("dual")
+        elif elem.tag == "header":
+            yield "header", dict(elem.attrib)
+        else:
+            continue
+
+        # Discard the element (the container holds the elements read so far)
+        elem.clear()
+        if containers:
+            containers[-1].clear()
+
+
+class _JSONStream(object):
+    """
+    Reads JSON values from a file one at a time.
+    """
+
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+
+    def _read_chunk(self):
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            return False
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """
+        :return: the next non-whitespace character (None at the end)
+        """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._read_chunk():
+                return None
+
+    def consume(self, char):
+        if self.peek() != char:
+            raise ValueError(
+                "Expected '{}' in JSON at position {}".format(char, self.pos)
+            )
+        self.pos += 1
+
+    def decode(self):
+        """
+        :return: the next JSON value
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._read_chunk():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and self._read_chunk():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_members(f, streamed_keys, chunk_size=2**20):
+    """
+    :param f: the open JSON file, containing an object
+    :param streamed_keys: the keys of the array members to stream
+    :param chunk_size: the number of characters to read at a time
+    :return: generator of (key, value) tuples for the members of the object;
+        for the array members in *streamed_keys*, a (key, item) tuple for
+        each item of the array
+    """
+    stream = _JSONStream(f=f, chunk_size=chunk_size)
+    stream.consume("{")
+    while stream.peek() != "}":
+        key = stream.decode()
+        stream.consume(":")
+        if key in streamed_keys and stream.peek() == "[":
+            stream.consume("[")
+            while stream.peek() != "]":
+                yield key, stream.decode()
+                if stream.peek() == ",":
+                    stream.consume(",")
+            stream.consume("]")
+        else:
+            yield key, stream.decode()
+        if stream.peek() == ",":
+            stream.consume(",")
+    stream.consume("}")
@@ -0,0 +1,286 @@
+# Copyright 2016-2024 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Store of the state handed off between subproblems and stages.
+
+Linked subproblems and multi-stage runs pass state from one solve to the
+next through tab-delimited files: the linked timepoint params written into
+the next subproblem's inputs directory by the operational type modules and
+the pass-through inputs (e.g. fixed_commitment.tab) appended to by each
+stage. Modules publish these tables with *open_state_table* and consume them
+with *load_state_table* (into a DataPortal) or *read_state_table_df*.
+
+By default, the tables are only written to and read from the files. With
+*--in_memory_handoff*, the tables are also kept in memory, keyed by the
+(weather iteration, hydro iteration, availability iteration, subproblem,
+stage) of the directory they belong to and their file path within it, and
+consumed from memory. Since linked subproblems and the stages of a
+subproblem are always solved in order in the same process, the next solve
+finds the tables of the previous one in memory; the files are then only
+written as an audit trail if requested (*--write_handoff_files*). Tables
+not found in memory (e.g. if the previous subproblem was solved by an
+earlier run) are read from the files.
+"""
+
+from contextlib import contextmanager
+import csv
+import os.path
+
+import numpy as np
+import pandas as pd
+
+# Whether to keep the published tables in memory and whether to (also)
+# write them to files
+_state_store_options = {"in_memory": False, "write_files": True}
+# {(weather iteration, hydro iteration, availability iteration, subproblem,
+# stage): {(subdirectory, filename): [header, *rows]}}
+_state_store = dict()
+
+
+def configure_state_store(in_memory, write_files):
+    """
+    :param in_memory: boolean, whether to keep the published tables in
+        memory
+    :param write_files: boolean, whether to write the published tables to
+        files when keeping them in memory (they are always written if not)
+    """
+    _state_store_options["in_memory"] = in_memory
+    _state_store_options["write_files"] = write_files or not in_memory
+
+
+def clear_state_store(problem_key=None):
+    """
+    :param problem_key: the (weather iteration, hydro iteration, availability
+        iteration, subproblem, stage) directory strings of the tables to
+        drop; all tables are dropped if None
+    """
+    if problem_key is None:
+        _state_store.clear()
+    else:
+        _state_store.pop(tuple(problem_key), None)
+
+
+def get_state_table_path(scenario_directory, problem_key, subdirectory, filename):
+    """
+    :param scenario_directory: the scenario directory
+    :param problem_key: the (weather iteration, hydro iteration, availability
+        iteration, subproblem, stage) directory strings
+    :param subdirectory: the subdirectory of the table file (e.g. "inputs")
+    :param filename: the name of the table file
+    :return: the path to the table file
+    """
+    return os.path.join(scenario_directory, *problem_key, subdirectory, filename)
+
+
+def get_state_table(problem_key, subdirectory, filename):
+    """
+    :param problem_key: the (weather iteration, hydro iteration, availability
+        iteration, subproblem, stage) directory strings
+    :param subdirectory: the subdirectory of the table file
+    :param filename: the name of the table file
+    :return: list of the table rows (starting with the header) if the table
+        is in memory; None otherwise
+    """
+    return _state_store.get(tuple(problem_key), dict()).get((subdirectory, filename))
+
+
+class StateTableWriter(object):
+    """
+    Writer for a published table with the *writerow* method of csv writers;
+    rows are added to the table in memory and/or written to its file.
+    """
+
+    def __init__(self, rows, file_writer):
+        """
+        :param rows: the list of rows of the table in memory (None if not
+            keeping the table in memory)
+        :param file_writer: the csv writer of the table file (None if not
+            writing the file)
+        """
+        self.rows = rows
+        self.file_writer = file_writer
+
+    def writerow(self, row):
+        """
+        :param row: list of the row values
+        """
+        if self.rows is not None:
+            # Keep Python scalars, as they would be parsed from the file
+            self.rows.append(
+                [
+                    value.item() if isinstance(value, np.generic) else value
+                    for value in row
+                ]
+            )
+        if self.file_writer is not None:
+            self.file_writer.writerow(row)
+
+
+@contextmanager
+def open_state_table(scenario_directory, problem_key, subdirectory, filename, mode="w"):
+    """
+    :param scenario_directory: the scenario directory
+    :param problem_key: the (weather iteration, hydro iteration, availability
+        iteration, subproblem, stage) directory strings of the directory the
+        table belongs to
+    :param subdirectory: the subdirectory of the table file (e.g. "inputs")
+    :param filename: the name of the table file
+    :param mode: "w" to write a new table or "a" to append to the table
+    :return: StateTableWriter to publish the table rows with
+
+    Publish a table (in memory and/or to its file, see the module docstring)
+    within the context.
+    """
+    path = get_state_table_path(
+        scenario_directory=scenario_directory,
+        problem_key=problem_key,
+        subdirectory=subdirectory,
+        filename=filename,
+    )
+
+    rows = None
+    if _state_store_options["in_memory"]:
+        tables = _state_store.setdefault(tuple(problem_key), dict())
+        if mode == "a" and (subdirectory, filename) not in tables:
+            # Append to the rows of the file (e.g. the header written when
+            # the pass-through inputs were created)
+            if os.path.exists(path):
+                with open(path, "r", newline="") as f:
+                    tables[(subdirectory, filename)] = [
+                        [parse_value(value) for value in row]
+                        for row in csv.reader(f, delimiter="\t")
+                    ]
+        if mode == "w" or (subdirectory, filename) not in tables:
+            tables[(subdirectory, filename)] = []
+        rows = tables[(subdirectory, filename)]
+
+    if _state_store_options["write_files"]:
+        with open(path, mode, newline="") as f:
+            yield StateTableWriter(
+                rows=rows,
+                file_writer=csv.writer(f, delimiter="\t", lineterminator="\n"),
+            )
+    else:
+        yield StateTableWriter(rows=rows, file_writer=None)
+
+
+def parse_value(value):
+    """
+    :param value: str, a value read from a table file
+    :return: the value as an int or float if it's a number; as is otherwise
+    """
+    for value_type in (int, float):
+        try:
+            return value_type(value)
+        except ValueError:
+            pass
+
+    return value
+
+
+def read_state_table_df(
+    scenario_directory, problem_key, subdirectory, filename, dtype=None
+):
+    """
+    :param scenario_directory: the scenario directory
+    :param problem_key: the (weather iteration, hydro iteration, availability
+        iteration, subproblem, stage) directory strings of the directory the
+        table belongs to
+    :param subdirectory: the subdirectory of the table file
+    :param filename: the name of the table file
+    :param dtype: dictionary of column types (optional)
+    :return: the table as a pandas DataFrame, from memory if available or
+        from its file otherwise
+    """
+    rows = get_state_table(
+        problem_key=problem_key, subdirectory=subdirectory, filename=filename
+    )
+    if rows is None:
+        return pd.read_csv(
+            get_state_table_path(
+                scenario_directory=scenario_directory,
+                problem_key=problem_key,
+                subdirectory=subdirectory,
+                filename=filename,
+            ),
+            sep="\t",
+            dtype=dtype,
+        )
+
+    df = pd.DataFrame(rows[1:], columns=rows[0])
+    if dtype is not None:
+        df = df.astype(dtype)
+
+    return df
+
+
+def load_state_table(
+    data_portal,
+    scenario_directory,
+    problem_key,
+    subdirectory,
+    filename,
+    param,
+    index=None,
+):
+    """
+    :param data_portal: the Pyomo DataPortal
+    :param scenario_directory: the scenario directory
+    :param problem_key: the (weather iteration, hydro iteration, availability
+        iteration, subproblem, stage) directory strings of the directory the
+        table belongs to
+    :param subdirectory: the subdirectory of the table file
+    :param filename: the name of the table file
+    :param param: tuple of the Pyomo Params to load (from the columns after
+        the index columns, in order)
+    :param index: the Pyomo Set to load the index of the table into (if any)
+
+    Load the table into the data portal like *DataPortal.load* would load its
+    file, from memory if available or from the file otherwise (nothing is
+    loaded if there's no table).
+    """
+    rows = get_state_table(
+        problem_key=problem_key, subdirectory=subdirectory, filename=filename
+    )
+    if rows is None:
+        path = get_state_table_path(
+            scenario_directory=scenario_directory,
+            problem_key=problem_key,
+            subdirectory=subdirectory,
+            filename=filename,
+        )
+        if os.path.exists(path):
+            if index is None:
+                data_portal.load(filename=path, param=param)
+            else:
+                data_portal.load(filename=path, index=index, param=param)
+        return
+
+    n_index_columns = len(rows[0]) - len(param)
+    keys = [
+        tuple(row[:n_index_columns]) if n_index_columns > 1 else row[0]
+        for row in rows[1:]
+    ]
+    if index is not None:
+        data_portal.data()[index.name] = {None: keys}
+    for i, p in enumerate(param):
+        # Values missing in the file (".") are not loaded
+        data_portal.data().setdefault(p.name, dict()).update(
+            {
+                key: row[n_index_columns + i]
+                for key, row in zip(keys, rows[1:])
+                if row[n_index_columns + i] != "."
+            }
+        )
@@ -0,0 +1,305 @@
+# Copyright 2016-2024 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+MIP warm starts from the solution of the previous stage or subproblem.
+
+The stages of a subproblem solve nearly the same problem (with the
+commitment of some projects fixed by the previous stage), and so do linked
+subproblems (rolling horizons). With *--warmstart*, the variable values of
+each solved problem are kept in memory and used to initialize the variables
+of the next problem before it's solved:
+
+1) for stage N+1, the solution of stage N of the same subproblem; or
+2) for the first stage solved of subproblem N+1 if the subproblems are linked
+   (and solved in order in the same process), the solution of the same stage
+   of subproblem N.
+
+Variables are matched by component name and index, so the commitment and
+dispatch variables of the timepoints the two problems share (e.g. the
+lookahead timepoints of subproblem N) are initialized; the timepoints of
+subproblem N exported as linked timepoints are already parameters in
+subproblem N+1. Fixed variables are not changed and integer values are
+rounded and clipped to the variable bounds.
+
+The values are passed to the solver as a MIP start if Pyomo supports warm
+starts for the solver interface. The number of variables initialized, the
+solve time, and the time to the first incumbent solution (parsed from the
+solver log for Cbc and Gurobi) are written to the *solver_warm_start.csv*
+file in the subproblem/stage results directory.
+"""
+
+import csv
+import os
+import re
+import tempfile
+
+from pyomo.core.staleflag import StaleFlagManager
+from pyomo.environ import Var
+
+WARM_START_FILENAME = "solver_warm_start.csv"
+
+# Solver log lines reporting a new incumbent solution and the time (seconds)
+# it was found
+FIRST_INCUMBENT_PATTERNS = [
+    # Cbc, e.g. "Cbc0012I Integer solution of 1232 found by Reduced search
+    # after 0 iterations and 0 nodes 0 depth 0 ontree (0.00 seconds)"
+    re.compile(r"^Cbc0012I Integer solution of \S+ found .*\(([\d.]+) seconds\)"),
+    # Cbc (newer builds) node log, e.g.
+    # " ★    2      2            3       0.2444 b&b solution     1218    0.006"
+    re.compile(r"^\s*★.*\ssolution\s+\S+\s+([\d.]+)\s*$"),
+    # Gurobi, e.g. "User MIP start produced solution with objective 1232
+    # (0.01s)"
+    re.compile(r"MIP start produced solution with objective \S+ \(([\d.]+)s\)"),
+    # Gurobi node log heuristic and branching solutions, e.g.
+    # "H    0     0                    1218.0000  1240.00000  1.81%     -    0s"
+    re.compile(r"^\s*[H*]\s*\d+\s+\d+.*\s(\d+)s\s*$"),
+]
+
+# The solution values of the problems solved by this process, by
+# (weather iteration, hydro iteration, availability iteration, subproblem,
+# stage) directory strings
+_solution_values = dict()
+
+
+def get_solution_values(instance):
+    """
+    :param instance: the solved problem instance
+    :return: dictionary of the variable values by component name and index
+    """
+    return {
+        component.name: {
+            index: var.value
+            for index, var in component.items()
+            if var.value is not None
+        }
+        for component in instance.component_objects(
+            ctype=Var, active=None, descend_into=True
+        )
+    }
+
+
+def save_solution_values(problem_key, instance):
+    """
+    :param problem_key: the (weather iteration, hydro iteration, availability
+        iteration, subproblem, stage) directory strings of the solved problem
+    :param instance: the solved problem instance
+
+    Keep the solution values of the problem for the next stage or linked
+    subproblem, dropping the values that can't be used anymore (other
+    iterations and subproblems before the previous one).
+    """
+    subproblem = problem_key[3]
+    for key in list(_solution_values.keys()):
+        if key[:3] != problem_key[:3] or (
+            subproblem != "" and int(key[3]) < int(subproblem) - 1
+        ):
+            del _solution_values[key]
+
+    _solution_values[problem_key] = get_solution_values(instance=instance)
+
+
+def get_warm_start_source(scenario_directory, problem_key):
+    """
+    :param scenario_directory: the scenario directory
+    :param problem_key: the (weather iteration, hydro iteration, availability
+        iteration, subproblem, stage) directory strings of the problem
+    :return: the key of the problem to warm start from (None if no solution
+        to warm start from is available)
+    """
+    subproblem, stage = problem_key[3], problem_key[4]
+
+    # The previous stage of the subproblem
+    if stage != "":
+        previous_stages = [
+            key
+            for key in _solution_values.keys()
+            if key[:4] == problem_key[:4] and int(key[4]) < int(stage)
+        ]
+        if previous_stages:
+            return max(previous_stages, key=lambda key: int(key[4]))
+
+    # The same stage of the previous subproblem if the subproblems are linked
+    if subproblem != "" and os.path.exists(
+        os.path.join(scenario_directory, "linked_subproblems_map.csv")
+    ):
+        previous_subproblem_key = problem_key[:3] + (str(int(subproblem) - 1), stage)
+        if previous_subproblem_key in _solution_values:
+            return previous_subproblem_key
+
+    return None
+
+
+def get_first_incumbent_seconds(log_file):
+    """
+    :param log_file: the path to the solver log file
+    :return: the time in seconds at which the solver found its first
+        incumbent solution (None if not found in the log)
+    """
+    if not os.path.exists(log_file):
+        return None
+
+    with open(log_file, "r", errors="replace") as f:
+        for line in f:
+            for pattern in FIRST_INCUMBENT_PATTERNS:
+                match = pattern.search(line)
+                if match:
+                    return float(match.group(1))
+
+    return None
+
+
+class WarmStart(object):
+    """
+    The variables of a problem initialized from the solution of a previous
+    problem (see *set_values*) and the warm start statistics to report.
+    """
+
+    def __init__(self, source, seeded_variables):
+        """
+        :param source: the key of the problem the values are from (None if
+            there was none)
+        :param seeded_variables: list of (variable data object, value before
+            it was initialized) tuples for the variables that were initialized
+        """
+        self.source = source
+        self.seeded_variables = seeded_variables
+        self.solver_warm_started = False
+        self.first_incumbent_seconds = None
+        self.solve_seconds = None
+        self._log_file = None
+
+    @classmethod
+    def set_values(cls, instance, scenario_directory, problem_key):
+        """
+        :param instance: the problem instance
+        :param scenario_directory: the scenario directory
+        :param problem_key: the (weather iteration, hydro iteration,
+            availability iteration, subproblem, stage) directory strings of
+            the problem
+        :return: the WarmStart
+
+        Initialize the (unfixed) variables of the instance from the solution
+        of the warm start source problem.
+        """
+        source = get_warm_start_source(
+            scenario_directory=scenario_directory, problem_key=problem_key
+        )
+        seeded_variables = []
+        if source is not None:
+            source_values = _solution_values[source]
+            for component in instance.component_objects(
+                ctype=Var, active=None, descend_into=True
+            ):
+                values = source_values.get(component.name)
+                if not values:
+                    continue
+                for index, var in component.items():
+                    if var.fixed or index not in values:
+                        continue
+                    value = values[index]
+                    if var.is_integer():
+                        value = round(value)
+                    if var.lb is not None and value < var.lb:
+                        value = var.lb
+                    if var.ub is not None and value > var.ub:
+                        value = var.ub
+                    seeded_variables.append((var, var.value))
+                    var.set_value(value, skip_validation=True)
+
+        # Mark all variables as stale, so that the variables that don't get a
+        # value from the solver can be told apart after the solve
+        StaleFlagManager.mark_all_as_stale()
+
+        return cls(source=source, seeded_variables=seeded_variables)
+
+    def get_solve_kwargs(self, optimizer):
+        """
+        :param optimizer: the Pyomo solver object
+        :return: dictionary of the keyword arguments to pass to the solver's
+            solve method
+
+        Pass the initialized values to the solver as a MIP start if any
+        variables were initialized and the solver interface supports warm
+        starts, and write the solver log to a temporary file to get the time
+        to the first incumbent from (see *process_solver_log*).
+        """
+        self.solver_warm_started = (
+            len(self.seeded_variables) > 0 and optimizer.warm_start_capable()
+        )
+        log_file_handle, self._log_file = tempfile.mkstemp(suffix=".log")
+        os.close(log_file_handle)
+
+        solve_kwargs = {"logfile": self._log_file}
+        if self.solver_warm_started:
+            solve_kwargs["warmstart"] = True
+
+        return solve_kwargs
+
+    def process_solver_log(self):
+        """
+        Get the time to the first incumbent from the solver log and remove
+        the log file.
+        """
+        self.first_incumbent_seconds = get_first_incumbent_seconds(
+            log_file=self._log_file
+        )
+        if os.path.exists(self._log_file):
+            os.remove(self._log_file)
+
+    def restore_unused_values(self):
+        """
+        Restore the previous value of the initialized variables that did not
+        get a value from the solver (e.g. variables not in the problem or if
+        no solution was found), so that the results are the same as without
+        the warm start.
+        """
+        for var, previous_value in self.seeded_variables:
+            if var.stale:
+                var.set_value(previous_value, skip_validation=True)
+
+    def write_report(self, results_directory):
+        """
+        :param results_directory: the subproblem/stage results directory
+
+        Write the warm start statistics to the results directory.
+        """
+        with open(
+            os.path.join(results_directory, WARM_START_FILENAME), "w", newline=""
+        ) as f:
+            writer = csv.writer(f, delimiter=",", lineterminator="\n")
+            writer.writerow(
+                [
+                    "warm_start_source",
+                    "variables_initialized",
+                    "solver_warm_started",
+                    "solve_time_s",
+                    "first_incumbent_time_s",
+                ]
+            )
+            writer.writerow(
+                [
+                    (
+                        ""
+                        if self.source is None
+                        else "/".join(
+                            directory for directory in self.source if directory
+                        )
+                    ),
+                    len(self.seeded_variables),
+                    int(self.solver_warm_started),
+                    self.solve_seconds,
+                    self.first_incumbent_seconds,
+                ]
+            )
@@ -0,0 +1,70 @@
+# Copyright 2016-2024 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Worker pool for running subproblems (writing inputs, solving, importing
+results) in parallel.
+
+The pool's worker processes are started once for the whole scenario and
+initialized with the data that are the same for all tasks (the module
+registry, the parsed arguments, etc.). Unpickling the *ModuleRegistry*
+imports the GridPath modules (and with them Pyomo and pandas), so this is
+done once per worker rather than once per task, and the tasks themselves
+only carry the (iteration, subproblem, stage) directory strings. Tasks
+report their results (e.g. the objective function values) by returning
+them to the parent process rather than through shared Manager proxies.
+
+The pool must use the "spawn" start method to work properly on Linux.
+"""
+
+from multiprocessing import get_context
+
+# The worker context is set by the pool initializer in each worker process
+_worker_context = dict()
+
+
+def initialize_worker(worker_context):
+    """
+    :param worker_context: dictionary with the data shared by all tasks
+    :return:
+
+    Pool initializer: store the shared data in the worker process.
+    """
+    _worker_context.clear()
+    _worker_context.update(worker_context)
+
+
+def get_worker_context():
+    """
+    :return: dictionary with the data shared by all tasks (see
+        *create_worker_pool*)
+    """
+    return _worker_context
+
+
+def create_worker_pool(n_processes, **worker_context):
+    """
+    :param n_processes: int, the number of worker processes
+    :param worker_context: the data shared by all tasks, available in the
+        workers via *get_worker_context*
+    :return: the multiprocessing Pool
+
+    Create a pool of long-lived worker processes, each initialized once with
+    the shared data.
+    """
+    return get_context("spawn").Pool(
+        processes=n_processes,
+        initializer=initialize_worker,
+        initargs=(worker_context,),
+    )
@@ -159,6 +159,14 @@ def get_get_inputs_parser():
         default=1,
         help="Get inputs for n subproblems in parallel.",
     )
+    parser.add_argument(
+        "--deduplicate_inputs",
+        default=False,
+        action="store_true",
+        help="Write the input files that are the same for all iterations, "
+        "subproblems, and stages once to a shared directory and hard-link "
+        "them into each inputs directory.",
+    )
 
     return parser
 
@@ -193,6 +201,14 @@ def get_run_scenario_parser():
         action="store_true",
         help="Create and save the problem file, but don't solve yet.",
     )
+    parser.add_argument(
+        "--skip_instance_pickle",
+        default=False,
+        action="store_true",
+        help="With --create_lp_problem_file_only, don't pickle the problem "
+        "instance; only save the solution-mapping manifest, and rebuild the "
+        "instance from the scenario inputs when loading the solution.",
+    )
     parser.add_argument(
         "--load_cplex_solution",
         default=False,
@@ -223,6 +239,69 @@ def get_run_scenario_parser():
         "--solver option must be the same as the solver "
         "for which you are providing an executable.",
     )
+    parser.add_argument(
+        "--persistent_solver",
+        default=False,
+        action="store_true",
+        help="Solve through a Pyomo persistent solver interface (e.g. "
+        "gurobi_persistent or appsi_cbc), which is created once and reused "
+        "for all subproblems and stages solved by the process. The instance "
+        "of the first stage of a subproblem is kept loaded in the solver and "
+        "updated in place with the fixed variables and changed constraints of "
+        "the following stages. GridPath falls back to the standard solver "
+        "interface if no persistent interface is available for the solver. "
+        "Note that only the APPSI interfaces (e.g. appsi_highs) are tested "
+        "with a solver; the Gurobi, CPLEX, and Xpress persistent interfaces "
+        "are only tested with mock solvers.",
+    )
+    parser.add_argument(
+        "--persistent_solver_fixed_vars_as_bounds",
+        default=False,
+        action="store_true",
+        help="With --persistent_solver and an APPSI interface (e.g. "
+        "appsi_highs), keep the fixed variables in the problem loaded into "
+        "the solver with equal bounds rather than substituting their values, "
+        "so that fixing the variables passed to the following stages doesn't "
+        "reload the constraints they are in. This can change the duals the "
+        "solver reports (e.g. for the constraints including the fixed "
+        "variables).",
+    )
+    parser.add_argument(
+        "--warmstart",
+        default=False,
+        action="store_true",
+        help="Initialize the variables of each stage from the solution of the "
+        "previous stage (and of the first stage of linked subproblems from the "
+        "previous subproblem) and pass them to the solver as a MIP start if "
+        "the solver interface supports it. The warm start statistics are "
+        "written to solver_warm_start.csv in the results directory.",
+    )
+    parser.add_argument(
+        "--in_memory_handoff",
+        default=False,
+        action="store_true",
+        help="Hand off the linked timepoint inputs between linked subproblems "
+        "and the pass-through inputs between stages in memory instead of "
+        "through files (linked subproblems and the stages of a subproblem are "
+        "solved in order by the same process).",
+    )
+    parser.add_argument(
+        "--write_handoff_files",
+        default=False,
+        action="store_true",
+        help="With --in_memory_handoff, also write the handoff files as an "
+        "audit trail (needed to later solve or load the solution of a "
+        "subproblem or stage on its own, e.g. with --incomplete_only).",
+    )
+    parser.add_argument(
+        "--profile",
+        default=False,
+        action="store_true",
+        help="Record the wall time of each phase of the run (by module where "
+        "applicable) and the peak RSS (memory) of the process during each "
+        "phase and write them to scenario_profiling.csv in the "
+        "subproblem/stage results directory.",
+    )
     parser.add_argument(
         "--mute_solver_output",
         default=False,
@@ -289,6 +368,15 @@ def get_run_scenario_parser():
         "summary results.",
     )
 
+    parser.add_argument(
+        "--results_format",
+        default="csv",
+        choices=["csv", "parquet"],
+        help="The file format for the detailed results tables (e.g. "
+        "project_timepoint); defaults to CSV. Parquet files are written via "
+        "DuckDB.",
+    )
+
     return parser
 
 
@@ -298,6 +386,25 @@ def get_import_results_parser():
         "--results_import_rule",
         help="The name of the rule to use to decide whether to import results.",
     )
+    parser.add_argument(
+        "--n_parallel_import",
+        default=1,
+        type=int,
+        help="Import results for n subproblems in parallel.",
+    )
+
+    return parser
+
+
+def get_process_results_parser():
+    parser = ArgumentParser(add_help=False)
+    parser.add_argument(
+        "--reprocess_all",
+        default=False,
+        action="store_true",
+        help="Process the results of all subproblems and stages rather than "
+        "only those imported since results were last processed.",
+    )
 
     return parser
 
@@ -23,7 +23,6 @@ The main() function of this script can also be called with the
 
 from argparse import ArgumentParser
 import csv
-from multiprocessing import get_context
 import os.path
 import pandas as pd
 import sys
@@ -37,16 +36,23 @@ from gridpath.common_functions import (
     get_db_parser,
     get_required_e2e_arguments_parser,
     get_get_inputs_parser,
-    ensure_empty_string,
 )
-from gridpath.auxiliary.module_list import determine_modules, load_modules
+from gridpath.auxiliary.module_list import determine_modules, ModuleRegistry
 from gridpath.auxiliary.scenario_chars import (
     OptionalFeatures,
     SubScenarios,
     get_scenario_structure_from_db,
     SolverOptions,
     ScenarioDirectoryStructure,
+    get_iteration_directories_list,
 )
+from gridpath.auxiliary.shared_inputs import (
+    SharedInputs,
+    check_query_tracing,
+    get_detection_keys,
+    record_module_inputs,
+)
+from gridpath.auxiliary.worker_pool import create_worker_pool, get_worker_context
 
 
 def write_model_inputs(
@@ -57,6 +63,7 @@ def write_model_inputs(
     subscenarios,
     db_path,
     n_parallel_subproblems,
+    deduplicate_inputs=False,
 ):
     """
     For each module, load the inputs from the database and write out the inputs
@@ -65,13 +72,14 @@ def write_model_inputs(
     :param scenario_directory: local scenario directory
     :param scenario_structure: ScenarioStructure object with info on the
         weather/hydro iterations and subproblem/stage structure
-    :param modules_to_use: list of imported modules (Python <class 'module'>
-        objects)
+    :param modules_to_use: list of the names of the modules to use
     :param scenario_id: integer
     :param subscenarios: SubScenarios object with all subscenario info
     :param db_path: database connection
     :param n_parallel_subproblems: int; get inputs for subproblems in parallel
-
+    :param deduplicate_inputs: boolean; write the inputs that are the same
+        for all iterations, subproblems, and stages only once (see
+        *auxiliary.shared_inputs*)
 
     :return:
     """
@@ -92,6 +100,45 @@ def write_model_inputs(
         scenario_structure
     ).SUBPROBLEM_STAGE_DIRECTORIES
 
+    # Load the modules once for all subproblems and stages
+    module_registry = ModuleRegistry(modules_to_use=modules_to_use)
+
+    # The inputs for each (weather, hydro, availability) iteration,
+    # subproblem, and stage are independent of each other, so we can write
+    # them in parallel across the full cross product
+    pool_data = []
+    for (
+        weather_iteration_str,
+        hydro_iteration_str,
+        availability_iteration_str,
+    ) in get_iteration_directories_list(
+        iteration_directory_strings=iteration_directory_strings
+    ):
+        for subproblem_str in subproblem_stage_directory_strings.keys():
+            for stage_str in subproblem_stage_directory_strings[subproblem_str]:
+                pool_data.append(
+                    [
+                        scenario_directory,
+                        weather_iteration_str,
+                        hydro_iteration_str,
+                        availability_iteration_str,
+                        subproblem_str,
+                        stage_str,
+                    ]
+                )
+
+    # Write the inputs that don't vary by iteration, subproblem, or stage
+    # only once
+    shared_inputs = None
+    if deduplicate_inputs:
+        shared_inputs, pool_data = write_shared_inputs(
+            pool_data=pool_data,
+            module_registry=module_registry,
+            scenario_id=scenario_id,
+            subscenarios=subscenarios,
+            db_path=db_path,
+        )
+
     # Do a few checks on parallelization request
     if n_parallel_subproblems < 1:
         warnings.warn(
@@ -100,7 +147,7 @@ def write_model_inputs(
         n_parallel_subproblems = 1
 
     # Check number of subproblems
-    if scenario_structure.N_SUBPROBLEMS == 1:
+    if len(pool_data) == 1:
         if n_parallel_subproblems > 1:
             warnings.warn(
                 "GridPath WARNING: only a single subproblem in "
@@ -111,81 +158,103 @@ def write_model_inputs(
     # If no parallelization requested, loop through the iterations
     # and subproblems
     if n_parallel_subproblems == 1:
-        for weather_iteration_str in iteration_directory_strings.keys():
-            for hydro_iteration_str in iteration_directory_strings[
-                weather_iteration_str
-            ].keys():
-                for availability_iteration_str in iteration_directory_strings[
-                    weather_iteration_str
-                ][hydro_iteration_str]:
-                    # We may have passed "empty_string" to avoid actual empty
-                    # strings as dictionary keys; convert to actual empty
-                    # strings here to pass to the directory creation methods
-                    weather_iteration_str = ensure_empty_string(weather_iteration_str)
-                    hydro_iteration_str = ensure_empty_string(hydro_iteration_str)
-                    availability_iteration_str = ensure_empty_string(
-                        availability_iteration_str
-                    )
-
-                    for subproblem_str in subproblem_stage_directory_strings.keys():
-                        for stage_str in subproblem_stage_directory_strings[
-                            subproblem_str
-                        ]:
-                            write_inputs(
-                                scenario_directory=scenario_directory,
-                                weather_iteration_str=weather_iteration_str,
-                                hydro_iteration_str=hydro_iteration_str,
-                                availability_iteration_str=availability_iteration_str,
-                                subproblem_str=subproblem_str,
-                                stage_str=stage_str,
-                                modules_to_use=modules_to_use,
-                                scenario_id=scenario_id,
-                                subscenarios=subscenarios,
-                                db_path=db_path,
-                            )
+        for [
+            scenario_directory,
+            weather_iteration_str,
+            hydro_iteration_str,
+            availability_iteration_str,
+            subproblem_str,
+            stage_str,
+        ] in pool_data:
+            write_inputs(
+                scenario_directory=scenario_directory,
+                weather_iteration_str=weather_iteration_str,
+                hydro_iteration_str=hydro_iteration_str,
+                availability_iteration_str=availability_iteration_str,
+                subproblem_str=subproblem_str,
+                stage_str=stage_str,
+                module_registry=module_registry,
+                scenario_id=scenario_id,
+                subscenarios=subscenarios,
+                db_path=db_path,
+                shared_inputs=shared_inputs,
+            )
     else:
-        pool_data = []
-        for weather_iteration_str in iteration_directory_strings.keys():
-            for hydro_iteration_str in iteration_directory_strings[
-                weather_iteration_str
-            ].keys():
-                for availability_iteration_str in iteration_directory_strings[
-                    weather_iteration_str
-                ][hydro_iteration_str]:
-                    # We may have passed "empty_string" to avoid actual empty
-                    # strings as dictionary keys; convert to actual empty
-                    # strings here to pass to the directory creation methods
-                    weather_iteration_str = ensure_empty_string(weather_iteration_str)
-                    hydro_iteration_str = ensure_empty_string(hydro_iteration_str)
-                    availability_iteration_str = ensure_empty_string(
-                        availability_iteration_str
-                    )
-
-                    for subproblem_str in subproblem_stage_directory_strings.keys():
-                        for stage_str in subproblem_stage_directory_strings[
-                            subproblem_str
-                        ]:
-                            pool_data.append(
-                                [
-                                    scenario_directory,
-                                    weather_iteration_str,
-                                    hydro_iteration_str,
-                                    availability_iteration_str,
-                                    subproblem_str,
-                                    stage_str,
-                                    modules_to_use,
-                                    scenario_id,
-                                    subscenarios,
-                                    db_path,
-                                ]
-                            )
-
-        pool_data = tuple(pool_data)
-
-        # Pool must use spawn to work properly on Linux
-        pool = get_context("spawn").Pool(n_parallel_subproblems)
-        pool.map(get_inputs_for_subproblem_pool, pool_data)
-        pool.close()
+        # Don't launch more processes than there are subproblems/stages
+        n_parallel_subproblems = min(n_parallel_subproblems, len(pool_data))
+
+        # The workers load the modules once and are reused for all tasks
+        with create_worker_pool(
+            n_processes=n_parallel_subproblems,
+            module_registry=module_registry,
+            scenario_id=scenario_id,
+            subscenarios=subscenarios,
+            db_path=db_path,
+            shared_inputs=shared_inputs,
+        ) as pool:
+            pool.map(get_inputs_for_subproblem_pool, pool_data)
+
+    if shared_inputs is not None:
+        shared_inputs.check_shared_files()
+
+
+def write_shared_inputs(pool_data, module_registry, scenario_id, subscenarios, db_path):
+    """
+    :param pool_data: list of the [scenario directory, weather iteration,
+        hydro iteration, availability iteration, subproblem, stage] lists of
+        the problems to write inputs for
+    :param module_registry: the scenario's ModuleRegistry
+    :param scenario_id: integer
+    :param subscenarios: SubScenarios object with all subscenario info
+    :param db_path: the database path
+    :return: the SharedInputs (None if the inputs can't be deduplicated) and
+        the list of the problems whose inputs are still to be written
+
+    Write the inputs of the detection problems, recording the queries and
+    files of each module, and determine which inputs are shared by all
+    problems (see *auxiliary.shared_inputs*).
+    """
+    scenario_directory = pool_data[0][0]
+    keys = [tuple(pool_datum[1:]) for pool_datum in pool_data]
+    detection_keys = get_detection_keys(keys=keys)
+
+    conn = connect_to_database(db_path=db_path)
+    query_tracing = check_query_tracing(conn=conn)
+    conn.close()
+
+    if len(detection_keys) >= len(keys):
+        return None, pool_data
+    if not query_tracing:
+        warnings.warn(
+            "GridPath WARNING: the database queries can't be traced with this "
+            "version of SQLite, so the inputs can't be deduplicated. Writing "
+            "all inputs."
+        )
+        return None, pool_data
+
+    inputs_records = []
+    for key in detection_keys:
+        inputs_record = dict()
+        inputs_directory = write_inputs(
+            scenario_directory,
+            *key,
+            module_registry=module_registry,
+            scenario_id=scenario_id,
+            subscenarios=subscenarios,
+            db_path=db_path,
+            inputs_record=inputs_record,
+        )
+        inputs_records.append((inputs_directory, inputs_record))
+
+    shared_inputs = SharedInputs.from_inputs_records(
+        scenario_directory=scenario_directory, inputs_records=inputs_records
+    )
+
+    return shared_inputs, [
+        pool_datum
+        for pool_datum, key in zip(pool_data, keys)
+        if key not in detection_keys
+    ]
 
 
 def write_inputs(
@@ -195,12 +264,33 @@ def write_inputs(
     availability_iteration_str,
     subproblem_str,
     stage_str,
-    modules_to_use,
+    module_registry,
     scenario_id,
     subscenarios,
     db_path,
+    shared_inputs=None,
+    inputs_record=None,
 ):
-    loaded_modules = load_modules(modules_to_use=modules_to_use)
+    """
+    :param scenario_directory: local scenario directory
+    :param weather_iteration_str:
+    :param hydro_iteration_str:
+    :param availability_iteration_str:
+    :param subproblem_str:
+    :param stage_str:
+    :param module_registry: the scenario's ModuleRegistry
+    :param scenario_id: integer
+    :param subscenarios: SubScenarios object with all subscenario info
+    :param db_path: the database path
+    :param shared_inputs: the SharedInputs if deduplicating inputs; the
+        shared files are linked into the inputs directory and the modules
+        that write them are skipped
+    :param inputs_record: dictionary to record the queries and files of each
+        module in (see *auxiliary.shared_inputs*)
+    :return: the inputs directory
+
+    Write the input .tab files for an iteration, subproblem, and stage.
+    """
 
     inputs_directory = os.path.join(
         scenario_directory,
@@ -218,16 +308,26 @@ def write_inputs(
     # Delete input files that may have existed before to avoid
     # phantom inputs
     delete_prior_inputs(inputs_directory=inputs_directory)
+    if shared_inputs is not None:
+        shared_inputs.link_shared_files(inputs_directory=inputs_directory)
 
     # Write model input .tab files for each of the loaded_modules if
     # appropriate. Note that all input files are saved in the
     # input_directory, even the non-temporal inputs that are not
     # dependent on the subproblem or stage. This simplifies the file
     # structure at the expense of unnecessarily duplicating
-    # non-temporal input files such as projects.tab.
+    # non-temporal input files such as projects.tab, unless the inputs are
+    # deduplicated, in which case these are hard links to the shared files.
     conn = connect_to_database(db_path=db_path)
-    for m in loaded_modules:
-        if hasattr(m, "write_model_inputs"):
+    for module_name, m in module_registry.modules_with("write_model_inputs"):
+        if shared_inputs is not None and shared_inputs.is_shared_module(module_name):
+            continue
+        with record_module_inputs(
+            conn=conn,
+            inputs_directory=inputs_directory,
+            module_name=module_name,
+            inputs_record=inputs_record,
+        ):
             m.write_model_inputs(
                 scenario_directory=scenario_directory,
                 scenario_id=scenario_id,
@@ -242,11 +342,14 @@ def write_inputs(
 
     conn.close()
 
+    return inputs_directory
+
 
 def get_inputs_for_subproblem_pool(pool_datum):
     """
-    Helper function to easily pass to pool.map if running subproblems in
-    parallel
+    Helper function to easily pass to the worker pool if running subproblems
+    in parallel; the data shared by all subproblems are set once per worker
+    (see *auxiliary.worker_pool*)
     """
     [
         scenario_directory,
@@ -255,11 +358,8 @@ def get_inputs_for_subproblem_pool(pool_datum):
         availability_iteration_str,
         subproblem_str,
         stage_str,
-        modules_to_use,
-        scenario_id,
-        subscenarios,
-        db_path,
     ] = pool_datum
+    worker_context = get_worker_context()
 
     write_inputs(
         scenario_directory=scenario_directory,
@@ -268,10 +368,11 @@ def get_inputs_for_subproblem_pool(pool_datum):
         availability_iteration_str=availability_iteration_str,
         subproblem_str=subproblem_str,
         stage_str=stage_str,
-        modules_to_use=modules_to_use,
-        scenario_id=scenario_id,
-        subscenarios=subscenarios,
-        db_path=db_path,
+        module_registry=worker_context["module_registry"],
+        scenario_id=worker_context["scenario_id"],
+        subscenarios=worker_context["subscenarios"],
+        db_path=worker_context["db_path"],
+        shared_inputs=worker_context["shared_inputs"],
     )
 
 
@@ -444,6 +545,55 @@ def write_linked_subproblems_map(scenario_directory, conn, subscenarios):
         )
 
 
+def write_scenario_files(
+    scenario_directory,
+    scenario_id,
+    scenario_name,
+    optional_features,
+    subscenarios,
+    solver_options,
+    conn,
+):
+    """
+    :param scenario_directory:
+    :param scenario_id:
+    :param scenario_name:
+    :param optional_features:
+    :param subscenarios:
+    :param solver_options:
+    :param conn:
+    :return:
+
+    Write the scenario-level files (features, scenario description, units,
+    solver options, and linked subproblems map) to the scenario directory.
+    """
+    # Save the list of optional features to a file (will be used to determine
+    # modules without database connection)
+    write_features_csv(
+        scenario_directory=scenario_directory,
+        feature_list=optional_features.get_active_features(),
+    )
+    # Write full scenario description
+    write_scenario_description(
+        scenario_directory=scenario_directory,
+        scenario_id=scenario_id,
+        scenario_name=scenario_name,
+        optional_features=optional_features,
+        subscenarios=subscenarios,
+    )
+
+    # Write the units used for all metrics
+    write_units_csv(scenario_directory, conn)
+
+    # Write the solver options file if needed
+    write_solver_options(
+        scenario_directory=scenario_directory, solver_options=solver_options
+    )
+
+    # Write the subproblem linked timepoints map file if needed
+    write_linked_subproblems_map(scenario_directory, conn, subscenarios)
+
+
 def main(args=None):
     """
 
@@ -507,31 +657,20 @@ def main(args=None):
         subscenarios=subscenarios,
         db_path=db_path,
         n_parallel_subproblems=int(parsed_arguments.n_parallel_get_inputs),
+        deduplicate_inputs=parsed_arguments.deduplicate_inputs,
     )
 
-    # Save the list of optional features to a file (will be used to determine
-    # modules without database connection)
-    write_features_csv(scenario_directory=scenario_directory, feature_list=feature_list)
-    # Write full scenario description
-    write_scenario_description(
+    # Write the scenario-level files
+    write_scenario_files(
         scenario_directory=scenario_directory,
         scenario_id=scenario_id,
         scenario_name=scenario_name,
         optional_features=optional_features,
         subscenarios=subscenarios,
+        solver_options=solver_options,
+        conn=conn,
     )
 
-    # Write the units used for all metrics
-    write_units_csv(scenario_directory, conn)
-
-    # Write the solver options file if needed
-    write_solver_options(
-        scenario_directory=scenario_directory, solver_options=solver_options
-    )
-
-    # Write the subproblem linked timepoints map file if needed
-    write_linked_subproblems_map(scenario_directory, conn, subscenarios)
-
     # Close the database connection
     conn.close()
 
@@ -25,24 +25,41 @@ from argparse import ArgumentParser
 import os.path
 import pandas as pd
 import sys
+import warnings
 
-from gridpath.auxiliary.db_interface import get_scenario_id_and_name
+from gridpath.auxiliary.db_interface import get_scenario_id_and_name, import_csv
 from gridpath.auxiliary.import_export_rules import import_export_rules
 from gridpath.common_functions import (
     determine_scenario_directory,
     get_db_parser,
     get_required_e2e_arguments_parser,
     get_import_results_parser,
-    ensure_empty_string,
 )
-from db.common_functions import connect_to_database, spin_on_database_lock
-from db.utilities.scenario import delete_scenario_results
-from gridpath.auxiliary.module_list import determine_modules, load_modules
+from db.common_functions import (
+    connect_to_database,
+    db_transaction,
+    set_wal_journal_mode,
+    spin_on_database_lock,
+)
+from db.utilities.scenario import (
+    delete_scenario_results,
+    delete_subproblem_stage_results,
+    get_subproblem_stage_results_tables,
+)
+from gridpath.auxiliary.db_interface import directories_to_db_values
+from gridpath.auxiliary.module_list import determine_modules, ModuleRegistry
+from gridpath.auxiliary.profiler import PROFILING_FILENAME
+from gridpath.auxiliary.worker_pool import create_worker_pool, get_worker_context
 from gridpath.auxiliary.scenario_chars import (
     get_scenario_structure_from_db,
     ScenarioDirectoryStructure,
+    get_iteration_directories_list,
 )
 
+# Seconds a process importing results in parallel waits for the other
+# processes' database writes before raising an error
+PARALLEL_IMPORT_DB_TIMEOUT = 600
+
 
 def _import_rule(results_directory, quiet):
     """
@@ -58,21 +75,34 @@ def _import_rule(results_directory, quiet):
 
 def import_scenario_results_into_database(
     import_rule,
-    loaded_modules,
+    module_registry,
     scenario_id,
     scenario_structure,
     db,
     scenario_directory,
     quiet,
+    db_path=None,
+    n_parallel_import=1,
+    subproblems=None,
 ):
     """
     :param import_rule:
-    :param loaded_modules:
+    :param module_registry: the scenario's ModuleRegistry
     :param scenario_id:
     :param scenario_structure:
     :param db:
     :param scenario_directory:
     :param quiet: boolean
+    :param db_path: the path to the database (needed to import in parallel)
+    :param n_parallel_import: int; import the results for this many
+        subproblems in parallel
+    :param subproblems: list of the subproblem IDs to import the results
+        for (in all iterations); all subproblems are imported if None
+
+    The results of each (weather, hydro, availability) iteration and
+    subproblem are imported independently, so they can be imported in
+    parallel across the full cross product, each process with its own
+    database connection. The stages of a subproblem are imported in order.
 
     :return:
     """
@@ -84,149 +114,318 @@ def import_scenario_results_into_database(
         scenario_structure
     ).SUBPROBLEM_STAGE_DIRECTORIES
 
-    # Hydro years first
-    for weather_iteration_str in iteration_directory_strings.keys():
-        for hydro_iteration_str in iteration_directory_strings[
-            weather_iteration_str
-        ].keys():
-            for availability_iteration_str in iteration_directory_strings[
-                weather_iteration_str
-            ][hydro_iteration_str]:
-                # We may have passed "empty_string" to avoid actual empty
-                # strings as dictionary keys; convert to actual empty
-                # strings here to pass to the directory creation methods
-                weather_iteration_str = ensure_empty_string(weather_iteration_str)
-                hydro_iteration_str = ensure_empty_string(hydro_iteration_str)
-                availability_iteration_str = ensure_empty_string(
-                    availability_iteration_str
+    # Every (weather, hydro, availability) iteration and subproblem, in
+    # directory order
+    subproblems_to_import = [
+        (
+            weather_iteration_str,
+            hydro_iteration_str,
+            availability_iteration_str,
+            subproblem_str,
+        )
+        for (
+            weather_iteration_str,
+            hydro_iteration_str,
+            availability_iteration_str,
+        ) in get_iteration_directories_list(
+            iteration_directory_strings=iteration_directory_strings
+        )
+        for subproblem_str in subproblem_stage_directory_strings.keys()
+        if subproblems is None
+        or (1 if subproblem_str == "" else int(subproblem_str)) in subproblems
+    ]
+
+    if n_parallel_import < 1:
+        warnings.warn(
+            "n_parallel_import can't be 0. Importing without parallelization."
+        )
+        n_parallel_import = 1
+    if n_parallel_import > 1 and db_path is None:
+        warnings.warn(
+            "GridPath WARNING: the database path is needed to import results "
+            "in parallel. Importing sequentially."
+        )
+        n_parallel_import = 1
+
+    # When importing all subproblems, the scenario's results have already
+    # been deleted; otherwise, delete each imported subproblem/stage's prior
+    # results (the list of tables to delete from is determined only once)
+    if subproblems is None:
+        results_tables_to_clear = None
+    else:
+        results_tables_to_clear = get_subproblem_stage_results_tables(conn=db)
+
+    if n_parallel_import == 1 or len(subproblems_to_import) == 1:
+        for (
+            weather_iteration_str,
+            hydro_iteration_str,
+            availability_iteration_str,
+            subproblem_str,
+        ) in subproblems_to_import:
+            import_subproblem_results_into_database(
+                import_rule=import_rule,
+                module_registry=module_registry,
+                scenario_id=scenario_id,
+                db=db,
+                scenario_directory=scenario_directory,
+                weather_iteration_str=weather_iteration_str,
+                hydro_iteration_str=hydro_iteration_str,
+                availability_iteration_str=availability_iteration_str,
+                subproblem_str=subproblem_str,
+                stage_strs=subproblem_stage_directory_strings[subproblem_str],
+                quiet=quiet,
+                results_tables_to_clear=results_tables_to_clear,
+            )
+    else:
+        pool_data = [
+            [
+                weather_iteration_str,
+                hydro_iteration_str,
+                availability_iteration_str,
+                subproblem_str,
+                subproblem_stage_directory_strings[subproblem_str],
+            ]
+            for (
+                weather_iteration_str,
+                hydro_iteration_str,
+                availability_iteration_str,
+                subproblem_str,
+            ) in subproblems_to_import
+        ]
+
+        # The workers load the modules once and are reused for all tasks
+        with create_worker_pool(
+            n_processes=min(n_parallel_import, len(subproblems_to_import)),
+            import_rule=import_rule,
+            module_registry=module_registry,
+            scenario_id=scenario_id,
+            db_path=db_path,
+            scenario_directory=scenario_directory,
+            quiet=quiet,
+            results_tables_to_clear=results_tables_to_clear,
+        ) as pool:
+            pool.map(import_subproblem_results_pool, pool_data)
+
+
+def import_subproblem_results_pool(pool_datum):
+    """
+    Helper function to easily pass to the worker pool if importing
+    subproblems in parallel; each process connects to the database
+    separately and waits for the other processes' writes to finish. The data
+    shared by all subproblems are set once per worker (see
+    *auxiliary.worker_pool*).
+    """
+    [
+        weather_iteration_str,
+        hydro_iteration_str,
+        availability_iteration_str,
+        subproblem_str,
+        stage_strs,
+    ] = pool_datum
+    worker_context = get_worker_context()
+
+    conn = connect_to_database(
+        db_path=worker_context["db_path"], timeout=PARALLEL_IMPORT_DB_TIMEOUT
+    )
+    import_subproblem_results_into_database(
+        import_rule=worker_context["import_rule"],
+        module_registry=worker_context["module_registry"],
+        scenario_id=worker_context["scenario_id"],
+        db=conn,
+        scenario_directory=worker_context["scenario_directory"],
+        weather_iteration_str=weather_iteration_str,
+        hydro_iteration_str=hydro_iteration_str,
+        availability_iteration_str=availability_iteration_str,
+        subproblem_str=subproblem_str,
+        stage_strs=stage_strs,
+        quiet=worker_context["quiet"],
+        results_tables_to_clear=worker_context["results_tables_to_clear"],
+    )
+    conn.close()
+
+
+def import_subproblem_results_into_database(
+    import_rule,
+    module_registry,
+    scenario_id,
+    db,
+    scenario_directory,
+    weather_iteration_str,
+    hydro_iteration_str,
+    availability_iteration_str,
+    subproblem_str,
+    stage_strs,
+    quiet,
+    results_tables_to_clear=None,
+):
+    """
+    :param import_rule:
+    :param module_registry: the scenario's ModuleRegistry
+    :param scenario_id:
+    :param db: the database connection
+    :param scenario_directory:
+    :param weather_iteration_str:
+    :param hydro_iteration_str:
+    :param availability_iteration_str:
+    :param subproblem_str:
+    :param stage_strs: list of the subproblem's stage directory strings
+    :param quiet: boolean
+    :param results_tables_to_clear: list of the results tables to delete
+        the stage's prior results from; nothing is deleted if None (e.g.
+        if the scenario's results have already been deleted)
+
+    Import the results of each stage of a subproblem in an iteration in a
+    single database transaction. When re-importing, the stage's prior
+    results are deleted first, so a subproblem can be re-imported without
+    touching the results of the scenario's other subproblems; its
+    results_scenario row is re-inserted and its results are then
+    re-processed by the next process_results run.
+    """
+    # All results of the subproblem are written in a single transaction, so
+    # the database is locked (and synced to disk) once per subproblem rather
+    # than once per statement
+    with db_transaction(db):
+        for stage_str in stage_strs:
+            # Use the same keys as the other results tables
+            (
+                weather_iteration,
+                hydro_iteration,
+                availability_iteration,
+                subproblem,
+                stage,
+            ) = directories_to_db_values(
+                weather_iteration_dir=weather_iteration_str,
+                hydro_iteration_dir=hydro_iteration_str,
+                availability_iteration_dir=availability_iteration_str,
+                subproblem=subproblem_str,
+                stage=stage_str,
+            )
+            results_directory = os.path.join(
+                scenario_directory,
+                weather_iteration_str,
+                hydro_iteration_str,
+                availability_iteration_str,
+                subproblem_str,
+                stage_str,
+                "results",
+            )
+            if not quiet:
+                if weather_iteration_str != "":
+                    print(f"--- weather iteration " f"{weather_iteration}")
+                if hydro_iteration_str != "":
+                    print(f"--- hydro iteration " f"{hydro_iteration}")
+                if availability_iteration_str != "":
+                    print(f"--- availability iteration " f"{availability_iteration}")
+                if subproblem_str != "":
+                    print(f"--- subproblem {subproblem_str}")
+                if stage_str != "":
+                    print(f"--- stage {stage_str}")
+
+            if results_tables_to_clear is not None:
+                delete_subproblem_stage_results(
+                    conn=db,
+                    results_tables=results_tables_to_clear,
+                    scenario_id=scenario_id,
+                    weather_iteration=weather_iteration,
+                    hydro_iteration=hydro_iteration,
+                    availability_iteration=availability_iteration,
+                    subproblem=subproblem,
+                    stage=stage,
                 )
 
-                weather_iteration = (
-                    0
-                    if weather_iteration_str == ""
-                    else int(weather_iteration_str.replace("weather_iteration_", ""))
+            # Import termination condition data
+            c = db.cursor()
+            with open(
+                os.path.join(results_directory, "termination_condition.txt"),
+                "r",
+            ) as f:
+                termination_condition = f.read()
+
+            termination_condition_sql = """
+                INSERT INTO results_scenario
+                (scenario_id, weather_iteration, hydro_iteration, availability_iteration, subproblem_id, 
+                stage_id, solver_termination_condition)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ;"""
+
+            termination_condition_data = (
+                scenario_id,
+                weather_iteration,
+                hydro_iteration,
+                availability_iteration,
+                subproblem,
+                stage,
+                termination_condition,
+            )
+            spin_on_database_lock(
+                conn=db,
+                cursor=c,
+                sql=termination_condition_sql,
+                data=termination_condition_data,
+                many=False,
+            )
+
+            # Import the profiling report if the run was profiled
+            if os.path.exists(os.path.join(results_directory, PROFILING_FILENAME)):
+                import_csv(
+                    conn=db,
+                    cursor=c,
+                    scenario_id=scenario_id,
+                    weather_iteration=weather_iteration_str,
+                    hydro_iteration=hydro_iteration_str,
+                    availability_iteration=availability_iteration_str,
+                    subproblem=subproblem_str,
+                    stage=stage_str,
+                    quiet=quiet,
+                    results_directory=results_directory,
+                    which_results="scenario_profiling",
                 )
-                hydro_iteration = (
-                    0
-                    if hydro_iteration_str == ""
-                    else int(hydro_iteration_str.replace("hydro_iteration_", ""))
+
+            with open(
+                os.path.join(results_directory, "solver_status.txt"), "r"
+            ) as status_f:
+                solver_status = status_f.read()
+
+            # Only import other results if solver status was "ok"
+            # When the problem is infeasible, the solver status is "warning"
+            # If there's no solution, variables remain uninitialized,
+            # throwing an error at some point during results-export,
+            # so we don't attempt to import missing results into the database
+            if solver_status == "ok":
+                import_objective_function_value(
+                    db=db,
+                    scenario_id=scenario_id,
+                    weather_iteration=weather_iteration,
+                    hydro_iteration=hydro_iteration,
+                    availability_iteration=availability_iteration,
+                    subproblem=subproblem,
+                    stage=stage,
+                    results_directory=results_directory,
                 )
-                availability_iteration = (
-                    0
-                    if availability_iteration_str == ""
-                    else int(
-                        availability_iteration_str.replace(
-                            "availability_iteration_", ""
-                        )
-                    )
+                import_subproblem_stage_results_into_database(
+                    import_rule=import_rule,
+                    db=db,
+                    scenario_id=scenario_id,
+                    weather_iteration=weather_iteration_str,
+                    hydro_iteration=hydro_iteration_str,
+                    availability_iteration=availability_iteration_str,
+                    subproblem=subproblem_str,
+                    stage=stage_str,
+                    results_directory=results_directory,
+                    module_registry=module_registry,
+                    quiet=quiet,
                 )
-                for subproblem_str in subproblem_stage_directory_strings.keys():
-                    subproblem = 0 if subproblem_str == "" else int(subproblem_str)
-                    for stage_str in subproblem_stage_directory_strings[subproblem_str]:
-                        stage = 0 if stage_str == "" else int(stage_str)
-                        results_directory = os.path.join(
-                            scenario_directory,
-                            weather_iteration_str,
-                            hydro_iteration_str,
-                            availability_iteration_str,
-                            subproblem_str,
-                            stage_str,
-                            "results",
-                        )
-                        if not quiet:
-                            if weather_iteration_str != "":
-                                print(f"--- weather iteration " f"{weather_iteration}")
-                            if hydro_iteration_str != "":
-                                print(f"--- hydro iteration " f"{hydro_iteration}")
-                            if availability_iteration_str != "":
-                                print(
-                                    f"--- availability iteration "
-                                    f"{availability_iteration}"
-                                )
-                            if subproblem_str != "":
-                                print(f"--- subproblem {subproblem_str}")
-                            if stage_str != "":
-                                print(f"--- stage {stage_str}")
-
-                        # Import termination condition data
-                        c = db.cursor()
-                        with open(
-                            os.path.join(
-                                results_directory, "termination_condition.txt"
-                            ),
-                            "r",
-                        ) as f:
-                            termination_condition = f.read()
-
-                        termination_condition_sql = """
-                            INSERT INTO results_scenario
-                            (scenario_id, weather_iteration, hydro_iteration, availability_iteration, subproblem_id, 
-                            stage_id, solver_termination_condition)
-                            VALUES (?, ?, ?, ?, ?, ?, ?)
-                        ;"""
-
-                        termination_condition_data = (
-                            scenario_id,
-                            weather_iteration,
-                            hydro_iteration,
-                            availability_iteration,
-                            subproblem,
-                            stage,
-                            termination_condition,
-                        )
-                        spin_on_database_lock(
-                            conn=db,
-                            cursor=c,
-                            sql=termination_condition_sql,
-                            data=termination_condition_data,
-                            many=False,
-                        )
-
-                        with open(
-                            os.path.join(results_directory, "solver_status.txt"), "r"
-                        ) as status_f:
-                            solver_status = status_f.read()
-
-                        # Only import other results if solver status was "ok"
-                        # When the problem is infeasible, the solver status is "warning"
-                        # If there's no solution, variables remain uninitialized,
-                        # throwing an error at some point during results-export,
-                        # so we don't attempt to import missing results into the database
-                        if solver_status == "ok":
-                            import_objective_function_value(
-                                db=db,
-                                scenario_id=scenario_id,
-                                weather_iteration=weather_iteration_str,
-                                hydro_iteration=hydro_iteration_str,
-                                availability_iteration=availability_iteration,
-                                subproblem=subproblem_str,
-                                stage=stage_str,
-                                results_directory=results_directory,
-                            )
-                            import_subproblem_stage_results_into_database(
-                                import_rule=import_rule,
-                                db=db,
-                                scenario_id=scenario_id,
-                                weather_iteration=weather_iteration_str,
-                                hydro_iteration=hydro_iteration_str,
-                                availability_iteration=availability_iteration_str,
-                                subproblem=subproblem_str,
-                                stage=stage_str,
-                                results_directory=results_directory,
-                                loaded_modules=loaded_modules,
-                                quiet=quiet,
-                            )
-                        else:
-                            if not quiet:
-                                print(
-                                    f"""
-                                Solver status for weather iteration {weather_iteration_str}, 
-                                hydro_iteration {hydro_iteration_str}, subproblem {subproblem_str}, 
-                                stage {stage_str} was '{solver_status}', 
-                                not 'ok', so there are no results to import. 
-                                Termination condition was '{termination_condition}'.
-                                """
-                                )
+            else:
+                if not quiet:
+                    print(
+                        f"""
+                    Solver status for weather iteration {weather_iteration_str}, 
+                    hydro_iteration {hydro_iteration_str}, subproblem {subproblem_str}, 
+                    stage {stage_str} was '{solver_status}', 
+                    not 'ok', so there are no results to import. 
+                    Termination condition was '{termination_condition}'.
+                    """
+                    )
 
 
 def import_objective_function_value(
@@ -240,8 +439,8 @@ def import_objective_function_value(
     results_directory,
 ):
     """
-    Import the objective function value for the subproblem/stage. Delete
-    prior results first.
+    Import the objective function value for the subproblem/stage into its
+    results_scenario row.
     """
 
     c = db.cursor()
@@ -283,7 +482,7 @@ def import_subproblem_stage_results_into_database(
     subproblem,
     stage,
     results_directory,
-    loaded_modules,
+    module_registry,
     quiet,
 ):
     """
@@ -299,20 +498,19 @@ def import_subproblem_stage_results_into_database(
 
     if import_results:
         c = db.cursor()
-        for m in loaded_modules:
-            if hasattr(m, "import_results_into_database"):
-                m.import_results_into_database(
-                    scenario_id=scenario_id,
-                    weather_iteration=weather_iteration,
-                    hydro_iteration=hydro_iteration,
-                    availability_iteration=availability_iteration,
-                    subproblem=subproblem,
-                    stage=stage,
-                    c=c,
-                    db=db,
-                    results_directory=results_directory,
-                    quiet=quiet,
-                )
+        for _, m in module_registry.modules_with("import_results_into_database"):
+            m.import_results_into_database(
+                scenario_id=scenario_id,
+                weather_iteration=weather_iteration,
+                hydro_iteration=hydro_iteration,
+                availability_iteration=availability_iteration,
+                subproblem=subproblem,
+                stage=stage,
+                c=c,
+                db=db,
+                results_directory=results_directory,
+                quiet=quiet,
+            )
     else:
         if not quiet:
             print("Results-import skipped based on import rule.")
@@ -336,6 +534,14 @@ def parse_arguments(args):
             get_import_results_parser(),
         ],
     )
+    parser.add_argument(
+        "--subproblems",
+        nargs="+",
+        type=int,
+        help="Import the results of these subproblems only (in all "
+        "iterations and stages). The results of the scenario's other "
+        "subproblems are kept and are not re-processed.",
+    )
     parsed_arguments = parser.parse_known_args(args=args)[0]
 
     return parsed_arguments
@@ -359,6 +565,9 @@ def main(args=None):
     import_rule = parsed_arguments.results_import_rule
 
     conn = connect_to_database(db_path=db_path)
+    # Use write-ahead logging, so that the (possibly parallel) subproblem
+    # imports don't block readers of the database
+    set_wal_journal_mode(conn=conn)
     c = conn.cursor()
 
     if not parsed_arguments.quiet:
@@ -394,21 +603,28 @@ def main(args=None):
     # Each module also makes sure results are deleted, but this step ensures
     # that if a scenario_id was run with different modules before, we also
     # delete previously imported "phantom" results
-    delete_scenario_results(conn=conn, scenario_id=scenario_id)
+    # When re-importing only some subproblems, only their results are
+    # deleted (when importing them)
+    if parsed_arguments.subproblems is None:
+        delete_scenario_results(conn=conn, scenario_id=scenario_id)
 
     # Go through modules
-    modules_to_use = determine_modules(scenario_directory=scenario_directory)
-    loaded_modules = load_modules(modules_to_use)
+    module_registry = ModuleRegistry(
+        modules_to_use=determine_modules(scenario_directory=scenario_directory)
+    )
 
     # Import appropriate results into database
     import_scenario_results_into_database(
         import_rule=import_rule,
-        loaded_modules=loaded_modules,
+        module_registry=module_registry,
         scenario_id=scenario_id,
         scenario_structure=scenario_structure,
         db=conn,
         scenario_directory=scenario_directory,
         quiet=quiet,
+        db_path=db_path,
+        n_parallel_import=parsed_arguments.n_parallel_import,
+        subproblems=parsed_arguments.subproblems,
     )
 
     # Close the database connection
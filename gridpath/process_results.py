@@ -17,6 +17,11 @@ This script iterates over all modules required for a GridPath scenario and
 calls their *process_results()* method, which makes updates to database
 tables.
 
+Results are processed incrementally: only the (iteration, subproblem, stage)
+keys imported since results were last processed are re-aggregated (see
+*setup_process_results_keys()*), unless *--reprocess_all* is specified. All
+updates are written in a single transaction.
+
 The main() function of this script can also be called with the
 *gridpath_process_results* command when GridPath is installed.
 """
@@ -25,13 +30,18 @@ The main() function of this script can also be called with the
 from argparse import ArgumentParser
 import sys
 
-from db.common_functions import connect_to_database
+from db.common_functions import connect_to_database, db_transaction
 from gridpath.common_functions import (
     determine_scenario_directory,
     get_db_parser,
     get_required_e2e_arguments_parser,
+    get_process_results_parser,
+)
+from gridpath.auxiliary.db_interface import (
+    get_scenario_id_and_name,
+    mark_results_processed,
+    setup_process_results_keys,
 )
-from gridpath.auxiliary.db_interface import get_scenario_id_and_name
 from gridpath.auxiliary.module_list import determine_modules, load_modules
 from gridpath.auxiliary.scenario_chars import SubScenarios
 
@@ -60,7 +70,12 @@ def parse_arguments(args):
     Parse the known arguments.
     """
     parser = ArgumentParser(
-        add_help=True, parents=[get_db_parser(), get_required_e2e_arguments_parser()]
+        add_help=True,
+        parents=[
+            get_db_parser(),
+            get_required_e2e_arguments_parser(),
+            get_process_results_parser(),
+        ],
     )
     parsed_arguments = parser.parse_known_args(args=args)[0]
 
@@ -107,15 +122,28 @@ def main(args=None):
     # Subscenarios
     subscenarios = SubScenarios(conn=conn, scenario_id=scenario_id)
 
-    process_results(
-        loaded_modules=loaded_modules,
-        db=conn,
-        cursor=c,
+    # Determine the subproblems/stages to process
+    n_keys = setup_process_results_keys(
+        conn=conn,
         scenario_id=scenario_id,
-        subscenarios=subscenarios,
-        quiet=parsed_arguments.quiet,
+        reprocess_all=parsed_arguments.reprocess_all,
     )
 
+    if n_keys == 0:
+        if not parsed_arguments.quiet:
+            print("No new results to process.")
+    else:
+        with db_transaction(conn):
+            process_results(
+                loaded_modules=loaded_modules,
+                db=conn,
+                cursor=c,
+                scenario_id=scenario_id,
+                subscenarios=subscenarios,
+                quiet=parsed_arguments.quiet,
+            )
+            mark_results_processed(conn=conn, scenario_id=scenario_id)
+
     # Close the database connection
     conn.close()
 
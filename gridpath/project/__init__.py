@@ -21,9 +21,10 @@ and demand-side infrastructure 'projects' in the optimization problem.
 import csv
 import os.path
 import pandas as pd
-from pyomo.environ import Set, Param, Any, value, NonNegativeReals
+from pyomo.environ import Set, Param, Any, NonNegativeReals
 
 from gridpath.auxiliary.auxiliary import cursor_to_df
+from gridpath.auxiliary.columnar_results import get_component_values
 from gridpath.auxiliary.db_interface import directories_to_db_values
 from gridpath.auxiliary.validations import (
     write_validation_to_database,
@@ -340,44 +341,53 @@ def export_results(
     setattr(d, PROJECT_PERIOD_DF, project_period_df)
 
     # Project-timepoint DF
+    # The project, timepoint, and project-period characteristics are looked
+    # up once each and the dataframe is built from columns
+    projects = [prj for (prj, tmp) in m.PRJ_OPR_TMPS]
+    timepoints = [tmp for (prj, tmp) in m.PRJ_OPR_TMPS]
+
+    def project_column(param):
+        param_values = {prj: param[prj] for prj in m.PROJECTS}
+        return [param_values[prj] for prj in projects]
+
+    def timepoint_column(param):
+        param_values = {tmp: param[tmp] for tmp in m.TMPS}
+        return [param_values[tmp] for tmp in timepoints]
+
+    periods = timepoint_column(m.period)
+    balancing_types = project_column(m.balancing_type_project)
+    horizons = {
+        (tmp, bt): m.horizon[tmp, bt]
+        for (tmp, bt) in set(zip(timepoints, balancing_types))
+    }
+    capacity_mw = dict(
+        zip(m.Capacity_MW.keys(), get_component_values(m.Capacity_MW).tolist())
+    )
+
     project_timepoint_df = pd.DataFrame(
-        columns=[
-            "project",
-            "timepoint",
-            "period",
-            "horizon",
-            "capacity_type",
-            "availability_type",
-            "operational_type",
-            "balancing_type",
-            "timepoint_weight",
-            "number_of_hours_in_timepoint",
-            "load_zone",
-            "technology",
-            "load_modifier_flag",
-            "distribution_loss_adjustment_factor",
-            "capacity_mw",
-        ],
-        data=[
-            [
-                prj,
-                tmp,
-                m.period[tmp],
-                m.horizon[tmp, m.balancing_type_project[prj]],
-                m.capacity_type[prj],
-                m.availability_type[prj],
-                m.operational_type[prj],
-                m.balancing_type_project[prj],
-                m.tmp_weight[tmp],
-                m.hrs_in_tmp[tmp],
-                m.load_zone[prj],
-                m.technology[prj],
-                m.load_modifier_flag[prj],
-                m.distribution_loss_adjustment_factor[prj],
-                value(m.Capacity_MW[prj, m.period[tmp]]),
-            ]
-            for (prj, tmp) in m.PRJ_OPR_TMPS
-        ],
+        {
+            "project": projects,
+            "timepoint": timepoints,
+            "period": periods,
+            "horizon": [
+                horizons[tmp, bt] for (tmp, bt) in zip(timepoints, balancing_types)
+            ],
+            "capacity_type": project_column(m.capacity_type),
+            "availability_type": project_column(m.availability_type),
+            "operational_type": project_column(m.operational_type),
+            "balancing_type": balancing_types,
+            "timepoint_weight": timepoint_column(m.tmp_weight),
+            "number_of_hours_in_timepoint": timepoint_column(m.hrs_in_tmp),
+            "load_zone": project_column(m.load_zone),
+            "technology": project_column(m.technology),
+            "load_modifier_flag": project_column(m.load_modifier_flag),
+            "distribution_loss_adjustment_factor": project_column(
+                m.distribution_loss_adjustment_factor
+            ),
+            "capacity_mw": [
+                capacity_mw[prj, prd] for (prj, prd) in zip(projects, periods)
+            ],
+        }
     ).set_index(["project", "timepoint"])
 
     project_timepoint_df.sort_index(inplace=True)
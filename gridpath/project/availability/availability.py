@@ -12,13 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from pyomo.environ import Expression, value
+from pyomo.environ import Expression
 
 from gridpath.auxiliary.auxiliary import (
     get_required_subtype_modules,
     load_subtype_modules,
 )
-from gridpath.common_functions import create_results_df
+from gridpath.auxiliary.columnar_results import (
+    get_component_values,
+    get_results_df,
+    update_results_df,
+)
 from gridpath.project import PROJECT_TIMEPOINT_DF
 
 
@@ -227,26 +231,18 @@ def export_results(
     Export availability results.
     """
 
-    results_columns = [
-        "availability_derate",
-    ]
-    data = [
-        [
-            prj,
-            tmp,
-            value(m.Availability_Derate[prj, tmp]),
-        ]
-        for (prj, tmp) in m.PRJ_OPR_TMPS
-    ]
-    results_df = create_results_df(
+    index = list(m.PRJ_OPR_TMPS)
+    results_df = get_results_df(
         index_columns=["project", "timepoint"],
-        results_columns=results_columns,
-        data=data,
+        index=index,
+        results_columns={
+            "availability_derate": get_component_values(
+                m.Availability_Derate, index=index
+            ),
+        },
     )
 
-    for c in results_columns:
-        getattr(d, PROJECT_TIMEPOINT_DF)[c] = None
-    getattr(d, PROJECT_TIMEPOINT_DF).update(results_df)
+    update_results_df(df=getattr(d, PROJECT_TIMEPOINT_DF), results_df=results_df)
 
     # Module-specific availability results
     required_availability_modules = get_required_subtype_modules(
@@ -275,10 +271,9 @@ def export_results(
                 m,
                 d,
             )
-            for c in op_m_results_columns:
-                getattr(d, PROJECT_TIMEPOINT_DF)[c] = None
-
-            getattr(d, PROJECT_TIMEPOINT_DF).update(op_m_results_df)
+            update_results_df(
+                df=getattr(d, PROJECT_TIMEPOINT_DF), results_df=op_m_results_df
+            )
 
 
 def validate_inputs(
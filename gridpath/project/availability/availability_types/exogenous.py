@@ -27,6 +27,7 @@ import os.path
 from pyomo.environ import Param, Set, NonNegativeReals
 
 from gridpath.auxiliary.auxiliary import cursor_to_df, subset_init_by_set_membership
+from gridpath.auxiliary.columnar_inputs import load_tab_file_params
 from gridpath.auxiliary.db_interface import directories_to_db_values
 from gridpath.auxiliary.validations import (
     write_validation_to_database,
@@ -287,12 +288,13 @@ def load_model_data(
     )
 
     if os.path.exists(availability_independent_file):
-        data_portal.load(
+        load_tab_file_params(
+            data_portal=data_portal,
             filename=availability_independent_file,
-            param=(
-                m.avl_exog_cap_derate_independent,
-                m.avl_exog_hyb_stor_cap_derate_independent,
-            ),
+            param_names=[
+                "avl_exog_cap_derate_independent",
+                "avl_exog_hyb_stor_cap_derate_independent",
+            ],
         )
 
     availability_weather_file = os.path.join(
@@ -301,9 +303,10 @@ def load_model_data(
     )
 
     if os.path.exists(availability_weather_file):
-        data_portal.load(
+        load_tab_file_params(
+            data_portal=data_portal,
             filename=availability_weather_file,
-            param=m.avl_exog_cap_derate_weather,
+            param_names=["avl_exog_cap_derate_weather"],
         )
 
     # Balancing type - horizon inputs
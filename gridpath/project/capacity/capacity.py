@@ -22,14 +22,15 @@ reliability constraints, etc.
 """
 
 import os.path
-import pandas as pd
 from pyomo.environ import Set, Expression, value
 
 from gridpath.auxiliary.auxiliary import (
     get_required_subtype_modules,
+    get_set_index,
     join_sets,
 )
 from gridpath.auxiliary.dynamic_components import capacity_type_operational_period_sets
+from gridpath.auxiliary.results_io import read_results_df
 from gridpath.common_functions import create_results_df
 from gridpath.project.capacity.common_functions import (
     load_project_capacity_type_modules,
@@ -87,6 +88,13 @@ def add_model_components(
     | Indexed set that describes all projects that could be operational in    |
     | each timepoint.                                                         |
     +-------------------------------------------------------------------------+
+    | | :code:`OPR_PRJS_IN_LZ_TMP`                                            |
+    | | *Defined over*: :code:`LOAD_ZONES x TMPS`                             |
+    |                                                                         |
+    | Indexed set that describes all projects in each load zone that could be |
+    | operational in each timepoint. Used to aggregate project-level          |
+    | quantities by load zone (e.g. in the load balance).                     |
+    +-------------------------------------------------------------------------+
 
     |
 
@@ -162,12 +170,7 @@ def add_model_components(
         ),
     )  # assumes capacity types model components are already added!
 
-    m.OPR_PRDS_BY_PRJ = Set(
-        m.PROJECTS,
-        initialize=lambda mod, project: operational_periods_by_project(
-            prj=project, project_operational_periods=mod.PRJ_OPR_PRDS
-        ),
-    )
+    m.OPR_PRDS_BY_PRJ = Set(m.PROJECTS, initialize=op_prds_by_prj)
 
     m.PRJ_OPR_TMPS = Set(
         dimen=2,
@@ -181,6 +184,8 @@ def add_model_components(
 
     m.OPR_PRJS_IN_TMP = Set(m.TMPS, initialize=op_gens_by_tmp)
 
+    m.OPR_PRJS_IN_LZ_TMP = Set(m.LOAD_ZONES, m.TMPS, initialize=op_gens_by_lz_tmp)
+
     # Expressions
     ###########################################################################
 
@@ -281,18 +286,52 @@ def add_model_components(
 ###############################################################################
 
 
-# TODO: the creation of the OPR_PRJS_IN_TMPS is by far
-#  the most time-consuming step in instantiating the problem; is there
-#  any way to speed it up? It is perhaps inefficient to iterate over all
-#  (g, t) for every timepoint, but how do we get around having to do that?
-#  Also, this is a more general problem with all the indexed sets,
-#  but the larger timepoints-based sets are more of a problem
 def op_gens_by_tmp(mod, tmp):
     """
-    Figure out which generators are operational in each timepoins.
+    Figure out which generators are operational in each timepoint. We look
+    up the timepoint in an index of PRJ_OPR_TMPS built in a single pass
+    rather than scanning all project-timepoints for every timepoint.
+    """
+    return get_set_index(
+        mod,
+        index_name="OPR_PRJS_IN_TMP",
+        set_name="PRJ_OPR_TMPS",
+        key_rule=lambda m, prj_tmp: prj_tmp[1],
+        value_rule=lambda m, prj_tmp: prj_tmp[0],
+    ).get(tmp, [])
+
+
+def op_gens_by_lz_tmp(mod, lz, tmp):
+    """
+    Figure out which generators in each load zone are operational in each
+    timepoint, using an index of PRJ_OPR_TMPS by load zone and timepoint
+    built in a single pass.
     """
-    gens = list(g for (g, t) in mod.PRJ_OPR_TMPS if t == tmp)
-    return gens
+    return get_set_index(
+        mod,
+        index_name="OPR_PRJS_IN_LZ_TMP",
+        set_name="PRJ_OPR_TMPS",
+        key_rule=lambda m, prj_tmp: (m.load_zone[prj_tmp[0]], prj_tmp[1]),
+        value_rule=lambda m, prj_tmp: prj_tmp[0],
+    ).get((lz, tmp), [])
+
+
+def op_prds_by_prj(mod, prj):
+    """
+    Figure out which periods each project is operational in, using an index
+    of PRJ_OPR_PRDS built in a single pass.
+    """
+    return sorted(
+        set(
+            get_set_index(
+                mod,
+                index_name="OPR_PRDS_BY_PRJ",
+                set_name="PRJ_OPR_PRDS",
+                key_rule=lambda m, prj_prd: prj_prd[0],
+                value_rule=lambda m, prj_prd: prj_prd[1],
+            ).get(prj, [])
+        )
+    )
 
 
 def operational_periods_by_project(prj, project_operational_periods):
@@ -479,9 +518,9 @@ def summarize_results(
     with open(summary_results_file, "a") as outfile:
         outfile.write("\n### CAPACITY RESULTS ###\n")
 
-    # Get the results CSV as dataframe
-    capacity_results_df = pd.read_csv(
-        os.path.join(
+    # Get the results (CSV or Parquet) as dataframe
+    capacity_results_df = read_results_df(
+        results_directory=os.path.join(
             scenario_directory,
             weather_iteration,
             hydro_iteration,
@@ -489,8 +528,8 @@ def summarize_results(
             subproblem,
             stage,
             "results",
-            "project_period.csv",
-        )
+        ),
+        results_name="project_period",
     )
 
     required_capacity_modules = get_required_subtype_modules(
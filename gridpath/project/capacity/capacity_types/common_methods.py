@@ -17,6 +17,7 @@ import os.path
 import pandas as pd
 
 from db.common_functions import spin_on_database_lock
+from gridpath.auxiliary.results_io import read_results_df
 from gridpath.project.common_functions import get_column_row_value
 
 
@@ -481,9 +482,9 @@ def read_results_file_generic(
     :return:
     """
 
-    # Get the results CSV as dataframe
-    df = pd.read_csv(
-        os.path.join(
+    # Get the results (CSV or Parquet) as dataframe
+    df = read_results_df(
+        results_directory=os.path.join(
             scenario_directory,
             weather_iteration,
             hydro_iteration,
@@ -491,8 +492,8 @@ def read_results_file_generic(
             subproblem,
             stage,
             "results",
-            "project_period.csv",
-        )
+        ),
+        results_name="project_period",
     )
 
     # Filter by capacity type and aggregate by technology
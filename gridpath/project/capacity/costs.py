@@ -25,6 +25,7 @@ import os.path
 from pyomo.environ import Set, Expression, value
 
 from db.common_functions import spin_on_database_lock
+from gridpath.auxiliary.db_interface import get_process_results_keys_filter_sql
 from gridpath.common_functions import create_results_df
 from gridpath.auxiliary.auxiliary import (
     get_required_subtype_modules,
@@ -274,20 +275,25 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
     :param quiet:
     :return:
     """
+    keys_filter = get_process_results_keys_filter_sql(
+        columns=["subproblem_id", "stage_id"]
+    )
+
     if not quiet:
         print("aggregate capacity costs by load zone")
 
     # Delete old resulst
-    del_sql = """
+    del_sql = f"""
         DELETE FROM results_project_costs_capacity_agg 
         WHERE scenario_id = ?
+        AND {keys_filter}
         """
     spin_on_database_lock(
         conn=db, cursor=c, sql=del_sql, data=(scenario_id,), many=False
     )
 
     # Insert new results
-    agg_sql = """
+    agg_sql = f"""
         INSERT INTO results_project_costs_capacity_agg
         (scenario_id, load_zone, period, subproblem_id, stage_id,
         spinup_or_lookahead, fraction_of_hours_in_subproblem, capacity_cost)
@@ -318,6 +324,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         GROUP BY scenario_id, subproblem_id, stage_id, period, load_zone
         ) AS cap_table
         USING (scenario_id, subproblem_id, stage_id, period, load_zone)
+        WHERE {keys_filter}
         ;"""
 
     spin_on_database_lock(
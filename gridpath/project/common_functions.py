@@ -17,6 +17,9 @@
 import csv
 import os.path
 import pandas as pd
+from pyomo.environ import value
+
+from gridpath.temporal.operations.horizons import horizon_tmp_positions
 
 
 # TODO: use this in capacity and operational type project subset
@@ -67,11 +70,16 @@ def determine_project_subset(
 
 
 def check_if_first_timepoint(mod, tmp, balancing_type):
-    return tmp == mod.first_hrz_tmp[balancing_type, mod.horizon[tmp, balancing_type]]
+    # Only the first timepoint of a horizon has no previous timepoint within
+    # the horizon; the balancing type may be passed as a Pyomo param, so get
+    # its value for the lookup
+    return (tmp, value(balancing_type)) not in horizon_tmp_positions(mod)["prev"]
 
 
 def check_if_last_timepoint(mod, tmp, balancing_type):
-    return tmp == mod.last_hrz_tmp[balancing_type, mod.horizon[tmp, balancing_type]]
+    # Only the last timepoint of a horizon has no next timepoint within the
+    # horizon
+    return (tmp, value(balancing_type)) not in horizon_tmp_positions(mod)["next"]
 
 
 def check_boundary_type(mod, tmp, balancing_type, boundary_type):
@@ -19,10 +19,15 @@ Carbon emissions from each carbonaceous project.
 
 import csv
 import os.path
-from pyomo.environ import Expression, value
+from pyomo.environ import Expression
 
 from db.common_functions import spin_on_database_lock
-from gridpath.common_functions import create_results_df
+from gridpath.auxiliary.db_interface import get_process_results_keys_filter_sql
+from gridpath.auxiliary.columnar_results import (
+    get_component_values,
+    get_results_df,
+    update_results_df,
+)
 from gridpath.project import PROJECT_TIMEPOINT_DF
 
 
@@ -111,26 +116,18 @@ def export_results(
     :return:
     """
 
-    results_columns = [
-        "carbon_emissions_tons",
-    ]
-    data = [
-        [
-            prj,
-            tmp,
-            value(m.Project_Carbon_Emissions[prj, tmp]),
-        ]
-        for (prj, tmp) in m.PRJ_OPR_TMPS
-    ]
-    emissions_df = create_results_df(
+    index = list(m.PRJ_OPR_TMPS)
+    emissions_df = get_results_df(
         index_columns=["project", "timepoint"],
-        results_columns=results_columns,
-        data=data,
+        index=index,
+        results_columns={
+            "carbon_emissions_tons": get_component_values(
+                m.Project_Carbon_Emissions, index=index
+            ),
+        },
     )
 
-    for c in results_columns:
-        getattr(d, PROJECT_TIMEPOINT_DF)[c] = None
-    getattr(d, PROJECT_TIMEPOINT_DF).update(emissions_df)
+    update_results_df(df=getattr(d, PROJECT_TIMEPOINT_DF), results_df=emissions_df)
 
 
 # Database
@@ -146,20 +143,25 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
     :param quiet:
     :return:
     """
+    keys_filter = get_process_results_keys_filter_sql(
+        columns=["subproblem_id", "stage_id"]
+    )
+
     if not quiet:
         print("aggregate emissions by technology-period")
 
     # Delete old emissions by technology
-    del_sql = """
+    del_sql = f"""
         DELETE FROM results_project_carbon_emissions_by_technology_period 
         WHERE scenario_id = ?
+        AND {keys_filter}
         """
     spin_on_database_lock(
         conn=db, cursor=c, sql=del_sql, data=(scenario_id,), many=False
     )
 
     # Aggregate emissions by technology, period, and spinup_or_lookahead
-    agg_sql = """
+    agg_sql = f"""
         INSERT INTO results_project_carbon_emissions_by_technology_period
         (scenario_id, subproblem_id, stage_id, period, load_zone, technology, 
         spinup_or_lookahead, carbon_emissions_tons)
@@ -169,6 +171,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         * number_of_hours_in_timepoint ) AS carbon_emissions_tons 
         FROM results_project_timepoint
         WHERE scenario_id = ?
+        AND {keys_filter}
         GROUP BY subproblem_id, stage_id, period, load_zone, technology, 
         spinup_or_lookahead
         ORDER BY subproblem_id, stage_id, period, load_zone, technology, 
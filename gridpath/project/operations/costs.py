@@ -22,9 +22,10 @@ For the purpose, this module calls the respective method from the
 operational type modules.
 """
 
-from pyomo.environ import Set, Var, Expression, Constraint, NonNegativeReals, value
+from pyomo.environ import Set, Var, Expression, Constraint, NonNegativeReals
 
 from db.common_functions import spin_on_database_lock
+from gridpath.auxiliary.db_interface import get_process_results_keys_filter_sql
 from gridpath.auxiliary.auxiliary import (
     get_required_subtype_modules,
     subset_init_by_set_membership,
@@ -32,8 +33,12 @@ from gridpath.auxiliary.auxiliary import (
 from gridpath.project.operations.common_functions import (
     load_operational_type_modules,
 )
-from gridpath.common_functions import create_results_df
 import gridpath.project.operations.operational_types as op_type_init
+from gridpath.auxiliary.columnar_results import (
+    get_component_values,
+    get_results_df,
+    update_results_df,
+)
 from gridpath.project import PROJECT_TIMEPOINT_DF
 
 
@@ -651,60 +656,43 @@ def export_results(
     Nothing
     """
 
-    results_columns = [
-        "variable_om_cost",
-        "fuel_cost",
-        "startup_cost",
-        "shutdown_cost",
-        "operational_violation_cost",
-        "curtailment_cost",
-        "soc_penalty_cost",
-        "soc_last_tmp_penalty_cost",
-    ]
-    data = [
-        [
-            prj,
-            tmp,
-            (
-                value(m.Variable_OM_Cost[prj, tmp])
-                if prj in m.VAR_OM_COST_ALL_PRJS
-                else None
+    index = list(m.PRJ_OPR_TMPS)
+
+    def get_cost_values(component, prj_set):
+        # Check whether each project is in the set only once
+        prj_in_set = {prj: prj in prj_set for prj in m.PROJECTS}
+        return get_component_values(
+            component,
+            index=index,
+            include=[prj_in_set[prj] for (prj, tmp) in index],
+        )
+
+    results_df = get_results_df(
+        index_columns=["project", "timepoint"],
+        index=index,
+        results_columns={
+            "variable_om_cost": get_cost_values(
+                m.Variable_OM_Cost, m.VAR_OM_COST_ALL_PRJS
             ),
-            value(m.Fuel_Cost[prj, tmp]) if prj in m.FUEL_PRJS else None,
-            value(m.Startup_Cost[prj, tmp]) if prj in m.STARTUP_COST_PRJS else None,
-            value(m.Shutdown_Cost[prj, tmp]) if prj in m.SHUTDOWN_COST_PRJS else None,
-            (
-                value(m.Operational_Violation_Cost[prj, tmp])
-                if prj in m.VIOL_ALL_PRJ_OPR_TMPS
-                else None
+            "fuel_cost": get_cost_values(m.Fuel_Cost, m.FUEL_PRJS),
+            "startup_cost": get_cost_values(m.Startup_Cost, m.STARTUP_COST_PRJS),
+            "shutdown_cost": get_cost_values(m.Shutdown_Cost, m.SHUTDOWN_COST_PRJS),
+            "operational_violation_cost": get_cost_values(
+                m.Operational_Violation_Cost, m.VIOL_ALL_PRJ_OPR_TMPS
             ),
-            (
-                value(m.Curtailment_Cost[prj, tmp])
-                if prj in m.CURTAILMENT_COST_PRJS
-                else None
+            "curtailment_cost": get_cost_values(
+                m.Curtailment_Cost, m.CURTAILMENT_COST_PRJS
             ),
-            (
-                value(m.SOC_Penalty_Cost[prj, tmp])
-                if prj in m.SOC_PENALTY_COST_PRJS
-                else None
+            "soc_penalty_cost": get_cost_values(
+                m.SOC_Penalty_Cost, m.SOC_PENALTY_COST_PRJS
             ),
-            (
-                value(m.SOC_Penalty_Last_Tmp_Cost[prj, tmp])
-                if prj in m.SOC_LAST_TMP_PENALTY_COST_PRJS
-                else None
+            "soc_last_tmp_penalty_cost": get_cost_values(
+                m.SOC_Penalty_Last_Tmp_Cost, m.SOC_LAST_TMP_PENALTY_COST_PRJS
             ),
-        ]
-        for (prj, tmp) in m.PRJ_OPR_TMPS
-    ]
-    results_df = create_results_df(
-        index_columns=["project", "timepoint"],
-        results_columns=results_columns,
-        data=data,
+        },
     )
 
-    for c in results_columns:
-        getattr(d, PROJECT_TIMEPOINT_DF)[c] = None
-    getattr(d, PROJECT_TIMEPOINT_DF).update(results_df)
+    update_results_df(df=getattr(d, PROJECT_TIMEPOINT_DF), results_df=results_df)
 
     # for prj, prd in m.PRJ_OPR_PRDS:
     #     for mnth in m.MONTHS:
@@ -725,20 +713,25 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
     :param quiet:
     :return:
     """
+    keys_filter = get_process_results_keys_filter_sql(
+        columns=["subproblem_id", "stage_id"]
+    )
+
     if not quiet:
         print("aggregate costs")
 
     # Delete old results
-    del_sql = """
+    del_sql = f"""
         DELETE FROM results_project_costs_operations_agg
         WHERE scenario_id = ?
+        AND {keys_filter}
         """
     spin_on_database_lock(
         conn=db, cursor=c, sql=del_sql, data=(scenario_id,), many=False
     )
 
     # Aggregate operational costs by period and load zone
-    agg_sql = """
+    agg_sql = f"""
         INSERT INTO results_project_costs_operations_agg
         (scenario_id, subproblem_id, stage_id, period, 
         load_zone, spinup_or_lookahead, 
@@ -753,6 +746,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         SUM(shutdown_cost * timepoint_weight) AS shutdown_cost
         FROM results_project_timepoint
         WHERE scenario_id = ?
+        AND {keys_filter}
         GROUP BY subproblem_id, stage_id, period, load_zone, spinup_or_lookahead
         ORDER BY subproblem_id, stage_id, period, load_zone, spinup_or_lookahead
         ;"""
@@ -18,7 +18,7 @@ Get RECs for each project
 
 import csv
 import os.path
-from pyomo.environ import Param, Set, Expression, value
+from pyomo.environ import Param, Set, Expression
 
 from gridpath.auxiliary.auxiliary import (
     get_required_subtype_modules,
@@ -30,10 +30,14 @@ from gridpath.auxiliary.db_interface import (
     determine_table_subset_by_start_and_column,
     directories_to_db_values,
 )
-from gridpath.common_functions import create_results_df
 from gridpath.project.operations.common_functions import load_operational_type_modules
 from gridpath.auxiliary.validations import write_validation_to_database, validate_idxs
 import gridpath.project.operations.operational_types as op_type_init
+from gridpath.auxiliary.columnar_results import (
+    get_component_values,
+    get_results_df,
+    update_results_df,
+)
 from gridpath.project import PROJECT_TIMEPOINT_DF
 
 
@@ -318,35 +322,28 @@ def export_results(
     :return:
     """
 
-    results_columns = [
-        "energy_target_zone",
-        "scheduled_energy_target_energy_mw",
-        "scheduled_curtailment_mw",
-        "subhourly_energy_target_energy_delivered_mw",
-        "subhourly_curtailment_mw",
-    ]
-    data = [
-        [
-            prj,
-            tmp,
-            m.energy_target_zone[prj],
-            value(m.Scheduled_Energy_Target_Energy_MW[prj, tmp]),
-            value(m.Scheduled_Curtailment_MW[prj, tmp]),
-            value(m.Subhourly_Energy_Target_Energy_MW[prj, tmp]),
-            value(m.Subhourly_Curtailment_MW[prj, tmp]),
-        ]
-        for (prj, tmp) in m.ENERGY_TARGET_PRJ_OPR_TMPS
-    ]
-
-    results_df = create_results_df(
+    index = list(m.ENERGY_TARGET_PRJ_OPR_TMPS)
+    results_df = get_results_df(
         index_columns=["project", "timepoint"],
-        results_columns=results_columns,
-        data=data,
+        index=index,
+        results_columns={
+            "energy_target_zone": [m.energy_target_zone[prj] for (prj, tmp) in index],
+            "scheduled_energy_target_energy_mw": get_component_values(
+                m.Scheduled_Energy_Target_Energy_MW, index=index
+            ),
+            "scheduled_curtailment_mw": get_component_values(
+                m.Scheduled_Curtailment_MW, index=index
+            ),
+            "subhourly_energy_target_energy_delivered_mw": get_component_values(
+                m.Subhourly_Energy_Target_Energy_MW, index=index
+            ),
+            "subhourly_curtailment_mw": get_component_values(
+                m.Subhourly_Curtailment_MW, index=index
+            ),
+        },
     )
 
-    for c in results_columns:
-        getattr(d, PROJECT_TIMEPOINT_DF)[c] = None
-    getattr(d, PROJECT_TIMEPOINT_DF).update(results_df)
+    update_results_df(df=getattr(d, PROJECT_TIMEPOINT_DF), results_df=results_df)
 
 
 # Database
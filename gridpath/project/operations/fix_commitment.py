@@ -29,6 +29,8 @@ from gridpath.auxiliary.auxiliary import (
     check_for_integer_subdirectories,
     subset_init_by_set_membership,
 )
+from gridpath.auxiliary.input_cache import read_cached_tab_df
+from gridpath.auxiliary.state_store import open_state_table, read_state_table_df
 from gridpath.project.operations.common_functions import load_operational_type_modules
 
 
@@ -247,17 +249,17 @@ def load_model_data(
         )
     )
 
-    fixed_commitment_df = read_csv(
-        os.path.join(
-            scenario_directory,
+    fixed_commitment_df = read_state_table_df(
+        scenario_directory=scenario_directory,
+        problem_key=(
             weather_iteration,
             hydro_iteration,
             availability_iteration,
             subproblem,
-            "pass_through_inputs",
-            "fixed_commitment.tab",
+            "",
         ),
-        sep="\t",
+        subdirectory="pass_through_inputs",
+        filename="fixed_commitment.tab",
         dtype={"stage": str},
     )
 
@@ -340,7 +342,7 @@ def export_pass_through_inputs(
     :param m:
     :return:
     """
-    df = read_csv(
+    df = read_cached_tab_df(
         os.path.join(
             scenario_directory,
             weather_iteration,
@@ -350,28 +352,24 @@ def export_pass_through_inputs(
             stage,
             "inputs",
             "projects.tab",
-        ),
-        sep="\t",
-        usecols=["project", "last_commitment_stage"],
+        )
     )
 
     final_commitment_stage_dict = dict(zip(df["project"], df["last_commitment_stage"]))
 
-    with open(
-        os.path.join(
-            scenario_directory,
+    with open_state_table(
+        scenario_directory=scenario_directory,
+        problem_key=(
             weather_iteration,
             hydro_iteration,
             availability_iteration,
             subproblem,
-            "pass_through_inputs",
-            "fixed_commitment.tab",
+            "",
         ),
-        "a",
-    ) as fixed_commitment_file:
-        fixed_commitment_writer = writer(
-            fixed_commitment_file, delimiter="\t", lineterminator="\n"
-        )
+        subdirectory="pass_through_inputs",
+        filename="fixed_commitment.tab",
+        mode="a",
+    ) as fixed_commitment_writer:
         for g, tmp in m.FNL_COMMIT_PRJ_OPR_TMPS:
             fixed_commitment_writer.writerow(
                 [
@@ -18,7 +18,7 @@ Get RECs for each project
 
 import csv
 import os.path
-from pyomo.environ import Param, Set, value
+from pyomo.environ import Param, Set
 
 from gridpath.auxiliary.auxiliary import (
     cursor_to_df,
@@ -29,8 +29,12 @@ from gridpath.auxiliary.db_interface import (
     determine_table_subset_by_start_and_column,
     directories_to_db_values,
 )
-from gridpath.common_functions import create_results_df
 from gridpath.auxiliary.validations import write_validation_to_database, validate_idxs
+from gridpath.auxiliary.columnar_results import (
+    get_component_values,
+    get_results_df,
+    update_results_df,
+)
 from gridpath.project import PROJECT_TIMEPOINT_DF
 
 
@@ -193,29 +197,21 @@ def export_results(
     :return:
     """
 
-    results_columns = [
-        "instantaneous_penetration_zone",
-        "instantaneous_penetration_power_mw",
-    ]
-    data = [
-        [
-            prj,
-            tmp,
-            m.instantaneous_penetration_zone[prj],
-            value(m.Bulk_Power_Provision_MW[prj, tmp]),
-        ]
-        for (prj, tmp) in m.INST_PEN_PRJ_OPR_TMP
-    ]
-
-    results_df = create_results_df(
+    index = list(m.INST_PEN_PRJ_OPR_TMP)
+    results_df = get_results_df(
         index_columns=["project", "timepoint"],
-        results_columns=results_columns,
-        data=data,
+        index=index,
+        results_columns={
+            "instantaneous_penetration_zone": [
+                m.instantaneous_penetration_zone[prj] for (prj, tmp) in index
+            ],
+            "instantaneous_penetration_power_mw": get_component_values(
+                m.Bulk_Power_Provision_MW, index=index
+            ),
+        },
     )
 
-    for c in results_columns:
-        getattr(d, PROJECT_TIMEPOINT_DF)[c] = None
-    getattr(d, PROJECT_TIMEPOINT_DF).update(results_df)
+    update_results_df(df=getattr(d, PROJECT_TIMEPOINT_DF), results_df=results_df)
 
 
 # Database
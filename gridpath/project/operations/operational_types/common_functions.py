@@ -23,6 +23,12 @@ from gridpath.project.common_functions import (
     check_boundary_type,
 )
 from gridpath.auxiliary.auxiliary import cursor_to_df
+from gridpath.auxiliary.columnar_inputs import get_param_data, isin_mask
+from gridpath.auxiliary.input_cache import (
+    get_cached_input,
+    read_cached_tab_columns,
+    read_cached_tab_df,
+)
 from gridpath.auxiliary.validations import (
     write_validation_to_database,
     validate_req_cols,
@@ -31,6 +37,10 @@ from gridpath.auxiliary.validations import (
     validate_column_monotonicity,
 )
 
+OPCHAR_PARAM_REQUIREMENTS_FILE = os.path.join(
+    os.path.dirname(__file__), "opchar_param_requirements.csv"
+)
+
 
 def determine_relevant_timepoints(mod, g, tmp, min_time):
     """
@@ -222,29 +232,9 @@ def get_optype_inputs_as_df(
     type and only the columns required or optional for the operational type.
     """
 
-    # Figure out which headers we have
-    header = pd.read_csv(
-        os.path.join(
-            scenario_directory,
-            weather_iteration,
-            hydro_iteration,
-            availability_iteration,
-            subproblem,
-            stage,
-            "inputs",
-            "projects.tab",
-        ),
-        sep="\t",
-        header=None,
-        nrows=1,
-    ).values[0]
-
-    # Get the columns for the optional params (it's OK if they don't exist)
-    used_columns = [c for c in optional_columns if c in header]
-
-    # Read in the appropriate columns for the operational type from
-    # projects.tab
-    df = pd.read_csv(
+    # projects.tab is read only once per problem and shared by all
+    # operational types (see gridpath.auxiliary.input_cache)
+    df = read_cached_tab_df(
         os.path.join(
             scenario_directory,
             weather_iteration,
@@ -254,13 +244,26 @@ def get_optype_inputs_as_df(
             stage,
             "inputs",
             "projects.tab",
-        ),
-        sep="\t",
-        usecols=["project", "operational_type"] + required_columns + used_columns,
+        )
     )
 
-    # Filter for the operational type
-    optype_df = df.loc[df["operational_type"] == op_type]
+    # Get the columns for the optional params (it's OK if they don't exist);
+    # keep the columns in their projects.tab order
+    used_columns = ["project", "operational_type"] + required_columns + optional_columns
+    missing_columns = [
+        c
+        for c in ["project", "operational_type"] + required_columns
+        if c not in df.columns
+    ]
+    if missing_columns:
+        raise ValueError(
+            "Required columns {} not found in projects.tab.".format(missing_columns)
+        )
+
+    # Filter for the operational type and the appropriate columns
+    optype_df = df.loc[
+        df["operational_type"] == op_type, [c for c in df.columns if c in used_columns]
+    ]
 
     return optype_df
 
@@ -274,15 +277,14 @@ def get_param_dict(df, column_name, cast_as_type):
 
     Create a dictionary for the parameter to load into Pyomo.
     """
-    param_dict = dict()
-
-    for row in zip(df["project"], df[column_name]):
-        [prj, param_val] = row
-        # Add to the param dictionary if a value is specified
-        # Otherwise, we'll use the default value (or Pyomo will throw an
-        # error if no default value)
-        if param_val != ".":
-            param_dict[prj] = cast_as_type(row[1])
+    # Values are added to the param dictionary only if specified; otherwise,
+    # we'll use the default value (or Pyomo will throw an error if no default
+    # value)
+    param_dict = get_param_data(
+        index_columns=[df["project"].to_numpy()],
+        values=df[column_name].to_numpy(),
+        cast_as_type=cast_as_type,
+    )
 
     return param_dict
 
@@ -301,10 +303,11 @@ def get_optype_param_requirements(op_type):
     inputs for for that operational type.
     """
 
-    df = pd.read_csv(
-        os.path.join(os.path.dirname(__file__), "opchar_param_requirements.csv"),
-        sep=",",
-        dtype=str,
+    df = get_cached_input(
+        filename=OPCHAR_PARAM_REQUIREMENTS_FILE,
+        read_rule=lambda: pd.read_csv(
+            OPCHAR_PARAM_REQUIREMENTS_FILE, sep=",", dtype=str
+        ),
     )
     # df.set_index('ID').T.to_dict('list')
     required_columns = df.loc[df[op_type] == "required"][["char", "type"]]
@@ -499,7 +502,7 @@ def load_var_profile_inputs(
 
     # Determine projects of this op_type and other var op_types
     # TODO: re-factor getting projects of certain op-type?
-    prj_df = pd.read_csv(
+    prj_df = read_cached_tab_df(
         os.path.join(
             scenario_directory,
             weather_iteration,
@@ -509,9 +512,7 @@ def load_var_profile_inputs(
             stage,
             "inputs",
             "projects.tab",
-        ),
-        sep="\t",
-        usecols=["project", "operational_type"],
+        )
     )
     op_type_prjs = prj_df[prj_df["operational_type"] == op_type]["project"]
     other_var_op_type_prjs = prj_df[
@@ -519,10 +520,11 @@ def load_var_profile_inputs(
     ]["project"]
     var_prjs = list(op_type_prjs) + list(other_var_op_type_prjs)
 
-    # Read in the cap factors, filter for projects with the correct op_type
-    # and convert to dictionary
-    cf_df = pd.read_csv(
-        os.path.join(
+    # Read in the cap factors as columns (only once for all variable
+    # operational types), filter for projects with the correct op_type and
+    # convert to dictionary
+    cf_columns = read_cached_tab_columns(
+        filename=os.path.join(
             scenario_directory,
             weather_iteration,
             hydro_iteration,
@@ -532,21 +534,22 @@ def load_var_profile_inputs(
             "inputs",
             tab_filename,
         ),
-        sep="\t",
-        usecols=["project", "timepoint", param_name],
-        dtype={param_name: float},
+        columns=["project", "timepoint", param_name],
+        dtypes={param_name: float},
+    )
+    cf_prjs = cf_columns["project"]
+    param_value = get_param_data(
+        index_columns=[cf_prjs, cf_columns["timepoint"]],
+        values=cf_columns[param_name],
+        mask=isin_mask(cf_prjs, op_type_prjs),
     )
-    op_type_cf_df = cf_df[cf_df["project"].isin(op_type_prjs)]
-    param_value = op_type_cf_df.set_index(["project", "timepoint"])[
-        param_name
-    ].to_dict()
 
     # Throw warning if profile exists for a project not in projects.tab
     # (as 'gen_var' or 'gen_var_must_take')
     # TODO: this will throw warning twice, once for gen_var and once for
     #  gen_var_must_take
     # TODO: move this to validation instead?
-    invalid_prjs = cf_df[~cf_df["project"].isin(var_prjs)]["project"].unique()
+    invalid_prjs = pd.unique(cf_prjs[~isin_mask(cf_prjs, var_prjs)])
     for prj in invalid_prjs:
         warnings.warn(
             f"""WARNING: Profiles are specified for '{prj}' in 
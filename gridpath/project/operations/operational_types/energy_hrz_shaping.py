@@ -19,7 +19,6 @@ period to the Energy_MWh for the project.
 
 """
 
-import csv
 import os.path
 
 import pandas as pd
@@ -42,6 +41,7 @@ from gridpath.auxiliary.auxiliary import (
 )
 from gridpath.auxiliary.db_interface import directories_to_db_values
 from gridpath.auxiliary.dynamic_components import headroom_variables, footroom_variables
+from gridpath.auxiliary.state_store import open_state_table
 from gridpath.project.common_functions import (
     check_if_boundary_type_and_first_timepoint,
     check_if_first_timepoint,
@@ -499,21 +499,18 @@ def export_results(
         next_subproblem = str(int(subproblem) + 1)
 
         # Export params by project and timepoint
-        with open(
-            os.path.join(
-                scenario_directory,
+        with open_state_table(
+            scenario_directory=scenario_directory,
+            problem_key=(
                 weather_iteration,
                 hydro_iteration,
                 availability_iteration,
                 next_subproblem,
                 stage,
-                "inputs",
-                "energy_hrz_shaping_linked_timepoint_params.tab",
             ),
-            "w",
-            newline="",
-        ) as f:
-            writer = csv.writer(f, delimiter="\t", lineterminator="\n")
+            subdirectory="inputs",
+            filename="energy_hrz_shaping_linked_timepoint_params.tab",
+        ) as writer:
             writer.writerow(
                 [
                     "project",
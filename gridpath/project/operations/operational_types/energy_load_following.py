@@ -14,7 +14,6 @@
 
 """ """
 
-import csv
 import os.path
 
 import pandas as pd
@@ -36,6 +35,7 @@ from gridpath.auxiliary.auxiliary import (
 )
 from gridpath.auxiliary.db_interface import directories_to_db_values
 from gridpath.auxiliary.dynamic_components import headroom_variables, footroom_variables
+from gridpath.auxiliary.state_store import load_state_table
 from gridpath.project.common_functions import (
     check_if_boundary_type_and_first_timepoint,
     check_if_first_timepoint,
@@ -424,22 +424,21 @@ def load_model_data(
         )
 
     # Linked timepoint params
-    linked_inputs_filename = os.path.join(
-        scenario_directory,
-        weather_iteration,
-        hydro_iteration,
-        availability_iteration,
-        subproblem,
-        stage,
-        "inputs",
-        "energy_hrz_shaping_linked_timepoint_params.tab",
+    load_state_table(
+        data_portal=data_portal,
+        scenario_directory=scenario_directory,
+        problem_key=(
+            weather_iteration,
+            hydro_iteration,
+            availability_iteration,
+            subproblem,
+            stage,
+        ),
+        subdirectory="inputs",
+        filename="energy_hrz_shaping_linked_timepoint_params.tab",
+        index=m.ENERGY_LOAD_FOLLOWING_LINKED_TMPS,
+        param=(m.energy_hrz_shaping_linked_power,),
     )
-    if os.path.exists(linked_inputs_filename):
-        data_portal.load(
-            filename=linked_inputs_filename,
-            index=m.ENERGY_LOAD_FOLLOWING_LINKED_TMPS,
-            param=(m.energy_hrz_shaping_linked_power,),
-        )
 
 
 def export_results(
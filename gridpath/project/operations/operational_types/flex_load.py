@@ -17,7 +17,6 @@ This operational type describes a battery-based model for a flexible load
 resource. Please use gen_spec as the 'capacity type' for flexible loads.
 
 """
-import csv
 import os.path
 from pyomo.environ import (
     Var,
@@ -34,6 +33,7 @@ from gridpath.auxiliary.auxiliary import (
     subset_init_by_param_value,
     subset_init_by_set_membership,
 )
+from gridpath.auxiliary.state_store import load_state_table, open_state_table
 from gridpath.project.common_functions import (
     check_if_first_timepoint,
     check_boundary_type,
@@ -551,26 +551,25 @@ def load_model_data(
     )
 
     # Linked timepoint params
-    linked_inputs_filename = os.path.join(
-        scenario_directory,
-        weather_iteration,
-        hydro_iteration,
-        availability_iteration,
-        subproblem,
-        stage,
-        "inputs",
-        "flex_load_linked_timepoint_params.tab",
+    load_state_table(
+        data_portal=data_portal,
+        scenario_directory=scenario_directory,
+        problem_key=(
+            weather_iteration,
+            hydro_iteration,
+            availability_iteration,
+            subproblem,
+            stage,
+        ),
+        subdirectory="inputs",
+        filename="flex_load_linked_timepoint_params.tab",
+        index=mod.FLEX_LOAD_LINKED_TMPS,
+        param=(
+            mod.flex_load_linked_starting_energy_in_storage,
+            mod.flex_load_linked_discharge,
+            mod.flex_load_linked_charge,
+        ),
     )
-    if os.path.exists(linked_inputs_filename):
-        data_portal.load(
-            filename=linked_inputs_filename,
-            index=mod.FLEX_LOAD_LINKED_TMPS,
-            param=(
-                mod.flex_load_linked_starting_energy_in_storage,
-                mod.flex_load_linked_discharge,
-                mod.flex_load_linked_charge,
-            ),
-        )
 
 
 def add_to_prj_tmp_results(mod):
@@ -639,18 +638,18 @@ def export_results(
         next_subproblem = str(int(subproblem) + 1)
 
         # Export params by project and timepoint
-        with open(
-            os.path.join(
-                scenario_directory,
+        with open_state_table(
+            scenario_directory=scenario_directory,
+            problem_key=(
+                weather_iteration,
+                hydro_iteration,
+                availability_iteration,
                 next_subproblem,
                 stage,
-                "inputs",
-                "flex_load_linked_timepoint_params.tab",
             ),
-            "w",
-            newline="",
-        ) as f:
-            writer = csv.writer(f, delimiter="\t", lineterminator="\n")
+            subdirectory="inputs",
+            filename="flex_load_linked_timepoint_params.tab",
+        ) as writer:
             writer.writerow(
                 [
                     "project",
@@ -47,7 +47,7 @@ Morales-Espana et al. (2013).
 from gridpath.project.operations.operational_types.common_functions import (
     validate_opchars,
 )
-from gridpath.common_functions import create_results_df
+from gridpath.auxiliary.columnar_results import get_results_df
 import gridpath.project.operations.operational_types.gen_commit_unit_common as gen_commit_unit_common
 
 
@@ -271,42 +271,32 @@ def load_model_data(
 
 
 def add_to_prj_tmp_results(mod):
-    results_columns, data = gen_commit_unit_common.add_to_prj_tmp_results(
+    index = list(mod.GEN_COMMIT_BIN_OPR_TMPS)
+    results_columns, results = gen_commit_unit_common.add_to_prj_tmp_results(
         mod=mod,
-        BIN_OR_LIN="BIN",
+        index=index,
         Bin_or_Lin="Bin",
-        bin_or_lin="bin",
     )
 
+    # Get the duals
     (
         duals_results_columns,
-        duals_data,
+        duals_results,
     ) = gen_commit_unit_common.add_duals_to_dispatch_results(
         mod=mod,
-        BIN_OR_LIN="BIN",
+        index=index,
         Bin_or_Lin="Bin",
     )
 
-    # Create DF
-    optype_dispatch_df = create_results_df(
-        index_columns=["project", "timepoint"],
-        results_columns=results_columns,
-        data=data,
-    )
-
-    # Get the duals
-    optype_duals_df = create_results_df(
+    # Create DF with the dispatch results and the duals
+    results_columns += duals_results_columns
+    results.update(duals_results)
+    optype_dispatch_df = get_results_df(
         index_columns=["project", "timepoint"],
-        results_columns=duals_results_columns,
-        data=duals_data,
+        index=index,
+        results_columns=results,
     )
 
-    # Add duals to dispatch DF
-    results_columns += duals_results_columns
-    for column in duals_results_columns:
-        optype_dispatch_df[column] = None
-    optype_dispatch_df.update(optype_duals_df)
-
     return results_columns, optype_dispatch_df
 
 
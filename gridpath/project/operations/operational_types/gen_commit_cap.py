@@ -46,8 +46,6 @@ startup and shutdown costs.
 """
 
 
-import csv
-import os.path
 import pandas as pd
 from pyomo.environ import (
     Var,
@@ -66,14 +64,19 @@ from gridpath.auxiliary.auxiliary import (
     subset_init_by_param_value,
     subset_init_by_set_membership,
 )
+from gridpath.auxiliary.columnar_results import (
+    get_component_values,
+    get_results_df,
+    to_array,
+)
 from gridpath.auxiliary.dynamic_components import headroom_variables, footroom_variables
+from gridpath.auxiliary.state_store import load_state_table, open_state_table
 from gridpath.project.operations.operational_types.common_functions import (
     determine_relevant_timepoints,
     load_optype_model_data,
     check_for_tmps_to_link,
     validate_opchars,
 )
-from gridpath.common_functions import create_results_df
 from gridpath.project.common_functions import (
     check_if_boundary_type_and_first_timepoint,
 )
@@ -1450,59 +1453,55 @@ def load_model_data(
     )
 
     # Linked timepoint params
-    linked_inputs_filename = os.path.join(
-        scenario_directory,
-        weather_iteration,
-        hydro_iteration,
-        availability_iteration,
-        subproblem,
-        stage,
-        "inputs",
-        "gen_commit_cap_linked_timepoint_params.tab",
+    load_state_table(
+        data_portal=data_portal,
+        scenario_directory=scenario_directory,
+        problem_key=(
+            weather_iteration,
+            hydro_iteration,
+            availability_iteration,
+            subproblem,
+            stage,
+        ),
+        subdirectory="inputs",
+        filename="gen_commit_cap_linked_timepoint_params.tab",
+        index=mod.GEN_COMMIT_CAP_LINKED_TMPS,
+        param=(
+            mod.gen_commit_cap_linked_commit_capacity,
+            mod.gen_commit_cap_linked_power,
+            mod.gen_commit_cap_linked_upwards_reserves,
+            mod.gen_commit_cap_linked_downwards_reserves,
+            mod.gen_commit_cap_linked_startup,
+            mod.gen_commit_cap_linked_shutdown,
+        ),
     )
-    if os.path.exists(linked_inputs_filename):
-        data_portal.load(
-            filename=linked_inputs_filename,
-            index=mod.GEN_COMMIT_CAP_LINKED_TMPS,
-            param=(
-                mod.gen_commit_cap_linked_commit_capacity,
-                mod.gen_commit_cap_linked_power,
-                mod.gen_commit_cap_linked_upwards_reserves,
-                mod.gen_commit_cap_linked_downwards_reserves,
-                mod.gen_commit_cap_linked_startup,
-                mod.gen_commit_cap_linked_shutdown,
-            ),
-        )
 
 
 def add_to_prj_tmp_results(mod):
-    results_columns = [
-        "gross_power_mw",
-        "auxiliary_consumption_mw",
-        "net_power_mw",
-        "committed_mw",
-        "committed_units",
-    ]
-    data = [
-        [
-            prj,
-            tmp,
-            value(mod.GenCommitCap_Provide_Power_MW[prj, tmp]),
-            value(mod.GenCommitCap_Auxiliary_Consumption_MW[prj, tmp]),
-            value(mod.GenCommitCap_Provide_Power_MW[prj, tmp])
-            - value(mod.GenCommitCap_Auxiliary_Consumption_MW[prj, tmp]),
-            value(mod.Commit_Capacity_MW[prj, tmp]),
-            value(mod.Commit_Capacity_MW[prj, tmp])
-            / mod.gen_commit_cap_unit_size_mw[prj],
-        ]
-        for (prj, tmp) in mod.GEN_COMMIT_CAP_OPR_TMPS
-    ]
+    index = list(mod.GEN_COMMIT_CAP_OPR_TMPS)
+    gross_power_mw = get_component_values(
+        mod.GenCommitCap_Provide_Power_MW, index=index
+    )
+    auxiliary_consumption_mw = get_component_values(
+        mod.GenCommitCap_Auxiliary_Consumption_MW, index=index
+    )
+    committed_mw = get_component_values(mod.Commit_Capacity_MW, index=index)
+    unit_size_mw = to_array(
+        [mod.gen_commit_cap_unit_size_mw[prj] for (prj, tmp) in index]
+    )
 
-    optype_dispatch_df = create_results_df(
+    optype_dispatch_df = get_results_df(
         index_columns=["project", "timepoint"],
-        results_columns=results_columns,
-        data=data,
+        index=index,
+        results_columns={
+            "gross_power_mw": gross_power_mw,
+            "auxiliary_consumption_mw": auxiliary_consumption_mw,
+            "net_power_mw": gross_power_mw - auxiliary_consumption_mw,
+            "committed_mw": committed_mw,
+            "committed_units": committed_mw / unit_size_mw,
+        },
     )
+    results_columns = list(optype_dispatch_df.columns)
 
     return results_columns, optype_dispatch_df
 
@@ -1543,18 +1542,18 @@ def export_results(
         next_subproblem = str(int(subproblem) + 1)
 
         # Export params by project and timepoint
-        with open(
-            os.path.join(
-                scenario_directory,
+        with open_state_table(
+            scenario_directory=scenario_directory,
+            problem_key=(
+                weather_iteration,
+                hydro_iteration,
+                availability_iteration,
                 next_subproblem,
                 stage,
-                "inputs",
-                "gen_commit_cap_linked_timepoint_params.tab",
             ),
-            "w",
-            newline="",
-        ) as f:
-            writer = csv.writer(f, delimiter="\t", lineterminator="\n")
+            subdirectory="inputs",
+            filename="gen_commit_cap_linked_timepoint_params.tab",
+        ) as writer:
             writer.writerow(
                 [
                     "project",
@@ -45,8 +45,6 @@ Morales-Espana et al. (2013).
 """
 
 
-import csv
-import os.path
 from pyomo.environ import (
     Var,
     Set,
@@ -66,7 +64,9 @@ from gridpath.auxiliary.auxiliary import (
     subset_init_by_param_value,
     subset_init_by_set_membership,
 )
+from gridpath.auxiliary.columnar_results import get_component_values, to_array
 from gridpath.auxiliary.dynamic_components import headroom_variables, footroom_variables
+from gridpath.auxiliary.state_store import load_state_table, open_state_table
 from gridpath.common_functions import duals_wrapper
 from gridpath.project.operations.operational_types.common_functions import (
     determine_relevant_timepoints,
@@ -3467,181 +3467,125 @@ def load_model_data(
     )
 
     # Linked timepoint params
-    linked_inputs_filename = os.path.join(
-        scenario_directory,
-        weather_iteration,
-        hydro_iteration,
-        availability_iteration,
-        subproblem,
-        stage,
-        "inputs",
-        "gen_commit_{}_linked_timepoint_params.tab".format(bin_or_lin),
-    )
-    if os.path.exists(linked_inputs_filename):
-        data_portal.load(
-            filename=linked_inputs_filename,
-            index=getattr(mod, "GEN_COMMIT_{}_LINKED_TMPS".format(BIN_OR_LIN)),
-            param=(
-                getattr(mod, "gen_commit_{}_linked_commit".format(bin_or_lin)),
-                getattr(mod, "gen_commit_{}_linked_startup".format(bin_or_lin)),
-                getattr(mod, "gen_commit_{}_linked_shutdown".format(bin_or_lin)),
-                getattr(
-                    mod, "gen_commit_{}_linked_power_above_pmin".format(bin_or_lin)
-                ),
-                getattr(
-                    mod, "gen_commit_{}_linked_upwards_reserves".format(bin_or_lin)
-                ),
-                getattr(
-                    mod, "gen_commit_{}_linked_downwards_reserves".format(bin_or_lin)
-                ),
-                getattr(
-                    mod,
-                    "gen_commit_{}_linked_ramp_up_rate_mw_per_tmp".format(bin_or_lin),
-                ),
-                getattr(
-                    mod,
-                    "gen_commit_{}_linked_ramp_down_rate_mw_per_tmp".format(bin_or_lin),
-                ),
-                getattr(
-                    mod,
-                    "gen_commit_{}_linked_provide_power_shutdown_mw"
-                    "".format(bin_or_lin),
-                ),
-                getattr(
-                    mod,
-                    "gen_commit_{}_linked_shutdown_ramp_rate_mw_per_tmp".format(
-                        bin_or_lin
-                    ),
-                ),
-                getattr(
-                    mod,
-                    "gen_commit_{}_linked_pmin_mw".format(bin_or_lin),
-                ),
-                getattr(
-                    mod,
-                    "gen_commit_{}_linked_pmax_mw".format(bin_or_lin),
-                ),
+    load_state_table(
+        data_portal=data_portal,
+        scenario_directory=scenario_directory,
+        problem_key=(
+            weather_iteration,
+            hydro_iteration,
+            availability_iteration,
+            subproblem,
+            stage,
+        ),
+        subdirectory="inputs",
+        filename="gen_commit_{}_linked_timepoint_params.tab".format(bin_or_lin),
+        index=getattr(mod, "GEN_COMMIT_{}_LINKED_TMPS".format(BIN_OR_LIN)),
+        param=(
+            getattr(mod, "gen_commit_{}_linked_commit".format(bin_or_lin)),
+            getattr(mod, "gen_commit_{}_linked_startup".format(bin_or_lin)),
+            getattr(mod, "gen_commit_{}_linked_shutdown".format(bin_or_lin)),
+            getattr(mod, "gen_commit_{}_linked_power_above_pmin".format(bin_or_lin)),
+            getattr(mod, "gen_commit_{}_linked_upwards_reserves".format(bin_or_lin)),
+            getattr(mod, "gen_commit_{}_linked_downwards_reserves".format(bin_or_lin)),
+            getattr(
+                mod,
+                "gen_commit_{}_linked_ramp_up_rate_mw_per_tmp".format(bin_or_lin),
             ),
-        )
+            getattr(
+                mod,
+                "gen_commit_{}_linked_ramp_down_rate_mw_per_tmp".format(bin_or_lin),
+            ),
+            getattr(
+                mod,
+                "gen_commit_{}_linked_provide_power_shutdown_mw" "".format(bin_or_lin),
+            ),
+            getattr(
+                mod,
+                "gen_commit_{}_linked_shutdown_ramp_rate_mw_per_tmp".format(bin_or_lin),
+            ),
+            getattr(
+                mod,
+                "gen_commit_{}_linked_pmin_mw".format(bin_or_lin),
+            ),
+            getattr(
+                mod,
+                "gen_commit_{}_linked_pmax_mw".format(bin_or_lin),
+            ),
+        ),
+    )
 
     # Linked timepoint params (by startup type)
-    linked_startup_inputs_filename = os.path.join(
-        scenario_directory,
-        weather_iteration,
-        hydro_iteration,
-        availability_iteration,
-        subproblem,
-        stage,
-        "inputs",
-        "gen_commit_{}_linked_timepoint_str_type_params.tab".format(bin_or_lin),
-    )
-    if os.path.exists(linked_startup_inputs_filename):
-        data_portal.load(
-            filename=linked_startup_inputs_filename,
-            param=(
-                getattr(
-                    mod,
-                    "gen_commit_{}_linked_provide_power_startup_by_st_mw".format(
-                        bin_or_lin
-                    ),
+    load_state_table(
+        data_portal=data_portal,
+        scenario_directory=scenario_directory,
+        problem_key=(
+            weather_iteration,
+            hydro_iteration,
+            availability_iteration,
+            subproblem,
+            stage,
+        ),
+        subdirectory="inputs",
+        filename="gen_commit_{}_linked_timepoint_str_type_params.tab".format(
+            bin_or_lin
+        ),
+        param=(
+            getattr(
+                mod,
+                "gen_commit_{}_linked_provide_power_startup_by_st_mw".format(
+                    bin_or_lin
                 ),
-                getattr(
-                    mod,
-                    "gen_commit_{}_linked_startup_ramp_rate_by_st_mw_per_tmp".format(
-                        bin_or_lin
-                    ),
+            ),
+            getattr(
+                mod,
+                "gen_commit_{}_linked_startup_ramp_rate_by_st_mw_per_tmp".format(
+                    bin_or_lin
                 ),
             ),
-        )
+        ),
+    )
 
 
 def add_to_prj_tmp_results(
     mod,
-    BIN_OR_LIN,
+    index,
     Bin_or_Lin,
-    bin_or_lin,
 ):
-    """ """
+    """
+    :param mod: the solved instance
+    :param index: list of the (project, timepoint) indices of the results
+    :param Bin_or_Lin: "Bin" or "Lin"
+    :return: list of the results columns and dictionary of the results
+        column arrays aligned to *index*
+    """
 
-    results_columns = [
-        "gross_power_mw",
-        "auxiliary_consumption_mw",
-        "net_power_mw",
-        "committed_mw",
-        "committed_units",
-        "started_units",
-        "stopped_units",
-        "synced_units",
-        "active_startup_type",
-        "ramp_up_violation",
-        "ramp_down_violation",
-        "min_up_time_violation",
-        "min_down_time_violation",
-    ]
+    def get_values(component_name):
+        return get_component_values(
+            getattr(mod, "GenCommit{}_{}".format(Bin_or_Lin, component_name)),
+            index=index,
+        )
 
-    data = [
-        [
-            prj,
-            tmp,
-            value(
-                getattr(mod, "GenCommit{}_Provide_Power_MW".format(Bin_or_Lin))[
-                    prj, tmp
-                ]
-            ),
-            value(
-                getattr(
-                    mod,
-                    "GenCommit{}_Auxiliary_Consumption_MW".format(Bin_or_Lin),
-                )[prj, tmp]
-            ),
-            value(
-                getattr(mod, "GenCommit{}_Provide_Power_MW".format(Bin_or_Lin))[
-                    prj, tmp
-                ]
-            )
-            - value(
-                getattr(
-                    mod,
-                    "GenCommit{}_Auxiliary_Consumption_MW".format(Bin_or_Lin),
-                )[prj, tmp]
-            ),
-            value(getattr(mod, "GenCommit{}_Pmax_MW".format(Bin_or_Lin))[prj, tmp])
-            * value(getattr(mod, "GenCommit{}_Commit".format(Bin_or_Lin))[prj, tmp]),
-            value(getattr(mod, "GenCommit{}_Commit".format(Bin_or_Lin))[prj, tmp]),
-            value(getattr(mod, "GenCommit{}_Startup".format(Bin_or_Lin))[prj, tmp]),
-            value(getattr(mod, "GenCommit{}_Shutdown".format(Bin_or_Lin))[prj, tmp]),
-            value(getattr(mod, "GenCommit{}_Synced".format(Bin_or_Lin))[prj, tmp]),
-            value(
-                getattr(mod, "GenCommit{}_Active_Startup_Type".format(Bin_or_Lin))[
-                    prj, tmp
-                ]
-            ),
-            value(
-                getattr(mod, "GenCommit{}_Ramp_Up_Violation_MW".format(Bin_or_Lin))[
-                    prj, tmp
-                ]
-            ),
-            value(
-                getattr(mod, "GenCommit{}_Ramp_Down_Violation_MW".format(Bin_or_Lin))[
-                    prj, tmp
-                ]
-            ),
-            value(
-                getattr(mod, "GenCommit{}_Min_Up_Time_Violation".format(Bin_or_Lin))[
-                    prj, tmp
-                ]
-            ),
-            value(
-                getattr(
-                    mod,
-                    "GenCommit{}_Min_Down_Time_Violation".format(Bin_or_Lin),
-                )[prj, tmp]
-            ),
-        ]
-        for (prj, tmp) in getattr(mod, "GEN_COMMIT_{}_OPR_TMPS".format(BIN_OR_LIN))
-    ]
+    gross_power_mw = get_values("Provide_Power_MW")
+    auxiliary_consumption_mw = get_values("Auxiliary_Consumption_MW")
+    committed_units = get_values("Commit")
+
+    results = {
+        "gross_power_mw": gross_power_mw,
+        "auxiliary_consumption_mw": auxiliary_consumption_mw,
+        "net_power_mw": gross_power_mw - auxiliary_consumption_mw,
+        "committed_mw": get_values("Pmax_MW") * committed_units,
+        "committed_units": committed_units,
+        "started_units": get_values("Startup"),
+        "stopped_units": get_values("Shutdown"),
+        "synced_units": get_values("Synced"),
+        "active_startup_type": get_values("Active_Startup_Type"),
+        "ramp_up_violation": get_values("Ramp_Up_Violation_MW"),
+        "ramp_down_violation": get_values("Ramp_Down_Violation_MW"),
+        "min_up_time_violation": get_values("Min_Up_Time_Violation"),
+        "min_down_time_violation": get_values("Min_Down_Time_Violation"),
+    }
 
-    return results_columns, data
+    return list(results.keys()), results
 
 
 def export_linked_subproblem_inputs(
@@ -3671,21 +3615,18 @@ def export_linked_subproblem_inputs(
         next_subproblem = str(int(subproblem) + 1)
 
         # Export params by project and timepoint
-        with open(
-            os.path.join(
-                scenario_directory,
+        with open_state_table(
+            scenario_directory=scenario_directory,
+            problem_key=(
                 weather_iteration,
                 hydro_iteration,
                 availability_iteration,
                 next_subproblem,
                 stage,
-                "inputs",
-                "gen_commit_{}_linked_timepoint_params.tab".format(bin_or_lin),
             ),
-            "w",
-            newline="",
-        ) as f:
-            writer = csv.writer(f, delimiter="\t", lineterminator="\n")
+            subdirectory="inputs",
+            filename="gen_commit_{}_linked_timepoint_params.tab".format(bin_or_lin),
+        ) as writer:
             writer.writerow(
                 [
                     "project",
@@ -3850,20 +3791,20 @@ def export_linked_subproblem_inputs(
             # avoid throwing an index error when trying to load these inputs
             # into the next subproblem
             if getattr(mod, "GEN_COMMIT_{}_OPR_TMPS_STR_TYPES".format(BIN_OR_LIN)):
-                with open(
-                    os.path.join(
-                        scenario_directory,
+                with open_state_table(
+                    scenario_directory=scenario_directory,
+                    problem_key=(
+                        weather_iteration,
+                        hydro_iteration,
+                        availability_iteration,
                         next_subproblem,
                         stage,
-                        "inputs",
-                        "gen_commit_{}_linked_timepoint_str_type_params.tab".format(
-                            bin_or_lin
-                        ),
                     ),
-                    "w",
-                    newline="",
-                ) as f:
-                    writer = csv.writer(f, delimiter="\t", lineterminator="\n")
+                    subdirectory="inputs",
+                    filename="gen_commit_{}_linked_timepoint_str_type_params.tab".format(
+                        bin_or_lin
+                    ),
+                ) as writer:
                     writer.writerow(
                         [
                             "project",
@@ -3947,22 +3888,28 @@ def generic_constraint_column_dict(Bin_or_Lin):
     return constraint_column_dict
 
 
-def add_duals_to_dispatch_results(mod, Bin_or_Lin, BIN_OR_LIN):
+def add_duals_to_dispatch_results(mod, index, Bin_or_Lin):
+    """
+    :param mod: the solved instance
+    :param index: list of the (project, timepoint) indices of the results
+    :param Bin_or_Lin: "Bin" or "Lin"
+    :return: list of the duals columns and dictionary of the duals column
+        arrays aligned to *index* (None where the constraint doesn't exist)
+    """
     constraint_column_dict = generic_constraint_column_dict(Bin_or_Lin)
-    results_columns = [
-        constraint_column_dict[c] for c in sorted(constraint_column_dict.keys())
-    ]
-
-    data = []
-    for prj, tmp in getattr(mod, "GEN_COMMIT_{}_OPR_TMPS".format(BIN_OR_LIN)):
-        duals = []
-        for c in sorted(constraint_column_dict.keys()):
-            constraint_object = getattr(mod, c)
-            if (prj, tmp) in constraint_object:
-                duals.append(duals_wrapper(mod, constraint_object[prj, tmp]))
-            else:
-                duals.append(None)
 
-        data.append([prj, tmp] + duals)
+    results = dict()
+    for c in sorted(constraint_column_dict.keys()):
+        constraint_object = getattr(mod, c)
+        results[constraint_column_dict[c]] = to_array(
+            [
+                (
+                    duals_wrapper(mod, constraint_object[idx])
+                    if idx in constraint_object
+                    else None
+                )
+                for idx in index
+            ]
+        )
 
-    return results_columns, data
+    return list(results.keys()), results
@@ -25,8 +25,6 @@ Costs for this operational type include variable O&M costs.
 
 """
 
-import csv
-import os.path
 from pyomo.environ import (
     Var,
     Set,
@@ -45,8 +43,12 @@ from gridpath.auxiliary.auxiliary import (
     subset_init_by_param_value,
     subset_init_by_set_membership,
 )
-from gridpath.auxiliary.db_interface import directories_to_db_values
+from gridpath.auxiliary.db_interface import (
+    directories_to_db_values,
+    get_process_results_keys_filter_sql,
+)
 from gridpath.auxiliary.dynamic_components import headroom_variables, footroom_variables
+from gridpath.auxiliary.state_store import load_state_table, open_state_table
 from gridpath.project.common_functions import (
     check_if_boundary_type_and_first_timepoint,
     check_if_first_timepoint,
@@ -775,27 +777,26 @@ def load_model_data(
     )
 
     # Linked timepoint params
-    linked_inputs_filename = os.path.join(
-        scenario_directory,
-        weather_iteration,
-        hydro_iteration,
-        availability_iteration,
-        subproblem,
-        stage,
-        "inputs",
-        "gen_hydro_linked_timepoint_params.tab",
+    load_state_table(
+        data_portal=data_portal,
+        scenario_directory=scenario_directory,
+        problem_key=(
+            weather_iteration,
+            hydro_iteration,
+            availability_iteration,
+            subproblem,
+            stage,
+        ),
+        subdirectory="inputs",
+        filename="gen_hydro_linked_timepoint_params.tab",
+        index=m.GEN_HYDRO_LINKED_TMPS,
+        param=(
+            m.gen_hydro_linked_power,
+            m.gen_hydro_linked_curtailment,
+            m.gen_hydro_linked_upwards_reserves,
+            m.gen_hydro_linked_downwards_reserves,
+        ),
     )
-    if os.path.exists(linked_inputs_filename):
-        data_portal.load(
-            filename=linked_inputs_filename,
-            index=m.GEN_HYDRO_LINKED_TMPS,
-            param=(
-                m.gen_hydro_linked_power,
-                m.gen_hydro_linked_curtailment,
-                m.gen_hydro_linked_upwards_reserves,
-                m.gen_hydro_linked_downwards_reserves,
-            ),
-        )
 
 
 def add_to_prj_tmp_results(mod):
@@ -860,18 +861,18 @@ def export_results(
         next_subproblem = str(int(subproblem) + 1)
 
         # Export params by project and timepoint
-        with open(
-            os.path.join(
-                scenario_directory,
+        with open_state_table(
+            scenario_directory=scenario_directory,
+            problem_key=(
+                weather_iteration,
+                hydro_iteration,
+                availability_iteration,
                 next_subproblem,
                 stage,
-                "inputs",
-                "gen_hydro_linked_timepoint_params.tab",
             ),
-            "w",
-            newline="",
-        ) as f:
-            writer = csv.writer(f, delimiter="\t", lineterminator="\n")
+            subdirectory="inputs",
+            filename="gen_hydro_linked_timepoint_params.tab",
+        ) as writer:
             writer.writerow(
                 [
                     "project",
@@ -1000,20 +1001,25 @@ def process_model_results(db, c, scenario_id, subscenarios, quiet):
     :param quiet:
     :return:
     """
+    keys_filter = get_process_results_keys_filter_sql(
+        columns=["subproblem_id", "stage_id"]
+    )
+
     if not quiet:
         print("aggregate hydro curtailment")
 
     # Delete old aggregated hydro curtailment results
-    del_sql = """
+    del_sql = f"""
         DELETE FROM results_project_curtailment_hydro_periodagg 
         WHERE scenario_id = ?
+        AND {keys_filter};
         """
     spin_on_database_lock(
         conn=db, cursor=c, sql=del_sql, data=(scenario_id,), many=False
     )
 
     # Aggregate hydro curtailment (just scheduled curtailment)
-    agg_sql = """
+    agg_sql = f"""
         INSERT INTO results_project_curtailment_hydro_periodagg
         (scenario_id, subproblem_id, stage_id, period, timepoint, 
         timepoint_weight, number_of_hours_in_timepoint, month, hour_of_day,
@@ -1042,6 +1048,7 @@ def process_model_results(db, c, scenario_id, subscenarios, quiet):
         ) as tmp_info_tbl
         USING (subproblem_id, stage_id, timepoint)
         WHERE scenario_id = ?
+        AND {keys_filter}
         ORDER BY subproblem_id, stage_id, load_zone, timepoint;
         """
     spin_on_database_lock(
@@ -20,8 +20,6 @@ allowed, i.e. this module can be used to model pumping.
 
 """
 
-import csv
-import os.path
 from pyomo.environ import (
     Var,
     Set,
@@ -41,6 +39,7 @@ from gridpath.auxiliary.auxiliary import (
 )
 from gridpath.auxiliary.db_interface import directories_to_db_values
 from gridpath.auxiliary.dynamic_components import headroom_variables, footroom_variables
+from gridpath.auxiliary.state_store import load_state_table, open_state_table
 from gridpath.project.common_functions import (
     check_if_boundary_type_and_first_timepoint,
     check_if_first_timepoint,
@@ -705,26 +704,25 @@ def load_model_data(
     )
 
     # Linked timepoint params
-    linked_inputs_filename = os.path.join(
-        scenario_directory,
-        weather_iteration,
-        hydro_iteration,
-        availability_iteration,
-        subproblem,
-        stage,
-        "inputs",
-        "gen_hydro_must_take_linked_timepoint_params.tab",
-    )
-    if os.path.exists(linked_inputs_filename):
-        data_portal.load(
-            filename=linked_inputs_filename,
-            index=m.GEN_HYDRO_MUST_TAKE_LINKED_TMPS,
-            param=(
-                m.gen_hydro_must_take_linked_power,
-                m.gen_hydro_must_take_linked_upwards_reserves,
-                m.gen_hydro_must_take_linked_downwards_reserves,
-            ),
-        )
+    load_state_table(
+        data_portal=data_portal,
+        scenario_directory=scenario_directory,
+        problem_key=(
+            weather_iteration,
+            hydro_iteration,
+            availability_iteration,
+            subproblem,
+            stage,
+        ),
+        subdirectory="inputs",
+        filename="gen_hydro_must_take_linked_timepoint_params.tab",
+        index=m.GEN_HYDRO_MUST_TAKE_LINKED_TMPS,
+        param=(
+            m.gen_hydro_must_take_linked_power,
+            m.gen_hydro_must_take_linked_upwards_reserves,
+            m.gen_hydro_must_take_linked_downwards_reserves,
+        ),
+    )
 
 
 def add_to_prj_tmp_results(mod):
@@ -787,21 +785,18 @@ def export_results(
         next_subproblem = str(int(subproblem) + 1)
 
         # Export params by project and timepoint
-        with open(
-            os.path.join(
-                scenario_directory,
+        with open_state_table(
+            scenario_directory=scenario_directory,
+            problem_key=(
                 weather_iteration,
                 hydro_iteration,
                 availability_iteration,
                 next_subproblem,
                 stage,
-                "inputs",
-                "gen_hydro_must_take_linked_timepoint_params.tab",
             ),
-            "w",
-            newline="",
-        ) as f:
-            writer = csv.writer(f, delimiter="\t", lineterminator="\n")
+            subdirectory="inputs",
+            filename="gen_hydro_must_take_linked_timepoint_params.tab",
+        ) as writer:
             writer.writerow(
                 [
                     "project",
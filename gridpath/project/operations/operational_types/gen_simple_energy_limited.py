@@ -27,8 +27,6 @@ startup and shutdown costs.
 
 """
 
-import csv
-import os
 from pyomo.environ import (
     Set,
     Var,
@@ -50,6 +48,7 @@ from gridpath.auxiliary.validations import (
     validate_single_input,
 )
 from gridpath.auxiliary.dynamic_components import headroom_variables, footroom_variables
+from gridpath.auxiliary.state_store import load_state_table, open_state_table
 from gridpath.project.common_functions import (
     check_if_boundary_type_and_first_timepoint,
     check_if_first_timepoint,
@@ -556,26 +555,25 @@ def load_model_data(
     )
 
     # Linked timepoint params
-    linked_inputs_filename = os.path.join(
-        scenario_directory,
-        weather_iteration,
-        hydro_iteration,
-        availability_iteration,
-        subproblem,
-        stage,
-        "inputs",
-        "gen_simple_energy_limited_linked_timepoint_params.tab",
+    load_state_table(
+        data_portal=data_portal,
+        scenario_directory=scenario_directory,
+        problem_key=(
+            weather_iteration,
+            hydro_iteration,
+            availability_iteration,
+            subproblem,
+            stage,
+        ),
+        subdirectory="inputs",
+        filename="gen_simple_energy_limited_linked_timepoint_params.tab",
+        index=mod.GEN_SIMPLE_ENERGY_LIMITED_LINKED_TMPS,
+        param=(
+            mod.gen_simple_energy_limited_linked_power,
+            mod.gen_simple_energy_limited_linked_upwards_reserves,
+            mod.gen_simple_energy_limited_linked_downwards_reserves,
+        ),
     )
-    if os.path.exists(linked_inputs_filename):
-        data_portal.load(
-            filename=linked_inputs_filename,
-            index=mod.GEN_SIMPLE_ENERGY_LIMITED_LINKED_TMPS,
-            param=(
-                mod.gen_simple_energy_limited_linked_power,
-                mod.gen_simple_energy_limited_linked_upwards_reserves,
-                mod.gen_simple_energy_limited_linked_downwards_reserves,
-            ),
-        )
 
 
 def export_results(
@@ -610,18 +608,18 @@ def export_results(
         next_subproblem = str(int(subproblem) + 1)
 
         # Export params by project and timepoint
-        with open(
-            os.path.join(
-                scenario_directory,
+        with open_state_table(
+            scenario_directory=scenario_directory,
+            problem_key=(
+                weather_iteration,
+                hydro_iteration,
+                availability_iteration,
                 next_subproblem,
                 stage,
-                "inputs",
-                "gen_simple_energy_limited_linked_timepoint_params.tab",
             ),
-            "w",
-            newline="",
-        ) as f:
-            writer = csv.writer(f, delimiter="\t", lineterminator="\n")
+            subdirectory="inputs",
+            filename="gen_simple_energy_limited_linked_timepoint_params.tab",
+        ) as writer:
             writer.writerow(
                 [
                     "project",
@@ -33,7 +33,6 @@ from pyomo.environ import (
     Reals,
     NonNegativeReals,
     Expression,
-    value,
 )
 import warnings
 
@@ -42,7 +41,14 @@ from gridpath.auxiliary.auxiliary import (
     subset_init_by_param_value,
     subset_init_by_set_membership,
 )
-from gridpath.auxiliary.db_interface import directories_to_db_values
+from gridpath.auxiliary.columnar_results import (
+    get_component_values,
+    get_results_df,
+)
+from gridpath.auxiliary.db_interface import (
+    directories_to_db_values,
+    get_process_results_keys_filter_sql,
+)
 from gridpath.auxiliary.dynamic_components import (
     footroom_variables,
     headroom_variables,
@@ -64,7 +70,6 @@ from gridpath.project.operations.operational_types.common_functions import (
     validate_var_profiles,
     load_optype_model_data,
 )
-from gridpath.common_functions import create_results_df
 
 
 def add_model_components(
@@ -532,29 +537,26 @@ def load_model_data(
 
 
 def add_to_prj_tmp_results(mod):
-    results_columns = [
-        "scheduled_curtailment_mw",
-        "subhourly_curtailment_mw",
-        "subhourly_energy_delivered_mw",
-        "total_curtailment_mw",
-    ]
-    data = [
-        [
-            prj,
-            tmp,
-            value(mod.GenVar_Scheduled_Curtailment_MW[prj, tmp]),
-            value(mod.GenVar_Subhourly_Curtailment_MW[prj, tmp]),
-            value(mod.GenVar_Subhourly_Energy_Delivered_MW[prj, tmp]),
-            value(mod.GenVar_Total_Curtailment_MW[prj, tmp]),
-        ]
-        for (prj, tmp) in mod.GEN_VAR_OPR_TMPS
-    ]
-
-    optype_dispatch_df = create_results_df(
+    index = list(mod.GEN_VAR_OPR_TMPS)
+    optype_dispatch_df = get_results_df(
         index_columns=["project", "timepoint"],
-        results_columns=results_columns,
-        data=data,
+        index=index,
+        results_columns={
+            "scheduled_curtailment_mw": get_component_values(
+                mod.GenVar_Scheduled_Curtailment_MW, index=index
+            ),
+            "subhourly_curtailment_mw": get_component_values(
+                mod.GenVar_Subhourly_Curtailment_MW, index=index
+            ),
+            "subhourly_energy_delivered_mw": get_component_values(
+                mod.GenVar_Subhourly_Energy_Delivered_MW, index=index
+            ),
+            "total_curtailment_mw": get_component_values(
+                mod.GenVar_Total_Curtailment_MW, index=index
+            ),
+        },
     )
+    results_columns = list(optype_dispatch_df.columns)
 
     return results_columns, optype_dispatch_df
 
@@ -663,20 +665,25 @@ def process_model_results(db, c, scenario_id, subscenarios, quiet):
     :param quiet:
     :return:
     """
+    keys_filter = get_process_results_keys_filter_sql(
+        columns=["subproblem_id", "stage_id"]
+    )
+
     if not quiet:
         print("aggregate variable curtailment")
 
     # Delete old aggregated variable curtailment results
-    del_sql = """
+    del_sql = f"""
         DELETE FROM results_project_curtailment_variable_periodagg 
-        WHERE scenario_id = ?;
+        WHERE scenario_id = ?
+        AND {keys_filter};
         """
     spin_on_database_lock(
         conn=db, cursor=c, sql=del_sql, data=(scenario_id,), many=False
     )
 
     # Aggregate variable curtailment (just scheduled curtailment)
-    insert_sql = """
+    insert_sql = f"""
         INSERT INTO results_project_curtailment_variable_periodagg
         (scenario_id, subproblem_id, stage_id, period, timepoint, 
         timepoint_weight, number_of_hours_in_timepoint, month, hour_of_day,
@@ -705,6 +712,7 @@ def process_model_results(db, c, scenario_id, subscenarios, quiet):
         ) as tmp_info_tbl
         USING (subproblem_id, stage_id, timepoint)
         WHERE scenario_id = ?
+        AND {keys_filter}
         ORDER BY subproblem_id, stage_id, load_zone, timepoint;"""
 
     spin_on_database_lock(
@@ -55,7 +55,10 @@ from gridpath.auxiliary.auxiliary import (
     subset_init_by_param_value,
     subset_init_by_set_membership,
 )
-from gridpath.auxiliary.db_interface import directories_to_db_values
+from gridpath.auxiliary.db_interface import (
+    directories_to_db_values,
+    get_process_results_keys_filter_sql,
+)
 from gridpath.auxiliary.dynamic_components import (
     footroom_variables,
     headroom_variables,
@@ -982,20 +985,25 @@ def process_model_results(db, c, scenario_id, subscenarios, quiet):
     :param quiet:
     :return:
     """
+    keys_filter = get_process_results_keys_filter_sql(
+        columns=["subproblem_id", "stage_id"]
+    )
+
     if not quiet:
         print("aggregate variable curtailment")
 
     # Delete old aggregated variable curtailment results
-    del_sql = """
+    del_sql = f"""
         DELETE FROM results_project_curtailment_variable_periodagg 
-        WHERE scenario_id = ?;
+        WHERE scenario_id = ?
+        AND {keys_filter};
         """
     spin_on_database_lock(
         conn=db, cursor=c, sql=del_sql, data=(scenario_id,), many=False
     )
 
     # Aggregate variable curtailment (just scheduled curtailment)
-    insert_sql = """
+    insert_sql = f"""
         INSERT INTO results_project_curtailment_variable_periodagg
         (scenario_id, subproblem_id, stage_id, period, timepoint, 
         timepoint_weight, number_of_hours_in_timepoint, month, hour_of_day,
@@ -1024,6 +1032,7 @@ def process_model_results(db, c, scenario_id, subscenarios, quiet):
         ) as tmp_info_tbl
         USING (subproblem_id, stage_id, timepoint)
         WHERE scenario_id = ?
+        AND {keys_filter}
         ORDER BY subproblem_id, stage_id, load_zone, timepoint;"""
 
     spin_on_database_lock(
@@ -38,7 +38,6 @@ Costs for this operational type include variable O&M costs.
 """
 
 
-import csv
 import os.path
 from pyomo.environ import (
     Var,
@@ -58,6 +57,7 @@ from gridpath.auxiliary.auxiliary import (
 )
 from gridpath.auxiliary.db_interface import directories_to_db_values
 from gridpath.auxiliary.dynamic_components import headroom_variables, footroom_variables
+from gridpath.auxiliary.state_store import load_state_table, open_state_table
 from gridpath.project.common_functions import (
     check_if_first_timepoint,
     check_if_last_timepoint,
@@ -879,26 +879,25 @@ def load_model_data(
     )
 
     # Linked timepoint params
-    linked_inputs_filename = os.path.join(
-        scenario_directory,
-        weather_iteration,
-        hydro_iteration,
-        availability_iteration,
-        subproblem,
-        stage,
-        "inputs",
-        "stor_linked_timepoint_params.tab",
+    load_state_table(
+        data_portal=data_portal,
+        scenario_directory=scenario_directory,
+        problem_key=(
+            weather_iteration,
+            hydro_iteration,
+            availability_iteration,
+            subproblem,
+            stage,
+        ),
+        subdirectory="inputs",
+        filename="stor_linked_timepoint_params.tab",
+        index=mod.STOR_LINKED_TMPS,
+        param=(
+            mod.stor_linked_starting_energy_in_storage,
+            mod.stor_linked_discharge,
+            mod.stor_linked_charge,
+        ),
     )
-    if os.path.exists(linked_inputs_filename):
-        data_portal.load(
-            filename=linked_inputs_filename,
-            index=mod.STOR_LINKED_TMPS,
-            param=(
-                mod.stor_linked_starting_energy_in_storage,
-                mod.stor_linked_discharge,
-                mod.stor_linked_charge,
-            ),
-        )
 
     # Exogenously specified SOC
     exog_soc_filename = os.path.join(
@@ -983,18 +982,18 @@ def export_results(
         next_subproblem = str(int(subproblem) + 1)
 
         # Export params by project and timepoint
-        with open(
-            os.path.join(
-                scenario_directory,
+        with open_state_table(
+            scenario_directory=scenario_directory,
+            problem_key=(
+                weather_iteration,
+                hydro_iteration,
+                availability_iteration,
                 next_subproblem,
                 stage,
-                "inputs",
-                "stor_linked_timepoint_params.tab",
             ),
-            "w",
-            newline="",
-        ) as f:
-            writer = csv.writer(f, delimiter="\t", lineterminator="\n")
+            subdirectory="inputs",
+            filename="stor_linked_timepoint_params.tab",
+        ) as writer:
             writer.writerow(
                 [
                     "project",
@@ -21,11 +21,17 @@ power that a project is providing in each study timepoint.
 
 import os.path
 import pandas as pd
-from pyomo.environ import Expression, value, Constraint
+from pyomo.environ import Expression, Constraint
 
 from db.common_functions import spin_on_database_lock
+from gridpath.auxiliary.db_interface import get_process_results_keys_filter_sql
 from gridpath.auxiliary.auxiliary import get_required_subtype_modules
-from gridpath.common_functions import create_results_df
+from gridpath.auxiliary.columnar_results import (
+    get_component_values,
+    get_results_df,
+    update_results_df,
+)
+from gridpath.auxiliary.results_io import read_results_df
 from gridpath.project.operations.common_functions import load_operational_type_modules
 import gridpath.project.operations.operational_types as op_type_init
 from gridpath.project import PROJECT_TIMEPOINT_DF
@@ -158,25 +164,19 @@ def export_results(
     Nothing
     """
 
-    results_columns = ["project_power_mw", "power_mw"]
-    data = [
-        [
-            prj,
-            tmp,
-            value(m.Project_Power_Provision_MW[prj, tmp]),
-            value(m.Bulk_Power_Provision_MW[prj, tmp]),
-        ]
-        for (prj, tmp) in m.PRJ_OPR_TMPS
-    ]
-    results_df = create_results_df(
+    index = list(m.PRJ_OPR_TMPS)
+    results_df = get_results_df(
         index_columns=["project", "timepoint"],
-        results_columns=results_columns,
-        data=data,
+        index=index,
+        results_columns={
+            "project_power_mw": get_component_values(
+                m.Project_Power_Provision_MW, index=index
+            ),
+            "power_mw": get_component_values(m.Bulk_Power_Provision_MW, index=index),
+        },
     )
 
-    for c in results_columns:
-        getattr(d, PROJECT_TIMEPOINT_DF)[c] = None
-    getattr(d, PROJECT_TIMEPOINT_DF).update(results_df)
+    update_results_df(df=getattr(d, PROJECT_TIMEPOINT_DF), results_df=results_df)
 
     required_operational_modules = get_required_subtype_modules(
         scenario_directory=scenario_directory,
@@ -199,10 +199,7 @@ def export_results(
             results_columns, optype_df = imported_operational_modules[
                 optype_module
             ].add_to_prj_tmp_results(mod=m)
-            for column in results_columns:
-                if column not in getattr(d, PROJECT_TIMEPOINT_DF):
-                    getattr(d, PROJECT_TIMEPOINT_DF)[column] = None
-            getattr(d, PROJECT_TIMEPOINT_DF).update(optype_df)
+            update_results_df(df=getattr(d, PROJECT_TIMEPOINT_DF), results_df=optype_df)
 
 
 def summarize_results(
@@ -242,9 +239,9 @@ def summarize_results(
     # zone, technology, and period
     # Note: this includes power from spinup_or_lookahead timepoints as well!
 
-    # Get the results CSV as dataframe
-    operational_results_df = pd.read_csv(
-        os.path.join(
+    # Get the results (CSV or Parquet) as dataframe
+    operational_results_df = read_results_df(
+        results_directory=os.path.join(
             scenario_directory,
             weather_iteration,
             hydro_iteration,
@@ -252,9 +249,17 @@ def summarize_results(
             subproblem,
             stage,
             "results",
-            "project_timepoint.csv",
-        )
-    )[["project", "load_zone", "period", "technology", "power_mw", "timepoint_weight"]]
+        ),
+        results_name="project_timepoint",
+        columns=[
+            "project",
+            "load_zone",
+            "period",
+            "technology",
+            "power_mw",
+            "timepoint_weight",
+        ],
+    )
 
     operational_results_df["weighted_power_mwh"] = (
         operational_results_df["power_mw"] * operational_results_df["timepoint_weight"]
@@ -335,20 +340,23 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
     :param quiet:
     :return:
     """
+    keys_filter = get_process_results_keys_filter_sql()
+
     if not quiet:
         print("aggregate dispatch by technology")
 
     # Delete old dispatch by technology
-    del_sql = """
+    del_sql = f"""
         DELETE FROM results_project_dispatch_by_technology 
         WHERE scenario_id = ?
+        AND {keys_filter}
         """
     spin_on_database_lock(
         conn=db, cursor=c, sql=del_sql, data=(scenario_id,), many=False
     )
 
     # Aggregate dispatch by technology
-    agg_sql = """
+    agg_sql = f"""
         INSERT INTO results_project_dispatch_by_technology (
             scenario_id, 
             weather_iteration, 
@@ -382,6 +390,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
             sum(power_mw) AS power_mw
         FROM results_project_timepoint
         WHERE scenario_id = ?
+        AND {keys_filter}
         GROUP BY 
             weather_iteration, 
             hydro_iteration, 
@@ -408,16 +417,17 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         print("aggregate dispatch by technology-period")
 
     # Delete old dispatch by technology
-    del_sql = """
+    del_sql = f"""
         DELETE FROM results_project_dispatch_by_technology_period 
         WHERE scenario_id = ?
+        AND {keys_filter}
         """
     spin_on_database_lock(
         conn=db, cursor=c, sql=del_sql, data=(scenario_id,), many=False
     )
 
     # Aggregate dispatch by technology, period, and spinup_or_lookahead
-    agg_sql = """
+    agg_sql = f"""
         INSERT INTO results_project_dispatch_by_technology_period (
             scenario_id, 
             weather_iteration, 
@@ -442,6 +452,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
             SUM(power_mw * timepoint_weight * number_of_hours_in_timepoint ) AS energy_mwh 
         FROM results_project_dispatch_by_technology
         WHERE scenario_id = ?
+        AND {keys_filter}
         GROUP BY 
             weather_iteration, 
             hydro_iteration, 
@@ -19,11 +19,15 @@ Add project-level components for frequency response reserves
 import csv
 import os.path
 import pandas as pd
-from pyomo.environ import Set, value
+from pyomo.environ import Set
 
 from gridpath.auxiliary.db_interface import directories_to_db_values
 from gridpath.auxiliary.dynamic_components import headroom_variables
-from gridpath.common_functions import create_results_df
+from gridpath.auxiliary.columnar_results import (
+    get_component_values,
+    get_results_df,
+    update_results_df,
+)
 from gridpath.project import PROJECT_TIMEPOINT_DF
 from gridpath.project.operations.reserves.reserve_provision import (
     generic_record_dynamic_components,
@@ -236,31 +240,24 @@ def export_results(
         else:
             partial_proj[prj] = 0
 
-    results_columns = [
-        "frequency_response_ba",
-        "frequency_response_reserve_provision_mw",
-        "frequency_response_partial_reserve_provision",
-    ]
-    data = [
-        [
-            prj,
-            tmp,
-            m.frequency_response_ba[prj],
-            value(m.Provide_Frequency_Response_MW[prj, tmp]),
-            partial_proj[prj],
-        ]
-        for (prj, tmp) in m.FREQUENCY_RESPONSE_PRJ_OPR_TMPS
-    ]
-
-    results_df = create_results_df(
+    index = list(m.FREQUENCY_RESPONSE_PRJ_OPR_TMPS)
+    results_df = get_results_df(
         index_columns=["project", "timepoint"],
-        results_columns=results_columns,
-        data=data,
+        index=index,
+        results_columns={
+            "frequency_response_ba": [
+                m.frequency_response_ba[prj] for (prj, tmp) in index
+            ],
+            "frequency_response_reserve_provision_mw": get_component_values(
+                m.Provide_Frequency_Response_MW, index=index
+            ),
+            "frequency_response_partial_reserve_provision": [
+                partial_proj[prj] for (prj, tmp) in index
+            ],
+        },
     )
 
-    for c in results_columns:
-        getattr(d, PROJECT_TIMEPOINT_DF)[c] = None
-    getattr(d, PROJECT_TIMEPOINT_DF).update(results_df)
+    update_results_df(df=getattr(d, PROJECT_TIMEPOINT_DF), results_df=results_df)
 
 
 def get_inputs_from_database(
@@ -16,7 +16,7 @@
 import csv
 import os.path
 import pandas as pd
-from pyomo.environ import Set, Param, Var, NonNegativeReals, PercentFraction, value
+from pyomo.environ import Set, Param, Var, NonNegativeReals, PercentFraction
 
 from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.db_interface import directories_to_db_values
@@ -31,7 +31,11 @@ from gridpath.auxiliary.dynamic_components import (
     reserve_variable_derate_params,
     reserve_to_energy_adjustment_params,
 )
-from gridpath.common_functions import create_results_df
+from gridpath.auxiliary.columnar_results import (
+    get_component_values,
+    get_results_df,
+    update_results_df,
+)
 from gridpath.project import PROJECT_TIMEPOINT_DF
 
 
@@ -427,30 +431,20 @@ def generic_export_results(
     :return:
     """
 
-    results_columns = [
-        f"{module_name}_ba",
-        f"{module_name}_reserve_provision_mw",
-    ]
-
-    data = [
-        [
-            prj,
-            tmp,
-            getattr(m, reserve_ba_param_name)[prj],
-            value(getattr(m, reserve_provision_variable_name)[prj, tmp]),
-        ]
-        for (prj, tmp) in getattr(m, reserve_project_operational_timepoints_set)
-    ]
-
-    results_df = create_results_df(
+    index = list(getattr(m, reserve_project_operational_timepoints_set))
+    reserve_ba = getattr(m, reserve_ba_param_name)
+    results_df = get_results_df(
         index_columns=["project", "timepoint"],
-        results_columns=results_columns,
-        data=data,
+        index=index,
+        results_columns={
+            f"{module_name}_ba": [reserve_ba[prj] for (prj, tmp) in index],
+            f"{module_name}_reserve_provision_mw": get_component_values(
+                getattr(m, reserve_provision_variable_name), index=index
+            ),
+        },
     )
 
-    for c in results_columns:
-        getattr(d, PROJECT_TIMEPOINT_DF)[c] = None
-    getattr(d, PROJECT_TIMEPOINT_DF).update(results_df)
+    update_results_df(df=getattr(d, PROJECT_TIMEPOINT_DF), results_df=results_df)
 
 
 def generic_get_inputs_from_database(
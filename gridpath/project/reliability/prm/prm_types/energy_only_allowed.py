@@ -35,7 +35,10 @@ from gridpath.auxiliary.auxiliary import (
     subset_init_by_param_value,
     subset_init_by_set_membership,
 )
-from gridpath.auxiliary.db_interface import import_csv
+from gridpath.auxiliary.db_interface import (
+    get_process_results_keys_filter_sql,
+    import_csv,
+)
 
 # TODO: rename deliverability_group_deliverability_cost_per_mw --> deliverability_group_deliverability_cost_per_mw_yr
 
@@ -220,6 +223,10 @@ def process_model_results(db, c, scenario_id, subscenarios, quiet):
     :param quiet:
     :return:
     """
+    keys_filter = get_process_results_keys_filter_sql(
+        columns=["subproblem_id", "stage_id"]
+    )
+
     if not quiet:
         print("update energy-only capacities")
 
@@ -253,17 +260,18 @@ def process_model_results(db, c, scenario_id, subscenarios, quiet):
     # Aggregate costs by period and break out into spinup_or_lookahead.
 
     # Delete old resulst
-    del_sql = """
+    del_sql = f"""
         DELETE FROM 
         results_project_deliverability_groups_agg 
         WHERE scenario_id = ?
+        AND {keys_filter}
         """
     spin_on_database_lock(
         conn=db, cursor=c, sql=del_sql, data=(scenario_id,), many=False
     )
 
     # Insert new results
-    agg_sql = """
+    agg_sql = f"""
         INSERT INTO 
         results_project_deliverability_groups_agg
         (scenario_id, period, subproblem_id, stage_id,
@@ -284,6 +292,7 @@ def process_model_results(db, c, scenario_id, subscenarios, quiet):
         SUM(deliverability_annual_cost_in_period) AS deliverable_capacity_cost
         FROM results_project_deliverability_groups
         WHERE scenario_id = ?
+        AND {keys_filter}
         GROUP BY scenario_id, subproblem_id, stage_id, period
         ) AS cap_table
         USING (scenario_id, subproblem_id, stage_id, period)
@@ -19,6 +19,17 @@ scenario end-to-end, i.e. get the scenario inputs from the database,
 solve the scenario problem, import the results the database and perform any
 necessary results-processing.
 
+With the --pipeline option, the get_inputs, run_scenario, and
+import_results steps are run as a pipeline by (iteration, subproblem)
+instead of one after another for the whole scenario: the inputs for the
+next subproblems are written in one thread and the results of the previous
+subproblems are imported into the database in another thread while the
+current subproblem is solved. The stages communicate through bounded queues
+(see --pipeline_queue_size), so the input writing can't run far ahead of the
+solver, and a single database-writer thread imports all results to avoid
+SQLite lock contention between writers. Subproblems are solved one at a
+time in this mode.
+
 The main() function of this script can also be called with the
 *gridpath_process_results* command when GridPath is installed.
 """
@@ -27,11 +38,18 @@ from argparse import ArgumentParser
 import datetime
 import logging
 import os
+import queue
 import signal
 import sys
+import threading
+import warnings
 
 # GridPath modules
-from db.common_functions import connect_to_database, spin_on_database_lock
+from db.common_functions import (
+    connect_to_database,
+    set_wal_journal_mode,
+    spin_on_database_lock,
+)
 from gridpath.common_functions import (
     get_db_parser,
     get_run_scenario_parser,
@@ -41,6 +59,8 @@ from gridpath.common_functions import (
     Logging,
     determine_scenario_directory,
     get_import_results_parser,
+    get_process_results_parser,
+    create_directory_if_not_exists,
 )
 from gridpath import (
     get_scenario_inputs,
@@ -51,6 +71,20 @@ from gridpath import (
 from gridpath.run_scenario import _export_rule, _summarize_rule
 from gridpath.import_scenario_results import _import_rule
 from gridpath.auxiliary.db_interface import get_scenario_id_and_name
+from gridpath.auxiliary.module_list import determine_modules, ModuleRegistry
+from gridpath.auxiliary.scenario_chars import (
+    OptionalFeatures,
+    SubScenarios,
+    get_scenario_structure_from_db,
+    SolverOptions,
+    ScenarioDirectoryStructure,
+    get_iteration_directories_list,
+)
+from db.utilities.scenario import delete_scenario_results
+
+# Seconds to wait on a pipeline queue before checking whether another
+# pipeline stage has failed
+PIPELINE_POLL_INTERVAL = 1
 
 
 def parse_arguments(args):
@@ -70,6 +104,7 @@ def parse_arguments(args):
             get_run_scenario_parser(),
             get_get_inputs_parser(),
             get_import_results_parser(),
+            get_process_results_parser(),
         ],
     )
 
@@ -99,6 +134,23 @@ def parse_arguments(args):
         help="Skip the 'process_results' E2E step.",
     )
 
+    # Pipeline the get_inputs, run_scenario, and import_results steps
+    parser.add_argument(
+        "--pipeline",
+        default=False,
+        action="store_true",
+        help="Write the inputs, solve, and import the results of the "
+        "subproblems as a pipeline, overlapping the input writing and "
+        "results import with the solve. Subproblems are solved one at a time.",
+    )
+    parser.add_argument(
+        "--pipeline_queue_size",
+        default=1,
+        type=int,
+        help="The maximum number of subproblems waiting to be solved or "
+        "imported in pipeline mode. Defaults to 1.",
+    )
+
     # Run only a single E2E step
     parser.add_argument(
         "--single_e2e_step_only",
@@ -357,6 +409,49 @@ def main(args=None):
         skip_import_results = False
         skip_process_results = False
 
+    expected_objective_values = None
+
+    # Run the get_inputs, run_scenario, and import_results steps as a
+    # pipeline if requested (and none of them are skipped)
+    if parsed_args.pipeline:
+        if (
+            skip_get_inputs
+            or skip_run_scenario
+            or skip_import_results
+            or parsed_args.skip_get_inputs
+            or parsed_args.skip_run_scenario
+            or parsed_args.skip_import_results
+        ):
+            warnings.warn(
+                "GridPath WARNING: the pipeline mode requires the get_inputs, "
+                "run_scenario, and import_results steps. Running the steps "
+                "one after another."
+            )
+        else:
+            try:
+                expected_objective_values = run_pipelined(
+                    args=args,
+                    scenario=scenario,
+                    queue_size=parsed_args.pipeline_queue_size,
+                )
+            except Exception as e:
+                logging.exception(e)
+                end_time = update_db_for_run_end(
+                    db_path=db_path,
+                    scenario=scenario,
+                    queue_order_id=queue_order_id,
+                    process_id=process_id,
+                    run_status_id=3,
+                )
+                print(
+                    "Error encountered when running scenario {} in pipeline "
+                    "mode. End time: {}.".format(scenario, end_time)
+                )
+                sys.exit(1)
+            skip_get_inputs = True
+            skip_run_scenario = True
+            skip_import_results = True
+
     # Go through the steps if user has not requested to skip them
     if not skip_get_inputs and not parsed_args.skip_get_inputs:
         try:
@@ -398,8 +493,6 @@ def main(args=None):
                 )
             )
             sys.exit(1)
-    else:
-        expected_objective_values = None
 
     if not skip_import_results and not parsed_args.skip_import_results:
         try:
@@ -460,6 +553,306 @@ def main(args=None):
         return expected_objective_values
 
 
+def run_pipelined(args, scenario, queue_size):
+    """
+    :param args: the script arguments
+    :param scenario: the scenario name
+    :param queue_size: int, the maximum number of subproblems waiting in
+        each pipeline queue
+    :return: the objective function values by (iteration, subproblem) and
+        stage
+
+    Write the inputs, solve, and import the results of the scenario's
+    (iteration, subproblem) problems as a pipeline. An input-writer thread
+    writes the inputs of each subproblem (all stages) and passes it to the
+    solver through a bounded queue; the current thread solves the subproblems
+    in order and passes them to a single database-writer thread that imports
+    their results. If any stage fails, the others stop and the error is
+    raised here.
+    """
+    get_inputs_args = get_scenario_inputs.parse_arguments(args=args)
+    run_scenario_args = run_scenario.parse_arguments(args + ["--scenario", scenario])
+    import_results_args = import_scenario_results.parse_arguments(args=args)
+    db_path = get_inputs_args.database
+    quiet = get_inputs_args.quiet
+
+    # Get the scenario characteristics and write the scenario-level files
+    conn = connect_to_database(db_path=db_path)
+    scenario_id, scenario_name = get_scenario_id_and_name(
+        scenario_id_arg=get_inputs_args.scenario_id,
+        scenario_name_arg=scenario,
+        c=conn.cursor(),
+        script="run_end_to_end",
+    )
+    scenario_directory = determine_scenario_directory(
+        scenario_location=get_inputs_args.scenario_location,
+        scenario_name=scenario_name,
+    )
+    create_directory_if_not_exists(directory=scenario_directory)
+
+    optional_features = OptionalFeatures(conn=conn, scenario_id=scenario_id)
+    subscenarios = SubScenarios(conn=conn, scenario_id=scenario_id)
+    scenario_structure = get_scenario_structure_from_db(
+        conn=conn, scenario_id=scenario_id
+    )
+    solver_options = SolverOptions(conn=conn, scenario_id=scenario_id)
+
+    get_scenario_inputs.delete_prior_aux_files(scenario_directory=scenario_directory)
+    get_scenario_inputs.write_scenario_files(
+        scenario_directory=scenario_directory,
+        scenario_id=scenario_id,
+        scenario_name=scenario_name,
+        optional_features=optional_features,
+        subscenarios=subscenarios,
+        solver_options=solver_options,
+        conn=conn,
+    )
+    conn.close()
+
+    # The same modules are used to write the inputs, solve, and import the
+    # results
+    module_registry = ModuleRegistry(
+        modules_to_use=determine_modules(
+            features=optional_features.get_active_features(),
+            multi_stage=scenario_structure.MULTI_STAGE,
+        )
+    )
+
+    subproblem_stage_directory_strings = ScenarioDirectoryStructure(
+        scenario_structure
+    ).SUBPROBLEM_STAGE_DIRECTORIES
+    subproblems = [
+        (
+            weather_iteration_str,
+            hydro_iteration_str,
+            availability_iteration_str,
+            subproblem_str,
+        )
+        for (
+            weather_iteration_str,
+            hydro_iteration_str,
+            availability_iteration_str,
+        ) in get_iteration_directories_list(
+            iteration_directory_strings=ScenarioDirectoryStructure(
+                scenario_structure
+            ).ITERATION_DIRECTORIES
+        )
+        for subproblem_str in subproblem_stage_directory_strings.keys()
+    ]
+
+    # Linked subproblems export inputs to the next subproblem, so we must
+    # not solve a subproblem before the next subproblem's inputs have been
+    # written (writing the inputs deletes prior input files)
+    linked_subproblems = os.path.exists(
+        os.path.join(scenario_directory, "linked_subproblems_map.csv")
+    )
+
+    # Write the inputs that don't vary by iteration, subproblem, or stage
+    # only once
+    shared_inputs = None
+    pool_data = [
+        [scenario_directory, *subproblem, stage_str]
+        for subproblem in subproblems
+        for stage_str in subproblem_stage_directory_strings[subproblem[3]]
+    ]
+    if get_inputs_args.deduplicate_inputs:
+        shared_inputs, pool_data = get_scenario_inputs.write_shared_inputs(
+            pool_data=pool_data,
+            module_registry=module_registry,
+            scenario_id=scenario_id,
+            subscenarios=subscenarios,
+            db_path=db_path,
+        )
+    inputs_to_write = set(tuple(pool_datum[1:]) for pool_datum in pool_data)
+
+    inputs_queue = queue.Queue(maxsize=queue_size)
+    results_queue = queue.Queue(maxsize=queue_size)
+    inputs_written = {s: threading.Event() for s in subproblems}
+    stop = threading.Event()
+    errors = []
+
+    def write_inputs_stage():
+        try:
+            for subproblem in subproblems:
+                if stop.is_set():
+                    break
+                (
+                    weather_iteration_str,
+                    hydro_iteration_str,
+                    availability_iteration_str,
+                    subproblem_str,
+                ) = subproblem
+                for stage_str in subproblem_stage_directory_strings[subproblem_str]:
+                    if (*subproblem, stage_str) not in inputs_to_write:
+                        continue
+                    get_scenario_inputs.write_inputs(
+                        scenario_directory=scenario_directory,
+                        weather_iteration_str=weather_iteration_str,
+                        hydro_iteration_str=hydro_iteration_str,
+                        availability_iteration_str=availability_iteration_str,
+                        subproblem_str=subproblem_str,
+                        stage_str=stage_str,
+                        module_registry=module_registry,
+                        scenario_id=scenario_id,
+                        subscenarios=subscenarios,
+                        db_path=db_path,
+                        shared_inputs=shared_inputs,
+                    )
+                inputs_written[subproblem].set()
+                put_in_pipeline_queue(inputs_queue, subproblem, stop)
+            if shared_inputs is not None and not stop.is_set():
+                shared_inputs.check_shared_files()
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            put_in_pipeline_queue(inputs_queue, None, stop)
+
+    def import_results_stage():
+        db = connect_to_database(db_path=db_path)
+        set_wal_journal_mode(conn=db)
+        try:
+            # Delete all previous results for this scenario_id
+            delete_scenario_results(conn=db, scenario_id=scenario_id)
+            while True:
+                subproblem = get_from_pipeline_queue(results_queue, stop)
+                if subproblem is None:
+                    break
+                (
+                    weather_iteration_str,
+                    hydro_iteration_str,
+                    availability_iteration_str,
+                    subproblem_str,
+                ) = subproblem
+                import_scenario_results.import_subproblem_results_into_database(
+                    import_rule=import_results_args.results_import_rule,
+                    module_registry=module_registry,
+                    scenario_id=scenario_id,
+                    db=db,
+                    scenario_directory=scenario_directory,
+                    weather_iteration_str=weather_iteration_str,
+                    hydro_iteration_str=hydro_iteration_str,
+                    availability_iteration_str=availability_iteration_str,
+                    subproblem_str=subproblem_str,
+                    stage_strs=subproblem_stage_directory_strings[subproblem_str],
+                    quiet=quiet,
+                )
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            db.close()
+
+    input_writer = threading.Thread(target=write_inputs_stage, daemon=True)
+    db_writer = threading.Thread(target=import_results_stage, daemon=True)
+    input_writer.start()
+    db_writer.start()
+
+    objective_values = {}
+    try:
+        while True:
+            subproblem = get_from_pipeline_queue(inputs_queue, stop)
+            if subproblem is None:
+                break
+            (
+                weather_iteration_str,
+                hydro_iteration_str,
+                availability_iteration_str,
+                subproblem_str,
+            ) = subproblem
+
+            if linked_subproblems:
+                next_index = subproblems.index(subproblem) + 1
+                if next_index < len(subproblems):
+                    while not inputs_written[subproblems[next_index]].wait(
+                        PIPELINE_POLL_INTERVAL
+                    ):
+                        if stop.is_set():
+                            break
+
+            if stop.is_set():
+                break
+
+            if scenario_structure.MULTI_STAGE:
+                run_scenario.create_pass_through_inputs(
+                    scenario_directory,
+                    module_registry,
+                    subproblem_str,
+                    weather_iteration_str,
+                    hydro_iteration_str,
+                    availability_iteration_str,
+                )
+
+            objective_values[
+                (
+                    weather_iteration_str,
+                    hydro_iteration_str,
+                    availability_iteration_str,
+                    1 if subproblem_str == "" else int(subproblem_str),
+                )
+            ] = {}
+            run_scenario.run_optimization_for_subproblem(
+                scenario_directory=scenario_directory,
+                weather_iteration_directory=weather_iteration_str,
+                hydro_iteration_directory=hydro_iteration_str,
+                availability_iteration_directory=availability_iteration_str,
+                subproblem_directory=subproblem_str,
+                stage_directories=subproblem_stage_directory_strings[subproblem_str],
+                module_registry=module_registry,
+                parsed_arguments=run_scenario_args,
+                objective_values=objective_values,
+            )
+            put_in_pipeline_queue(results_queue, subproblem, stop)
+    except Exception:
+        stop.set()
+        raise
+    finally:
+        put_in_pipeline_queue(results_queue, None, stop)
+        input_writer.join()
+        db_writer.join()
+
+    if errors:
+        raise errors[0]
+
+    return objective_values
+
+
+def put_in_pipeline_queue(pipeline_queue, item, stop):
+    """
+    :param pipeline_queue: the bounded queue between two pipeline stages
+    :param item: the item to put in the queue
+    :param stop: threading.Event set when a pipeline stage has failed
+    :return:
+
+    Wait for room in the queue unless the pipeline has been stopped.
+    """
+    while True:
+        try:
+            pipeline_queue.put(item, timeout=PIPELINE_POLL_INTERVAL)
+            return
+        except queue.Full:
+            if stop.is_set():
+                return
+
+
+def get_from_pipeline_queue(pipeline_queue, stop):
+    """
+    :param pipeline_queue: the bounded queue between two pipeline stages
+    :param stop: threading.Event set when a pipeline stage has failed
+    :return: the next item in the queue or None if the pipeline has been
+        stopped
+
+    Wait for the next item in the queue unless the pipeline has been
+    stopped.
+    """
+    while True:
+        try:
+            return pipeline_queue.get(timeout=PIPELINE_POLL_INTERVAL)
+        except queue.Empty:
+            if stop.is_set():
+                return None
+
+
 def update_db_for_run_end(db_path, scenario, queue_order_id, process_id, run_status_id):
     """
     Make the necessary database updates when a run ends (remove from queue,
@@ -24,10 +24,9 @@ import argparse
 from csv import reader, writer
 import datetime
 import dill
-import json
-from multiprocessing import get_context, Manager
+import functools
 import os.path
-import xml.etree.ElementTree as ET
+import time
 
 from pyomo.environ import (
     AbstractModel,
@@ -41,13 +40,15 @@ from pyomo.environ import (
 # from pyomo.util.infeasible import log_infeasible_constraints
 from pyomo.common.timing import report_timing
 from pyomo.common.tempfiles import TempfileManager
-from pyomo.core import ComponentUID, SymbolMap
+from pyomo.core import SymbolMap
 from pyomo.opt import ReaderFactory, ResultsFormat, ProblemFormat
+from pyomo.solvers.plugins.solvers.persistent_solver import PersistentSolver
 import sys
 import warnings
 
 from gridpath.auxiliary.import_export_rules import import_export_rules
 from gridpath.auxiliary.scenario_chars import (
+    get_iteration_directories_list,
     get_scenario_structure_from_disk,
     ScenarioDirectoryStructure,
 )
@@ -60,8 +61,31 @@ from gridpath.common_functions import (
     Logging,
     ensure_empty_string,
 )
-from gridpath.auxiliary.dynamic_components import DynamicComponents
-from gridpath.auxiliary.module_list import determine_modules, load_modules
+from gridpath.auxiliary.dynamic_components import (
+    DynamicComponents,
+    results_format as dynamic_components_results_format,
+)
+from gridpath.auxiliary.input_cache import clear_input_cache, get_input_cache_stats
+from gridpath.auxiliary.module_list import ModuleRegistry
+from gridpath.auxiliary.persistent_model import (
+    get_persistent_model,
+    record_rule_reads,
+)
+from gridpath.auxiliary.profiler import (
+    Profiler,
+    profile_construction_phase,
+    profile_phase,
+)
+from gridpath.auxiliary.solution_loaders import (
+    SYMBOL_INDEX_FILENAME,
+    SolutionLoader,
+    SymbolIndex,
+    iter_cplex_xml_solution,
+    iter_json_members,
+)
+from gridpath.auxiliary.state_store import clear_state_store, configure_state_store
+from gridpath.auxiliary.warm_start import WarmStart, save_solution_values
+from gridpath.auxiliary.worker_pool import create_worker_pool, get_worker_context
 
 
 def create_problem(
@@ -71,14 +95,17 @@ def create_problem(
     availability_iteration,
     subproblem,
     stage,
-    multi_stage,
+    module_registry,
     parsed_arguments,
+    profiler=None,
 ):
     """
     :param scenario_directory: the main scenario directory
     :param subproblem: the horizon subproblem name
     :param stage: the stage subproblem name
+    :param module_registry: the scenario's ModuleRegistry
     :param parsed_arguments: the user-defined script arguments
+    :param profiler: the Profiler object (None if not profiling)
     :return: modules_to_use (list of module names used in scenario),
         loaded_modules (Python objects), dynamic_inputs (the populated
         dynamic components class), instance (the problem instance), results
@@ -90,10 +117,9 @@ def create_problem(
     Pyomo optimization components to this class, will load data into the
     components, and will then compile the problem.
 
-    We first need to determine which GridPath modules we need to use. See
-    *determine_modules* method (imported from
-    *gridpath.auxiilary.module_list*) and import those modules (via the
-    *load_modules* method imported from *gridpath.auxiliary.module_list*).
+    The GridPath modules we need to use have already been determined and
+    loaded once for the scenario (see the *ModuleRegistry* class imported
+    from *gridpath.auxiliary.module_list*).
 
     We then determine the dynamic model components based on the selected
     modules and input data. See *populate_dynamic_components* method.
@@ -110,10 +136,11 @@ def create_problem(
     model = AbstractModel()
     dynamic_components = DynamicComponents()
 
-    # Determine/load modules and dynamic components
-    modules_to_use, loaded_modules = set_up_gridpath_modules(
-        scenario_directory=scenario_directory, multi_stage=multi_stage
-    )
+    loaded_modules = module_registry.loaded_modules
+
+    # Input files are parsed once per problem; drop the files cached (and the
+    # cache hit/miss counts) for any prior problem
+    clear_input_cache(reset_stats=True)
 
     # Create the abstract model; some components are initialized here
     if not parsed_arguments.quiet:
@@ -128,6 +155,7 @@ def create_problem(
         availability_iteration,
         subproblem,
         stage,
+        profiler=profiler,
     )
 
     if parsed_arguments.report_timing:
@@ -150,11 +178,28 @@ def create_problem(
         availability_iteration,
         subproblem,
         stage,
+        profiler=profiler,
     )
 
+    if parsed_arguments.verbose:
+        cache_stats = get_input_cache_stats()
+        print(
+            "...input file cache: {} hits, {} misses".format(
+                sum(s["hits"] for s in cache_stats.values()),
+                sum(s["misses"] for s in cache_stats.values()),
+            )
+        )
+
+    # With a persistent solver, record the model components the constraint
+    # rules read, so that only the constraints built from data that changed
+    # are compared when updating the instance kept by the solver
+    if parsed_arguments.persistent_solver:
+        record_rule_reads(model)
+
     if not parsed_arguments.quiet:
         print("Creating problem instance...")
-    instance = create_problem_instance(model, scenario_data)
+    with profile_construction_phase(profiler, "create_instance"):
+        instance = create_problem_instance(model, scenario_data)
 
     # Fix variables if modules request so
     instance = fix_variables(
@@ -167,16 +212,27 @@ def create_problem(
         subproblem,
         stage,
         loaded_modules,
+        profiler=profiler,
     )
 
     return dynamic_components, instance
 
 
-def solve_problem(parsed_arguments, instance):
+def solve_problem(
+    parsed_arguments, instance, profiler=None, warm_start=None, problem_key=None
+):
     # Solve
     if not parsed_arguments.quiet:
         print("Solving...")
-    results = solve(instance, parsed_arguments)
+    solve_start_time = time.time()
+    with profile_phase(profiler, "solve"):
+        results = solve(
+            instance, parsed_arguments, warm_start=warm_start, problem_key=problem_key
+        )
+
+    if warm_start is not None:
+        warm_start.solve_seconds = round(time.time() - solve_start_time, 3)
+        warm_start.restore_unused_values()
 
     return instance, results
 
@@ -188,13 +244,14 @@ def run_optimization_for_subproblem_stage(
     availability_iteration_directory,
     subproblem_directory,
     stage_directory,
-    multi_stage,
+    module_registry,
     parsed_arguments,
 ):
     """
     :param scenario_directory: the main scenario directory
     :param subproblem_directory: if there are horizon subproblems, the horizon
     :param stage_directory: if there are stage subproblems, the stage
+    :param module_registry: the scenario's ModuleRegistry
     :param parsed_arguments: the parsed script arguments
     :return: return the objective function value (Total_Cost); only used in
         testing
@@ -299,6 +356,10 @@ def run_optimization_for_subproblem_stage(
         subproblem_directory = str(subproblem_directory)
         stage_directory = str(stage_directory)
 
+        # If directed to do so, profile the wall time and memory use of the
+        # phases of the run
+        profiler = Profiler() if parsed_arguments.profile else None
+
         # Used only if we are writing problem files or loading solutions
         prob_sol_files_directory = os.path.join(
             scenario_directory, subproblem_directory, stage_directory, "prob_sol_files"
@@ -308,27 +369,35 @@ def run_optimization_for_subproblem_stage(
         # TODO: incompatible options
         # If we are loading a solution, skip the compilation step; we'll use the saved
         # instance and dynamic components
+        # The instance is rebuilt from the inputs to load a solution if it
+        # wasn't pickled with the problem file
+        rebuild_problem = functools.partial(
+            create_problem,
+            scenario_directory=scenario_directory,
+            weather_iteration=weather_iteration_directory,
+            hydro_iteration=hydro_iteration_directory,
+            availability_iteration=availability_iteration_directory,
+            subproblem=subproblem_directory,
+            stage=stage_directory,
+            module_registry=module_registry,
+            parsed_arguments=parsed_arguments,
+            profiler=profiler,
+        )
+        warm_start = None
         if parsed_arguments.load_cplex_solution:
             solved_instance, results, dynamic_components = load_cplex_xml_solution(
                 prob_sol_files_directory=prob_sol_files_directory,
                 solution_filename="cplex_solution.sol",
+                rebuild_problem=rebuild_problem,
             )
         elif parsed_arguments.load_gurobi_solution:
             solved_instance, results, dynamic_components = load_gurobi_json_solution(
                 prob_sol_files_directory=prob_sol_files_directory,
                 solution_filename="gurobi_solution.json",
+                rebuild_problem=rebuild_problem,
             )
         else:
-            dynamic_components, instance = create_problem(
-                scenario_directory=scenario_directory,
-                weather_iteration=weather_iteration_directory,
-                hydro_iteration=hydro_iteration_directory,
-                availability_iteration=availability_iteration_directory,
-                subproblem=subproblem_directory,
-                stage=stage_directory,
-                multi_stage=multi_stage,
-                parsed_arguments=parsed_arguments,
-            )
+            dynamic_components, instance = rebuild_problem()
 
             if parsed_arguments.create_lp_problem_file_only:
                 prob_sol_files_directory = os.path.join(
@@ -339,38 +408,67 @@ def run_optimization_for_subproblem_stage(
                 )
                 if not os.path.exists(prob_sol_files_directory):
                     os.makedirs(prob_sol_files_directory)
-                with open(
-                    os.path.join(prob_sol_files_directory, "instance.pickle"), "wb"
-                ) as f_out:
-                    dill.dump(instance, f_out)
-                with open(
-                    os.path.join(prob_sol_files_directory, "dynamic_components.pickle"),
-                    "wb",
-                ) as f_out:
-                    dill.dump(dynamic_components, f_out)
+                for f, obj in [
+                    ("instance.pickle", instance),
+                    ("dynamic_components.pickle", dynamic_components),
+                ]:
+                    if parsed_arguments.skip_instance_pickle:
+                        # Don't load a previously pickled instance with the
+                        # new problem file
+                        if os.path.exists(os.path.join(prob_sol_files_directory, f)):
+                            os.remove(os.path.join(prob_sol_files_directory, f))
+                    else:
+                        with open(
+                            os.path.join(prob_sol_files_directory, f), "wb"
+                        ) as f_out:
+                            dill.dump(obj, f_out)
 
                 smap_id = write_problem_file(
                     instance=instance, prob_sol_files_directory=prob_sol_files_directory
                 )
                 symbol_map = instance.solutions.symbol_map[smap_id]
 
-                symbol_cuid_pairs = tuple(
-                    (symbol, ComponentUID(var_weakref(), cuid_buffer={}))
-                    for symbol, var_weakref in symbol_map.bySymbol.items()
-                )
-
-                with open(
-                    os.path.join(prob_sol_files_directory, "symbol_map.pickle"), "wb"
-                ) as f_out:
-                    dill.dump(symbol_cuid_pairs, f_out)
+                # Save the index of the problem file symbols to load the
+                # solution with
+                SymbolIndex.from_symbol_map(
+                    instance=instance, symbol_map=symbol_map
+                ).save(os.path.join(prob_sol_files_directory, SYMBOL_INDEX_FILENAME))
 
                 print("Problem file written to {}".format(prob_sol_files_directory))
                 sys.exit()
             else:
+                # If directed to do so, initialize the variables from the
+                # solution of the previous stage or linked subproblem
+                problem_key = (
+                    weather_iteration_directory,
+                    hydro_iteration_directory,
+                    availability_iteration_directory,
+                    subproblem_directory,
+                    stage_directory,
+                )
+                warm_start = (
+                    WarmStart.set_values(
+                        instance=instance,
+                        scenario_directory=scenario_directory,
+                        problem_key=problem_key,
+                    )
+                    if parsed_arguments.warmstart
+                    else None
+                )
                 solved_instance, results = solve_problem(
                     parsed_arguments=parsed_arguments,
                     instance=instance,
+                    profiler=profiler,
+                    warm_start=warm_start,
+                    problem_key=problem_key,
                 )
+                if (
+                    warm_start is not None
+                    and results.solver.termination_condition != "infeasible"
+                ):
+                    save_solution_values(
+                        problem_key=problem_key, instance=solved_instance
+                    )
 
         # Save the scenario results to disk
         save_results(
@@ -380,11 +478,12 @@ def run_optimization_for_subproblem_stage(
             availability_iteration_directory,
             subproblem_directory,
             stage_directory,
-            multi_stage,
+            module_registry,
             solved_instance,
             results,
             dynamic_components,
             parsed_arguments,
+            profiler=profiler,
         )
 
         # Summarize results
@@ -395,10 +494,39 @@ def run_optimization_for_subproblem_stage(
             availability_iteration_directory,
             subproblem_directory,
             stage_directory,
-            multi_stage,
+            module_registry,
             parsed_arguments,
+            profiler=profiler,
         )
 
+        # Write the warm start statistics to the results directory
+        if warm_start is not None:
+            warm_start.write_report(
+                results_directory=os.path.join(
+                    scenario_directory,
+                    weather_iteration_directory,
+                    hydro_iteration_directory,
+                    availability_iteration_directory,
+                    subproblem_directory,
+                    stage_directory,
+                    "results",
+                )
+            )
+
+        # Write the profiling report to the results directory
+        if profiler is not None:
+            profiler.write_report(
+                results_directory=os.path.join(
+                    scenario_directory,
+                    weather_iteration_directory,
+                    hydro_iteration_directory,
+                    availability_iteration_directory,
+                    subproblem_directory,
+                    stage_directory,
+                    "results",
+                )
+            )
+
         # If logging, we need to return sys.stdout to original (i.e. stop writing
         # to log file)
         if parsed_arguments.log:
@@ -422,7 +550,7 @@ def run_optimization_for_subproblem(
     availability_iteration_directory,
     subproblem_directory,
     stage_directories,
-    multi_stage,
+    module_registry,
     parsed_arguments,
     objective_values,
 ):
@@ -432,6 +560,13 @@ def run_optimization_for_subproblem(
     """
     subproblem = 1 if subproblem_directory == "" else int(subproblem_directory)
 
+    # Set whether to hand off the linked subproblem and pass-through inputs
+    # in memory (see *auxiliary.state_store*)
+    configure_state_store(
+        in_memory=parsed_arguments.in_memory_handoff,
+        write_files=parsed_arguments.write_handoff_files,
+    )
+
     for stage_directory in stage_directories:
         stage = 1 if stage_directory == "" else int(stage_directory)
         objective_values[
@@ -448,39 +583,69 @@ def run_optimization_for_subproblem(
             availability_iteration_directory,
             subproblem_directory,
             stage_directory,
-            multi_stage,
+            module_registry,
             parsed_arguments,
         )
 
+    # The subproblem's inputs and pass-through inputs handed off in memory
+    # are not needed anymore
+    for stage_directory in list(stage_directories) + [""]:
+        clear_state_store(
+            problem_key=(
+                weather_iteration_directory,
+                hydro_iteration_directory,
+                availability_iteration_directory,
+                subproblem_directory,
+                stage_directory,
+            )
+        )
+
 
 def run_optimization_for_subproblem_pool(pool_datum):
     """
-    Helper function to easily pass to pool.map if solving subproblems in
-    parallel
+    Helper function to easily pass to the worker pool if solving subproblems
+    in parallel; the pool datum includes the stage directories by subproblem
+    for the subproblem(s) to solve, which are solved in order (linked
+    subproblems are solved in the same task). The module registry and parsed
+    arguments are set once per worker (see *auxiliary.worker_pool*) and the
+    objective function values are returned to the parent process.
     """
     [
         scenario_directory,
         weather_iteration_directory,
         hydro_iteration_directory,
         availability_iteration_directory,
+        stage_directories_by_subproblem,
+    ] = pool_datum
+    worker_context = get_worker_context()
+
+    objective_values = {}
+    for (
         subproblem_directory,
         stage_directories,
-        multi_stage,
-        parsed_arguments,
-        objective_values,
-    ] = pool_datum
+    ) in stage_directories_by_subproblem.items():
+        subproblem = 1 if subproblem_directory == "" else int(subproblem_directory)
+        objective_values[
+            (
+                weather_iteration_directory,
+                hydro_iteration_directory,
+                availability_iteration_directory,
+                subproblem,
+            )
+        ] = {}
+        run_optimization_for_subproblem(
+            scenario_directory=scenario_directory,
+            weather_iteration_directory=weather_iteration_directory,
+            hydro_iteration_directory=hydro_iteration_directory,
+            availability_iteration_directory=availability_iteration_directory,
+            subproblem_directory=subproblem_directory,
+            stage_directories=stage_directories,
+            module_registry=worker_context["module_registry"],
+            parsed_arguments=worker_context["parsed_arguments"],
+            objective_values=objective_values,
+        )
 
-    run_optimization_for_subproblem(
-        scenario_directory=scenario_directory,
-        weather_iteration_directory=weather_iteration_directory,
-        hydro_iteration_directory=hydro_iteration_directory,
-        availability_iteration_directory=availability_iteration_directory,
-        subproblem_directory=subproblem_directory,
-        stage_directories=stage_directories,
-        multi_stage=multi_stage,
-        parsed_arguments=parsed_arguments,
-        objective_values=objective_values,
-    )
+    return objective_values
 
 
 def solve_sequentially(
@@ -488,6 +653,7 @@ def solve_sequentially(
     subproblem_stage_directory_strings,
     scenario_directory,
     scenario_structure,
+    module_registry,
     parsed_arguments,
 ):
     # Create dictionary with which we'll keep track of subproblem/stage
@@ -515,9 +681,7 @@ def solve_sequentially(
                     subproblem = 1 if subproblem_str == "" else int(subproblem_str)
 
                     # Write pass through input file headers
-                    # TODO: this is not the best place for this; we should
-                    #  probably set up the gridpath modules only once and do
-                    #  this first
+                    # TODO: this is not the best place for this
                     #  It needs to be created BEFORE stage 1 is run; it could
                     #  alternatively be created by the first stage that
                     #  exports pass through inputs, but this will require
@@ -525,7 +689,7 @@ def solve_sequentially(
                     if scenario_structure.MULTI_STAGE:
                         create_pass_through_inputs(
                             scenario_directory,
-                            scenario_structure,
+                            module_registry,
                             subproblem_str,
                             weather_iteration_str,
                             hydro_iteration_str,
@@ -549,7 +713,7 @@ def solve_sequentially(
                         stage_directories=subproblem_stage_directory_strings[
                             subproblem_str
                         ],
-                        multi_stage=scenario_structure.MULTI_STAGE,
+                        module_registry=module_registry,
                         parsed_arguments=parsed_arguments,
                         objective_values=objective_values,
                     )
@@ -557,6 +721,56 @@ def solve_sequentially(
     return objective_values
 
 
+def get_subproblem_tasks(scenario_directory, scenario_structure):
+    """
+    :param scenario_directory: the scenario directory
+    :param scenario_structure: the scenario's ScenarioStructure
+    :return: list of (weather_iteration_str, hydro_iteration_str,
+        availability_iteration_str, stage_directories_by_subproblem) tasks
+
+    Split the scenario into the tasks that can be solved independently of
+    each other: each task is either a single subproblem or, if the
+    subproblems are linked, all the subproblems of an iteration (to be
+    solved in order). The stage directories by subproblem are a dictionary
+    {subproblem_str: [stage_str]} in subproblem order.
+    """
+    subproblem_stage_directory_strings = ScenarioDirectoryStructure(
+        scenario_structure
+    ).SUBPROBLEM_STAGE_DIRECTORIES
+    linked_subproblems = os.path.exists(
+        os.path.join(scenario_directory, "linked_subproblems_map.csv")
+    )
+    if linked_subproblems:
+        task_subproblems = [list(subproblem_stage_directory_strings.keys())]
+    else:
+        task_subproblems = [
+            [subproblem_str]
+            for subproblem_str in subproblem_stage_directory_strings.keys()
+        ]
+
+    return [
+        (
+            weather_iteration_str,
+            hydro_iteration_str,
+            availability_iteration_str,
+            {
+                subproblem_str: subproblem_stage_directory_strings[subproblem_str]
+                for subproblem_str in subproblem_strs
+            },
+        )
+        for (
+            weather_iteration_str,
+            hydro_iteration_str,
+            availability_iteration_str,
+        ) in get_iteration_directories_list(
+            iteration_directory_strings=ScenarioDirectoryStructure(
+                scenario_structure
+            ).ITERATION_DIRECTORIES
+        )
+        for subproblem_strs in task_subproblems
+    ]
+
+
 def run_scenario(
     scenario_directory,
     scenario_structure,
@@ -583,6 +797,13 @@ def run_scenario(
         scenario_structure
     ).SUBPROBLEM_STAGE_DIRECTORIES
 
+    # Determine and load the modules once for the scenario; the registry is
+    # shared by all subproblems and stages
+    module_registry = ModuleRegistry.from_scenario_directory(
+        scenario_directory=scenario_directory,
+        multi_stage=scenario_structure.MULTI_STAGE,
+    )
+
     # TODO: consolidate parallelization checks
     try:
         n_parallel_subproblems = int(parsed_arguments.n_parallel_solve)
@@ -593,13 +814,34 @@ def run_scenario(
         )
         n_parallel_subproblems = 1
 
-    # If only a single subproblem, run main problem
-    if scenario_structure.N_SUBPROBLEMS == 1:
+    # The (weather, hydro, availability) iterations are independent of each
+    # other; the subproblems within an iteration are also independent
+    # unless they are linked, in which case they must be solved in order
+    iteration_directories = get_iteration_directories_list(
+        iteration_directory_strings=iteration_directory_strings
+    )
+    linked_subproblems = os.path.exists(
+        os.path.join(scenario_directory, "linked_subproblems_map.csv")
+    )
+    subproblem_tasks = get_subproblem_tasks(
+        scenario_directory=scenario_directory, scenario_structure=scenario_structure
+    )
+    n_parallel_tasks = len(subproblem_tasks)
+
+    # If only a single task, run main problem
+    if n_parallel_tasks == 1:
         if n_parallel_subproblems > 1:
-            warnings.warn(
-                "GridPath WARNING: only a single subproblem in "
-                "scenario. No parallelization possible."
-            )
+            if linked_subproblems:
+                warnings.warn(
+                    "GridPath WARNING: subproblems are linked and "
+                    "cannot be solved in parallel. Solving "
+                    "sequentially."
+                )
+            else:
+                warnings.warn(
+                    "GridPath WARNING: only a single subproblem in "
+                    "scenario. No parallelization possible."
+                )
         n_parallel_subproblems = 1
 
     # If parallelization is not requested, solve sequentially
@@ -609,144 +851,81 @@ def run_scenario(
             subproblem_stage_directory_strings=subproblem_stage_directory_strings,
             scenario_directory=scenario_directory,
             scenario_structure=scenario_structure,
+            module_registry=module_registry,
             parsed_arguments=parsed_arguments,
         )
 
         return objective_values
 
-    # If parallelization is requested, proceed with some checks
-    elif n_parallel_subproblems > 1:
-        # Check if the subproblems are linked, in which case
-        # we can't parallelize and throw a warning, then solve
-        # sequentially
-        if os.path.exists(
-            os.path.join(scenario_directory, "linked_subproblems_map.csv")
-        ):
-            warnings.warn(
-                "GridPath WARNING: subproblems are linked and "
-                "cannot be solved in parallel. Solving "
-                "sequentially."
-            )
-            objective_values = solve_sequentially(
-                iteration_directory_strings=iteration_directory_strings,
-                subproblem_stage_directory_strings=subproblem_stage_directory_strings,
-                scenario_directory=scenario_directory,
-                scenario_structure=scenario_structure,
-                parsed_arguments=parsed_arguments,
-            )
-
-            return objective_values
-
-        # If subproblems are independent, we create pool of subproblems
-        # and solve them in parallel
-        else:
-            # Create dictionary with which we'll keep track
-            # of subproblem objective function values
-            manager = Manager()
-            objective_values = manager.dict()
-
-            for weather_iteration_str in iteration_directory_strings.keys():
-                for hydro_iteration_str in iteration_directory_strings[
-                    weather_iteration_str
-                ].keys():
-                    for availability_iteration_str in iteration_directory_strings[
-                        weather_iteration_str
-                    ][hydro_iteration_str]:
-                        # We may have passed "empty_string" to avoid actual empty
-                        # strings as dictionary keys; convert to actual empty
-                        # strings here to pass to the directory creation methods
-                        weather_iteration_str = ensure_empty_string(
-                            weather_iteration_str
-                        )
-                        hydro_iteration_str = ensure_empty_string(hydro_iteration_str)
-                        availability_iteration_str = ensure_empty_string(
-                            availability_iteration_str
-                        )
-                        for subproblem_str in subproblem_stage_directory_strings.keys():
-                            if scenario_structure.MULTI_STAGE:
-                                create_pass_through_inputs(
-                                    scenario_directory,
-                                    scenario_structure,
-                                    subproblem_str,
-                                    weather_iteration_str,
-                                    hydro_iteration_str,
-                                    availability_iteration_str,
-                                )
-
-                            # TODO: create management of iteration objective functions
-                            subproblem = (
-                                1 if subproblem_str == "" else int(subproblem_str)
-                            )
-                            objective_values[
-                                (
-                                    weather_iteration_str,
-                                    hydro_iteration_str,
-                                    availability_iteration_str,
-                                    subproblem,
-                                )
-                            ] = manager.dict()
-
-            # If we have more processes requested than subproblems, don't launch
-            # the unnecessary processes by reducing n_parallel_subproblems here
-            if n_parallel_subproblems > scenario_structure.N_SUBPROBLEMS:
-                n_parallel_subproblems = scenario_structure.N_SUBPROBLEMS
-
-            # Pool must use spawn to work properly on Linux
-            pool = get_context("spawn").Pool(n_parallel_subproblems)
-
-            pool_data = []
-            for weather_iteration_str in iteration_directory_strings.keys():
-                for hydro_iteration_str in iteration_directory_strings[
-                    weather_iteration_str
-                ].keys():
-                    for availability_iteration_str in iteration_directory_strings[
-                        weather_iteration_str
-                    ][hydro_iteration_str]:
-                        # We may have passed "empty_string" to avoid actual empty
-                        # strings as dictionary keys; convert to actual empty
-                        # strings here to pass to the directory creation methods
-                        weather_iteration_str = ensure_empty_string(
-                            weather_iteration_str
-                        )
-                        hydro_iteration_str = ensure_empty_string(hydro_iteration_str)
-                        availability_iteration_str = ensure_empty_string(
-                            availability_iteration_str
-                        )
-                        for subproblem_str in subproblem_stage_directory_strings.keys():
-                            pool_data.append(
-                                [
-                                    scenario_directory,
-                                    weather_iteration_str,
-                                    hydro_iteration_str,
-                                    availability_iteration_str,
-                                    subproblem_str,
-                                    subproblem_stage_directory_strings[subproblem_str],
-                                    scenario_structure.MULTI_STAGE,
-                                    parsed_arguments,
-                                    objective_values,
-                                ]
-                            )
-
-            pool_data = tuple(pool_data)
+    # If parallelization is requested, we create a pool of tasks across the
+    # iterations and subproblems and solve them in parallel: each task is
+    # either a single subproblem or, if the subproblems are linked, all the
+    # subproblems of an iteration (solved in order)
+    else:
+        # Create dictionary with which we'll keep track
+        # of subproblem objective function values; the values are returned
+        # by the workers as each task finishes
+        objective_values = {}
+
+        for (
+            weather_iteration_str,
+            hydro_iteration_str,
+            availability_iteration_str,
+        ) in iteration_directories:
+            for subproblem_str in subproblem_stage_directory_strings.keys():
+                if scenario_structure.MULTI_STAGE:
+                    create_pass_through_inputs(
+                        scenario_directory,
+                        module_registry,
+                        subproblem_str,
+                        weather_iteration_str,
+                        hydro_iteration_str,
+                        availability_iteration_str,
+                    )
 
-            pool.map(run_optimization_for_subproblem_pool, pool_data)
-            pool.close()
+                # TODO: create management of iteration objective functions
+                subproblem = 1 if subproblem_str == "" else int(subproblem_str)
+                objective_values[
+                    (
+                        weather_iteration_str,
+                        hydro_iteration_str,
+                        availability_iteration_str,
+                        subproblem,
+                    )
+                ] = {}
+
+        pool_data = [
+            [scenario_directory] + list(subproblem_task)
+            for subproblem_task in subproblem_tasks
+        ]
+
+        # If we have more processes requested than tasks, don't launch
+        # the unnecessary processes by reducing n_parallel_subproblems here
+        if n_parallel_subproblems > n_parallel_tasks:
+            n_parallel_subproblems = n_parallel_tasks
+
+        # The workers load the modules once and are reused for all tasks
+        with create_worker_pool(
+            n_processes=n_parallel_subproblems,
+            module_registry=module_registry,
+            parsed_arguments=parsed_arguments,
+        ) as pool:
+            for task_objective_values in pool.imap_unordered(
+                run_optimization_for_subproblem_pool, pool_data
+            ):
+                objective_values.update(task_objective_values)
 
-            return objective_values
+        return objective_values
 
 
 def create_pass_through_inputs(
     scenario_directory,
-    scenario_structure,
+    module_registry,
     subproblem_str,
     weather_iteration_str,
     hydro_iteration_str,
     availability_iteration_str,
 ):
-    modules_to_use, loaded_modules = set_up_gridpath_modules(
-        scenario_directory=scenario_directory,
-        multi_stage=scenario_structure.MULTI_STAGE,
-    )
     pass_through_directory = os.path.join(
         scenario_directory,
         weather_iteration_str,
@@ -757,12 +936,18 @@ def create_pass_through_inputs(
     )
     if not os.path.exists(pass_through_directory):
         os.makedirs(pass_through_directory)
-    for m in loaded_modules:
-        # Writing the headers will delete prior data in the file
-        if hasattr(m, "write_pass_through_file_headers"):
-            m.write_pass_through_file_headers(
-                pass_through_directory=pass_through_directory
-            )
+    # Writing the headers will delete prior data in the file (and in memory)
+    clear_state_store(
+        problem_key=(
+            weather_iteration_str,
+            hydro_iteration_str,
+            availability_iteration_str,
+            subproblem_str,
+            "",
+        )
+    )
+    for _, m in module_registry.modules_with("write_pass_through_file_headers"):
+        m.write_pass_through_file_headers(pass_through_directory=pass_through_directory)
 
 
 def save_results(
@@ -772,19 +957,22 @@ def save_results(
     availability_iteration,
     subproblem,
     stage,
-    multi_stage,
+    module_registry,
     instance,
     results,
     dynamic_components,
     parsed_arguments,
+    profiler=None,
 ):
     """
     :param scenario_directory:
     :param subproblem:
     :param stage:
+    :param module_registry: the scenario's ModuleRegistry
     :param instance: model instance (solution loaded after solving by default)
     :param dynamic_components:
     :param parsed_arguments:
+    :param profiler: the Profiler object (None if not profiling)
     :return:
 
     Create a results directory for the (sub)problem.
@@ -840,8 +1028,19 @@ def save_results(
                 "export"
             ](instance=instance, quiet=parsed_arguments.quiet)
 
+        # The results tables are written in the requested file format
+        setattr(
+            dynamic_components,
+            dynamic_components_results_format,
+            parsed_arguments.results_format,
+        )
+
         if not parsed_arguments.quiet:
-            print("...exporting detailed CSV results")
+            print(
+                "...exporting detailed {} results".format(
+                    parsed_arguments.results_format.upper()
+                )
+            )
         export_results(
             scenario_directory=scenario_directory,
             weather_iteration=weather_iteration,
@@ -849,11 +1048,12 @@ def save_results(
             availability_iteration=availability_iteration,
             subproblem=subproblem,
             stage=stage,
-            multi_stage=multi_stage,
+            module_registry=module_registry,
             instance=instance,
             dynamic_components=dynamic_components,
             export_rule=export_rule,
             verbose=parsed_arguments.verbose,
+            profiler=profiler,
         )
 
         if parsed_arguments.results_export_summary_rule is None:
@@ -874,11 +1074,12 @@ def save_results(
             availability_iteration=availability_iteration,
             subproblem=subproblem,
             stage=stage,
-            multi_stage=multi_stage,
+            module_registry=module_registry,
             instance=instance,
             dynamic_components=dynamic_components,
             export_summary_results_rule=export_summary_rule,
             verbose=parsed_arguments.verbose,
+            profiler=profiler,
         )
 
         export_pass_through_inputs(
@@ -888,9 +1089,10 @@ def save_results(
             availability_iteration=availability_iteration,
             subproblem=subproblem,
             stage=stage,
-            multi_stage=multi_stage,
+            module_registry=module_registry,
             instance=instance,
             verbose=parsed_arguments.verbose,
+            profiler=profiler,
         )
 
         save_objective_function_value(
@@ -910,10 +1112,11 @@ def save_results(
             availability_iteration=availability_iteration,
             subproblem=subproblem,
             stage=stage,
-            multi_stage=multi_stage,
+            module_registry=module_registry,
             instance=instance,
             dynamic_components=dynamic_components,
             verbose=parsed_arguments.verbose,
+            profiler=profiler,
         )
     # If solver status is not ok, don't export results and print some
     # messages for the user
@@ -946,6 +1149,7 @@ def create_abstract_model(
     availability_iteration,
     subproblem,
     stage,
+    profiler=None,
 ):
     """
     :param model: the Pyomo AbstractModel object
@@ -954,6 +1158,7 @@ def create_abstract_model(
     :param scenario_directory:
     :param subproblem:
     :param stage:
+    :param profiler: the Profiler object (None if not profiling)
 
     To create the abstract model, we iterate over all required modules and
     call their *add_model_components* method to add components to the Pyomo
@@ -963,16 +1168,21 @@ def create_abstract_model(
     """
     for m in loaded_modules:
         if hasattr(m, "add_model_components"):
-            m.add_model_components(
-                model,
-                dynamic_components,
-                scenario_directory,
-                weather_iteration,
-                hydro_iteration,
-                availability_iteration,
-                subproblem,
-                stage,
-            )
+            with profile_phase(profiler, "add_model_components", m):
+                m.add_model_components(
+                    model,
+                    dynamic_components,
+                    scenario_directory,
+                    weather_iteration,
+                    hydro_iteration,
+                    availability_iteration,
+                    subproblem,
+                    stage,
+                )
+            # Record which module declared the new components, so that
+            # the construction time can be attributed to the module
+            if profiler is not None:
+                profiler.record_component_modules(model, m)
 
 
 def load_scenario_data(
@@ -985,6 +1195,7 @@ def load_scenario_data(
     availability_iteration,
     subproblem,
     stage,
+    profiler=None,
 ):
     """
     :param model: the Pyomo abstract model object with components added
@@ -994,6 +1205,7 @@ def load_scenario_data(
     :param scenario_directory: the main scenario directory
     :param subproblem: the horizon subproblem
     :param stage: the stage subproblem
+    :param profiler: the Profiler object (None if not profiling)
     :return: the DataPortal object populated with the input data
 
     Iterate over all required GridPath modules and call their
@@ -1005,17 +1217,18 @@ def load_scenario_data(
     data_portal = DataPortal()
     for m in loaded_modules:
         if hasattr(m, "load_model_data"):
-            m.load_model_data(
-                model,
-                dynamic_components,
-                data_portal,
-                scenario_directory,
-                weather_iteration,
-                hydro_iteration,
-                availability_iteration,
-                subproblem,
-                stage,
-            )
+            with profile_phase(profiler, "load_model_data", m):
+                m.load_model_data(
+                    model,
+                    dynamic_components,
+                    data_portal,
+                    scenario_directory,
+                    weather_iteration,
+                    hydro_iteration,
+                    availability_iteration,
+                    subproblem,
+                    stage,
+                )
     return data_portal
 
 
@@ -1044,6 +1257,7 @@ def fix_variables(
     subproblem,
     stage,
     loaded_modules,
+    profiler=None,
 ):
     """
     :param instance: the compiled problem instance
@@ -1052,6 +1266,7 @@ def fix_variables(
     :param subproblem: str
     :param stage: str
     :param loaded_modules: list of imported GridPath modules as Python objects
+    :param profiler: the Profiler object (None if not profiling)
     :return: the problem instance with the relevant variables fixed
 
     Iterate over the required GridPath modules and fix variables by calling
@@ -1060,16 +1275,17 @@ def fix_variables(
     """
     for m in loaded_modules:
         if hasattr(m, "fix_variables"):
-            m.fix_variables(
-                instance,
-                dynamic_components,
-                scenario_directory,
-                weather_iteration,
-                hydro_iteration,
-                availability_iteration,
-                subproblem,
-                stage,
-            )
+            with profile_phase(profiler, "fix_variables", m):
+                m.fix_variables(
+                    instance,
+                    dynamic_components,
+                    scenario_directory,
+                    weather_iteration,
+                    hydro_iteration,
+                    availability_iteration,
+                    subproblem,
+                    stage,
+                )
 
     return instance
 
@@ -1087,10 +1303,15 @@ def view_loaded_data(loaded_modules, instance):
             m.view_loaded_data(instance)
 
 
-def solve(instance, parsed_arguments):
+def solve(instance, parsed_arguments, warm_start=None, problem_key=None):
     """
     :param instance: the compiled problem instance
     :param parsed_arguments: the user-defined arguments (parsed)
+    :param warm_start: the WarmStart with the variables initialized from a
+        previous solution (None if not warm starting)
+    :param problem_key: the (weather iteration, hydro iteration, availability
+        iteration, subproblem, stage) directory strings of the problem (None
+        if not known)
     :return: the problem results
 
     Send the compiled problem instance to the solver and solve.
@@ -1141,6 +1362,24 @@ def solve(instance, parsed_arguments):
         if parsed_arguments.solver is None:
             solver_name = "cbc"
 
+    # If requested, solve with a persistent solver interface; if one is not
+    # available for this solver, fall back to the standard interface below
+    if parsed_arguments.persistent_solver and solver_name != "gams":
+        persistent_optimizer = get_persistent_solver(
+            solver_name=solver_name,
+            solver_executable=parsed_arguments.solver_executable,
+            fixed_vars_as_bounds=parsed_arguments.persistent_solver_fixed_vars_as_bounds,
+        )
+        if persistent_optimizer is not None:
+            return solve_with_persistent_solver(
+                optimizer=persistent_optimizer,
+                instance=instance,
+                solver_options=solver_options,
+                parsed_arguments=parsed_arguments,
+                warm_start=warm_start,
+                subproblem_key=None if problem_key is None else problem_key[:4],
+            )
+
     # Get solver
     # If a solver executable is specified, pass it to Pyomo
     if parsed_arguments.solver_executable is not None:
@@ -1198,13 +1437,24 @@ def solve(instance, parsed_arguments):
         for opt in solver_options.keys():
             optimizer.options[opt] = solver_options[opt]
 
+        # If warm starting, pass the initialized variable values to the
+        # solver as a MIP start (if the solver interface supports it) and
+        # write the solver log to get the time to the first incumbent
+        warm_start_kwargs = (
+            dict() if warm_start is None else warm_start.get_solve_kwargs(optimizer)
+        )
+
         results = optimizer.solve(
             instance,
             tee=not parsed_arguments.mute_solver_output,
             keepfiles=parsed_arguments.keepfiles,
             symbolic_solver_labels=parsed_arguments.symbolic,
+            **warm_start_kwargs,
         )
 
+        if warm_start is not None:
+            warm_start.process_solver_log()
+
     # Can optionally log infeasibilities but this has resulted in false
     # positives due to rounding errors larger than the default tolerance
     # of 1E-6.
@@ -1213,6 +1463,159 @@ def solve(instance, parsed_arguments):
     return results
 
 
+# The Pyomo persistent solver interfaces to try for each solver, in order of
+# preference
+PERSISTENT_SOLVER_INTERFACES = {
+    "gurobi": ["gurobi_persistent", "appsi_gurobi"],
+    "cplex": ["cplex_persistent", "appsi_cplex"],
+    "xpress": ["xpress_persistent"],
+    "highs": ["appsi_highs"],
+    "cbc": ["appsi_cbc"],
+    "ipopt": ["appsi_ipopt"],
+}
+
+# Persistent solvers created by this process, keyed by solver name,
+# executable, and fixed-variable setting; None if no persistent interface
+# is available
+_persistent_solvers = dict()
+
+
+def get_persistent_solver(solver_name, solver_executable, fixed_vars_as_bounds=False):
+    """
+    :param solver_name: str, the name of the solver
+    :param solver_executable: str, the path to the solver executable (or None)
+    :param fixed_vars_as_bounds: boolean, whether an APPSI interface should
+        keep the fixed variables in the problem with equal bounds rather than
+        substitute their values (this can change the duals)
+    :return: the Pyomo persistent solver object or None if no persistent
+        interface is available for the solver
+
+    Get a persistent solver interface for the solver. The solver object is
+    created only once per process and reused for all subproblems and stages
+    the process solves.
+    """
+    key = (solver_name, solver_executable, fixed_vars_as_bounds)
+    if key not in _persistent_solvers:
+        optimizer = None
+        for interface_name in PERSISTENT_SOLVER_INTERFACES.get(solver_name, []):
+            candidate = SolverFactory(interface_name)
+            if (
+                solver_executable is not None
+                and hasattr(candidate, "config")
+                and "executable" in candidate.config
+            ):
+                candidate.config.executable = solver_executable
+            # Also check that the interface can determine the solver version
+            # (e.g. the APPSI Cbc interface fails on development builds)
+            try:
+                available = (
+                    candidate.available(exception_flag=False)
+                    and candidate.version() is not None
+                )
+            except Exception:
+                available = False
+            if available:
+                optimizer = candidate
+                break
+
+        # The APPSI interfaces substitute the fixed variables by their value
+        # by default, so fixing the variables passed through to the following
+        # stages of a subproblem reloads all constraints they are in; if
+        # requested, update their bounds instead like the Pyomo persistent
+        # solvers do
+        if (
+            fixed_vars_as_bounds
+            and optimizer is not None
+            and hasattr(optimizer, "update_config")
+        ):
+            optimizer.update_config.treat_fixed_vars_as_params = False
+
+        if optimizer is None:
+            warnings.warn(
+                "GridPath WARNING: no persistent solver interface available "
+                "for solver '{}'. Using the standard solver interface.".format(
+                    solver_name
+                )
+            )
+        _persistent_solvers[key] = optimizer
+
+    return _persistent_solvers[key]
+
+
+def solve_with_persistent_solver(
+    optimizer,
+    instance,
+    solver_options,
+    parsed_arguments,
+    warm_start=None,
+    subproblem_key=None,
+):
+    """
+    :param optimizer: the Pyomo persistent solver object
+    :param instance: the compiled problem instance
+    :param solver_options: dictionary of the user-requested solver options
+    :param parsed_arguments: the user-defined arguments (parsed)
+    :param warm_start: the WarmStart with the variables initialized from a
+        previous solution (None if not warm starting)
+    :param subproblem_key: the (weather iteration, hydro iteration,
+        availability iteration, subproblem) directory strings of the problem
+        (None if not known)
+    :return: the problem results
+
+    Solve the instance with a persistent solver interface. Both the Pyomo
+    persistent solvers (e.g. gurobi_persistent) and the APPSI solvers (e.g.
+    appsi_cbc) are supported. The instance of the first stage of a
+    subproblem is loaded into the solver and kept; the following stages of
+    the subproblem update it in place with their fixed variables and changed
+    constraints rather than being loaded into the solver themselves (see
+    *auxiliary.persistent_model*). As with the standard interface, the
+    solution (including the duals) is loaded into the instance if one was
+    found. MIP starts are only passed to the solver through the Pyomo
+    persistent solvers.
+    """
+    persistent_model = get_persistent_model(
+        optimizer=optimizer,
+        instance=instance,
+        subproblem_key=subproblem_key,
+        symbolic_solver_labels=parsed_arguments.symbolic,
+    )
+    solver_instance = persistent_model.instance
+
+    if isinstance(optimizer, PersistentSolver):
+        for opt in solver_options.keys():
+            optimizer.options[opt] = solver_options[opt]
+        warm_start_kwargs = (
+            dict() if warm_start is None else warm_start.get_solve_kwargs(optimizer)
+        )
+        results = optimizer.solve(
+            tee=not parsed_arguments.mute_solver_output,
+            keepfiles=parsed_arguments.keepfiles,
+            **warm_start_kwargs,
+        )
+        if warm_start is not None:
+            warm_start.process_solver_log()
+    else:
+        # The APPSI interfaces raise an error when asked to load a solution
+        # that was not found (e.g. if the problem is infeasible), so we load
+        # the solution from the results object here if there is one
+        results = optimizer.solve(
+            solver_instance,
+            tee=not parsed_arguments.mute_solver_output,
+            load_solutions=False,
+            options=solver_options,
+            keepfiles=parsed_arguments.keepfiles,
+            symbolic_solver_labels=parsed_arguments.symbolic,
+        )
+        if len(results.solution) > 0:
+            solver_instance.solutions.load_from(results)
+
+    # The results are exported from the stage's instance
+    if solver_instance is not instance:
+        persistent_model.copy_solution(instance=instance)
+
+    return results
+
+
 def export_results(
     scenario_directory,
     weather_iteration,
@@ -1220,36 +1623,33 @@ def export_results(
     availability_iteration,
     subproblem,
     stage,
-    multi_stage,
+    module_registry,
     instance,
     dynamic_components,
     export_rule,
     verbose,
+    profiler=None,
 ):
     """
     :param scenario_directory:
     :param hydro_iteration:
     :param subproblem:
     :param stage:
+    :param module_registry: the scenario's ModuleRegistry
     :param instance:
     :param dynamic_components:
     :param export_rule:
     :param verbose:
+    :param profiler: the Profiler object (None if not profiling)
     :return:
 
     Export results for each loaded module (if applicable)
     """
     if export_rule:
-        # Determine/load modules and dynamic components
-        modules_to_use, loaded_modules = set_up_gridpath_modules(
-            scenario_directory=scenario_directory, multi_stage=multi_stage
-        )
-
-        n = 0
-        for m in loaded_modules:
-            if hasattr(m, "export_results"):
-                if verbose:
-                    print(f"... {modules_to_use[n]}")
+        for module_name, m in module_registry.modules_with("export_results"):
+            if verbose:
+                print(f"... {module_name}")
+            with profile_phase(profiler, "export_results", m):
                 m.export_results(
                     scenario_directory,
                     weather_iteration,
@@ -1261,8 +1661,6 @@ def export_results(
                     dynamic_components,
                 )
 
-            n += 1
-
 
 def export_summary_results(
     scenario_directory,
@@ -1271,36 +1669,33 @@ def export_summary_results(
     availability_iteration,
     subproblem,
     stage,
-    multi_stage,
+    module_registry,
     instance,
     dynamic_components,
     export_summary_results_rule,
     verbose,
+    profiler=None,
 ):
     """
     :param scenario_directory:
     :param hydro_iteration:
     :param subproblem:
     :param stage:
+    :param module_registry: the scenario's ModuleRegistry
     :param instance:
     :param dynamic_components:
     :param export_rule:
     :param verbose:
+    :param profiler: the Profiler object (None if not profiling)
     :return:
 
     Export results for each loaded module (if applicable)
     """
     if export_summary_results_rule:
-        # Determine/load modules and dynamic components
-        modules_to_use, loaded_modules = set_up_gridpath_modules(
-            scenario_directory=scenario_directory, multi_stage=multi_stage
-        )
-
-        n = 0
-        for m in loaded_modules:
-            if hasattr(m, "export_summary_results"):
-                if verbose:
-                    print(f"... {modules_to_use[n]}")
+        for module_name, m in module_registry.modules_with("export_summary_results"):
+            if verbose:
+                print(f"... {module_name}")
+            with profile_phase(profiler, "export_summary_results", m):
                 m.export_summary_results(
                     scenario_directory,
                     weather_iteration,
@@ -1312,8 +1707,6 @@ def export_summary_results(
                     dynamic_components,
                 )
 
-            n += 1
-
 
 def export_pass_through_inputs(
     scenario_directory,
@@ -1322,30 +1715,27 @@ def export_pass_through_inputs(
     availability_iteration,
     subproblem,
     stage,
-    multi_stage,
+    module_registry,
     instance,
     verbose,
+    profiler=None,
 ):
     """
     :param scenario_directory:
     :param subproblem:
     :param stage:
+    :param module_registry: the scenario's ModuleRegistry
     :param instance:
     :param verbose:
+    :param profiler: the Profiler object (None if not profiling)
     :return:
 
     Export pass through inputs for each loaded module (if applicable)
     """
-    # Determine/load modules and dynamic components
-    modules_to_use, loaded_modules = set_up_gridpath_modules(
-        scenario_directory=scenario_directory, multi_stage=multi_stage
-    )
-
-    n = 0
-    for m in loaded_modules:
-        if hasattr(m, "export_pass_through_inputs"):
-            if verbose:
-                print(f"... {modules_to_use[n]}")
+    for module_name, m in module_registry.modules_with("export_pass_through_inputs"):
+        if verbose:
+            print(f"... {module_name}")
+        with profile_phase(profiler, "export_pass_through_inputs", m):
             m.export_pass_through_inputs(
                 scenario_directory,
                 weather_iteration,
@@ -1355,7 +1745,6 @@ def export_pass_through_inputs(
                 stage,
                 instance,
             )
-        n += 1
 
 
 def save_objective_function_value(
@@ -1405,34 +1794,31 @@ def save_duals(
     availability_iteration,
     subproblem,
     stage,
-    multi_stage,
+    module_registry,
     instance,
     dynamic_components,
     verbose,
+    profiler=None,
 ):
     """
     :param scenario_directory:
     :param subproblem:
     :param stage:
+    :param module_registry: the scenario's ModuleRegistry
     :param instance:
     :param dynamic_components:
     :param verbose:
+    :param profiler: the Profiler object (None if not profiling)
     :return:
 
     Save the duals of various constraints.
     """
-    # Determine/load modules and dynamic components
-    modules_to_use, loaded_modules = set_up_gridpath_modules(
-        scenario_directory=scenario_directory, multi_stage=multi_stage
-    )
-
     instance.constraint_indices = {}
 
-    n = 0
-    for m in loaded_modules:
+    for module_name, m in module_registry.modules_with("save_duals"):
         if verbose:
-            print(f"... {modules_to_use[n]}")
-        if hasattr(m, "save_duals"):
+            print(f"... {module_name}")
+        with profile_phase(profiler, "save_duals", m):
             m.save_duals(
                 scenario_directory,
                 weather_iteration,
@@ -1443,7 +1829,6 @@ def save_duals(
                 instance,
                 dynamic_components,
             )
-        n += 1
 
 
 def summarize_results(
@@ -1453,14 +1838,17 @@ def summarize_results(
     availability_iteration,
     subproblem,
     stage,
-    multi_stage,
+    module_registry,
     parsed_arguments,
+    profiler=None,
 ):
     """
     :param scenario_directory:
     :param subproblem:
     :param stage:
+    :param module_registry: the scenario's ModuleRegistry
     :param parsed_arguments:
+    :param profiler: the Profiler object (None if not profiling)
     :return:
 
     Summarize results (after results export)
@@ -1509,11 +1897,6 @@ def summarize_results(
             if not parsed_arguments.quiet:
                 print("Summarizing results...")
 
-            # Determine/load modules and dynamic components
-            modules_to_use, loaded_modules = set_up_gridpath_modules(
-                scenario_directory=scenario_directory, multi_stage=multi_stage
-            )
-
             # Make the summary results file
             summary_results_file = os.path.join(
                 scenario_directory,
@@ -1536,11 +1919,10 @@ def summarize_results(
                 )
 
             # Go through the modules and get the appropriate results
-            n = 0
-            for m in loaded_modules:
-                if hasattr(m, "summarize_results"):
-                    if parsed_arguments.verbose:
-                        print(f"... {modules_to_use[n]}")
+            for module_name, m in module_registry.modules_with("summarize_results"):
+                if parsed_arguments.verbose:
+                    print(f"... {module_name}")
+                with profile_phase(profiler, "summarize_results", m):
                     m.summarize_results(
                         scenario_directory,
                         weather_iteration,
@@ -1549,7 +1931,6 @@ def summarize_results(
                         subproblem,
                         stage,
                     )
-                n += 1
 
 
 def set_up_gridpath_modules(scenario_directory, multi_stage):
@@ -1561,16 +1942,15 @@ def set_up_gridpath_modules(scenario_directory, multi_stage):
     instance.
     """
     # Determine and load modules
-    modules_to_use = determine_modules(
+    module_registry = ModuleRegistry.from_scenario_directory(
         scenario_directory=scenario_directory, multi_stage=multi_stage
     )
-    loaded_modules = load_modules(modules_to_use)
     # Determine the dynamic components based on the needed modules and input
     # data
     # populate_dynamic_inputs(dynamic_components, loaded_modules,
     #                         scenario_directory, subproblem, stage)
 
-    return modules_to_use, loaded_modules
+    return module_registry.modules_to_use, module_registry.loaded_modules
 
 
 # Parse run options
@@ -1730,48 +2110,48 @@ def write_problem_file(instance, prob_sol_files_directory, problem_format="lp"):
 
 
 def load_cplex_xml_solution(
-    prob_sol_files_directory, solution_filename="cplex_solution.sol"
+    prob_sol_files_directory,
+    solution_filename="cplex_solution.sol",
+    rebuild_problem=None,
 ):
     """
     :param prob_sol_files_directory:
     :param solution_filename:
+    :param rebuild_problem: function returning the dynamic components and
+        the instance rebuilt from the inputs (if not pickled)
     :return:
+
+    Stream the CPLEX XML (.sol) solution file into the instance.
     """
     print(
         "Loading results from solution file {}...".format(
             os.path.join(prob_sol_files_directory, solution_filename)
         )
     )
-    instance, dynamic_components, symbol_map = load_problem_info(
-        prob_sol_files_directory=prob_sol_files_directory
+    instance, dynamic_components, symbol_index = load_problem_info(
+        prob_sol_files_directory=prob_sol_files_directory,
+        rebuild_problem=rebuild_problem,
     )
-
-    # Read XML (.sol) solution file
-    root = ET.parse(os.path.join(prob_sol_files_directory, solution_filename)).getroot()
-
-    # Variables
-    for type_tag in root.findall("variables/variable"):
-        var_id, var_index, value = (
-            type_tag.get("name"),
-            type_tag.get("index"),
-            type_tag.get("value"),
-        )
-        if not var_id == "ONE_VAR_CONSTANT":
-            symbol_map.bySymbol[var_id]().value = float(value)
-
-    # Constraints
-    for type_tag in root.findall("linearConstraints/constraint"):
-        constraint_id_w_extra_symbols, const_index, dual = (
-            type_tag.get("name"),
-            type_tag.get("index"),
-            type_tag.get("dual"),
-        )
-        if not constraint_id_w_extra_symbols == "c_e_ONE_VAR_CONSTANT":
-            constraint_id = constraint_id_w_extra_symbols[4:-1]
-            instance.dual[symbol_map.bySymbol[constraint_id]()] = float(dual)
-
-    # Solver status
-    header = root.findall("header")[0]  # Need a check that there is only one element
+    solution_loader = SolutionLoader(instance=instance, symbol_index=symbol_index)
+
+    header = None
+    for item in iter_cplex_xml_solution(
+        os.path.join(prob_sol_files_directory, solution_filename)
+    ):
+        # Variables
+        if item[0] == "variable":
+            _, var_id, value = item
+            if not var_id == "ONE_VAR_CONSTANT":
+                solution_loader.add_value(var_id, value)
+        # Constraints
+        elif item[0] == "constraint":
+            _, constraint_id, dual = item
+            if not constraint_id == "c_e_ONE_VAR_CONSTANT":
+                solution_loader.add_dual(constraint_id, dual)
+        # Solver status
+        elif header is None:
+            header = item[1]
+    solution_loader.flush()
 
     termination_condition = header.get("solutionStatusString")
     # TODO: what are the types
@@ -1784,12 +2164,18 @@ def load_cplex_xml_solution(
 
 
 def load_gurobi_json_solution(
-    prob_sol_files_directory, solution_filename="gurobi_solution.json"
+    prob_sol_files_directory,
+    solution_filename="gurobi_solution.json",
+    rebuild_problem=None,
 ):
     """
     :param prob_sol_files_directory:
     :param solution_filename:
+    :param rebuild_problem: function returning the dynamic components and
+        the instance rebuilt from the inputs (if not pickled)
     :return:
+
+    Stream the Gurobi JSON solution file into the instance.
     """
     print(
         "Loading results from solution file {}...".format(
@@ -1797,35 +2183,33 @@ def load_gurobi_json_solution(
         )
     )
 
-    instance, dynamic_components, symbol_map = load_problem_info(
-        prob_sol_files_directory=prob_sol_files_directory
+    instance, dynamic_components, symbol_index = load_problem_info(
+        prob_sol_files_directory=prob_sol_files_directory,
+        rebuild_problem=rebuild_problem,
     )
+    solution_loader = SolutionLoader(instance=instance, symbol_index=symbol_index)
 
-    # #### WORKING VERSION #####
-    # This needs to be under an if statement and execute when we are loading
-    # solution from disk
-    # Read JSON solution file
+    solution_info = None
     with open(os.path.join(prob_sol_files_directory, solution_filename), "r") as f:
-        solution = json.load(f)
-
-    # Variables
-    for v in solution["Vars"]:
-        var_id, value = v["VTag"][0], v["X"]
-        if not var_id == "ONE_VAR_CONSTANT":
-            symbol_map.bySymbol[var_id]().value = float(value)
-
-    # Constraints
-    for c in solution["Constrs"]:
-        constraint_id, dual = c["CTag"][0][4:], c["Pi"]
-        if not constraint_id == "ONE_VAR_CONSTAN":
-            instance.dual[symbol_map.bySymbol[constraint_id]()] = float(dual)
+        for key, value in iter_json_members(f=f, streamed_keys=("Vars", "Constrs")):
+            # Variables
+            if key == "Vars":
+                var_id = value["VTag"][0]
+                if not var_id == "ONE_VAR_CONSTANT":
+                    solution_loader.add_value(var_id, value["X"])
+            # Constraints
+            elif key == "Constrs":
+                constraint_id = value["CTag"][0]
+                if not constraint_id[4:] == "ONE_VAR_CONSTAN":
+                    solution_loader.add_dual(constraint_id, value["Pi"])
+            elif key == "SolutionInfo":
+                solution_info = value
+    solution_loader.flush()
 
     # Solver status
     # TODO: what are the types
-    termination_condition = (
-        "optimal" if solution["SolutionInfo"]["Status"] == 2 else "unknown"
-    )
-    solver_status = "ok" if solution["SolutionInfo"]["Status"] == 2 else "unknown"
+    termination_condition = "optimal" if solution_info["Status"] == 2 else "unknown"
+    solver_status = "ok" if solution_info["Status"] == 2 else "unknown"
     results = Results(
         solver_status=solver_status, termination_condition=termination_condition
     )
@@ -1833,26 +2217,47 @@ def load_gurobi_json_solution(
     return instance, results, dynamic_components
 
 
-def load_problem_info(prob_sol_files_directory):
-    with open(
-        os.path.join(prob_sol_files_directory, "instance.pickle"), "rb"
-    ) as instance_in:
-        instance = dill.load(instance_in)
-    with open(
-        os.path.join(prob_sol_files_directory, "dynamic_components.pickle"), "rb"
-    ) as dc_in:
-        dynamic_components = dill.load(dc_in)
-    with open(
-        os.path.join(prob_sol_files_directory, "symbol_map.pickle"), "rb"
-    ) as map_in:
-        symbol_cuid_pairs = dill.load(map_in)
-        symbol_map = SymbolMap()
-        symbol_map.addSymbols(
-            (cuid.find_component_on(instance), symbol)
-            for symbol, cuid in symbol_cuid_pairs
+def load_problem_info(prob_sol_files_directory, rebuild_problem=None):
+    """
+    :param prob_sol_files_directory:
+    :param rebuild_problem: function returning the dynamic components and
+        the instance rebuilt from the inputs, used if the instance was not
+        pickled with the problem file (see *--skip_instance_pickle*)
+    :return: the instance, the dynamic components, and the SymbolIndex
+
+    Problem files written by older GridPath versions have a pickled tuple of
+    (symbol, ComponentUID) pairs instead of the symbol index; the index is
+    then created from these.
+    """
+    instance_file = os.path.join(prob_sol_files_directory, "instance.pickle")
+    if os.path.isfile(instance_file) or rebuild_problem is None:
+        with open(instance_file, "rb") as instance_in:
+            instance = dill.load(instance_in)
+        with open(
+            os.path.join(prob_sol_files_directory, "dynamic_components.pickle"), "rb"
+        ) as dc_in:
+            dynamic_components = dill.load(dc_in)
+    else:
+        dynamic_components, instance = rebuild_problem()
+
+    symbol_index_file = os.path.join(prob_sol_files_directory, SYMBOL_INDEX_FILENAME)
+    if os.path.isfile(symbol_index_file):
+        symbol_index = SymbolIndex.load(symbol_index_file)
+    else:
+        with open(
+            os.path.join(prob_sol_files_directory, "symbol_map.pickle"), "rb"
+        ) as map_in:
+            symbol_cuid_pairs = dill.load(map_in)
+            symbol_map = SymbolMap()
+            symbol_map.addSymbols(
+                (cuid.find_component_on(instance), symbol)
+                for symbol, cuid in symbol_cuid_pairs
+            )
+        symbol_index = SymbolIndex.from_symbol_map(
+            instance=instance, symbol_map=symbol_map
         )
 
-    return instance, dynamic_components, symbol_map
+    return instance, dynamic_components, symbol_index
 
 
 class Results(object):
@@ -16,13 +16,39 @@
 Parallel gridpath_run. Note that parallel gridpath_run_e2e is not yet
 supported. You can get the scenario inputs, solve the scenarios in parallel
 with gridpath_run_parallel, the import the results to the database in sequence.
+
+Rather than running each scenario in its own process (with its own pool if
+the scenario's subproblems are solved in parallel), we split all scenarios
+into the tasks that can be solved independently -- the (iteration,
+subproblem) problems of each scenario, or all the subproblems of an
+iteration if they are linked, which must be solved in order -- and solve the
+tasks of all scenarios in a single pool of --n_parallel_scenarios worker
+processes. Workers take the next task from the shared queue as soon as they
+are done with their current one, and the tasks are queued from the largest
+to the smallest (by the size of their input files), so that the largest
+tasks don't end up running last while the other workers sit idle. The
+scenarios' --n_parallel_solve options are ignored.
+
+The wall time of each task is reported at the end of the run and, if
+--task_timings_csv is specified, saved to a CSV file.
 """
 from argparse import ArgumentParser
 import csv
-from multiprocessing import get_context
+import os.path
 import sys
+import time
+import warnings
 
-from gridpath.run_scenario import main as run_scenario_main
+from gridpath.auxiliary.module_list import ModuleRegistry
+from gridpath.auxiliary.scenario_chars import get_scenario_structure_from_disk
+from gridpath.auxiliary.worker_pool import create_worker_pool, get_worker_context
+from gridpath.common_functions import determine_scenario_directory
+from gridpath.run_scenario import (
+    create_pass_through_inputs,
+    get_subproblem_tasks,
+    parse_arguments as parse_run_scenario_arguments,
+    run_optimization_for_subproblem,
+)
 
 
 def parse_arguments(arguments):
@@ -38,7 +64,16 @@ def parse_arguments(arguments):
         default="./scenarios_to_run.csv",
         help="The file containing the scenarios to run along with their run_scenario options.",
     )
-    parser.add_argument("--n_parallel_scenarios", help="Solve n scenarios in parallel.")
+    parser.add_argument(
+        "--n_parallel_scenarios",
+        help="The number of worker processes solving the subproblems of all "
+        "scenarios in parallel.",
+    )
+    parser.add_argument(
+        "--task_timings_csv",
+        help="Save the wall time of each task (scenario iteration and "
+        "subproblem(s)) to this CSV file.",
+    )
     # Parse arguments
     parsed_arguments = parser.parse_known_args(args=arguments)[0]
 
@@ -81,22 +116,262 @@ def main(args=None):
 
                 id += 1
 
-    # Create pool
-    pool = get_context("spawn").Pool(n_parallel_scenarios)
+    # Determine the tasks of each scenario
+    scenario_arguments = []
+    scenario_directories = []
+    multi_stage = []
+    tasks = []
+    for scenario_index, scenario_args in enumerate(args_for_run_scenario):
+        parsed_scenario_args = parse_run_scenario_arguments(scenario_args)
+        if int(parsed_scenario_args.n_parallel_solve) > 1:
+            warnings.warn(
+                "GridPath WARNING: the subproblems of all scenarios are solved "
+                "in a single pool; ignoring --n_parallel_solve for scenario "
+                "{}.".format(parsed_scenario_args.scenario)
+            )
+        scenario_directory = determine_scenario_directory(
+            scenario_location=parsed_scenario_args.scenario_location,
+            scenario_name=parsed_scenario_args.scenario,
+        )
+        if not os.path.exists(scenario_directory):
+            raise IOError(
+                "Scenario '{}/{}' does not exist. Please verify"
+                " scenario name and scenario location".format(
+                    parsed_scenario_args.scenario_location,
+                    parsed_scenario_args.scenario,
+                )
+            )
+        scenario_structure = get_scenario_structure_from_disk(
+            scenario_directory=scenario_directory
+        )
+
+        scenario_arguments.append(parsed_scenario_args)
+        scenario_directories.append(scenario_directory)
+        multi_stage.append(scenario_structure.MULTI_STAGE)
+        for subproblem_task in get_subproblem_tasks(
+            scenario_directory=scenario_directory,
+            scenario_structure=scenario_structure,
+        ):
+            tasks.append([scenario_index] + list(subproblem_task))
 
-    pool_data = tuple(args_for_run_scenario)
-    pool.map(run_scenario_pool, pool_data)
-    pool.close()
+    # Queue the largest tasks first
+    tasks.sort(
+        key=lambda task: -get_task_input_size(
+            scenario_directory=scenario_directories[task[0]],
+            weather_iteration_str=task[1],
+            hydro_iteration_str=task[2],
+            availability_iteration_str=task[3],
+            stage_directories_by_subproblem=task[4],
+        )
+    )
+
+    objective_values = {
+        scenario_args.scenario: {} for scenario_args in scenario_arguments
+    }
+    task_timings = []
+    start_time = time.perf_counter()
+    # The tasks are taken from the queue one at a time by the first idle
+    # worker
+    with create_worker_pool(
+        n_processes=max(1, min(n_parallel_scenarios, len(tasks))),
+        scenario_arguments=scenario_arguments,
+        scenario_directories=scenario_directories,
+        multi_stage=multi_stage,
+    ) as pool:
+        for task_timing, task_objective_values in pool.imap_unordered(
+            run_scenario_task_pool, tasks, chunksize=1
+        ):
+            scenario = scenario_arguments[task_timing["scenario_index"]].scenario
+            objective_values[scenario].update(task_objective_values)
+            task_timings.append(
+                {
+                    "scenario": scenario,
+                    "weather_iteration": task_timing["weather_iteration"],
+                    "hydro_iteration": task_timing["hydro_iteration"],
+                    "availability_iteration": task_timing["availability_iteration"],
+                    "subproblems": task_timing["subproblems"],
+                    "process_id": task_timing["process_id"],
+                    "start_time_s": task_timing["start_time"] - start_time,
+                    "wall_time_s": task_timing["wall_time"],
+                }
+            )
+
+    report_task_timings(
+        task_timings=task_timings,
+        total_wall_time=time.perf_counter() - start_time,
+        task_timings_csv=parsed_args.task_timings_csv,
+    )
 
+    return objective_values
 
-def run_scenario_pool(pool_datum):
+
+def get_task_input_size(
+    scenario_directory,
+    weather_iteration_str,
+    hydro_iteration_str,
+    availability_iteration_str,
+    stage_directories_by_subproblem,
+):
     """
-    Helper function to pass to pool.map if solving scenarios in parallel.
+    :return: the total size in bytes of the input files of the task's
+        subproblems and stages
+
+    We use the size of the inputs as a proxy for how long the task will take
+    to solve.
     """
-    run_scenario_main(
-        args=pool_datum,
+    input_size = 0
+    for subproblem_str, stage_strs in stage_directories_by_subproblem.items():
+        for stage_str in stage_strs:
+            inputs_directory = os.path.join(
+                scenario_directory,
+                weather_iteration_str,
+                hydro_iteration_str,
+                availability_iteration_str,
+                subproblem_str,
+                stage_str,
+                "inputs",
+            )
+            if os.path.isdir(inputs_directory):
+                input_size += sum(
+                    entry.stat().st_size
+                    for entry in os.scandir(inputs_directory)
+                    if entry.is_file()
+                )
+
+    return input_size
+
+
+def run_scenario_task_pool(pool_datum):
+    """
+    Helper function to pass to the worker pool if solving scenarios in
+    parallel; the pool datum includes the scenario index and the stage
+    directories by subproblem for the subproblem(s) to solve, which are
+    solved in order (linked subproblems are solved in the same task). The
+    scenarios' parsed arguments and directories are set once per worker
+    (see *auxiliary.worker_pool*) and each scenario's modules are loaded
+    the first time the worker solves one of the scenario's tasks.
+    """
+    [
+        scenario_index,
+        weather_iteration_str,
+        hydro_iteration_str,
+        availability_iteration_str,
+        stage_directories_by_subproblem,
+    ] = pool_datum
+    worker_context = get_worker_context()
+    scenario_directory = worker_context["scenario_directories"][scenario_index]
+    multi_stage = worker_context["multi_stage"][scenario_index]
+
+    module_registries = worker_context.setdefault("module_registries", dict())
+    if scenario_index not in module_registries:
+        module_registries[scenario_index] = ModuleRegistry.from_scenario_directory(
+            scenario_directory=scenario_directory, multi_stage=multi_stage
+        )
+    module_registry = module_registries[scenario_index]
+
+    start_time = time.perf_counter()
+    objective_values = {}
+    for subproblem_str, stage_strs in stage_directories_by_subproblem.items():
+        if multi_stage:
+            create_pass_through_inputs(
+                scenario_directory,
+                module_registry,
+                subproblem_str,
+                weather_iteration_str,
+                hydro_iteration_str,
+                availability_iteration_str,
+            )
+        objective_values[
+            (
+                weather_iteration_str,
+                hydro_iteration_str,
+                availability_iteration_str,
+                1 if subproblem_str == "" else int(subproblem_str),
+            )
+        ] = {}
+        run_optimization_for_subproblem(
+            scenario_directory=scenario_directory,
+            weather_iteration_directory=weather_iteration_str,
+            hydro_iteration_directory=hydro_iteration_str,
+            availability_iteration_directory=availability_iteration_str,
+            subproblem_directory=subproblem_str,
+            stage_directories=stage_strs,
+            module_registry=module_registry,
+            parsed_arguments=worker_context["scenario_arguments"][scenario_index],
+            objective_values=objective_values,
+        )
+
+    task_timing = {
+        "scenario_index": scenario_index,
+        "weather_iteration": weather_iteration_str,
+        "hydro_iteration": hydro_iteration_str,
+        "availability_iteration": availability_iteration_str,
+        "subproblems": " ".join(stage_directories_by_subproblem.keys()),
+        "process_id": os.getpid(),
+        "start_time": start_time,
+        "wall_time": time.perf_counter() - start_time,
+    }
+
+    return task_timing, objective_values
+
+
+def report_task_timings(task_timings, total_wall_time, task_timings_csv):
+    """
+    :param task_timings: list of dictionaries with the timing of each task
+    :param total_wall_time: the wall time of the whole run in seconds
+    :param task_timings_csv: the path to the CSV file to save the timings to
+        (None if not saving)
+    :return:
+
+    Print the wall time of each task, the total wall time, and the sum of the
+    task wall times, and save the task timings if requested.
+    """
+    task_timings = sorted(task_timings, key=lambda t: t["start_time_s"])
+    print("Task wall times:")
+    for t in task_timings:
+        print(
+            "  {} {} (process {}): {:.2f} s".format(
+                t["scenario"],
+                "/".join(
+                    d
+                    for d in [
+                        t["weather_iteration"],
+                        t["hydro_iteration"],
+                        t["availability_iteration"],
+                        t["subproblems"],
+                    ]
+                    if d != ""
+                ),
+                t["process_id"],
+                t["wall_time_s"],
+            )
+        )
+    print(
+        "Solved {} tasks in {:.2f} s (sum of task wall times {:.2f} s).".format(
+            len(task_timings),
+            total_wall_time,
+            sum(t["wall_time_s"] for t in task_timings),
+        )
     )
 
+    if task_timings_csv is not None:
+        with open(task_timings_csv, "w", newline="") as f:
+            writer = csv.DictWriter(
+                f,
+                fieldnames=[
+                    "scenario",
+                    "weather_iteration",
+                    "hydro_iteration",
+                    "availability_iteration",
+                    "subproblems",
+                    "process_id",
+                    "start_time_s",
+                    "wall_time_s",
+                ],
+            )
+            writer.writeheader()
+            writer.writerows(task_timings)
+
 
 if __name__ == "__main__":
     main()
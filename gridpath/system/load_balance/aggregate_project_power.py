@@ -58,8 +58,7 @@ def add_model_components(
         """
         return sum(
             mod.Bulk_Power_Provision_MW[prj, tmp]
-            for prj in mod.OPR_PRJS_IN_TMP[tmp]
-            if mod.load_zone[prj] == z
+            for prj in mod.OPR_PRJS_IN_LZ_TMP[z, tmp]
         )
 
     m.Bulk_Power_Production_in_Zone_MW = Expression(
@@ -55,8 +55,7 @@ def add_model_components(
         """
         return sum(
             (mod.Transmit_Power_MW[tx, tmp] - mod.Tx_Losses_LZ_To_MW[tx, tmp])
-            for tx in mod.TX_LINES_OPR_IN_TMP[tmp]
-            if mod.load_zone_to[tx] == z
+            for tx in mod.TX_LINES_OPR_TO_LZ_IN_TMP[z, tmp]
         )
 
     m.Transmission_to_Zone_MW = Expression(
@@ -73,8 +72,7 @@ def add_model_components(
         """
         return sum(
             (mod.Transmit_Power_MW[tx, tmp] + mod.Tx_Losses_LZ_From_MW[tx, tmp])
-            for tx in mod.TX_LINES_OPR_IN_TMP[tmp]
-            if mod.load_zone_from[tx] == z
+            for tx in mod.TX_LINES_OPR_FROM_LZ_IN_TMP[z, tmp]
         )
 
     m.Transmission_from_Zone_MW = Expression(
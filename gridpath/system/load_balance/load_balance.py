@@ -41,6 +41,7 @@ import pandas as pd
 from pyomo.environ import Var, Constraint, Expression, NonNegativeReals, value
 
 from db.common_functions import spin_on_database_lock
+from gridpath.auxiliary.db_interface import get_process_results_keys_filter_sql
 from gridpath.auxiliary.dynamic_components import (
     load_balance_consumption_components,
     load_balance_production_components,
@@ -369,19 +370,22 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
     :param quiet:
     :return:
     """
+    keys_filter = get_process_results_keys_filter_sql()
+
     if not quiet:
         print("calculating loss of load timepoint summary")
 
     # results_system_timepoint_loss_of_load_summary
-    del_sql = """
+    del_sql = f"""
         DELETE FROM results_system_timepoint_loss_of_load_summary
         WHERE scenario_id = ?
+        AND {keys_filter}
         """
     spin_on_database_lock(
         conn=db, cursor=c, sql=del_sql, data=(scenario_id,), many=False
     )
 
-    agg_sql = """
+    agg_sql = f"""
         INSERT INTO results_system_timepoint_loss_of_load_summary
         (scenario_id, weather_iteration, hydro_iteration, 
         availability_iteration, subproblem_id, stage_id, timepoint, period, 
@@ -397,6 +401,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         SUM(unserved_energy_mw) AS unserved_energy_mw
         FROM results_system_load_zone_timepoint_loss_of_load_summary
         WHERE scenario_id = ?
+        AND {keys_filter}
         GROUP BY scenario_id, weather_iteration, hydro_iteration, 
         availability_iteration, subproblem_id, stage_id, timepoint
         ORDER BY scenario_id, weather_iteration, hydro_iteration, 
@@ -409,15 +414,16 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         print("calculating loss of load days summary")
 
     # results_system_days_loss_of_load_summary
-    del_sql = """
+    del_sql = f"""
         DELETE FROM results_system_days_loss_of_load_summary
         WHERE scenario_id = ?
+        AND {keys_filter}
         """
     spin_on_database_lock(
         conn=db, cursor=c, sql=del_sql, data=(scenario_id,), many=False
     )
 
-    agg_sql = """
+    agg_sql = f"""
         INSERT INTO results_system_days_loss_of_load_summary
         (scenario_id, weather_iteration, hydro_iteration, 
         availability_iteration, subproblem_id, stage_id, period, month, 
@@ -432,6 +438,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         SUM(number_of_hours_in_timepoint)
         FROM results_system_timepoint_loss_of_load_summary
         WHERE scenario_id = ?
+        AND {keys_filter}
         GROUP BY scenario_id, weather_iteration, hydro_iteration, 
         availability_iteration, subproblem_id, stage_id, period, month, 
         day_of_month
@@ -446,6 +453,8 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         print("calculating loss of load metrics summary")
 
     # results_system_loss_of_load_metrics_summary
+    # The scenario-level metrics are recalculated from the summaries for all
+    # subproblems
     del_sql = """
         DELETE FROM results_system_loss_of_load_metrics_summary
         WHERE scenario_id = ?
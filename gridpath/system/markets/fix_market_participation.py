@@ -16,6 +16,8 @@ import csv
 import os.path
 from pyomo.environ import value
 
+from gridpath.auxiliary.state_store import open_state_table
+
 
 def fix_variables(
     m,
@@ -78,21 +80,19 @@ def export_pass_through_inputs(
     :return:
     """
 
-    with open(
-        os.path.join(
-            scenario_directory,
+    with open_state_table(
+        scenario_directory=scenario_directory,
+        problem_key=(
             weather_iteration,
             hydro_iteration,
             availability_iteration,
             subproblem,
-            "pass_through_inputs",
-            "market_positions.tab",
+            "",
         ),
-        "a",
-    ) as market_positions_file:
-        fixed_commitment_writer = csv.writer(
-            market_positions_file, delimiter="\t", lineterminator="\n"
-        )
+        subdirectory="pass_through_inputs",
+        filename="market_positions.tab",
+        mode="a",
+    ) as fixed_commitment_writer:
         for lz, hub, tmp in m.LZ_MARKETS * m.TMPS:
             fixed_commitment_writer.writerow(
                 [
@@ -34,6 +34,7 @@ from gridpath.auxiliary.db_interface import (
     import_csv,
     directories_to_db_values,
 )
+from gridpath.auxiliary.state_store import read_state_table_df
 from gridpath.common_functions import create_results_df
 from gridpath.system.load_balance import LOAD_ZONE_TMP_DF
 
@@ -156,13 +157,17 @@ def load_model_data(
         else:
             first_stage_flag = {None: False}
 
-            starting_market_positions_df = pd.read_csv(
-                os.path.join(
-                    subproblem_directory,
-                    "pass_through_inputs",
-                    "market_positions.tab",
+            starting_market_positions_df = read_state_table_df(
+                scenario_directory=scenario_directory,
+                problem_key=(
+                    weather_iteration,
+                    hydro_iteration,
+                    availability_iteration,
+                    subproblem,
+                    "",
                 ),
-                sep="\t",
+                subdirectory="pass_through_inputs",
+                filename="market_positions.tab",
                 dtype={"stage": str},
             )
 
@@ -22,6 +22,7 @@ from pyomo.environ import Expression, value
 from gridpath.auxiliary.dynamic_components import carbon_cap_balance_emission_components
 from gridpath.common_functions import create_results_df
 from gridpath.system.policy.carbon_cap import CARBON_CAP_ZONE_PRD_DF
+from gridpath.system.policy.common_functions import get_policy_zone_index
 
 
 def add_model_components(
@@ -54,8 +55,13 @@ def add_model_components(
             mod.Project_Carbon_Emissions[g, tmp]
             * mod.hrs_in_tmp[tmp]
             * mod.tmp_weight[tmp]
-            for (g, tmp) in mod.CRBN_PRJ_OPR_TMPS
-            if g in mod.CRBN_PRJS_BY_CARBON_CAP_ZONE[z] and tmp in mod.TMPS_IN_PRD[p]
+            for (g, tmp) in get_policy_zone_index(
+                mod,
+                index_name="CRBN_PRJ_OPR_TMPS_BY_CARBON_CAP_ZONE_PRD",
+                set_name="CRBN_PRJ_OPR_TMPS",
+                by="tmp_period",
+                members_by_zone_set="CRBN_PRJS_BY_CARBON_CAP_ZONE",
+            ).get((z, p), [])
         )
 
     m.Total_Carbon_Cap_Project_Emissions = Expression(
@@ -32,6 +32,7 @@ from pyomo.environ import (
 
 from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.dynamic_components import carbon_cap_balance_emission_components
+from gridpath.system.policy.common_functions import get_policy_zone_index
 from gridpath.common_functions import create_results_df
 from gridpath.system.policy.carbon_cap import CARBON_CAP_ZONE_PRD_DF
 from gridpath.transmission.operations.carbon_emissions import (
@@ -69,9 +70,13 @@ def add_model_components(
             mod.Import_Carbon_Emissions_Tons[tx, tmp]
             * mod.hrs_in_tmp[tmp]
             * mod.tmp_weight[tmp]
-            for (tx, tmp) in mod.CRB_TX_OPR_TMPS
-            if tx in mod.CRB_TX_LINES_BY_CARBON_CAP_ZONE[z]
-            and tmp in mod.TMPS_IN_PRD[p]
+            for (tx, tmp) in get_policy_zone_index(
+                mod,
+                index_name="CRB_TX_OPR_TMPS_BY_CARBON_CAP_ZONE_PRD",
+                set_name="CRB_TX_OPR_TMPS",
+                by="tmp_period",
+                members_by_zone_set="CRB_TX_LINES_BY_CARBON_CAP_ZONE",
+            ).get((z, p), [])
         )
 
     m.Total_Carbon_Emission_Imports_Tons = Expression(
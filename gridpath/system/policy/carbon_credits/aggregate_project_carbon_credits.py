@@ -26,6 +26,7 @@ from gridpath.auxiliary.dynamic_components import (
     carbon_credits_balance_purchase_components,
 )
 from gridpath.system.policy.carbon_credits import CARBON_CREDITS_ZONE_PRD_DF
+from gridpath.system.policy.common_functions import get_policy_zone_index
 
 
 def add_model_components(
@@ -56,9 +57,13 @@ def add_model_components(
         """
         return sum(
             mod.Project_Carbon_Credits_Generated[prj, prd]
-            for (prj, period) in mod.CARBON_CREDITS_GENERATION_PRJ_OPR_PRDS
-            if prj in mod.CARBON_CREDITS_GENERATION_PRJS_BY_CARBON_CREDITS_ZONE[z]
-            and prd == period
+            for (prj, period) in get_policy_zone_index(
+                mod,
+                index_name="CARBON_CREDITS_GENERATION_PRJ_OPR_PRDS_BY_ZONE_PRD",
+                set_name="CARBON_CREDITS_GENERATION_PRJ_OPR_PRDS",
+                by="period",
+                members_by_zone_set="CARBON_CREDITS_GENERATION_PRJS_BY_CARBON_CREDITS_ZONE",
+            ).get((z, prd), [])
         )
 
     m.Total_Project_Carbon_Credits_Generated = Expression(
@@ -76,14 +81,18 @@ def add_model_components(
         """
         return sum(
             mod.Project_Purchase_Carbon_Credits[prj, z, prd]
-            for (
-                prj,
-                cc_z,
-                period,
-            ) in mod.CARBON_CREDITS_PURCHASE_PRJS_CARBON_CREDITS_ZONES_OPR_PRDS
-            if prj in mod.CARBON_CREDITS_PURCHASE_PRJS_BY_CARBON_CREDITS_ZONE[cc_z]
-            and prd == period
-            and cc_z == z
+            for (prj, cc_z, period) in get_policy_zone_index(
+                mod,
+                index_name="CARBON_CREDITS_PURCHASE_PRJS_CARBON_CREDITS_ZONES_OPR_PRDS_BY_ZONE_PRD",
+                set_name="CARBON_CREDITS_PURCHASE_PRJS_CARBON_CREDITS_ZONES_OPR_PRDS",
+                by="period",
+                zone_rule=lambda m, el: (
+                    [el[1]]
+                    if el[0]
+                    in m.CARBON_CREDITS_PURCHASE_PRJS_BY_CARBON_CREDITS_ZONE[el[1]]
+                    else []
+                ),
+            ).get((z, prd), [])
         )
 
     m.Total_Project_Carbon_Credits_Purchased = Expression(
@@ -23,6 +23,7 @@ from pyomo.environ import Expression, value
 
 from gridpath.auxiliary.dynamic_components import carbon_tax_cost_components
 from gridpath.common_functions import create_results_df
+from gridpath.system.policy.common_functions import get_policy_zone_index
 from gridpath.system.policy.carbon_tax import CARBON_TAX_ZONE_PRD_DF
 
 
@@ -56,9 +57,13 @@ def add_model_components(
             mod.Project_Carbon_Emissions[g, tmp]
             * mod.hrs_in_tmp[tmp]
             * mod.tmp_weight[tmp]
-            for (g, tmp) in mod.CARBON_TAX_PRJ_OPR_TMPS
-            if g in mod.CARBON_TAX_PRJS_BY_CARBON_TAX_ZONE[z]
-            and tmp in mod.TMPS_IN_PRD[p]
+            for (g, tmp) in get_policy_zone_index(
+                mod,
+                index_name="CARBON_TAX_PRJ_OPR_TMPS_BY_CARBON_TAX_ZONE_PRD",
+                set_name="CARBON_TAX_PRJ_OPR_TMPS",
+                by="tmp_period",
+                members_by_zone_set="CARBON_TAX_PRJS_BY_CARBON_TAX_ZONE",
+            ).get((z, p), [])
         )
 
     m.Total_Carbon_Tax_Project_Emissions = Expression(
@@ -78,9 +83,13 @@ def add_model_components(
             mod.Project_Carbon_Tax_Allowance[g, fg, tmp]
             * mod.hrs_in_tmp[tmp]
             * mod.tmp_weight[tmp]
-            for (g, fg, tmp) in mod.CARBON_TAX_PRJ_FUEL_GROUP_OPR_TMPS
-            if g in mod.CARBON_TAX_PRJS_BY_CARBON_TAX_ZONE[z]
-            and tmp in mod.TMPS_IN_PRD[p]
+            for (g, fg, tmp) in get_policy_zone_index(
+                mod,
+                index_name="CARBON_TAX_PRJ_FUEL_GROUP_OPR_TMPS_BY_CARBON_TAX_ZONE_PRD",
+                set_name="CARBON_TAX_PRJ_FUEL_GROUP_OPR_TMPS",
+                by="tmp_period",
+                members_by_zone_set="CARBON_TAX_PRJS_BY_CARBON_TAX_ZONE",
+            ).get((z, p), [])
         )
 
     m.Total_Carbon_Tax_Project_Allowance = Expression(
@@ -0,0 +1,119 @@
+# Copyright 2016-2023 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Functions shared by the policy aggregation modules.
+
+The policy aggregation expressions sum project-level (or transmission-level)
+contributions by policy zone and period or balancing type horizon. Rather
+than filtering the full project-timepoint set by zone and period for each
+zone-period, the aggregation modules look up the relevant elements in an
+index of the set by (zone, period) or (zone, balancing type, horizon) that
+is built in a single pass and cached on the model instance.
+"""
+
+from gridpath.auxiliary.auxiliary import get_cached_model_data
+
+
+def zones_by_member(mod, members_by_zone_set):
+    """
+    :param mod: the Pyomo model instance
+    :param members_by_zone_set: the name of a set of members (e.g.
+        projects) indexed by zone
+    :return: dictionary {member: [zones the member belongs to]}
+
+    Invert a set of members indexed by zone (e.g.
+    CRBN_PRJS_BY_CARBON_CAP_ZONE); a member can belong to more than one zone.
+    """
+
+    def zones_by_member_init(instance):
+        zones = dict()
+        members_by_zone = getattr(instance, members_by_zone_set)
+        for z in members_by_zone.keys():
+            for member in members_by_zone[z]:
+                zones.setdefault(member, []).append(z)
+        return zones
+
+    return get_cached_model_data(
+        mod,
+        name="zones_by_member_{}".format(members_by_zone_set),
+        build_rule=zones_by_member_init,
+    )
+
+
+def get_policy_zone_index(
+    mod,
+    index_name,
+    set_name,
+    by,
+    members_by_zone_set=None,
+    zone_rule=None,
+):
+    """
+    :param mod: the Pyomo model instance
+    :param index_name: the name under which to cache the index
+    :param set_name: the name of the set to index; the first item of each
+        element must be the member (project or transmission line) and the last
+        item either a timepoint or a period (see *by*)
+    :param by: "tmp_period" to index elements ending in a timepoint by the
+        period of the timepoint, "tmp_horizon" to index elements ending in a
+        timepoint by the (balancing type, horizon) of the timepoint for each
+        balancing type, or "period" to index elements ending in a period by
+        that period
+    :param members_by_zone_set: the name of the set of members indexed by
+        zone; the element's zones are those its first item belongs to
+    :param zone_rule: alternatively, a function of (mod, element) returning
+        the zones of the element; zones can be tuples (e.g. (policy, zone))
+    :return: dictionary {(zone, period): [elements]} or
+        {(zone, balancing_type, horizon): [elements]}, with elements ordered as
+        in the indexed set
+
+    Index a set by policy zone and period or horizon in a single pass.
+    """
+    if zone_rule is None:
+        zone_rule = lambda m, element: zones_by_member(m, members_by_zone_set).get(
+            element[0], []
+        )
+
+    def time_keys(instance, element):
+        if by == "tmp_period":
+            return [(instance.period[element[-1]],)]
+        elif by == "tmp_horizon":
+            return [
+                (bt, instance.horizon[element[-1], bt])
+                for bt in instance.BLN_TYPES
+                if (element[-1], bt) in instance.TMPS_BLN_TYPES
+            ]
+        elif by == "period":
+            return [(element[-1],)]
+        else:
+            raise ValueError(
+                "Invalid policy index type '{}'. Must be 'tmp_period', "
+                "'tmp_horizon', or 'period'.".format(by)
+            )
+
+    def index_init(instance):
+        index = dict()
+        for element in getattr(instance, set_name):
+            zones = zone_rule(instance, element)
+            if not zones:
+                continue
+            keys = time_keys(instance, element)
+            for z in zones:
+                zone_key = z if isinstance(z, tuple) else (z,)
+                for key in keys:
+                    index.setdefault(zone_key + key, []).append(element)
+        return index
+
+    return get_cached_model_data(mod, name=index_name, build_rule=index_init)
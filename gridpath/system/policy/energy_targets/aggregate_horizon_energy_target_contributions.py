@@ -20,6 +20,7 @@ level to the energy-target zone - balancing type - horizon level.
 from pyomo.environ import Expression, value
 
 from gridpath.common_functions import create_results_df
+from gridpath.system.policy.common_functions import get_policy_zone_index
 from gridpath.system.policy.energy_targets import ENERGY_TARGET_ZONE_HRZ_DF
 
 
@@ -62,9 +63,13 @@ def add_model_components(
             )
             * mod.hrs_in_tmp[tmp]
             * mod.tmp_weight[tmp]
-            for (g, tmp) in mod.ENERGY_TARGET_PRJ_OPR_TMPS
-            if g in mod.ENERGY_TARGET_PRJS_BY_ENERGY_TARGET_ZONE[z]
-            and tmp in mod.TMPS_BY_BLN_TYPE_HRZ[bt, h]
+            for (g, tmp) in get_policy_zone_index(
+                mod,
+                index_name="ENERGY_TARGET_PRJ_OPR_TMPS_BY_ENERGY_TARGET_ZONE_BLN_TYPE_HRZ",
+                set_name="ENERGY_TARGET_PRJ_OPR_TMPS",
+                by="tmp_horizon",
+                members_by_zone_set="ENERGY_TARGET_PRJS_BY_ENERGY_TARGET_ZONE",
+            ).get((z, bt, h), [])
         )
 
     m.Total_Delivered_Horizon_Energy_Target_Energy_MWh = Expression(
@@ -90,9 +95,13 @@ def add_model_components(
             )
             * mod.hrs_in_tmp[tmp]
             * mod.tmp_weight[tmp]
-            for (g, tmp) in mod.ENERGY_TARGET_PRJ_OPR_TMPS
-            if g in mod.ENERGY_TARGET_PRJS_BY_ENERGY_TARGET_ZONE[z]
-            and tmp in mod.TMPS_BY_BLN_TYPE_HRZ[bt, h]
+            for (g, tmp) in get_policy_zone_index(
+                mod,
+                index_name="ENERGY_TARGET_PRJ_OPR_TMPS_BY_ENERGY_TARGET_ZONE_BLN_TYPE_HRZ",
+                set_name="ENERGY_TARGET_PRJ_OPR_TMPS",
+                by="tmp_horizon",
+                members_by_zone_set="ENERGY_TARGET_PRJS_BY_ENERGY_TARGET_ZONE",
+            ).get((z, bt, h), [])
         )
 
     m.Total_Curtailed_Horizon_Energy_Target_Energy_MWh = Expression(
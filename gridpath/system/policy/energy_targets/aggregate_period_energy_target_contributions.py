@@ -20,6 +20,7 @@ the energy-target zone - period level.
 from pyomo.environ import Expression, value
 
 from gridpath.common_functions import create_results_df
+from gridpath.system.policy.common_functions import get_policy_zone_index
 from gridpath.system.policy.energy_targets import ENERGY_TARGET_ZONE_PRD_DF
 
 
@@ -60,9 +61,13 @@ def add_model_components(
             )
             * mod.hrs_in_tmp[tmp]
             * mod.tmp_weight[tmp]
-            for (g, tmp) in mod.ENERGY_TARGET_PRJ_OPR_TMPS
-            if g in mod.ENERGY_TARGET_PRJS_BY_ENERGY_TARGET_ZONE[z]
-            and tmp in mod.TMPS_IN_PRD[p]
+            for (g, tmp) in get_policy_zone_index(
+                mod,
+                index_name="ENERGY_TARGET_PRJ_OPR_TMPS_BY_ENERGY_TARGET_ZONE_PRD",
+                set_name="ENERGY_TARGET_PRJ_OPR_TMPS",
+                by="tmp_period",
+                members_by_zone_set="ENERGY_TARGET_PRJS_BY_ENERGY_TARGET_ZONE",
+            ).get((z, p), [])
         )
 
     m.Total_Delivered_Period_Energy_Target_Energy_MWh = Expression(
@@ -87,9 +92,13 @@ def add_model_components(
             )
             * mod.hrs_in_tmp[tmp]
             * mod.tmp_weight[tmp]
-            for (g, tmp) in mod.ENERGY_TARGET_PRJ_OPR_TMPS
-            if g in mod.ENERGY_TARGET_PRJS_BY_ENERGY_TARGET_ZONE[z]
-            and tmp in mod.TMPS_IN_PRD[p]
+            for (g, tmp) in get_policy_zone_index(
+                mod,
+                index_name="ENERGY_TARGET_PRJ_OPR_TMPS_BY_ENERGY_TARGET_ZONE_PRD",
+                set_name="ENERGY_TARGET_PRJ_OPR_TMPS",
+                by="tmp_period",
+                members_by_zone_set="ENERGY_TARGET_PRJS_BY_ENERGY_TARGET_ZONE",
+            ).get((z, p), [])
         )
 
     m.Total_Curtailed_Period_Energy_Target_Energy_MWh = Expression(
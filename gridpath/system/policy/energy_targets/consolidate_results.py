@@ -15,6 +15,8 @@
 
 import os.path
 
+from gridpath.auxiliary.dynamic_components import results_format
+from gridpath.auxiliary.results_io import write_results_df
 from gridpath.system.policy.energy_targets import (
     ENERGY_TARGET_ZONE_PRD_DF,
     ENERGY_TARGET_ZONE_HRZ_DF,
@@ -37,8 +39,9 @@ def export_results(
     """
 
     if hasattr(m, "ENERGY_TARGET_ZONE_PERIODS_WITH_ENERGY_TARGET"):
-        getattr(d, ENERGY_TARGET_ZONE_PRD_DF).to_csv(
-            os.path.join(
+        write_results_df(
+            df=getattr(d, ENERGY_TARGET_ZONE_PRD_DF),
+            results_directory=os.path.join(
                 scenario_directory,
                 weather_iteration,
                 hydro_iteration,
@@ -46,21 +49,20 @@ def export_results(
                 subproblem,
                 stage,
                 "results",
-                "system_period_energy_target.csv",
             ),
-            sep=",",
-            index=True,
+            results_name="system_period_energy_target",
+            results_format=getattr(d, results_format),
         )
 
     if hasattr(m, "ENERGY_TARGET_ZONE_BLN_TYPE_HRZS_WITH_ENERGY_TARGET"):
-        getattr(d, ENERGY_TARGET_ZONE_HRZ_DF).to_csv(
-            os.path.join(
+        write_results_df(
+            df=getattr(d, ENERGY_TARGET_ZONE_HRZ_DF),
+            results_directory=os.path.join(
                 scenario_directory,
                 subproblem,
                 stage,
                 "results",
-                "system_horizon_energy_target.csv",
             ),
-            sep=",",
-            index=True,
+            results_name="system_horizon_energy_target",
+            results_format=getattr(d, results_format),
         )
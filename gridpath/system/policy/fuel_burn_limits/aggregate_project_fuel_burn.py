@@ -23,6 +23,7 @@ from pyomo.environ import Param, Set, Expression
 import pandas as pd
 from gridpath.auxiliary.db_interface import directories_to_db_values
 from gridpath.auxiliary.dynamic_components import fuel_burn_balance_components
+from gridpath.system.policy.common_functions import get_policy_zone_index
 
 
 def add_model_components(
@@ -97,10 +98,14 @@ def add_model_components(
             )
             * mod.hrs_in_tmp[tmp]
             * mod.tmp_weight[tmp]
-            for (prj, fuel, tmp) in mod.FUEL_PRJS_FUEL_WITH_LIMITS_OPR_TMPS
-            if prj in mod.PRJS_BY_FUEL_BA[ba]  # find projects for this BA
+            for (prj, fuel, tmp) in get_policy_zone_index(
+                mod,
+                index_name="FUEL_PRJS_FUEL_WITH_LIMITS_OPR_TMPS_BY_FUEL_BA_BLN_TYPE_HRZ",
+                set_name="FUEL_PRJS_FUEL_WITH_LIMITS_OPR_TMPS",
+                by="tmp_horizon",
+                members_by_zone_set="PRJS_BY_FUEL_BA",
+            ).get((ba, bt, h), [])
             if fuel in mod.FUELS_BY_FUEL_BA[ba]  # find fuel for this BA
-            and tmp in mod.TMPS_BY_BLN_TYPE_HRZ[bt, h]  # only tmps in relevant horizon
         )
 
     m.Total_Horizon_Fuel_Burn_By_Fuel_BA_Unit = Expression(
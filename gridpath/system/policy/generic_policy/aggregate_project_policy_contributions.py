@@ -17,6 +17,7 @@
 from pyomo.environ import Expression, value
 
 from gridpath.common_functions import create_results_df
+from gridpath.system.policy.common_functions import get_policy_zone_index
 from gridpath.system.policy.energy_targets import ENERGY_TARGET_ZONE_HRZ_DF
 
 
@@ -49,10 +50,13 @@ def add_model_components(
             (mod.Policy_Contribution_in_Timepoint[prj, policy, zone, tmp])
             * mod.hrs_in_tmp[tmp]
             * mod.tmp_weight[tmp]
-            for (prj, _policy, _zone, tmp) in mod.PRJ_POLICY_ZONE_OPR_TMPS
-            if policy == _policy
-            and zone == _zone
-            and tmp in mod.TMPS_BY_BLN_TYPE_HRZ[bt, h]
+            for (prj, _policy, _zone, tmp) in get_policy_zone_index(
+                mod,
+                index_name="PRJ_POLICY_ZONE_OPR_TMPS_BY_POLICY_ZONE_BLN_TYPE_HRZ",
+                set_name="PRJ_POLICY_ZONE_OPR_TMPS",
+                by="tmp_horizon",
+                zone_rule=lambda m, el: [(el[1], el[2])],
+            ).get((policy, zone, bt, h), [])
         )
 
     m.Total_Project_Policy_Zone_Tmp_Contributions = Expression(
@@ -34,7 +34,10 @@ def add_model_components(
     """
 
     m.INST_PEN_PRJ_OPERATIONAL_IN_TIMEPOINT = Set(
-        m.TMPS, initialize=lambda mod, tmp: mod.INST_PEN_PRJS & mod.OPR_PRJS_IN_TMP[tmp]
+        m.TMPS,
+        initialize=lambda mod, tmp: [
+            g for g in mod.OPR_PRJS_IN_TMP[tmp] if g in mod.INST_PEN_PRJS
+        ],
     )
 
     # instantaneous penetration provision
@@ -24,6 +24,7 @@ from gridpath.auxiliary.dynamic_components import (
     performance_standard_balance_emission_components,
 )
 from gridpath.common_functions import create_results_df
+from gridpath.system.policy.common_functions import get_policy_zone_index
 from gridpath.system.policy.performance_standard import PERFORMANCE_STANDARD_Z_PRD_DF
 
 
@@ -57,9 +58,13 @@ def add_model_components(
             mod.Project_Carbon_Emissions[g, tmp]
             * mod.hrs_in_tmp[tmp]
             * mod.tmp_weight[tmp]
-            for (g, tmp) in mod.PERFORMANCE_STANDARD_OPR_TMPS
-            if g in mod.PERFORMANCE_STANDARD_PRJS_BY_PERFORMANCE_STANDARD_ZONE[z]
-            and tmp in mod.TMPS_IN_PRD[p]
+            for (g, tmp) in get_policy_zone_index(
+                mod,
+                index_name="PERFORMANCE_STANDARD_OPR_TMPS_BY_PERFORMANCE_STANDARD_ZONE_PRD",
+                set_name="PERFORMANCE_STANDARD_OPR_TMPS",
+                by="tmp_period",
+                members_by_zone_set="PERFORMANCE_STANDARD_PRJS_BY_PERFORMANCE_STANDARD_ZONE",
+            ).get((z, p), [])
         )
 
     m.Total_Performance_Standard_Project_Emissions = Expression(
@@ -80,9 +85,13 @@ def add_model_components(
             mod.Bulk_Power_Provision_MW[g, tmp]
             * mod.hrs_in_tmp[tmp]
             * mod.tmp_weight[tmp]
-            for (g, tmp) in mod.PERFORMANCE_STANDARD_OPR_TMPS
-            if g in mod.PERFORMANCE_STANDARD_PRJS_BY_PERFORMANCE_STANDARD_ZONE[z]
-            and tmp in mod.TMPS_IN_PRD[p]
+            for (g, tmp) in get_policy_zone_index(
+                mod,
+                index_name="PERFORMANCE_STANDARD_OPR_TMPS_BY_PERFORMANCE_STANDARD_ZONE_PRD",
+                set_name="PERFORMANCE_STANDARD_OPR_TMPS",
+                by="tmp_period",
+                members_by_zone_set="PERFORMANCE_STANDARD_PRJS_BY_PERFORMANCE_STANDARD_ZONE",
+            ).get((z, p), [])
         )
 
     # We'll multiply this by the standard in the balance constraint
@@ -103,9 +112,13 @@ def add_model_components(
         """
         return sum(
             mod.Capacity_MW[prj, prd]
-            for (prj, prd) in mod.PERFORMANCE_STANDARD_OPR_PRDS
-            if prj in mod.PERFORMANCE_STANDARD_PRJS_BY_PERFORMANCE_STANDARD_ZONE[z]
-            and prd == p
+            for (prj, prd) in get_policy_zone_index(
+                mod,
+                index_name="PERFORMANCE_STANDARD_OPR_PRDS_BY_PERFORMANCE_STANDARD_ZONE_PRD",
+                set_name="PERFORMANCE_STANDARD_OPR_PRDS",
+                by="period",
+                members_by_zone_set="PERFORMANCE_STANDARD_PRJS_BY_PERFORMANCE_STANDARD_ZONE",
+            ).get((z, p), [])
         )
 
     # We'll multiply this by the standard in the balance constraint
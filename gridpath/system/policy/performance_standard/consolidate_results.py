@@ -15,6 +15,8 @@
 
 import os.path
 
+from gridpath.auxiliary.dynamic_components import results_format
+from gridpath.auxiliary.results_io import write_results_df
 from gridpath.system.policy.performance_standard import PERFORMANCE_STANDARD_Z_PRD_DF
 
 
@@ -33,8 +35,9 @@ def export_results(
     have added to
     """
 
-    getattr(d, PERFORMANCE_STANDARD_Z_PRD_DF).to_csv(
-        os.path.join(
+    write_results_df(
+        df=getattr(d, PERFORMANCE_STANDARD_Z_PRD_DF),
+        results_directory=os.path.join(
             scenario_directory,
             weather_iteration,
             hydro_iteration,
@@ -42,8 +45,7 @@ def export_results(
             subproblem,
             stage,
             "results",
-            "system_performance_standard.csv",
         ),
-        sep=",",
-        index=True,
+        results_name="system_performance_standard",
+        results_format=getattr(d, results_format),
     )
@@ -22,6 +22,7 @@ horizon level.
 from pyomo.environ import Expression, value
 
 from gridpath.common_functions import create_results_df
+from gridpath.system.policy.common_functions import get_policy_zone_index
 from gridpath.system.policy.transmission_targets import TX_TARGETS_DF
 
 
@@ -58,9 +59,13 @@ def add_model_components(
             )
             * mod.hrs_in_tmp[tmp]
             * mod.tmp_weight[tmp]
-            for (tx, tmp) in mod.TRANSMISSION_TARGET_TX_OPR_TMPS
-            if tx in mod.TRANSMISSION_TARGET_TX_LINES_BY_TRANSMISSION_TARGET_ZONE[z]
-            and tmp in mod.TMPS_BY_BLN_TYPE_HRZ[bt, hz]
+            for (tx, tmp) in get_policy_zone_index(
+                mod,
+                index_name="TRANSMISSION_TARGET_TX_OPR_TMPS_BY_TRANSMISSION_TARGET_ZONE_BLN_TYPE_HRZ",
+                set_name="TRANSMISSION_TARGET_TX_OPR_TMPS",
+                by="tmp_horizon",
+                members_by_zone_set="TRANSMISSION_TARGET_TX_LINES_BY_TRANSMISSION_TARGET_ZONE",
+            ).get((z, bt, hz), [])
         )
 
     m.Total_Transmission_Target_Energy_Pos_Dir_MWh = Expression(
@@ -84,9 +89,13 @@ def add_model_components(
             )
             * mod.hrs_in_tmp[tmp]
             * mod.tmp_weight[tmp]
-            for (tx, tmp) in mod.TRANSMISSION_TARGET_TX_OPR_TMPS
-            if tx in mod.TRANSMISSION_TARGET_TX_LINES_BY_TRANSMISSION_TARGET_ZONE[z]
-            and tmp in mod.TMPS_BY_BLN_TYPE_HRZ[bt, hz]
+            for (tx, tmp) in get_policy_zone_index(
+                mod,
+                index_name="TRANSMISSION_TARGET_TX_OPR_TMPS_BY_TRANSMISSION_TARGET_ZONE_BLN_TYPE_HRZ",
+                set_name="TRANSMISSION_TARGET_TX_OPR_TMPS",
+                by="tmp_horizon",
+                members_by_zone_set="TRANSMISSION_TARGET_TX_LINES_BY_TRANSMISSION_TARGET_ZONE",
+            ).get((z, bt, hz), [])
         )
 
     m.Total_Transmission_Target_Energy_Neg_Dir_MWh = Expression(
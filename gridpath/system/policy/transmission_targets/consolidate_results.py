@@ -15,6 +15,8 @@
 
 import os.path
 
+from gridpath.auxiliary.dynamic_components import results_format
+from gridpath.auxiliary.results_io import write_results_df
 from gridpath.system.policy.transmission_targets import TX_TARGETS_DF
 
 
@@ -33,8 +35,9 @@ def export_results(
     have added to
     """
 
-    getattr(d, TX_TARGETS_DF).to_csv(
-        os.path.join(
+    write_results_df(
+        df=getattr(d, TX_TARGETS_DF),
+        results_directory=os.path.join(
             scenario_directory,
             weather_iteration,
             hydro_iteration,
@@ -42,8 +45,7 @@ def export_results(
             subproblem,
             stage,
             "results",
-            "system_transmission_targets.csv",
         ),
-        sep=",",
-        index=True,
+        results_name="system_transmission_targets",
+        results_format=getattr(d, results_format),
     )
@@ -15,6 +15,8 @@
 
 import os.path
 
+from gridpath.auxiliary.dynamic_components import results_format
+from gridpath.auxiliary.results_io import write_results_df
 from gridpath.system.reliability.local_capacity import LOCAL_CAPACITY_ZONE_PRD_DF
 
 
@@ -33,8 +35,9 @@ def export_results(
     have added to
     """
 
-    getattr(d, LOCAL_CAPACITY_ZONE_PRD_DF).to_csv(
-        os.path.join(
+    write_results_df(
+        df=getattr(d, LOCAL_CAPACITY_ZONE_PRD_DF),
+        results_directory=os.path.join(
             scenario_directory,
             weather_iteration,
             hydro_iteration,
@@ -42,8 +45,7 @@ def export_results(
             subproblem,
             stage,
             "results",
-            "system_local_capacity.csv",
         ),
-        sep=",",
-        index=True,
+        results_name="system_local_capacity",
+        results_format=getattr(d, results_format),
     )
@@ -639,7 +639,7 @@ def import_results_into_database(
     df["stage_id"] = stage
 
     spin_on_database_lock_generic(
-        command=df.to_sql(
+        command=lambda: df.to_sql(
             name="results_system_capacity_transfers",
             con=db,
             if_exists="append",
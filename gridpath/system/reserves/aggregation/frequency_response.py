@@ -47,8 +47,11 @@ def add_model_components(
 
     m.FREQUENCY_RESPONSE_PARTIAL_PROJECTS_OPERATIONAL_IN_TIMEPOINT = Set(
         m.TMPS,
-        initialize=lambda mod, tmp: mod.FREQUENCY_RESPONSE_PARTIAL_PROJECTS
-        & mod.OPR_PRJS_IN_TMP[tmp],
+        initialize=lambda mod, tmp: [
+            g
+            for g in mod.OPR_PRJS_IN_TMP[tmp]
+            if g in mod.FREQUENCY_RESPONSE_PARTIAL_PROJECTS
+        ],
     )
 
     # Reserve provision
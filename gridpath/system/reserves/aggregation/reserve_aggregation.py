@@ -41,15 +41,20 @@ def generic_add_model_components(
 
     # Reserve generators operational generators in timepoint
     # This will be the intersection of the reserve generator set and the set of
-    # generators operational in the timepoint
+    # generators operational in the timepoint; we filter the (indexed)
+    # operational projects in the timepoint rather than intersecting with the
+    # full set in each timepoint
     op_set = str(reserve_generator_set) + "_OPERATIONAL_IN_TIMEPOINT"
     setattr(
         m,
         op_set,
         Set(
             m.TMPS,
-            initialize=lambda mod, tmp: getattr(mod, reserve_generator_set)
-            & mod.OPR_PRJS_IN_TMP[tmp],
+            initialize=lambda mod, tmp: [
+                g
+                for g in mod.OPR_PRJS_IN_TMP[tmp]
+                if g in getattr(mod, reserve_generator_set)
+            ],
         ),
     )
 
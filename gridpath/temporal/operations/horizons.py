@@ -48,7 +48,7 @@ import warnings
 
 from pyomo.environ import Set, Param, PositiveIntegers
 
-from gridpath.auxiliary.auxiliary import cursor_to_df
+from gridpath.auxiliary.auxiliary import cursor_to_df, get_cached_model_data
 from gridpath.auxiliary.db_interface import directories_to_db_values
 from gridpath.auxiliary.validations import (
     write_validation_to_database,
@@ -220,13 +220,13 @@ def add_model_components(
     m.first_hrz_tmp = Param(
         m.BLN_TYPE_HRZS,
         within=PositiveIntegers,
-        initialize=lambda mod, b, h: list(mod.TMPS_BY_BLN_TYPE_HRZ[b, h])[0],
+        initialize=lambda mod, b, h: horizon_tmp_positions(mod)["first"][b, h],
     )
 
     m.last_hrz_tmp = Param(
         m.BLN_TYPE_HRZS,
         within=PositiveIntegers,
-        initialize=lambda mod, b, h: list(mod.TMPS_BY_BLN_TYPE_HRZ[b, h])[-1],
+        initialize=lambda mod, b, h: horizon_tmp_positions(mod)["last"][b, h],
     )
 
     def hrz_period_init(mod, bt, hrz):
@@ -295,6 +295,40 @@ def horizons_by_balancing_type_init(mod, bt):
 ###############################################################################
 
 
+def horizon_tmp_positions(mod):
+    """
+    Get the positions of timepoints within their horizons for each
+    balancing type: the first and last timepoint of each horizon and the
+    previous and next timepoint within the horizon of each timepoint.
+
+    The positions are determined in a single pass over each horizon's
+    ordered timepoints and cached on the model instance, so that looking up
+    a timepoint's neighbors does not require searching the horizon's
+    timepoints. The previous timepoint of the first timepoint and the next
+    timepoint of the last timepoint of a horizon are not included, as they
+    depend on the horizon boundary.
+
+    :param mod: the Pyomo model instance
+    :return: dictionary with keys "first" and "last" ({(bt, hrz): tmp}),
+        and "prev" and "next" ({(tmp, bt): tmp})
+    """
+
+    def positions_init(instance):
+        positions = {"first": {}, "last": {}, "prev": {}, "next": {}}
+        for bt, hrz in instance.BLN_TYPE_HRZS:
+            tmps = list(instance.TMPS_BY_BLN_TYPE_HRZ[bt, hrz])
+            positions["first"][bt, hrz] = tmps[0]
+            positions["last"][bt, hrz] = tmps[-1]
+            for prev_tmp, tmp in zip(tmps[:-1], tmps[1:]):
+                positions["prev"][tmp, bt] = prev_tmp
+                positions["next"][prev_tmp, bt] = tmp
+        return positions
+
+    return get_cached_model_data(
+        mod, name="horizon_tmp_positions", build_rule=positions_init
+    )
+
+
 def prev_tmp_init(mod, tmp, bt):
     """
     **Param Name**: prev_tmp
@@ -324,9 +358,7 @@ def prev_tmp_init(mod, tmp, bt):
                 "or 'linked.'"
             )
     else:
-        prev_tmp = list(mod.TMPS_BY_BLN_TYPE_HRZ[bt, hrz])[
-            list(mod.TMPS_BY_BLN_TYPE_HRZ[bt, hrz]).index(tmp) - 1
-        ]
+        prev_tmp = horizon_tmp_positions(mod)["prev"][tmp, bt]
 
     return prev_tmp
 
@@ -359,9 +391,7 @@ def next_tmp_init(mod, tmp, bt):
                 "or 'linked.'"
             )
     else:
-        next_tmp = list(mod.TMPS_BY_BLN_TYPE_HRZ[bt, hrz])[
-            list(mod.TMPS_BY_BLN_TYPE_HRZ[bt, hrz]).index(tmp) + 1
-        ]
+        next_tmp = horizon_tmp_positions(mod)["next"][tmp, bt]
 
     return next_tmp
 
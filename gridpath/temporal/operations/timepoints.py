@@ -75,6 +75,7 @@ from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.db_interface import (
     determine_table_subset_by_start_and_column,
     directories_to_db_values,
+    get_process_results_keys_filter_sql,
 )
 from gridpath.auxiliary.validations import write_validation_to_database
 
@@ -416,6 +417,10 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
 
     spinup_or_lookahead = c.execute(spinup_or_lookahead_sql).fetchall()
     if spinup_or_lookahead:
+        keys_filter = get_process_results_keys_filter_sql(
+            columns=["subproblem_id", "stage_id"]
+        )
+
         if not quiet:
             print("add spinup_or_lookahead flag")
 
@@ -442,7 +447,8 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
                 AND {tbl}.stage_id = inputs_temporal.stage_id
                 AND {tbl}.timepoint = inputs_temporal.timepoint
                 )
-                WHERE scenario_id = {scenario_id};
+                WHERE scenario_id = {scenario_id}
+                AND {keys_filter};
                 """.format(
                 tbl, tbl, tbl, tbl
             )
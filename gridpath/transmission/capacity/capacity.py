@@ -27,8 +27,10 @@ import pandas as pd
 from pyomo.environ import Set, Expression, value
 
 from db.common_functions import spin_on_database_lock
+from gridpath.auxiliary.db_interface import get_process_results_keys_filter_sql
 from gridpath.auxiliary.auxiliary import (
     get_required_subtype_modules,
+    get_set_index,
     join_sets,
 )
 from gridpath.common_functions import create_results_df
@@ -87,6 +89,18 @@ def add_model_components(
     |                                                                         |
     | Indexed set of transmission lines operatoinal in each timepoint.        |
     +-------------------------------------------------------------------------+
+    | | :code:`TX_LINES_OPR_TO_LZ_IN_TMP`                                     |
+    | | *Defined over*: :code:`LOAD_ZONES x TIMEPOINTS`                       |
+    |                                                                         |
+    | Indexed set of transmission lines operational in each timepoint that    |
+    | have the load zone as their destination.                                |
+    +-------------------------------------------------------------------------+
+    | | :code:`TX_LINES_OPR_FROM_LZ_IN_TMP`                                   |
+    | | *Defined over*: :code:`LOAD_ZONES x TIMEPOINTS`                       |
+    |                                                                         |
+    | Indexed set of transmission lines operational in each timepoint that    |
+    | have the load zone as their origin.                                     |
+    +-------------------------------------------------------------------------+
 
     |
 
@@ -169,7 +183,43 @@ def add_model_components(
     m.TX_LINES_OPR_IN_TMP = Set(
         m.TMPS,
         initialize=lambda mod, tmp: sorted(
-            list(set(tx for (tx, t) in mod.TX_OPR_TMPS if t == tmp)),
+            set(
+                get_set_index(
+                    mod,
+                    index_name="TX_LINES_OPR_IN_TMP",
+                    set_name="TX_OPR_TMPS",
+                    key_rule=lambda m, tx_tmp: tx_tmp[1],
+                    value_rule=lambda m, tx_tmp: tx_tmp[0],
+                ).get(tmp, [])
+            )
+        ),
+    )
+
+    m.TX_LINES_OPR_TO_LZ_IN_TMP = Set(
+        m.LOAD_ZONES,
+        m.TMPS,
+        initialize=lambda mod, lz, tmp: sorted(
+            get_set_index(
+                mod,
+                index_name="TX_LINES_OPR_TO_LZ_IN_TMP",
+                set_name="TX_OPR_TMPS",
+                key_rule=lambda m, tx_tmp: (m.load_zone_to[tx_tmp[0]], tx_tmp[1]),
+                value_rule=lambda m, tx_tmp: tx_tmp[0],
+            ).get((lz, tmp), [])
+        ),
+    )
+
+    m.TX_LINES_OPR_FROM_LZ_IN_TMP = Set(
+        m.LOAD_ZONES,
+        m.TMPS,
+        initialize=lambda mod, lz, tmp: sorted(
+            get_set_index(
+                mod,
+                index_name="TX_LINES_OPR_FROM_LZ_IN_TMP",
+                set_name="TX_OPR_TMPS",
+                key_rule=lambda m, tx_tmp: (m.load_zone_from[tx_tmp[0]], tx_tmp[1]),
+                value_rule=lambda m, tx_tmp: tx_tmp[0],
+            ).get((lz, tmp), [])
         ),
     )
 
@@ -344,20 +394,25 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
     :param quiet:
     :return:
     """
+    keys_filter = get_process_results_keys_filter_sql(
+        columns=["subproblem_id", "stage_id"]
+    )
+
     if not quiet:
         print("aggregate tx capacity costs by load zone")
 
     # Delete old resulst
-    del_sql = """
+    del_sql = f"""
         DELETE FROM results_transmission_costs_capacity_agg 
         WHERE scenario_id = ?
+        AND {keys_filter}
         """
     spin_on_database_lock(
         conn=db, cursor=c, sql=del_sql, data=(scenario_id,), many=False
     )
 
     # Insert new results
-    agg_sql = """
+    agg_sql = f"""
         INSERT INTO results_transmission_costs_capacity_agg
         (scenario_id, load_zone, period, subproblem_id, stage_id,
         spinup_or_lookahead, fraction_of_hours_in_subproblem, capacity_cost)
@@ -389,6 +444,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         GROUP BY scenario_id, subproblem_id, stage_id, period, load_zone
         ) AS cap_table
         USING (scenario_id, subproblem_id, stage_id, period, load_zone)
+        WHERE {keys_filter}
         ;"""
 
     spin_on_database_lock(
@@ -16,6 +16,8 @@
 
 import os.path
 
+from gridpath.auxiliary.dynamic_components import results_format
+from gridpath.auxiliary.results_io import write_results_df
 from gridpath.transmission import TX_PERIOD_DF
 
 
@@ -35,8 +37,9 @@ def export_results(
     """
     tx_cap_df = getattr(d, TX_PERIOD_DF)
 
-    tx_cap_df.to_csv(
-        os.path.join(
+    write_results_df(
+        df=tx_cap_df,
+        results_directory=os.path.join(
             scenario_directory,
             weather_iteration,
             hydro_iteration,
@@ -44,8 +47,7 @@ def export_results(
             subproblem,
             stage,
             "results",
-            "transmission_period.csv",
         ),
-        sep=",",
-        index=True,
+        results_name="transmission_period",
+        results_format=getattr(d, results_format),
     )
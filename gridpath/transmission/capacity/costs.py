@@ -24,6 +24,7 @@ import pandas as pd
 from pyomo.environ import Set, Expression, value
 
 from db.common_functions import spin_on_database_lock
+from gridpath.auxiliary.db_interface import get_process_results_keys_filter_sql
 from gridpath.auxiliary.auxiliary import join_sets
 from gridpath.common_functions import create_results_df
 from gridpath.transmission.capacity.common_functions import (
@@ -383,20 +384,25 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
     :param quiet:
     :return:
     """
+    keys_filter = get_process_results_keys_filter_sql(
+        columns=["subproblem_id", "stage_id"]
+    )
+
     if not quiet:
         print("aggregate tx capacity costs by load zone")
 
     # Delete old resulst
-    del_sql = """
+    del_sql = f"""
         DELETE FROM results_transmission_costs_capacity_agg 
         WHERE scenario_id = ?
+        AND {keys_filter}
         """
     spin_on_database_lock(
         conn=db, cursor=c, sql=del_sql, data=(scenario_id,), many=False
     )
 
     # Insert new results
-    agg_sql = """
+    agg_sql = f"""
         INSERT INTO results_transmission_costs_capacity_agg
         (scenario_id, load_zone, period, subproblem_id, stage_id,
         spinup_or_lookahead, fraction_of_hours_in_subproblem, capacity_cost)
@@ -428,6 +434,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         GROUP BY scenario_id, subproblem_id, stage_id, period, load_zone
         ) AS cap_table
         USING (scenario_id, subproblem_id, stage_id, period, load_zone)
+        WHERE {keys_filter}
         ;"""
 
     spin_on_database_lock(
@@ -436,7 +443,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
 
     # Update the capacity cost removing the fraction attributable to the
     # spinup and lookahead hours
-    update_sql = """
+    update_sql = f"""
         UPDATE results_transmission_period
         SET capacity_cost_wo_spinup_or_lookahead = capacity_cost * (
             SELECT fraction_of_hours_in_subproblem
@@ -451,7 +458,11 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
             AND results_transmission_period.period = 
             spinup_or_lookahead_ratios.period
         )
+        WHERE scenario_id = ?
+        AND {keys_filter}
         ;
     """
 
-    spin_on_database_lock(conn=db, cursor=c, sql=update_sql, data=(), many=False)
+    spin_on_database_lock(
+        conn=db, cursor=c, sql=update_sql, data=(scenario_id,), many=False
+    )
@@ -16,6 +16,8 @@
 
 import os.path
 
+from gridpath.auxiliary.dynamic_components import results_format
+from gridpath.auxiliary.results_io import write_results_df
 from gridpath.transmission import TX_TIMEPOINT_DF
 
 
@@ -33,8 +35,9 @@ def export_results(
     Export all results from the TX_OPERATIONS_DF that various modules
     have added to
     """
-    getattr(d, TX_TIMEPOINT_DF).to_csv(
-        os.path.join(
+    write_results_df(
+        df=getattr(d, TX_TIMEPOINT_DF),
+        results_directory=os.path.join(
             scenario_directory,
             weather_iteration,
             hydro_iteration,
@@ -42,8 +45,7 @@ def export_results(
             subproblem,
             stage,
             "results",
-            "transmission_timepoint.csv",
         ),
-        sep=",",
-        index=True,
+        results_name="transmission_timepoint",
+        results_format=getattr(d, results_format),
     )
@@ -27,6 +27,7 @@ from pyomo.environ import Param, Var, Constraint, NonNegativeReals, Expression,
 from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.auxiliary import cursor_to_df
 from gridpath.auxiliary.db_interface import (
+    get_process_results_keys_filter_sql,
     setup_results_import,
     directories_to_db_values,
 )
@@ -423,20 +424,25 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
     :param quiet:
     :return:
     """
+    keys_filter = get_process_results_keys_filter_sql(
+        columns=["subproblem_id", "stage_id"]
+    )
+
     if not quiet:
         print("aggregate hurdle costs")
 
     # Delete old results
-    del_sql = """
+    del_sql = f"""
         DELETE FROM results_transmission_hurdle_costs_by_timepoint_agg
         WHERE scenario_id = ?
+        AND {keys_filter}
         """
     spin_on_database_lock(
         conn=db, cursor=c, sql=del_sql, data=(scenario_id,), many=False
     )
 
     # Aggregate hurdle costs by period, load zone, and spinup_or_lookahead
-    agg_sql = """
+    agg_sql = f"""
         INSERT INTO results_transmission_hurdle_costs_by_timepoint_agg
         (scenario_id, subproblem_id, stage_id, timepoint, load_zone, 
         spinup_or_lookahead, tx_hurdle_cost_by_timepoint)
@@ -453,6 +459,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         number_of_hours_in_timepoint) AS pos_dir_hurdle_cost_by_tmp
         FROM results_transmission_timepoint
         WHERE scenario_id = ?
+        AND {keys_filter}
         GROUP BY subproblem_id, stage_id, timepoint, load_zone, spinup_or_lookahead
         ORDER BY subproblem_id, stage_id, timepoint, load_zone, spinup_or_lookahead
         ) AS pos_dir_hurdle_costs_by_tmp
@@ -465,6 +472,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         number_of_hours_in_timepoint) AS neg_dir_hurdle_cost_by_tmp
         FROM results_transmission_timepoint
         WHERE scenario_id = ?
+        AND {keys_filter}
         GROUP BY subproblem_id, stage_id, timepoint, load_zone, spinup_or_lookahead
         ORDER BY subproblem_id, stage_id, timepoint, load_zone, spinup_or_lookahead
         ) AS neg_dir_hurdle_costs_by_tmp
@@ -23,6 +23,7 @@ import pandas as pd
 from pyomo.environ import Expression, value
 
 from db.common_functions import spin_on_database_lock
+from gridpath.auxiliary.db_interface import get_process_results_keys_filter_sql
 from gridpath.auxiliary.auxiliary import get_required_subtype_modules
 from gridpath.common_functions import create_results_df
 from gridpath.transmission.operations.common_functions import (
@@ -221,20 +222,25 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
     :param quiet:
     :return:
     """
+    keys_filter = get_process_results_keys_filter_sql(
+        columns=["subproblem_id", "stage_id"]
+    )
+
     if not quiet:
         print("aggregate transmission imports exports")
 
     # Delete old results
-    del_sql = """
+    del_sql = f"""
         DELETE FROM results_transmission_imports_exports_agg
         WHERE scenario_id = ?
+        AND {keys_filter}
         """
     spin_on_database_lock(
         conn=db, cursor=c, sql=del_sql, data=(scenario_id,), many=False
     )
 
     # Aggregate imports/exports by period, load zone, and spinup_or_lookahead
-    agg_sql = """
+    agg_sql = f"""
         INSERT INTO results_transmission_imports_exports_agg
         (scenario_id, subproblem_id, stage_id, period, 
         load_zone, spinup_or_lookahead, imports, exports)
@@ -258,14 +264,16 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
                 (SELECT DISTINCT scenario_id, subproblem_id, stage_id, period, 
                 load_zone_to AS load_zone, spinup_or_lookahead
                 FROM results_transmission_timepoint
-                WHERE scenario_id = ?) AS dummy
+                WHERE scenario_id = ?
+                AND {keys_filter}) AS dummy
                 
                 LEFT JOIN 
                 
                 (SELECT DISTINCT scenario_id, subproblem_id, stage_id, period, 
                 load_zone_from AS load_zone, spinup_or_lookahead
                 FROM results_transmission_timepoint
-                WHERE scenario_id = ?) AS dummy2
+                WHERE scenario_id = ?
+                AND {keys_filter}) AS dummy2
                 USING (scenario_id, subproblem_id, stage_id, period, load_zone,
                 spinup_or_lookahead)
             ) AS left_join1
@@ -278,14 +286,16 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
                 (SELECT DISTINCT scenario_id, subproblem_id, stage_id, period, 
                 load_zone_from AS load_zone, spinup_or_lookahead
                 FROM results_transmission_timepoint
-                WHERE scenario_id = ?) AS dummy3
+                WHERE scenario_id = ?
+                AND {keys_filter}) AS dummy3
                 
                 LEFT JOIN 
                 
                 (SELECT DISTINCT scenario_id, subproblem_id, stage_id, period, 
                 load_zone_to AS load_zone, spinup_or_lookahead
                 FROM results_transmission_timepoint
-                WHERE scenario_id = ?) AS dummy4
+                WHERE scenario_id = ?
+                AND {keys_filter}) AS dummy4
                 USING (scenario_id, subproblem_id, stage_id, period, load_zone,
                 spinup_or_lookahead)
             
@@ -304,6 +314,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         FROM results_transmission_timepoint
         WHERE transmission_flow_mw > 0
         AND scenario_id = ?
+        AND {keys_filter}
         GROUP BY scenario_id, subproblem_id, stage_id, period, load_zone, 
         spinup_or_lookahead) 
         AS imports_pos_dir
@@ -319,6 +330,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         FROM results_transmission_timepoint
         WHERE transmission_flow_mw > 0
         AND scenario_id = ?
+        AND {keys_filter}
         GROUP BY scenario_id, subproblem_id, stage_id, period, load_zone, 
         spinup_or_lookahead) 
         AS exports_pos_dir
@@ -334,6 +346,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         FROM results_transmission_timepoint
         WHERE transmission_flow_mw < 0
         AND scenario_id = ?
+        AND {keys_filter}
         GROUP BY scenario_id, subproblem_id, stage_id, period, load_zone,
         spinup_or_lookahead) 
         AS imports_neg_dir
@@ -349,6 +362,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         FROM results_transmission_timepoint
         WHERE transmission_flow_mw < 0
         AND scenario_id = ?
+        AND {keys_filter}
         GROUP BY scenario_id, subproblem_id, stage_id, period, load_zone,
         spinup_or_lookahead) 
         AS exports_neg_dir
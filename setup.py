@@ -85,6 +85,7 @@ setup(
             "gridpath_create_database = db.create_database:main",
             "gridpath_load_csvs = db.utilities.port_csvs_to_db:main",
             "gridpath_load_scenarios = db.utilities.scenario:main",
+            "gridpath_db_indexes = db.utilities.indexes:main",
             "gridpath_get_pudl_data = "
             "data_toolkit.raw_data.pudl.download_data_from_pudl:main",
             "gridpath_pudl_to_gridpath_raw = "
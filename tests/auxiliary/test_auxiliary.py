@@ -48,6 +48,37 @@ class TestAuxiliary(unittest.TestCase):
         )
         self.assertListEqual(two_sets_joined_expected, two_sets_joined_actual)
 
+    def test_get_set_index(self):
+        """
+
+        :return:
+        """
+        mod = AbstractModel()
+        mod.prj_tmps = [("a", 1), ("b", 1), ("a", 2), ("c", 3)]
+
+        expected_index = {1: ["a", "b"], 2: ["a"]}
+        actual_index = auxiliary_module_to_test.get_set_index(
+            mod,
+            index_name="prjs_by_tmp",
+            set_name="prj_tmps",
+            key_rule=lambda m, x: None if x[0] == "c" else x[1],
+            value_rule=lambda m, x: x[0],
+        )
+        self.assertDictEqual(expected_index, actual_index)
+
+        # The index is cached on the model and not rebuilt
+        mod.prj_tmps = []
+        self.assertIs(
+            actual_index,
+            auxiliary_module_to_test.get_set_index(
+                mod,
+                index_name="prjs_by_tmp",
+                set_name="prj_tmps",
+                key_rule=lambda m, x: x[1],
+                value_rule=lambda m, x: x[0],
+            ),
+        )
+
     def test_check_list_has_single_item(self):
         """
 
@@ -0,0 +1,93 @@
+# Copyright 2016-2023 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import os
+from pyomo.environ import AbstractModel, DataPortal, Param, Set
+import unittest
+
+import gridpath.auxiliary.columnar_inputs as module_to_test
+
+TEST_DATA_DIRECTORY = os.path.join(os.path.dirname(__file__), "..", "test_data")
+
+
+class TestColumnarInputs(unittest.TestCase):
+    """ """
+
+    def test_get_param_data(self):
+        """
+        Skip "." values and rows not in the mask; cast the values
+        :return:
+        """
+        columns = {
+            "project": np.array(["A", "A", "B", "C"], dtype=object),
+            "timepoint": np.array([1, 2, 1, 1], dtype=object),
+            "value": np.array(["0.5", ".", "1", "2"], dtype=object),
+        }
+
+        self.assertDictEqual(
+            {("A", 1): 0.5, ("B", 1): 1.0, ("C", 1): 2.0},
+            module_to_test.get_param_data(
+                index_columns=[columns["project"], columns["timepoint"]],
+                values=columns["value"],
+            ),
+        )
+        self.assertDictEqual(
+            {"B": 1, "C": 2},
+            module_to_test.get_param_data(
+                index_columns=[columns["project"]],
+                values=columns["value"],
+                cast_as_type=int,
+                mask=module_to_test.isin_mask(columns["project"], ["B", "C"]),
+            ),
+        )
+
+    def test_load_tab_file_params(self):
+        """
+        The columnar loading must match the DataPortal tab-file loading
+        :return:
+        """
+        filename = os.path.join(
+            TEST_DATA_DIRECTORY,
+            "inputs",
+            "project_availability_exogenous_independent.tab",
+        )
+        param_names = [
+            "avl_exog_cap_derate_independent",
+            "avl_exog_hyb_stor_cap_derate_independent",
+        ]
+
+        m = AbstractModel()
+        m.PRJ_TMPS = Set(dimen=2)
+        for param_name in param_names:
+            setattr(m, param_name, Param(m.PRJ_TMPS))
+        expected_data = DataPortal()
+        expected_data.load(
+            filename=filename,
+            param=tuple(getattr(m, param_name) for param_name in param_names),
+        )
+
+        actual_data = DataPortal(data_dict={None: dict()})
+        module_to_test.load_tab_file_params(
+            data_portal=actual_data, filename=filename, param_names=param_names
+        )
+
+        for param_name in param_names:
+            self.assertDictEqual(
+                expected_data.data(param_name), actual_data.data(param_name)
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+# Copyright 2016-2023 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pandas as pd
+from pyomo.environ import ConcreteModel, Expression, Param, Set, Var, value
+import unittest
+
+from gridpath.common_functions import create_results_df
+import gridpath.auxiliary.columnar_results as module_to_test
+
+INDEX = [("A", 1), ("A", 2), ("B", 1)]
+
+
+def create_instance():
+    m = ConcreteModel()
+    m.PRJ_TMPS = Set(dimen=2, initialize=INDEX)
+    m.size = Param(m.PRJ_TMPS, initialize={("A", 1): 2}, default=1)
+    m.Power = Var(m.PRJ_TMPS, initialize={("A", 1): 1.5, ("A", 2): 3, ("B", 1): 0})
+    m.Power_Alias = Expression(m.PRJ_TMPS, rule=lambda mod, p, t: mod.Power[p, t])
+    m.Size_Product = Expression(
+        m.PRJ_TMPS, rule=lambda mod, p, t: mod.size[p, t] * mod.size[p, t]
+    )
+    m.Power_Times_Size = Expression(
+        m.PRJ_TMPS, rule=lambda mod, p, t: mod.Power[p, t] * mod.size[p, t]
+    )
+    return m
+
+
+class TestColumnarResults(unittest.TestCase):
+    """ """
+
+    def test_get_component_values(self):
+        """
+        The values must be the same as with value(), with None for the
+        indices not included
+        :return:
+        """
+        m = create_instance()
+        index = [("B", 1), ("A", 1)]
+        for component in [
+            m.size,
+            m.Power,
+            m.Power_Alias,
+            m.Size_Product,
+            m.Power_Times_Size,
+        ]:
+            expected = [value(component[idx]) for idx in index]
+            values = module_to_test.get_component_values(component, index=index)
+            self.assertListEqual(values.tolist(), expected)
+            data_values = [
+                module_to_test.get_data_value(component[idx]) for idx in index
+            ]
+            self.assertListEqual(data_values, expected)
+            self.assertListEqual(
+                [type(v) for v in data_values], [type(v) for v in expected]
+            )
+
+        self.assertListEqual(
+            module_to_test.get_component_values(m.Power).tolist(), [1.5, 3.0, 0.0]
+        )
+        self.assertListEqual(
+            module_to_test.get_component_values(
+                m.Power_Alias, index=INDEX, include=[True, False, True]
+            ).tolist()[::2],
+            [1.5, 0.0],
+        )
+        self.assertTrue(
+            pd.isna(
+                module_to_test.get_component_values(
+                    m.Power_Alias, index=INDEX, include=[True, False, True]
+                )[1]
+            )
+        )
+
+    def test_get_results_df(self):
+        """
+        The results DF must be the same as the one created from rows
+        :return:
+        """
+        results_columns = ["power_mw", "zone", "startup_type"]
+        data = [
+            ["A", 1, 1.5, "Z1", 1],
+            ["A", 2, None, "Z1", 0],
+            ["B", 1, 3, "Z2", 2],
+        ]
+        expected_df = create_results_df(
+            index_columns=["project", "timepoint"],
+            results_columns=results_columns,
+            data=data,
+        )
+        results_df = module_to_test.get_results_df(
+            index_columns=["project", "timepoint"],
+            index=[(row[0], row[1]) for row in data],
+            results_columns={
+                c: module_to_test.to_array([row[2 + i] for row in data])
+                for i, c in enumerate(results_columns)
+            },
+        )
+        pd.testing.assert_frame_equal(results_df, expected_df)
+
+        empty_df = module_to_test.get_results_df(
+            index_columns=["project", "timepoint"],
+            index=[],
+            results_columns={"power_mw": module_to_test.to_array([])},
+        )
+        self.assertListEqual(list(empty_df.index.names), ["project", "timepoint"])
+        self.assertListEqual(list(empty_df.columns), ["power_mw"])
+        self.assertEqual(len(empty_df), 0)
+
+    def test_update_results_df(self):
+        """
+        The updated DF must be the same as with DataFrame.update
+        :return:
+        """
+        df = pd.DataFrame(
+            {
+                "project": ["A", "A", "B", "C"],
+                "timepoint": [1, 2, 1, 1],
+                "period": [2030, 2030, 2030, 2030],
+            }
+        ).set_index(["project", "timepoint"])
+        results = [
+            # Results for some of the rows, an existing column, and a row not
+            # in the DF
+            pd.DataFrame(
+                {
+                    "project": ["A", "B", "D"],
+                    "timepoint": [1, 1, 1],
+                    "power_mw": [1.5, None, 2.0],
+                    "units": [1, 2, 3],
+                }
+            ).set_index(["project", "timepoint"]),
+            pd.DataFrame(
+                {
+                    "project": ["B"],
+                    "timepoint": [1],
+                    "power_mw": [4.0],
+                }
+            ).set_index(["project", "timepoint"]),
+            # Results for all rows
+            pd.DataFrame(
+                {
+                    "project": ["C", "B", "A", "A"],
+                    "timepoint": [1, 1, 2, 1],
+                    "flag": [1, 0, 0, 1],
+                }
+            ).set_index(["project", "timepoint"]),
+        ]
+
+        expected_df = df.copy()
+        for results_df in results:
+            for c in results_df.columns:
+                if c not in expected_df.columns:
+                    expected_df[c] = None
+            expected_df.update(results_df)
+
+        for results_df in results:
+            module_to_test.update_results_df(df=df, results_df=results_df)
+
+        pd.testing.assert_frame_equal(df, expected_df)
+        self.assertEqual(df.to_csv(), expected_df.to_csv())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+# Copyright 2016-2023 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sqlite3
+import unittest
+
+import gridpath.auxiliary.db_interface as module_to_test
+
+SCENARIO_ID = 1
+
+
+class TestProcessResultsKeys(unittest.TestCase):
+    """ """
+
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.execute(
+            """CREATE TABLE results_scenario (
+            scenario_id INTEGER, weather_iteration INTEGER,
+            hydro_iteration INTEGER, availability_iteration INTEGER,
+            subproblem_id INTEGER, stage_id INTEGER,
+            results_processed INTEGER DEFAULT 0);"""
+        )
+        self.conn.execute(
+            """CREATE TABLE results_agg (
+            scenario_id INTEGER, subproblem_id INTEGER, stage_id INTEGER,
+            value FLOAT);"""
+        )
+        for subproblem in [1, 2]:
+            for stage in [1, 2]:
+                self.conn.execute(
+                    "INSERT INTO results_scenario (scenario_id, "
+                    "weather_iteration, hydro_iteration, availability_iteration, "
+                    "subproblem_id, stage_id) VALUES (?, 0, 0, 0, ?, ?);",
+                    (SCENARIO_ID, subproblem, stage),
+                )
+                self.conn.execute(
+                    "INSERT INTO results_agg VALUES (?, ?, ?, 1.0);",
+                    (SCENARIO_ID, subproblem, stage),
+                )
+        self.conn.commit()
+
+    def tearDown(self):
+        self.conn.close()
+
+    def get_keys(self):
+        return sorted(
+            self.conn.execute(
+                f"SELECT * FROM {module_to_test.PROCESS_RESULTS_KEYS_TABLE};"
+            ).fetchall()
+        )
+
+    def test_incremental_keys(self):
+        """
+        Only keys not processed yet are processed; all keys are processed
+        with reprocess_all
+        :return:
+        """
+        n_keys = module_to_test.setup_process_results_keys(
+            conn=self.conn, scenario_id=SCENARIO_ID
+        )
+        self.assertEqual(n_keys, 4)
+
+        module_to_test.mark_results_processed(conn=self.conn, scenario_id=SCENARIO_ID)
+        self.assertEqual(
+            module_to_test.setup_process_results_keys(
+                conn=self.conn, scenario_id=SCENARIO_ID
+            ),
+            0,
+        )
+
+        # Re-import subproblem 2
+        self.conn.execute(
+            "UPDATE results_scenario SET results_processed = 0 "
+            "WHERE subproblem_id = 2;"
+        )
+        module_to_test.setup_process_results_keys(
+            conn=self.conn, scenario_id=SCENARIO_ID
+        )
+        self.assertListEqual(self.get_keys(), [(0, 0, 0, 2, 1), (0, 0, 0, 2, 2)])
+
+        module_to_test.setup_process_results_keys(
+            conn=self.conn, scenario_id=SCENARIO_ID, reprocess_all=True
+        )
+        self.assertEqual(len(self.get_keys()), 4)
+
+    def test_keys_filter_sql(self):
+        """
+        The filter limits aggregations to the keys being processed
+        :return:
+        """
+        self.conn.execute(
+            "UPDATE results_scenario SET results_processed = 1 "
+            "WHERE subproblem_id = 1;"
+        )
+        module_to_test.setup_process_results_keys(
+            conn=self.conn, scenario_id=SCENARIO_ID
+        )
+        keys_filter = module_to_test.get_process_results_keys_filter_sql(
+            columns=["subproblem_id", "stage_id"]
+        )
+        self.conn.execute(
+            f"DELETE FROM results_agg WHERE scenario_id = ? AND {keys_filter};",
+            (SCENARIO_ID,),
+        )
+        self.assertListEqual(
+            self.conn.execute(
+                "SELECT subproblem_id, stage_id FROM results_agg;"
+            ).fetchall(),
+            [(1, 1), (1, 2)],
+        )
+
+    def test_no_results_processed_column(self):
+        """
+        All keys are processed in databases without the results_processed
+        column
+        :return:
+        """
+        self.conn.execute("ALTER TABLE results_scenario DROP COLUMN results_processed;")
+        self.assertEqual(
+            module_to_test.setup_process_results_keys(
+                conn=self.conn, scenario_id=SCENARIO_ID
+            ),
+            4,
+        )
+        module_to_test.mark_results_processed(conn=self.conn, scenario_id=SCENARIO_ID)
+
+
+if __name__ == "__main__":
+    unittest.main()
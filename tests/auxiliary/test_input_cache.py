@@ -0,0 +1,92 @@
+# Copyright 2016-2023 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+
+import gridpath.auxiliary.input_cache as module_to_test
+
+
+class TestInputCache(unittest.TestCase):
+    """ """
+
+    def setUp(self):
+        module_to_test.clear_input_cache(reset_stats=True)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmp_dir.name, "projects.tab")
+        with open(self.filename, "w") as f:
+            f.write("project\toperational_type\nA\tgen_var\nB\tgen_simple\n")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+        module_to_test.clear_input_cache(reset_stats=True)
+
+    def test_read_cached_tab_df(self):
+        """
+        The file is parsed once until it changes on disk
+        :return:
+        """
+        df = module_to_test.read_cached_tab_df(self.filename)
+        self.assertIs(df, module_to_test.read_cached_tab_df(self.filename))
+        self.assertListEqual(["A", "B"], df["project"].tolist())
+
+        path = os.path.abspath(self.filename)
+        self.assertDictEqual(
+            {path: {"hits": 1, "misses": 1}}, module_to_test.get_input_cache_stats()
+        )
+
+        # Rewrite the file with a later modification time
+        with open(self.filename, "w") as f:
+            f.write("project\toperational_type\nC\tgen_var\n")
+        stat = os.stat(self.filename)
+        os.utime(self.filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        self.assertListEqual(
+            ["C"], module_to_test.read_cached_tab_df(self.filename)["project"].tolist()
+        )
+        self.assertDictEqual(
+            {path: {"hits": 1, "misses": 2}}, module_to_test.get_input_cache_stats()
+        )
+
+    def test_read_cached_tab_columns(self):
+        """
+        Different read options are cached separately
+        :return:
+        """
+        columns = module_to_test.read_cached_tab_columns(
+            self.filename, columns=["project"]
+        )
+        self.assertListEqual(["project"], list(columns.keys()))
+        self.assertIs(
+            columns,
+            module_to_test.read_cached_tab_columns(self.filename, columns=["project"]),
+        )
+        module_to_test.read_cached_tab_df(self.filename)
+
+        path = os.path.abspath(self.filename)
+        self.assertDictEqual(
+            {path: {"hits": 1, "misses": 2}}, module_to_test.get_input_cache_stats()
+        )
+
+        # Clearing the cache keeps the stats unless requested
+        module_to_test.clear_input_cache()
+        module_to_test.read_cached_tab_df(self.filename)
+        self.assertDictEqual(
+            {path: {"hits": 1, "misses": 3}}, module_to_test.get_input_cache_stats()
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
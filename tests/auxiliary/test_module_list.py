@@ -0,0 +1,71 @@
+# Copyright 2016-2023 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pickle
+import unittest
+
+import gridpath.auxiliary.module_list as module_to_test
+
+EXAMPLES_DIRECTORY = os.path.join(os.path.dirname(__file__), "..", "..", "examples")
+
+
+class TestModuleList(unittest.TestCase):
+    """ """
+
+    def test_module_registry(self):
+        """
+        The registry loads the scenario's modules once and maps each module
+        method to the modules that implement it
+
+        :return:
+        """
+        scenario_directory = os.path.join(EXAMPLES_DIRECTORY, "test")
+        registry = module_to_test.ModuleRegistry.from_scenario_directory(
+            scenario_directory=scenario_directory, multi_stage=False
+        )
+
+        expected_modules = module_to_test.determine_modules(
+            scenario_directory=scenario_directory, multi_stage=False
+        )
+        self.assertListEqual(expected_modules, registry.modules_to_use)
+        self.assertListEqual(
+            expected_modules,
+            [m.__name__.replace("gridpath.", "", 1) for m in registry.loaded_modules],
+        )
+
+        expected_export_modules = [
+            name
+            for name, m in zip(registry.modules_to_use, registry.loaded_modules)
+            if hasattr(m, "export_results")
+        ]
+        actual_export_modules = [
+            name for name, m in registry.modules_with("export_results")
+        ]
+        self.assertListEqual(expected_export_modules, actual_export_modules)
+        # The capability map is only built once per method
+        self.assertIs(
+            registry.modules_with("export_results"),
+            registry.modules_with("export_results"),
+        )
+        self.assertListEqual([], registry.modules_with("not_a_module_method"))
+
+        # The registry can be pickled (e.g. to send to worker processes)
+        unpickled_registry = pickle.loads(pickle.dumps(registry))
+        self.assertListEqual(registry.modules_to_use, unpickled_registry.modules_to_use)
+        self.assertListEqual(registry.loaded_modules, unpickled_registry.loaded_modules)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,461 @@
+# Copyright 2016-2023 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import dill
+from pyomo.environ import (
+    AbstractModel,
+    Binary,
+    ConcreteModel,
+    Constraint,
+    Expression,
+    NonNegativeReals,
+    Objective,
+    Param,
+    Set,
+    Suffix,
+    Var,
+    exp,
+)
+from pyomo.solvers.plugins.solvers.persistent_solver import PersistentSolver
+
+import gridpath.auxiliary.persistent_model as module_to_test
+
+SUBPROBLEM_KEY = ("", "", "", "1")
+
+
+def create_instance(load, fixed_commitment=None, timepoints=(1, 2, 3)):
+    """
+    :param load: dictionary of the load by timepoint
+    :param fixed_commitment: dictionary of the fixed commitment by timepoint
+    :param timepoints: the timepoints
+    :return: a small commitment problem instance
+    """
+    m = ConcreteModel()
+    m.TMPS = Set(initialize=timepoints)
+    m.static_load_mw = Param(m.TMPS, initialize=load)
+    m.Commit = Var(m.TMPS, within=Binary)
+    m.Power = Var(m.TMPS, within=NonNegativeReals, bounds=(0, 10))
+    m.Unserved = Var(m.TMPS, within=NonNegativeReals)
+    m.Provide_Power = Expression(m.TMPS, rule=lambda mod, t: mod.Power[t])
+    m.Meet_Load_Constraint = Constraint(
+        m.TMPS,
+        rule=lambda mod, t: mod.Provide_Power[t] + mod.Unserved[t]
+        == mod.static_load_mw[t],
+    )
+    m.Max_Power_Constraint = Constraint(
+        m.TMPS, rule=lambda mod, t: mod.Power[t] <= 10 * mod.Commit[t]
+    )
+    m.Total_Cost = Objective(
+        expr=sum(m.Power[t] + 5 * m.Commit[t] + 100 * m.Unserved[t] for t in m.TMPS)
+    )
+    m.dual = Suffix(direction=Suffix.IMPORT)
+
+    for t, commitment in (fixed_commitment or {}).items():
+        m.Commit[t].fix(commitment)
+
+    return m
+
+
+def create_abstract_model():
+    """
+    :return: the small commitment problem as an abstract model, with the
+        maximum power of the timepoints cached on the model by a rule
+    """
+
+    def max_power_rule(mod, t):
+        if not hasattr(mod, "max_power_by_tmp"):
+            mod.max_power_by_tmp = {tmp: 10 for tmp in mod.TMPS}
+        return mod.Power[t] <= mod.max_power_by_tmp[t] * mod.Commit[t]
+
+    m = AbstractModel()
+    m.TMPS = Set()
+    m.static_load_mw = Param(m.TMPS)
+    m.Commit = Var(m.TMPS, within=Binary)
+    m.Power = Var(m.TMPS, within=NonNegativeReals, bounds=(0, 10))
+    m.Unserved = Var(m.TMPS, within=NonNegativeReals)
+    m.Provide_Power = Expression(m.TMPS, rule=lambda mod, t: mod.Power[t])
+    m.Meet_Load_Constraint = Constraint(
+        m.TMPS,
+        rule=lambda mod, t: mod.Provide_Power[t] + mod.Unserved[t]
+        == mod.static_load_mw[t],
+    )
+    m.Max_Power_Constraint = Constraint(m.TMPS, rule=max_power_rule)
+    m.Total_Cost = Objective(
+        rule=lambda mod: sum(
+            mod.Power[t] + 5 * mod.Commit[t] + 100 * mod.Unserved[t] for t in mod.TMPS
+        )
+    )
+
+    return m
+
+
+def get_lp_lines(instance, lp_file):
+    """
+    :param instance: the problem instance
+    :param lp_file: the path of the LP file to write
+    :return: the sorted lines of the instance's LP file
+    """
+    instance.write(lp_file, io_options={"symbolic_solver_labels": True})
+    with open(lp_file) as f:
+        return sorted(
+            line.strip() for line in f if line.strip() and not line.startswith("\\")
+        )
+
+
+class TestPersistentModel(unittest.TestCase):
+    """ """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        module_to_test._persistent_models.clear()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+        module_to_test._persistent_models.clear()
+
+    def assertSameProblem(self, instance, other_instance):
+        self.assertListEqual(
+            get_lp_lines(instance, os.path.join(self.tmp_dir.name, "a.lp")),
+            get_lp_lines(other_instance, os.path.join(self.tmp_dir.name, "b.lp")),
+        )
+
+    def test_update_in_place(self):
+        """
+        The following stages of a subproblem update the instance loaded into
+        the solver with the variables and constraints that changed
+        :return:
+        """
+        optimizer = mock.create_autospec(PersistentSolver, instance=True)
+        instance = create_instance(load={1: 5, 2: 8, 3: 3})
+        persistent_model = module_to_test.get_persistent_model(
+            optimizer=optimizer, instance=instance, subproblem_key=SUBPROBLEM_KEY
+        )
+        self.assertIs(persistent_model.instance, instance)
+        optimizer.set_instance.assert_called_once_with(
+            instance, symbolic_solver_labels=False
+        )
+
+        # Same data; the commitment is fixed
+        stage_instance = create_instance(
+            load={1: 5, 2: 8, 3: 3}, fixed_commitment={1: 1, 2: 0}
+        )
+        self.assertIs(
+            module_to_test.get_persistent_model(
+                optimizer=optimizer,
+                instance=stage_instance,
+                subproblem_key=SUBPROBLEM_KEY,
+            ),
+            persistent_model,
+        )
+        optimizer.set_instance.assert_called_once()
+        self.assertListEqual(
+            [c.args[0].name for c in optimizer.update_var.call_args_list],
+            ["Commit[1]", "Commit[2]"],
+        )
+        optimizer.remove_constraint.assert_not_called()
+        optimizer.add_constraint.assert_not_called()
+        optimizer.set_objective.assert_not_called()
+        self.assertTrue(instance.Commit[2].fixed)
+        self.assertEqual(instance.Commit[2].value, 0)
+        self.assertSameProblem(instance, stage_instance)
+
+        # Different load; the commitment is unfixed
+        optimizer.reset_mock()
+        stage_instance = create_instance(
+            load={1: 5, 2: 9, 3: 3}, fixed_commitment={1: 1}
+        )
+        module_to_test.get_persistent_model(
+            optimizer=optimizer, instance=stage_instance, subproblem_key=SUBPROBLEM_KEY
+        )
+        optimizer.set_instance.assert_not_called()
+        self.assertListEqual(
+            [c.args[0].name for c in optimizer.update_var.call_args_list],
+            ["Commit[2]"],
+        )
+        self.assertListEqual(
+            [c.args[0].name for c in optimizer.remove_constraint.call_args_list],
+            ["Meet_Load_Constraint[2]"],
+        )
+        self.assertListEqual(
+            [c.args[0] for c in optimizer.add_constraint.call_args_list],
+            [instance.Meet_Load_Constraint[2]],
+        )
+        optimizer.set_objective.assert_not_called()
+        self.assertFalse(instance.Commit[2].fixed)
+        self.assertSameProblem(instance, stage_instance)
+
+        # Different objective
+        optimizer.reset_mock()
+        stage_instance = create_instance(
+            load={1: 5, 2: 9, 3: 3}, fixed_commitment={1: 1}
+        )
+        stage_instance.Total_Cost.set_value(stage_instance.Total_Cost.expr * 2)
+        module_to_test.get_persistent_model(
+            optimizer=optimizer, instance=stage_instance, subproblem_key=SUBPROBLEM_KEY
+        )
+        optimizer.update_var.assert_not_called()
+        optimizer.remove_constraint.assert_not_called()
+        optimizer.set_objective.assert_called_once_with(instance.Total_Cost)
+        self.assertSameProblem(instance, stage_instance)
+
+    def test_rule_reads(self):
+        """
+        With the rule reads recorded, only the constraints built from data
+        that changed are compared
+        :return:
+        """
+        m = create_abstract_model()
+        module_to_test.record_rule_reads(m)
+
+        def create(load):
+            return m.create_instance(
+                data={
+                    None: {
+                        "TMPS": {None: [1, 2, 3]},
+                        "static_load_mw": load,
+                    }
+                }
+            )
+
+        instance = create(load={1: 5, 2: 8, 3: 3})
+        self.assertDictEqual(
+            module_to_test.get_rule_reads(instance=instance),
+            {
+                "Provide_Power": {"Power"},
+                "Meet_Load_Constraint": {
+                    "Provide_Power",
+                    "Unserved",
+                    "static_load_mw",
+                },
+                "Max_Power_Constraint": {
+                    "TMPS",
+                    "Power",
+                    "Commit",
+                    "max_power_by_tmp",
+                },
+                "Total_Cost": {"TMPS", "Power", "Commit", "Unserved"},
+            },
+        )
+        # The data cached by the rules are on the instance
+        self.assertDictEqual(instance.max_power_by_tmp, {1: 10, 2: 10, 3: 10})
+        # The instance can still be pickled (see run_scenario)
+        self.assertDictEqual(
+            module_to_test.get_rule_reads(instance=dill.loads(dill.dumps(instance))),
+            module_to_test.get_rule_reads(instance=instance),
+        )
+
+        optimizer = mock.create_autospec(PersistentSolver, instance=True)
+        persistent_model = module_to_test.get_persistent_model(
+            optimizer=optimizer, instance=instance, subproblem_key=SUBPROBLEM_KEY
+        )
+
+        # No data changed
+        stage_instance = create(load={1: 5, 2: 8, 3: 3})
+        self.assertSetEqual(
+            persistent_model.get_changed_components(
+                stage_data=module_to_test.get_data(instance=stage_instance)
+            ),
+            set(),
+        )
+
+        # The load changed, so the constraints reading it and (as they read
+        # derived data cached on the model) the maximum power constraints
+        # are compared, but not the objective
+        stage_instance = create(load={1: 5, 2: 9, 3: 3})
+        self.assertSetEqual(
+            persistent_model.get_changed_components(
+                stage_data=module_to_test.get_data(instance=stage_instance)
+            ),
+            {"Meet_Load_Constraint", "Max_Power_Constraint"},
+        )
+        module_to_test.get_persistent_model(
+            optimizer=optimizer, instance=stage_instance, subproblem_key=SUBPROBLEM_KEY
+        )
+        optimizer.set_instance.assert_called_once()
+        self.assertListEqual(
+            [c.args[0].name for c in optimizer.remove_constraint.call_args_list],
+            ["Meet_Load_Constraint[2]"],
+        )
+        optimizer.set_objective.assert_not_called()
+        self.assertSameProblem(instance, stage_instance)
+
+    def test_load_instance(self):
+        """
+        Instances with a different structure or from a different subproblem
+        are loaded into the solver
+        :return:
+        """
+        optimizer = mock.create_autospec(PersistentSolver, instance=True)
+        instance = create_instance(load={1: 5, 2: 8, 3: 3})
+        module_to_test.get_persistent_model(
+            optimizer=optimizer, instance=instance, subproblem_key=SUBPROBLEM_KEY
+        )
+
+        for stage_instance, subproblem_key in [
+            (
+                create_instance(load={1: 5, 2: 8, 3: 3, 4: 1}, timepoints=(1, 2, 3, 4)),
+                SUBPROBLEM_KEY,
+            ),
+            (create_instance(load={1: 5, 2: 8, 3: 3}), ("", "", "", "2")),
+            (create_instance(load={1: 5, 2: 8, 3: 3}), None),
+        ]:
+            optimizer.reset_mock()
+            persistent_model = module_to_test.get_persistent_model(
+                optimizer=optimizer,
+                instance=stage_instance,
+                subproblem_key=subproblem_key,
+            )
+            self.assertIs(persistent_model.instance, stage_instance)
+            optimizer.set_instance.assert_called_once_with(
+                stage_instance, symbolic_solver_labels=False
+            )
+            optimizer.update_var.assert_not_called()
+
+        # Deactivated constraints
+        stage_instance = create_instance(load={1: 5, 2: 8, 3: 3})
+        stage_instance.Max_Power_Constraint[1].deactivate()
+        self.assertIs(
+            module_to_test.get_persistent_model(
+                optimizer=optimizer, instance=stage_instance, subproblem_key=None
+            ).instance,
+            stage_instance,
+        )
+        stage_instance = create_instance(load={1: 5, 2: 8, 3: 3})
+        self.assertIs(
+            module_to_test.get_persistent_model(
+                optimizer=optimizer, instance=stage_instance, subproblem_key=None
+            ).instance,
+            stage_instance,
+        )
+
+    def test_update_appsi(self):
+        """
+        The APPSI solvers detect the changes to the kept instance themselves
+        :return:
+        """
+        optimizer = mock.MagicMock()
+        instance = create_instance(load={1: 5, 2: 8, 3: 3})
+        module_to_test.get_persistent_model(
+            optimizer=optimizer, instance=instance, subproblem_key=SUBPROBLEM_KEY
+        )
+        stage_instance = create_instance(
+            load={1: 5, 2: 9, 3: 3}, fixed_commitment={1: 1}
+        )
+        persistent_model = module_to_test.get_persistent_model(
+            optimizer=optimizer, instance=stage_instance, subproblem_key=SUBPROBLEM_KEY
+        )
+        self.assertIs(persistent_model.instance, instance)
+        self.assertListEqual(optimizer.method_calls, [])
+        self.assertSameProblem(instance, stage_instance)
+
+    def test_get_expression_signature(self):
+        """
+        Expressions have the same signature if they are the same except for
+        the instance of their variables
+        :return:
+        """
+        instance = create_instance(load={1: 5, 2: 8, 3: 3})
+        other_instance = create_instance(load={1: 5, 2: 9, 3: 3})
+        positions = module_to_test.get_positions(
+            data=module_to_test.get_component_data(
+                components=module_to_test.get_components(instance=instance, ctype=Var)
+            )
+        )
+        other_positions = module_to_test.get_positions(
+            data=module_to_test.get_component_data(
+                components=module_to_test.get_components(
+                    instance=other_instance, ctype=Var
+                )
+            )
+        )
+
+        def signature(m, expr):
+            return module_to_test.get_expression_signature(
+                expr=expr,
+                variable_positions=positions if m is instance else other_positions,
+            )
+
+        for expr, other_expr in [
+            (instance.Total_Cost.expr, other_instance.Total_Cost.expr),
+            (
+                instance.Meet_Load_Constraint[1].body,
+                other_instance.Meet_Load_Constraint[1].body,
+            ),
+            (
+                -instance.Power[1] / (2 * instance.Commit[1] + 1) ** 2,
+                -other_instance.Power[1] / (2 * other_instance.Commit[1] + 1) ** 2,
+            ),
+        ]:
+            self.assertIsNotNone(signature(instance, expr))
+            self.assertEqual(
+                signature(instance, expr), signature(other_instance, other_expr)
+            )
+
+        for expr, other_expr in [
+            (instance.Power[1] + instance.Commit[1], other_instance.Power[1]),
+            (2 * instance.Power[1], 3 * other_instance.Power[1]),
+            (instance.Power[1], other_instance.Power[2]),
+        ]:
+            self.assertNotEqual(
+                signature(instance, expr), signature(other_instance, other_expr)
+            )
+
+        # Functions and variables of other instances can't be compared
+        self.assertIsNone(signature(instance, exp(instance.Power[1])))
+        self.assertIsNone(signature(instance, other_instance.Power[1]))
+
+    def test_copy_solution(self):
+        """
+        The solution of the kept instance is copied to the stage instance
+        :return:
+        """
+        optimizer = mock.MagicMock()
+        instance = create_instance(load={1: 5, 2: 8, 3: 3})
+        module_to_test.get_persistent_model(
+            optimizer=optimizer, instance=instance, subproblem_key=SUBPROBLEM_KEY
+        )
+        stage_instance = create_instance(
+            load={1: 5, 2: 8, 3: 3}, fixed_commitment={1: 1}
+        )
+        persistent_model = module_to_test.get_persistent_model(
+            optimizer=optimizer, instance=stage_instance, subproblem_key=SUBPROBLEM_KEY
+        )
+
+        for t in instance.TMPS:
+            instance.Power[t].set_value(t)
+            instance.dual[instance.Meet_Load_Constraint[t]] = 10 * t
+        stage_instance.dual[stage_instance.Max_Power_Constraint[1]] = 1
+        persistent_model.copy_solution(instance=stage_instance)
+
+        self.assertDictEqual(
+            {t: stage_instance.Power[t].value for t in stage_instance.TMPS},
+            {1: 1, 2: 2, 3: 3},
+        )
+        self.assertDictEqual(
+            {c.name: v for c, v in stage_instance.dual.items()},
+            {
+                "Meet_Load_Constraint[1]": 10,
+                "Meet_Load_Constraint[2]": 20,
+                "Meet_Load_Constraint[3]": 30,
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
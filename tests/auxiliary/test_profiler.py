@@ -0,0 +1,199 @@
+# Copyright 2016-2023 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+import logging
+import os
+import pandas as pd
+from pyomo.environ import (
+    AbstractModel,
+    Constraint,
+    NonNegativeReals,
+    Param,
+    Set,
+    Suffix,
+    Var,
+)
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+import psutil
+
+import gridpath.auxiliary.profiler as module_to_test
+import gridpath.project as project_module
+
+
+class TestProfiler(unittest.TestCase):
+    """ """
+
+    def test_profiler(self):
+        """
+        Phases are recorded in order, by module where applicable, and written
+        to the results directory
+
+        :return:
+        """
+        profiler = module_to_test.Profiler()
+        with profiler.phase("solve"):
+            pass
+        with profiler.phase("export_results", project_module):
+            pass
+        # Phases are recorded even if they fail
+        with self.assertRaises(RuntimeError):
+            with profiler.phase("summarize_results"):
+                raise RuntimeError
+
+        self.assertListEqual(
+            [
+                (1, "solve", ""),
+                (2, "export_results", "project"),
+                (3, "summarize_results", ""),
+            ],
+            [(r["phase_order"], r["phase"], r["module"]) for r in profiler.records],
+        )
+        for record in profiler.records:
+            self.assertGreaterEqual(record["wall_time_s"], 0)
+            self.assertGreater(record["peak_rss_mb"], 0)
+            self.assertGreaterEqual(record["peak_rss_increase_mb"], 0)
+
+        with tempfile.TemporaryDirectory() as results_directory:
+            profiler.write_report(results_directory=results_directory)
+            df = pd.read_csv(
+                os.path.join(results_directory, module_to_test.PROFILING_FILENAME)
+            )
+        self.assertListEqual(
+            [
+                "phase_order",
+                "phase",
+                "module",
+                "wall_time_s",
+                "peak_rss_mb",
+                "peak_rss_increase_mb",
+            ],
+            list(df.columns),
+        )
+        self.assertListEqual([1, 2, 3], df["phase_order"].tolist())
+
+    def test_phase_peak_rss(self):
+        """
+        Each phase reports its own peak RSS, even if an earlier phase used
+        more memory; the process maximum RSS is the fallback if the RSS
+        can't be sampled
+
+        :return:
+        """
+        profiler = module_to_test.Profiler()
+        with profiler.phase("create_instance"):
+            large = b"\x01" * 200 * 1024**2
+        del large
+        with profiler.phase("export_results"):
+            small = b"\x01" * 50 * 1024**2
+        del small
+
+        large_record, small_record = profiler.records
+        self.assertGreater(large_record["peak_rss_increase_mb"], 150)
+        self.assertGreater(small_record["peak_rss_increase_mb"], 40)
+        self.assertLess(small_record["peak_rss_mb"], large_record["peak_rss_mb"])
+
+        with mock.patch.object(
+            module_to_test.PeakRSSSampler, "start", side_effect=psutil.Error
+        ):
+            with profiler.phase("solve"):
+                pass
+        fallback_record = profiler.records[-1]
+        if module_to_test.resource is None:
+            self.assertIsNone(fallback_record["peak_rss_mb"])
+        else:
+            self.assertGreater(fallback_record["peak_rss_mb"], 0)
+            self.assertGreaterEqual(fallback_record["peak_rss_increase_mb"], 0)
+
+    def test_construction_phase(self):
+        """
+        The construction time of the components is attributed to the module
+        that declared them, in the order the modules declared them
+
+        :return:
+        """
+        profiler = module_to_test.Profiler()
+        model = AbstractModel()
+
+        model.PERIODS = Set()
+        model.period_weight = Param(model.PERIODS)
+        profiler.record_component_modules(model, types.ModuleType("gridpath.a"))
+        # A module declaring no components
+        profiler.record_component_modules(model, types.ModuleType("gridpath.b"))
+        model.Build = Var(model.PERIODS * model.PERIODS, within=NonNegativeReals)
+        model.Build_Constraint = Constraint(
+            model.PERIODS, rule=lambda mod, p: mod.Build[p, p] <= mod.period_weight[p]
+        )
+        profiler.record_component_modules(model, types.ModuleType("gridpath.c"))
+        # Not declared by a module
+        model.dual = Suffix(direction=Suffix.IMPORT)
+
+        self.assertEqual("a", profiler.component_modules["period_weight"])
+        self.assertEqual("c", profiler.component_modules["Build"])
+        self.assertNotIn("dual", profiler.component_modules)
+
+        with module_to_test.profile_construction_phase(profiler, "create_instance"):
+            instance = model.create_instance(
+                data={None: {"PERIODS": {None: [1, 2]}, "period_weight": {1: 1, 2: 2}}}
+            )
+        self.assertEqual(2, len(instance.Build_Constraint))
+
+        self.assertListEqual(
+            [
+                (1, "create_instance", ""),
+                (2, "create_instance", "a"),
+                (3, "create_instance", "c"),
+            ],
+            [(r["phase_order"], r["phase"], r["module"]) for r in profiler.records],
+        )
+        # The module construction times add up to at most the total time
+        self.assertLessEqual(
+            sum(r["wall_time_s"] for r in profiler.records[1:]),
+            profiler.records[0]["wall_time_s"],
+        )
+        for record in profiler.records[1:]:
+            self.assertGreaterEqual(record["wall_time_s"], 0)
+            self.assertIsNone(record["peak_rss_mb"])
+
+        # Pyomo's construction timing logger is restored
+        self.assertFalse(module_to_test.CONSTRUCTION_LOGGER.handlers)
+        self.assertEqual(logging.NOTSET, module_to_test.CONSTRUCTION_LOGGER.level)
+
+    def test_profile_phase(self):
+        """
+        Profiling is a no-op without a profiler
+
+        :return:
+        """
+        self.assertIsInstance(
+            module_to_test.profile_phase(None, "solve"), contextlib.nullcontext
+        )
+
+        profiler = module_to_test.Profiler()
+        with module_to_test.profile_phase(profiler, "solve"):
+            pass
+        self.assertEqual(1, len(profiler.records))
+
+        self.assertIsInstance(
+            module_to_test.profile_construction_phase(None, "create_instance"),
+            contextlib.nullcontext,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
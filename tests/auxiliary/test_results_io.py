@@ -0,0 +1,126 @@
+# Copyright 2016-2023 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+import gridpath.auxiliary.results_io as module_to_test
+
+
+def get_results_df():
+    """
+    A results dataframe indexed like the consolidated results tables
+    """
+    return pd.DataFrame(
+        {
+            "project": ["Gas_CCGT", "Gas_CCGT", "Wind"],
+            "timepoint": [1, 2, 1],
+            "technology": ["CCGT", "CCGT", "Wind"],
+            "power_mw": [100.5, 0.0, None],
+        }
+    ).set_index(["project", "timepoint"])
+
+
+class TestResultsIO(unittest.TestCase):
+    """ """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.results_directory = self.tmp_dir.name
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_write_and_read_results(self):
+        """
+        The results read back are the same in both formats; the index is
+        written as columns
+        :return:
+        """
+        for results_format in module_to_test.RESULTS_FORMATS:
+            module_to_test.write_results_df(
+                df=get_results_df(),
+                results_directory=self.results_directory,
+                results_name="project_timepoint",
+                results_format=results_format,
+            )
+            self.assertTrue(
+                os.path.exists(
+                    os.path.join(
+                        self.results_directory, f"project_timepoint.{results_format}"
+                    )
+                )
+            )
+
+            actual_df = module_to_test.read_results_df(
+                results_directory=self.results_directory,
+                results_name="project_timepoint",
+            )
+            pd.testing.assert_frame_equal(
+                actual_df, get_results_df().reset_index(), check_dtype=False
+            )
+
+            actual_subset_df = module_to_test.read_results_df(
+                results_directory=self.results_directory,
+                results_name="project_timepoint",
+                columns=["power_mw", "project"],
+            )
+            self.assertListEqual(
+                list(actual_subset_df.columns), ["power_mw", "project"]
+            )
+
+    def test_stale_results_removed(self):
+        """
+        Writing a results table removes the file in the other format
+        :return:
+        """
+        for results_format in ["parquet", "csv"]:
+            module_to_test.write_results_df(
+                df=get_results_df(),
+                results_directory=self.results_directory,
+                results_name="project_timepoint",
+                results_format=results_format,
+            )
+
+        self.assertListEqual(
+            os.listdir(self.results_directory), ["project_timepoint.csv"]
+        )
+
+    def test_missing_results(self):
+        """
+        :return:
+        """
+        self.assertFalse(
+            module_to_test.results_file_exists(
+                self.results_directory, "project_timepoint"
+            )
+        )
+        self.assertIsNone(
+            module_to_test.read_results_df(self.results_directory, "project_timepoint")
+        )
+
+        with self.assertRaises(ValueError):
+            module_to_test.write_results_df(
+                df=get_results_df(),
+                results_directory=self.results_directory,
+                results_name="project_timepoint",
+                results_format="xlsx",
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
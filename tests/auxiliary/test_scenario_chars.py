@@ -0,0 +1,59 @@
+# Copyright 2016-2023 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import gridpath.auxiliary.scenario_chars as module_to_test
+
+
+class TestScenarioChars(unittest.TestCase):
+    """ """
+
+    def test_get_iteration_directories_list(self):
+        """
+        Flatten the iteration directory strings, converting "empty_string"
+        to actual empty strings
+        :return:
+        """
+        self.assertListEqual(
+            module_to_test.get_iteration_directories_list(
+                {"empty_string": {"empty_string": ["empty_string"]}}
+            ),
+            [("", "", "")],
+        )
+
+        self.assertListEqual(
+            module_to_test.get_iteration_directories_list(
+                {
+                    "weather_iteration_1": {
+                        "empty_string": [
+                            "availability_iteration_1",
+                            "availability_iteration_2",
+                        ]
+                    },
+                    "weather_iteration_2": {
+                        "empty_string": ["availability_iteration_1"]
+                    },
+                }
+            ),
+            [
+                ("weather_iteration_1", "", "availability_iteration_1"),
+                ("weather_iteration_1", "", "availability_iteration_2"),
+                ("weather_iteration_2", "", "availability_iteration_1"),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
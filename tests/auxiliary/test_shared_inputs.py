@@ -0,0 +1,171 @@
+# Copyright 2016-2023 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sqlite3
+import tempfile
+import unittest
+
+import gridpath.auxiliary.shared_inputs as module_to_test
+
+
+def write_file(inputs_directory, filename, content, mode="w"):
+    with open(os.path.join(inputs_directory, filename), mode) as f:
+        f.write(content)
+
+
+class TestSharedInputs(unittest.TestCase):
+    """ """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.scenario_directory = self.tmp_dir.name
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.execute("CREATE TABLE inputs (subproblem_id INTEGER, value FLOAT);")
+        self.conn.executemany(
+            "INSERT INTO inputs VALUES (?, ?);", [(1, 10.0), (2, 20.0)]
+        )
+
+    def tearDown(self):
+        self.conn.close()
+        self.tmp_dir.cleanup()
+
+    def write_inputs(self, subproblem, inputs_record):
+        """
+        Write the inputs of three mock modules: a module with the same inputs
+        for all subproblems, a module that adds subproblem-specific data to
+        the first module's file, and another subproblem-independent module
+        """
+        inputs_directory = os.path.join(self.scenario_directory, subproblem, "inputs")
+        os.makedirs(inputs_directory, exist_ok=True)
+
+        with module_to_test.record_module_inputs(
+            self.conn, inputs_directory, "projects", inputs_record
+        ):
+            self.conn.execute("SELECT * FROM inputs;").fetchall()
+            write_file(inputs_directory, "projects.tab", "project\nWind\n")
+        with module_to_test.record_module_inputs(
+            self.conn, inputs_directory, "profiles", inputs_record
+        ):
+            (value,) = self.conn.execute(
+                "SELECT value FROM inputs WHERE subproblem_id = ?;",
+                (int(subproblem),),
+            ).fetchone()
+            write_file(inputs_directory, "projects.tab", f"{value}\n", mode="a")
+            write_file(inputs_directory, "profiles.tab", f"{value}\n")
+        with module_to_test.record_module_inputs(
+            self.conn, inputs_directory, "load_zones", inputs_record
+        ):
+            self.conn.execute("SELECT 1;").fetchall()
+            write_file(inputs_directory, "load_zones.tab", "load_zone\nZone1\n")
+
+        return inputs_directory
+
+    def test_get_detection_keys(self):
+        """
+        :return:
+        """
+        keys = [
+            ("", "", "", subproblem, stage)
+            for subproblem in ["1", "2", "3"]
+            for stage in ["1", "2"]
+        ]
+        self.assertListEqual(
+            module_to_test.get_detection_keys(keys=keys),
+            [("", "", "", "1", "1"), ("", "", "", "3", "2")],
+        )
+
+        # No key differs from the first in all dimensions
+        keys = [("1", "", "", "1", ""), ("1", "", "", "2", ""), ("2", "", "", "1", "")]
+        self.assertListEqual(
+            module_to_test.get_detection_keys(keys=keys),
+            [
+                ("1", "", "", "1", ""),
+                ("2", "", "", "1", ""),
+                ("1", "", "", "2", ""),
+            ],
+        )
+
+        self.assertListEqual(
+            module_to_test.get_detection_keys(keys=[("", "", "", "", "")]),
+            [("", "", "", "", "")],
+        )
+
+    def test_record_module_inputs(self):
+        """
+        The queries (with their parameters) and files of each module are
+        recorded
+        :return:
+        """
+        self.assertTrue(module_to_test.check_query_tracing(self.conn))
+
+        inputs_record = dict()
+        self.write_inputs(subproblem="2", inputs_record=inputs_record)
+        self.assertListEqual(
+            inputs_record["profiles"][0],
+            ["SELECT value FROM inputs WHERE subproblem_id = 2;"],
+        )
+        self.assertSetEqual(
+            inputs_record["profiles"][1], {"projects.tab", "profiles.tab"}
+        )
+        self.assertSetEqual(inputs_record["load_zones"][1], {"load_zones.tab"})
+
+    def test_shared_inputs(self):
+        """
+        Only the files written exclusively by subproblem-independent modules
+        are shared
+        :return:
+        """
+        inputs_records = []
+        for subproblem in ["1", "2"]:
+            inputs_record = dict()
+            inputs_directory = self.write_inputs(
+                subproblem=subproblem, inputs_record=inputs_record
+            )
+            inputs_records.append((inputs_directory, inputs_record))
+
+        shared_inputs = module_to_test.SharedInputs.from_inputs_records(
+            scenario_directory=self.scenario_directory,
+            inputs_records=inputs_records,
+        )
+        self.assertSetEqual(shared_inputs.shared_modules, {"load_zones"})
+        self.assertListEqual(shared_inputs.shared_files, ["load_zones.tab"])
+
+        # The detection subproblems' shared files are linked to the shared file
+        shared_file = os.path.join(shared_inputs.shared_directory, "load_zones.tab")
+        for inputs_directory, _ in inputs_records:
+            self.assertTrue(
+                os.path.samefile(
+                    shared_file, os.path.join(inputs_directory, "load_zones.tab")
+                )
+            )
+            self.assertTrue(
+                os.path.exists(os.path.join(inputs_directory, "projects.tab"))
+            )
+
+        new_inputs_directory = os.path.join(self.scenario_directory, "3", "inputs")
+        os.makedirs(new_inputs_directory)
+        shared_inputs.link_shared_files(inputs_directory=new_inputs_directory)
+        with open(os.path.join(new_inputs_directory, "load_zones.tab")) as f:
+            self.assertEqual(f.read(), "load_zone\nZone1\n")
+
+        # Modifying a shared file raises an error
+        shared_inputs.check_shared_files()
+        write_file(new_inputs_directory, "load_zones.tab", "Zone2\n", mode="a")
+        with self.assertRaises(Exception):
+            shared_inputs.check_shared_files()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,216 @@
+# Copyright 2016-2023 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import json
+import os
+import tempfile
+import unittest
+
+import dill
+from pyomo.environ import (
+    ConcreteModel,
+    Constraint,
+    NonNegativeReals,
+    Objective,
+    Set,
+    Suffix,
+    Var,
+    value,
+)
+
+import gridpath.auxiliary.solution_loaders as module_to_test
+
+
+def create_instance(projects=("Coal", "Gas", "Wind")):
+    m = ConcreteModel()
+    m.PROJECTS = Set(initialize=projects)
+    m.Power = Var(m.PROJECTS, within=NonNegativeReals)
+    m.Max_Power = Constraint(m.PROJECTS, rule=lambda mod, p: mod.Power[p] <= 10)
+    m.Load = Constraint(expr=sum(m.Power[p] for p in m.PROJECTS) == 15)
+    m.Range = Constraint(expr=(1, m.Power["Gas"], 8))
+    m.Cost = Objective(expr=m.Power["Coal"] + 2 * m.Power["Gas"])
+    m.dual = Suffix(direction=Suffix.IMPORT)
+    return m
+
+
+class TestSolutionLoaders(unittest.TestCase):
+    """ """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_problem(self, symbolic=False):
+        """
+        Write the problem file and save the symbol index; return the
+        symbols of the components and an unpickled copy of the instance
+        """
+        instance = create_instance()
+        _, smap_id = instance.write(
+            os.path.join(self.tmp_dir.name, "problem_file.lp"),
+            format="lp",
+            io_options={"symbolic_solver_labels": symbolic},
+        )
+        symbol_map = instance.solutions.symbol_map[smap_id]
+        symbol_index_file = os.path.join(
+            self.tmp_dir.name, module_to_test.SYMBOL_INDEX_FILENAME
+        )
+        module_to_test.SymbolIndex.from_symbol_map(
+            instance=instance, symbol_map=symbol_map
+        ).save(symbol_index_file)
+
+        symbols = {
+            component.name: symbol
+            for symbol, component in symbol_map.bySymbol.items()
+            if component.ctype in (Var, Constraint)
+        }
+        unpickled_instance = dill.loads(dill.dumps(instance))
+
+        return (
+            symbols,
+            unpickled_instance,
+            module_to_test.SymbolIndex.load(symbol_index_file),
+        )
+
+    def test_symbol_index(self):
+        """
+        The values and duals are loaded into the right components of the
+        unpickled instance, for numbered and symbolic labels
+        :return:
+        """
+        for symbolic in [False, True]:
+            symbols, instance, symbol_index = self.write_problem(symbolic=symbolic)
+            self.assertEqual(symbol_index.symbols is None, not symbolic)
+
+            solution_loader = module_to_test.SolutionLoader(
+                instance=instance, symbol_index=symbol_index
+            )
+            solution_loader.add_value(symbols["Power[Coal]"], "5")
+            solution_loader.add_value(symbols["Power[Gas]"], 1.0)
+            solution_loader.add_value(symbols["Power[Wind]"], 9.0)
+            # Solvers may strip the constraint type prefix and underscore
+            solution_loader.add_dual(symbols["Load"][4:-1], -1.0)
+            solution_loader.add_dual(symbols["Range"], 3.0)
+            solution_loader.flush()
+
+            self.assertEqual(value(instance.Cost), 7.0)
+            self.assertEqual(instance.Power["Wind"].value, 9.0)
+            self.assertEqual(instance.dual[instance.Load], -1.0)
+            self.assertEqual(instance.dual[instance.Range], 3.0)
+            self.assertEqual(len(instance.dual), 2)
+
+            with self.assertRaises(KeyError):
+                solution_loader.add_value("x1000", 1.0)
+                solution_loader.flush()
+
+    def test_rebuilt_instance(self):
+        """
+        The symbol index can be used with an instance rebuilt from the same
+        data, but not with an instance with different components or indices
+        :return:
+        """
+        symbols, _, symbol_index = self.write_problem()
+
+        instance = create_instance()
+        solution_loader = module_to_test.SolutionLoader(
+            instance=instance, symbol_index=symbol_index
+        )
+        solution_loader.add_value(symbols["Power[Wind]"], 9.0)
+        solution_loader.flush()
+        self.assertEqual(instance.Power["Wind"].value, 9.0)
+
+        instance = create_instance()
+        instance.Extra = Var()
+        with self.assertRaises(Exception):
+            module_to_test.SolutionLoader(instance=instance, symbol_index=symbol_index)
+
+        instance = create_instance(projects=("Coal", "Wind", "Gas"))
+        with self.assertRaises(Exception):
+            module_to_test.SolutionLoader(instance=instance, symbol_index=symbol_index)
+
+    def test_iter_cplex_xml_solution(self):
+        """
+        :return:
+        """
+        solution_file = os.path.join(self.tmp_dir.name, "cplex_solution.sol")
+        with open(solution_file, "w") as f:
+            f.write(
+                """<?xml version = "1.0" encoding="UTF-8" standalone="yes"?>
+<CPLEXSolution version="1.2">
+ <header
+   problemName="problem_file.lp"
+   solutionStatusValue="1"
+   solutionStatusString="optimal"/>
+ <linearConstraints>
+  <constraint name="c_e_x5_" index="0" slack="0" dual="-1"/>
+ </linearConstraints>
+ <variables>
+  <variable name="x2" index="0" value="5" reducedCost="0"/>
+  <variable name="x3" index="1" value="1.5" reducedCost="0"/>
+ </variables>
+</CPLEXSolution>
+"""
+            )
+
+        self.assertListEqual(
+            list(module_to_test.iter_cplex_xml_solution(solution_file)),
+            [
+                (
+                    "header",
+                    {
+                        "problemName": "problem_file.lp",
+                        "solutionStatusValue": "1",
+                        "solutionStatusString": "optimal",
+                    },
+                ),
+                ("constraint", "c_e_x5_", "-1"),
+                ("variable", "x2", "5"),
+                ("variable", "x3", "1.5"),
+            ],
+        )
+
+    def test_iter_json_members(self):
+        """
+        The array members are streamed item by item, including when items
+        and numbers are split across chunks
+        :return:
+        """
+        solution = {
+            "SolutionInfo": {"Status": 2, "ObjVal": 123.456789},
+            "Vars": [{"VTag": ["x{}".format(i)], "X": i * 1.25} for i in range(20)],
+            "Constrs": [],
+            "Empty": {},
+        }
+        expected = (
+            [("SolutionInfo", solution["SolutionInfo"])]
+            + [("Vars", v) for v in solution["Vars"]]
+            + [("Empty", {})]
+        )
+        for indent in [None, 2]:
+            for chunk_size in [1, 7, 2**20]:
+                members = list(
+                    module_to_test.iter_json_members(
+                        f=io.StringIO(json.dumps(solution, indent=indent)),
+                        streamed_keys=("Vars", "Constrs"),
+                        chunk_size=chunk_size,
+                    )
+                )
+                self.assertListEqual(members, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
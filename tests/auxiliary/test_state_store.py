@@ -0,0 +1,166 @@
+# Copyright 2016-2023 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from pyomo.environ import AbstractModel, DataPortal, Param, Set
+
+import gridpath.auxiliary.state_store as module_to_test
+
+PROBLEM_KEY = ("", "", "", "2", "1")
+HEADER = ["project", "linked_timepoint", "linked_power", "linked_commit"]
+ROWS = [["Coal", np.int64(0), 1.5, "."], ["Gas", np.int64(-1), 2.0, 1]]
+
+
+def create_model():
+    m = AbstractModel()
+    m.LINKED_TMPS = Set(dimen=2)
+    m.linked_power = Param(m.LINKED_TMPS)
+    m.linked_commit = Param(m.LINKED_TMPS)
+    m.TMPS = Set()
+    m.other = Param(m.TMPS)
+    return m
+
+
+class TestStateStore(unittest.TestCase):
+    """ """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.scenario_directory = self.tmp_dir.name
+        for subdirectory in ["inputs", "pass_through_inputs"]:
+            os.makedirs(os.path.join(self.scenario_directory, "2", "1", subdirectory))
+        module_to_test.clear_state_store()
+
+    def tearDown(self):
+        module_to_test.configure_state_store(in_memory=False, write_files=True)
+        module_to_test.clear_state_store()
+        self.tmp_dir.cleanup()
+
+    def get_path(self, filename, subdirectory="inputs"):
+        return module_to_test.get_state_table_path(
+            scenario_directory=self.scenario_directory,
+            problem_key=PROBLEM_KEY,
+            subdirectory=subdirectory,
+            filename=filename,
+        )
+
+    def publish(self, filename="linked.tab", rows=ROWS, mode="w"):
+        with module_to_test.open_state_table(
+            scenario_directory=self.scenario_directory,
+            problem_key=PROBLEM_KEY,
+            subdirectory="inputs",
+            filename=filename,
+            mode=mode,
+        ) as writer:
+            if mode == "w":
+                writer.writerow(HEADER)
+            for row in rows:
+                writer.writerow(row)
+
+    def load(self):
+        """
+        Load the published table into a DataPortal (after loading another
+        file, as a module would after the data loaded by other modules)
+        """
+        m = create_model()
+        with open(self.get_path("other.tab"), "w") as f:
+            f.write("timepoint\tother\n1\t10\n")
+        data_portal = DataPortal(model=m)
+        data_portal.load(
+            filename=self.get_path("other.tab"), index=m.TMPS, param=m.other
+        )
+        module_to_test.load_state_table(
+            data_portal=data_portal,
+            scenario_directory=self.scenario_directory,
+            problem_key=PROBLEM_KEY,
+            subdirectory="inputs",
+            filename="linked.tab",
+            index=m.LINKED_TMPS,
+            param=(m.linked_power, m.linked_commit),
+        )
+        return data_portal.data()
+
+    def test_load_state_table(self):
+        """
+        The data loaded from memory are the same as the data loaded from the
+        file, and no file is written unless requested
+        :return:
+        """
+        self.publish()
+        data_from_file = self.load()
+        self.assertDictEqual(
+            data_from_file["linked_power"], {("Coal", 0): 1.5, ("Gas", -1): 2.0}
+        )
+        self.assertDictEqual(data_from_file["linked_commit"], {("Gas", -1): 1})
+        os.remove(self.get_path("linked.tab"))
+
+        module_to_test.configure_state_store(in_memory=True, write_files=False)
+        self.publish()
+        self.assertFalse(os.path.exists(self.get_path("linked.tab")))
+        data_from_memory = self.load()
+        self.assertDictEqual(data_from_memory, data_from_file)
+        self.assertIs(type(data_from_memory["LINKED_TMPS"][None][0][1]), int)
+
+        # Audit trail
+        module_to_test.configure_state_store(in_memory=True, write_files=True)
+        self.publish()
+        self.assertTrue(os.path.exists(self.get_path("linked.tab")))
+
+        # Nothing is loaded if there's no table
+        module_to_test.clear_state_store(problem_key=PROBLEM_KEY)
+        os.remove(self.get_path("linked.tab"))
+        self.assertNotIn("linked_power", self.load())
+
+    def test_read_state_table_df(self):
+        """
+        Rows appended in memory are added to the rows of the file
+        :return:
+        """
+        for in_memory in [False, True]:
+            module_to_test.configure_state_store(in_memory=in_memory, write_files=False)
+            with open(
+                self.get_path("positions.tab", subdirectory="pass_through_inputs"),
+                "w",
+            ) as f:
+                f.write("project\ttimepoint\tstage\tvalue\nCoal\t1\t1\t3.0\n")
+            module_to_test.clear_state_store()
+
+            for stage in ["2", "3"]:
+                with module_to_test.open_state_table(
+                    scenario_directory=self.scenario_directory,
+                    problem_key=PROBLEM_KEY,
+                    subdirectory="pass_through_inputs",
+                    filename="positions.tab",
+                    mode="a",
+                ) as writer:
+                    writer.writerow(["Coal", 1, stage, 4.0])
+
+            df = module_to_test.read_state_table_df(
+                scenario_directory=self.scenario_directory,
+                problem_key=PROBLEM_KEY,
+                subdirectory="pass_through_inputs",
+                filename="positions.tab",
+                dtype={"stage": str},
+            )
+            self.assertListEqual(df["stage"].tolist(), ["1", "2", "3"])
+            self.assertListEqual(df["value"].tolist(), [3.0, 4.0, 4.0])
+            self.assertListEqual(df["timepoint"].tolist(), [1, 1, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
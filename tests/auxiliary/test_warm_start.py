@@ -0,0 +1,198 @@
+# Copyright 2016-2023 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import csv
+import os
+import tempfile
+import unittest
+
+from pyomo.environ import Binary, ConcreteModel, NonNegativeReals, Set, Var
+
+import gridpath.auxiliary.warm_start as module_to_test
+
+
+def create_instance(timepoints=(1, 2, 3)):
+    m = ConcreteModel()
+    m.TMPS = Set(initialize=timepoints)
+    m.Commit = Var(m.TMPS, within=Binary)
+    m.Power = Var(m.TMPS, within=NonNegativeReals, bounds=(0, 10))
+    return m
+
+
+class TestWarmStart(unittest.TestCase):
+    """ """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.scenario_directory = self.tmp_dir.name
+        module_to_test._solution_values.clear()
+
+    def tearDown(self):
+        module_to_test._solution_values.clear()
+        self.tmp_dir.cleanup()
+
+    def save_solution(self, problem_key, timepoints=(1, 2, 3)):
+        instance = create_instance(timepoints=timepoints)
+        for tmp in timepoints:
+            instance.Commit[tmp].set_value(1)
+            instance.Power[tmp].set_value(tmp * 5.0)
+        module_to_test.save_solution_values(problem_key, instance)
+
+    def test_get_warm_start_source(self):
+        """
+        Stages are warm started from the latest previous stage and the first
+        stage of a subproblem from the previous subproblem if they are linked
+        :return:
+        """
+        self.save_solution(("", "", "", "1", "1"))
+        self.save_solution(("", "", "", "1", "2"))
+        self.assertEqual(
+            module_to_test.get_warm_start_source(
+                self.scenario_directory, ("", "", "", "1", "3")
+            ),
+            ("", "", "", "1", "2"),
+        )
+        self.assertIsNone(
+            module_to_test.get_warm_start_source(
+                self.scenario_directory, ("", "", "", "2", "1")
+            )
+        )
+
+        with open(
+            os.path.join(self.scenario_directory, "linked_subproblems_map.csv"), "w"
+        ) as f:
+            f.write("subproblem,stage,timepoint\n")
+        self.assertEqual(
+            module_to_test.get_warm_start_source(
+                self.scenario_directory, ("", "", "", "2", "1")
+            ),
+            ("", "", "", "1", "1"),
+        )
+
+        # Solutions of earlier subproblems and other iterations are dropped
+        self.save_solution(("", "", "", "2", "1"))
+        self.save_solution(("", "", "", "3", "1"))
+        self.assertListEqual(
+            sorted(module_to_test._solution_values.keys()),
+            [("", "", "", "2", "1"), ("", "", "", "3", "1")],
+        )
+        self.save_solution(("2", "", "", "1", "1"))
+        self.assertListEqual(
+            list(module_to_test._solution_values.keys()), [("2", "", "", "1", "1")]
+        )
+
+    def test_set_values(self):
+        """
+        Only the unfixed variables of the shared indices are initialized,
+        with integer values rounded and values clipped to the bounds; values
+        not loaded from the solver are restored after the solve
+        :return:
+        """
+        instance = create_instance(timepoints=(1, 2, 3))
+        instance.Commit[1].set_value(0.9999, skip_validation=True)
+        instance.Power[1].set_value(12.0, skip_validation=True)
+        module_to_test.save_solution_values(("", "", "", "", "1"), instance)
+
+        instance = create_instance(timepoints=(2, 3, 4))
+        instance.Commit[3].fix(0)
+        instance.Power[2].set_value(1.0)
+        instance.Power[3].set_value(2.0)
+        module_to_test.save_solution_values(("", "", "", "", "2"), instance)
+
+        instance = create_instance(timepoints=(1, 2, 3, 4))
+        instance.Power[1].set_value(3.0)
+        warm_start = module_to_test.WarmStart.set_values(
+            instance=instance,
+            scenario_directory=self.scenario_directory,
+            problem_key=("", "", "", "", "3"),
+        )
+        self.assertEqual(warm_start.source, ("", "", "", "", "2"))
+        self.assertListEqual(
+            [var.name for var, _ in warm_start.seeded_variables],
+            ["Commit[3]", "Power[2]", "Power[3]"],
+        )
+
+        instance = create_instance(timepoints=(1, 2))
+        instance.Commit[2].fix(1)
+        warm_start = module_to_test.WarmStart.set_values(
+            instance=instance,
+            scenario_directory=self.scenario_directory,
+            problem_key=("", "", "", "", "2"),
+        )
+        self.assertEqual(warm_start.source, ("", "", "", "", "1"))
+        self.assertEqual(instance.Commit[1].value, 1)
+        self.assertEqual(instance.Power[1].value, 10)
+        self.assertEqual(instance.Commit[2].value, 1)
+
+        # Power[1] gets a value from the solver, the other variables don't
+        instance.Power[1].set_value(7.0)
+        warm_start.restore_unused_values()
+        self.assertEqual(instance.Power[1].value, 7.0)
+        self.assertIsNone(instance.Commit[1].value)
+
+    def test_get_first_incumbent_seconds(self):
+        """
+        :return:
+        """
+        log_file = os.path.join(self.tmp_dir.name, "solver.log")
+        for log, seconds in [
+            (
+                "Cbc0045I MIPStart provided solution with cost 1232\n"
+                "Cbc0012I Integer solution of 1232 found by Reduced search "
+                "after 0 iterations and 0 nodes 0 depth 0 ontree (0.03 seconds)\n"
+                "Cbc0012I Integer solution of 1218 found by DiveCoefficient "
+                "after 5 iterations and 0 nodes 0 depth 0 ontree (0.10 seconds)\n",
+                0.03,
+            ),
+            (
+                " ★    2      2            3       0.2677 cont solution    "
+                "-1.57692e+12    0.009\n",
+                0.009,
+            ),
+            (
+                "User MIP start produced solution with objective 1232 (0.01s)\n",
+                0.01,
+            ),
+            (
+                "H    0     0                    1218.0000  1240.00000  1.81%"
+                "     -    2s\n",
+                2.0,
+            ),
+            ("Optimal solution found\n", None),
+        ]:
+            with open(log_file, "w") as f:
+                f.write(log)
+            self.assertEqual(
+                module_to_test.get_first_incumbent_seconds(log_file), seconds
+            )
+
+    def test_write_report(self):
+        """
+        :return:
+        """
+        warm_start = module_to_test.WarmStart(
+            source=("", "", "", "2", "1"),
+            seeded_variables=[(None, None)] * 3,
+        )
+        warm_start.solve_seconds = 1.5
+        warm_start.write_report(results_directory=self.tmp_dir.name)
+        with open(
+            os.path.join(self.tmp_dir.name, module_to_test.WARM_START_FILENAME)
+        ) as f:
+            rows = list(csv.reader(f))
+        self.assertListEqual(rows[1], ["2/1", "3", "0", "1.5", ""])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+# Copyright 2016-2023 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import unittest
+
+import gridpath.auxiliary.worker_pool as module_to_test
+
+
+def get_context_value(key):
+    """
+    Task returning the worker context value and the worker process ID
+    """
+    return module_to_test.get_worker_context()[key], os.getpid()
+
+
+class TestWorkerPool(unittest.TestCase):
+    """ """
+
+    def test_initialize_worker(self):
+        """
+        The initializer replaces the worker context
+        :return:
+        """
+        module_to_test.initialize_worker({"a": 1})
+        module_to_test.initialize_worker({"b": 2})
+        self.assertDictEqual(module_to_test.get_worker_context(), {"b": 2})
+        module_to_test.initialize_worker({})
+
+    def test_create_worker_pool(self):
+        """
+        Tasks see the shared data and the workers are reused across tasks
+        :return:
+        """
+        with module_to_test.create_worker_pool(
+            n_processes=2, shared_value="shared"
+        ) as pool:
+            results = pool.map(get_context_value, ["shared_value"] * 6)
+
+        self.assertListEqual([r[0] for r in results], ["shared"] * 6)
+        self.assertLessEqual(len(set(r[1] for r in results)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -20,9 +20,23 @@ import pandas as pd
 import sys
 import unittest
 
+from pyomo.environ import Set
+
 from tests.common_functions import create_abstract_model, add_components_and_load_data
 
 TEST_DATA_DIRECTORY = os.path.join(os.path.dirname(__file__), "..", "..", "test_data")
+EXAMPLES_DIRECTORY = os.path.join(
+    os.path.dirname(__file__), "..", "..", "..", "examples"
+)
+
+# Examples against which to check the indexed operational sets
+EXAMPLES_TO_CHECK = [
+    "test",
+    "test_new_build_storage",
+    "2periods_new_build_2zones_transmission",
+    "2periods_new_build_rps_variable_reserves",
+    "test_new_instantaneous_penetration",
+]
 
 # Import prerequisite modules
 PREREQUISITE_MODULE_NAMES = [
@@ -308,6 +322,77 @@ class TestCapacity(unittest.TestCase):
             expected_battery_specified_periods, actual_battery_specified_periods
         )
 
+    def test_indexed_operational_sets_on_examples(self):
+        """
+        Check that the indexed operational sets match the sets created by
+        scanning the full project-period and project-timepoint sets on the
+        examples
+        """
+        from gridpath.auxiliary.dynamic_components import DynamicComponents
+        from gridpath.auxiliary.scenario_chars import get_scenario_structure_from_disk
+        from gridpath.run_scenario import (
+            create_abstract_model as create_scenario_model,
+            create_problem_instance,
+            load_scenario_data,
+            set_up_gridpath_modules,
+        )
+        from pyomo.environ import AbstractModel
+
+        for example in EXAMPLES_TO_CHECK:
+            scenario_directory = os.path.join(EXAMPLES_DIRECTORY, example)
+            scenario_structure = get_scenario_structure_from_disk(scenario_directory)
+            modules_to_use, loaded_modules = set_up_gridpath_modules(
+                scenario_directory=scenario_directory,
+                multi_stage=scenario_structure.MULTI_STAGE,
+            )
+            model = AbstractModel()
+            d = DynamicComponents()
+            create_scenario_model(
+                model, d, loaded_modules, scenario_directory, "", "", "", "", ""
+            )
+            data = load_scenario_data(
+                model, d, loaded_modules, scenario_directory, "", "", "", "", ""
+            )
+            instance = create_problem_instance(model, data)
+
+            for prj in instance.PROJECTS:
+                self.assertListEqual(
+                    MODULE_BEING_TESTED.operational_periods_by_project(
+                        prj=prj, project_operational_periods=instance.PRJ_OPR_PRDS
+                    ),
+                    list(instance.OPR_PRDS_BY_PRJ[prj]),
+                )
+
+            for tmp in instance.TMPS:
+                self.assertListEqual(
+                    [g for (g, t) in instance.PRJ_OPR_TMPS if t == tmp],
+                    list(instance.OPR_PRJS_IN_TMP[tmp]),
+                )
+                for lz in instance.LOAD_ZONES:
+                    self.assertListEqual(
+                        [
+                            g
+                            for (g, t) in instance.PRJ_OPR_TMPS
+                            if t == tmp and instance.load_zone[g] == lz
+                        ],
+                        list(instance.OPR_PRJS_IN_LZ_TMP[lz, tmp]),
+                    )
+
+            # Reserve and other aggregation sets drawing from the index
+            for op_set_name, prj_set_name in [
+                (c.name, c.name.replace("_OPERATIONAL_IN_TIMEPOINT", ""))
+                for c in instance.component_objects(ctype=Set)
+                if c.name.endswith("_OPERATIONAL_IN_TIMEPOINT")
+            ]:
+                if op_set_name == "INST_PEN_PRJ_OPERATIONAL_IN_TIMEPOINT":
+                    prj_set_name = "INST_PEN_PRJS"
+                for tmp in instance.TMPS:
+                    self.assertSetEqual(
+                        set(getattr(instance, prj_set_name))
+                        & set(instance.OPR_PRJS_IN_TMP[tmp]),
+                        set(getattr(instance, op_set_name)[tmp]),
+                    )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,123 @@
+# Copyright 2016-2023 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pyomo.environ import ConcreteModel, Param, Set
+import unittest
+
+import gridpath.system.policy.common_functions as module_to_test
+
+
+class TestPolicyCommonFunctions(unittest.TestCase):
+    """ """
+
+    def setUp(self):
+        """
+        Two zones, one project in both zones; two periods with two
+        timepoints each; one balancing type with one horizon per period
+        """
+        m = ConcreteModel()
+        m.ZONES = Set(initialize=["Z1", "Z2"])
+        m.TMPS = Set(initialize=[1, 2, 3, 4])
+        m.period = Param(m.TMPS, initialize={1: 2020, 2: 2020, 3: 2030, 4: 2030})
+        m.BLN_TYPES = Set(initialize=["year"])
+        m.TMPS_BLN_TYPES = Set(dimen=2, initialize=[(t, "year") for t in m.TMPS])
+        m.horizon = Param(
+            m.TMPS_BLN_TYPES,
+            initialize={(1, "year"): 1, (2, "year"): 1, (3, "year"): 2, (4, "year"): 2},
+        )
+        m.PRJS_BY_ZONE = Set(
+            m.ZONES, initialize={"Z1": ["A", "B"], "Z2": ["B"]}, dimen=1
+        )
+        m.PRJ_OPR_TMPS = Set(
+            dimen=2,
+            initialize=[("A", 1), ("A", 2), ("B", 2), ("B", 3), ("C", 4)],
+        )
+        self.m = m
+
+    def test_zones_by_member(self):
+        """
+
+        :return:
+        """
+        self.assertDictEqual(
+            {"A": ["Z1"], "B": ["Z1", "Z2"]},
+            module_to_test.zones_by_member(self.m, "PRJS_BY_ZONE"),
+        )
+
+    def test_get_policy_zone_index(self):
+        """
+
+        :return:
+        """
+        expected_by_period = {
+            ("Z1", 2020): [("A", 1), ("A", 2), ("B", 2)],
+            ("Z2", 2020): [("B", 2)],
+            ("Z1", 2030): [("B", 3)],
+            ("Z2", 2030): [("B", 3)],
+        }
+        self.assertDictEqual(
+            expected_by_period,
+            module_to_test.get_policy_zone_index(
+                self.m,
+                index_name="by_period",
+                set_name="PRJ_OPR_TMPS",
+                by="tmp_period",
+                members_by_zone_set="PRJS_BY_ZONE",
+            ),
+        )
+
+        expected_by_horizon = {
+            ("Z1", "year", 1): [("A", 1), ("A", 2), ("B", 2)],
+            ("Z2", "year", 1): [("B", 2)],
+            ("Z1", "year", 2): [("B", 3)],
+            ("Z2", "year", 2): [("B", 3)],
+        }
+        self.assertDictEqual(
+            expected_by_horizon,
+            module_to_test.get_policy_zone_index(
+                self.m,
+                index_name="by_horizon",
+                set_name="PRJ_OPR_TMPS",
+                by="tmp_horizon",
+                members_by_zone_set="PRJS_BY_ZONE",
+            ),
+        )
+
+        # Zones determined by a rule
+        expected_by_rule = {
+            ("Z3", 2020): [("A", 1), ("A", 2)],
+        }
+        self.assertDictEqual(
+            expected_by_rule,
+            module_to_test.get_policy_zone_index(
+                self.m,
+                index_name="by_rule",
+                set_name="PRJ_OPR_TMPS",
+                by="tmp_period",
+                zone_rule=lambda mod, el: ["Z3"] if el[0] == "A" else [],
+            ),
+        )
+
+        with self.assertRaises(ValueError):
+            module_to_test.get_policy_zone_index(
+                self.m,
+                index_name="invalid",
+                set_name="PRJ_OPR_TMPS",
+                by="month",
+                members_by_zone_set="PRJS_BY_ZONE",
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -328,6 +328,40 @@ class TestHorizons(unittest.TestCase):
             msg="Data for param next_tmp do not match " "expected.",
         )
 
+    def test_first_and_last_timepoint_checks(self):
+        """
+        Check that the project first/last timepoint checks, which use the
+        horizon timepoint positions, agree with the first_hrz_tmp and
+        last_hrz_tmp params
+        """
+        from gridpath.project.common_functions import (
+            check_if_first_timepoint,
+            check_if_last_timepoint,
+        )
+
+        m, data = add_components_and_load_data(
+            prereq_modules=IMPORTED_PREREQ_MODULES,
+            module_to_test=MODULE_BEING_TESTED,
+            test_data_dir=TEST_DATA_DIRECTORY,
+            weather_iteration="",
+            hydro_iteration="",
+            availability_iteration="",
+            subproblem="",
+            stage="",
+        )
+        instance = m.create_instance(data)
+
+        for tmp, bt in instance.TMPS_BLN_TYPES:
+            hrz = instance.horizon[tmp, bt]
+            self.assertEqual(
+                tmp == instance.first_hrz_tmp[bt, hrz],
+                check_if_first_timepoint(mod=instance, tmp=tmp, balancing_type=bt),
+            )
+            self.assertEqual(
+                tmp == instance.last_hrz_tmp[bt, hrz],
+                check_if_last_timepoint(mod=instance, tmp=tmp, balancing_type=bt),
+            )
+
 
 if __name__ == "__main__":
     unittest.main()
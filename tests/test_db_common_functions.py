@@ -0,0 +1,139 @@
+# Copyright 2016-2023 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sqlite3
+import tempfile
+import unittest
+
+import pandas as pd
+
+import db.common_functions as module_to_test
+from gridpath.auxiliary.db_interface import insert_results_df
+
+
+class TestDBCommonFunctions(unittest.TestCase):
+    """ """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, "test.db")
+        sqlite3.connect(self.db_path).close()
+        self.conn = module_to_test.connect_to_database(db_path=self.db_path)
+        self.conn.execute(
+            "CREATE TABLE results_test (project TEXT, timepoint INTEGER, "
+            "power_mw FLOAT);"
+        )
+        self.conn.commit()
+
+    def tearDown(self):
+        self.conn.close()
+        self.tmp_dir.cleanup()
+
+    def count_rows(self):
+        """
+        Count the rows visible to a separate connection, i.e. committed rows
+        """
+        other_conn = sqlite3.connect(self.db_path)
+        n_rows = other_conn.execute("SELECT COUNT(*) FROM results_test;").fetchone()[0]
+        other_conn.close()
+
+        return n_rows
+
+    def test_db_transaction(self):
+        """
+        Commits by the statements in the transaction are deferred until the
+        end of the transaction
+        :return:
+        """
+        module_to_test.set_wal_journal_mode(conn=self.conn)
+        c = self.conn.cursor()
+        with module_to_test.db_transaction(self.conn):
+            for tmp in [1, 2]:
+                module_to_test.spin_on_database_lock(
+                    conn=self.conn,
+                    cursor=c,
+                    sql="INSERT INTO results_test VALUES (?, ?, ?);",
+                    data=("Wind", tmp, 10.0),
+                    many=False,
+                )
+                self.assertEqual(self.count_rows(), 0)
+
+        self.assertEqual(self.count_rows(), 2)
+
+    def test_db_transaction_rollback(self):
+        """
+        Nothing is written if the transaction fails
+        :return:
+        """
+        c = self.conn.cursor()
+        with self.assertRaises(ValueError):
+            with module_to_test.db_transaction(self.conn):
+                c.execute("INSERT INTO results_test VALUES ('Wind', 1, 10.0);")
+                self.conn.commit()
+                raise ValueError
+
+        self.assertEqual(self.count_rows(), 0)
+        self.assertFalse(self.conn.defer_commit)
+
+    def test_spin_on_database_lock_generic(self):
+        """
+        The command is retried while the database is locked
+        :return:
+        """
+        attempts = []
+
+        def command():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise sqlite3.OperationalError("database is locked")
+
+        module_to_test.spin_on_database_lock_generic(
+            command=command, max_attempts=5, interval=0
+        )
+        self.assertEqual(len(attempts), 3)
+
+        # Exit if the database is still locked after the last attempt
+        attempts.clear()
+        with self.assertRaises(SystemExit):
+            module_to_test.spin_on_database_lock_generic(
+                command=command, max_attempts=2, interval=0
+            )
+        self.assertEqual(len(attempts), 2)
+
+    def test_insert_results_df(self):
+        """
+        Missing values are inserted as NULLs
+        :return:
+        """
+        df = pd.DataFrame(
+            {
+                "project": ["Wind", "Gas"],
+                "timepoint": [1, 2],
+                "power_mw": [10.5, None],
+            }
+        )
+        with module_to_test.db_transaction(self.conn):
+            insert_results_df(
+                conn=self.conn, cursor=self.conn.cursor(), table="results_test", df=df
+            )
+
+        self.assertListEqual(
+            self.conn.execute("SELECT * FROM results_test;").fetchall(),
+            [("Wind", 1, 10.5), ("Gas", 2, None)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
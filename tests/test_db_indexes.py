@@ -0,0 +1,229 @@
+# Copyright 2016-2023 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sqlite3
+import unittest
+
+import db.utilities.indexes as module_to_test
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "..", "db", "db_schema.sql")
+
+# The hot query shapes and the index each of them is expected to use
+HOT_QUERIES = {
+    # project/operations/power.py
+    "idx_results_project_timepoint_dispatch_by_technology": """
+        SELECT scenario_id, weather_iteration, hydro_iteration,
+        availability_iteration, subproblem_id, stage_id, period, timepoint,
+        timepoint_weight, number_of_hours_in_timepoint, spinup_or_lookahead,
+        load_zone, technology, sum(power_mw) AS power_mw
+        FROM results_project_timepoint
+        WHERE scenario_id = ?
+        GROUP BY weather_iteration, hydro_iteration, availability_iteration,
+        subproblem_id, stage_id, timepoint, load_zone, technology
+        ORDER BY weather_iteration, hydro_iteration, availability_iteration,
+        subproblem_id, stage_id, timepoint, load_zone, technology;
+        """,
+    # viz/capacity_total_loadzone_comparison_plot.py
+    "idx_results_project_period_load_zone_technology": """
+        SELECT period, load_zone, technology, sum(capacity_mw) AS capacity_mw
+        FROM results_project_period
+        WHERE scenario_id = ?
+        AND period = ?
+        AND subproblem_id = ?
+        AND stage_id = ?
+        GROUP BY period, load_zone, technology;
+        """,
+    # viz/dispatch_plot.py
+    "idx_results_project_dispatch_by_technology_load_zone": """
+        SELECT timepoint, technology, power_mw
+        FROM results_project_dispatch_by_technology
+        WHERE scenario_id = ?
+        AND load_zone = ?
+        AND weather_iteration = ?
+        AND hydro_iteration = ?
+        AND availability_iteration = ?
+        AND stage_id = ?
+        AND timepoint IN (?, ?, ?);
+        """,
+    "idx_results_system_load_zone_timepoint_load_zone": """
+        SELECT timepoint, static_load_mw
+        FROM results_system_load_zone_timepoint
+        WHERE scenario_id = ?
+        AND load_zone = ?
+        AND weather_iteration = ?
+        AND hydro_iteration = ?
+        AND availability_iteration = ?
+        AND stage_id = ?
+        AND timepoint IN (?, ?, ?);
+        """,
+    "idx_results_project_curtailment_variable_periodagg_load_zone": """
+        SELECT timepoint, scheduled_curtailment_mw
+        FROM results_project_curtailment_variable_periodagg
+        WHERE scenario_id = ?
+        AND load_zone = ?
+        AND weather_iteration = ?
+        AND hydro_iteration = ?
+        AND availability_iteration = ?
+        AND stage_id = ?
+        AND timepoint IN (?, ?, ?);
+        """,
+    "idx_results_project_curtailment_hydro_periodagg_load_zone": """
+        SELECT timepoint, scheduled_curtailment_mw
+        FROM results_project_curtailment_hydro_periodagg
+        WHERE scenario_id = ?
+        AND load_zone = ?
+        AND weather_iteration = ?
+        AND hydro_iteration = ?
+        AND availability_iteration = ?
+        AND stage_id = ?
+        AND timepoint IN (?, ?, ?);
+        """,
+    # viz/energy_plot.py
+    "idx_results_project_dispatch_by_technology_period_load_zone": """
+        SELECT period, technology, SUM(energy_mwh) AS energy_mwh
+        FROM results_project_dispatch_by_technology_period
+        WHERE scenario_id = ?
+        AND load_zone = ?
+        AND stage_id = ?
+        AND spinup_or_lookahead = 0
+        GROUP BY period, technology;
+        """,
+    # project/operations/operational_types/common_functions.py
+    "idx_inputs_project_operational_chars_operational_type": """
+        SELECT project
+        FROM inputs_project_operational_chars
+        WHERE project_operational_chars_scenario_id = ?
+        AND operational_type = ?;
+        """,
+}
+
+
+def get_query_plan(conn, sql):
+    """
+    :return: list of the query plan details
+    """
+    return [
+        row[3]
+        for row in conn.execute(
+            f"EXPLAIN QUERY PLAN {sql}", (1,) * sql.count("?")
+        ).fetchall()
+    ]
+
+
+class TestIndexes(unittest.TestCase):
+    """ """
+
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        with open(SCHEMA_PATH, "r") as f:
+            self.conn.executescript(f.read())
+
+    def tearDown(self):
+        self.conn.close()
+
+    def get_index_names(self):
+        return [
+            row[0]
+            for row in self.conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' "
+                "AND name LIKE 'idx_%';"
+            ).fetchall()
+        ]
+
+    def test_catalog(self):
+        """
+        All catalog indexes are on tables and columns in the schema
+        :return:
+        """
+        for index_name, (table, columns) in module_to_test.INDEX_CATALOG.items():
+            table_columns = [
+                row[1] for row in self.conn.execute(f"PRAGMA table_info({table});")
+            ]
+            self.assertTrue(table_columns, f"{table} not in schema")
+            self.assertTrue(set(columns).issubset(table_columns), index_name)
+
+    def test_create_and_drop_indexes(self):
+        """
+        :return:
+        """
+        # The opt-in indexes are only created when requested
+        module_to_test.create_indexes(conn=self.conn)
+        self.assertListEqual(
+            sorted(self.get_index_names()),
+            sorted(
+                i
+                for i in module_to_test.INDEX_CATALOG.keys()
+                if i not in module_to_test.OPT_IN_INDEXES
+            ),
+        )
+        module_to_test.create_indexes(conn=self.conn, opt_in=True)
+        self.assertListEqual(
+            sorted(self.get_index_names()),
+            sorted(module_to_test.INDEX_CATALOG.keys()),
+        )
+
+        module_to_test.drop_indexes(
+            conn=self.conn, tables=["results_project_timepoint"]
+        )
+        self.assertNotIn(
+            "idx_results_project_timepoint_dispatch_by_technology",
+            self.get_index_names(),
+        )
+
+        # Only the indexes that existed are re-created
+        existing_indexes = sorted(self.get_index_names())
+        with module_to_test.indexes_dropped(conn=self.conn):
+            self.assertListEqual(self.get_index_names(), [])
+        self.assertListEqual(sorted(self.get_index_names()), existing_indexes)
+
+        module_to_test.create_indexes(conn=self.conn, opt_in=True)
+        with module_to_test.indexes_dropped(
+            conn=self.conn, tables=["results_project_timepoint"]
+        ):
+            self.assertEqual(
+                len(self.get_index_names()), len(module_to_test.INDEX_CATALOG) - 1
+            )
+        self.assertEqual(len(self.get_index_names()), len(module_to_test.INDEX_CATALOG))
+
+    def test_query_plans(self):
+        """
+        The hot queries use their index and don't scan the full table
+        :return:
+        """
+        # Without the opt-in indexes, their queries don't scan the full
+        # table either
+        module_to_test.create_indexes(conn=self.conn)
+        for index_name in module_to_test.OPT_IN_INDEXES:
+            query_plan = get_query_plan(conn=self.conn, sql=HOT_QUERIES[index_name])
+            self.assertFalse(
+                any(detail.startswith("SCAN") for detail in query_plan),
+                f"full scan: {query_plan}",
+            )
+
+        module_to_test.create_indexes(conn=self.conn, opt_in=True)
+        for index_name, sql in HOT_QUERIES.items():
+            query_plan = get_query_plan(conn=self.conn, sql=sql)
+            self.assertTrue(
+                any(index_name in detail for detail in query_plan),
+                f"{index_name} not used: {query_plan}",
+            )
+            self.assertFalse(
+                any(detail.startswith("SCAN") for detail in query_plan),
+                f"full scan: {query_plan}",
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
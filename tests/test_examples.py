@@ -20,9 +20,16 @@ import os
 import pandas as pd
 import platform
 import sqlite3
+import tempfile
 import unittest
 
-from gridpath import run_end_to_end, run_scenario, validate_inputs
+from gridpath import (
+    import_scenario_results,
+    process_results,
+    run_end_to_end,
+    run_scenario,
+    validate_inputs,
+)
 from db import create_database
 from db.common_functions import connect_to_database
 from db.utilities import port_csvs_to_db, scenario
@@ -216,9 +223,12 @@ class TestExamples(unittest.TestCase):
             logging.exception(e)
             os.remove(DB_PATH)
 
-    def validate_and_test_example_generic(
-        self, scenario_name, solver=None, skip_validation=False
-    ):
+    def get_expected_objective(self, scenario_name):
+        """
+
+        :param scenario_name: str, name of the test example
+        :return: float or dict, expected objective
+        """
         # Use the expected objective column by default
         column_to_use = "expected_objective"
         if MACOS and not pd.isnull(
@@ -234,7 +244,12 @@ class TestExamples(unittest.TestCase):
         # dictionary format stored as string in the CSV)
         # This is now done for all scenarios, even if they have no iterations
         # or multiple subproblem/stages
-        objective = ast.literal_eval(self.df.loc[scenario_name][column_to_use])
+        return ast.literal_eval(self.df.loc[scenario_name][column_to_use])
+
+    def validate_and_test_example_generic(
+        self, scenario_name, solver=None, skip_validation=False
+    ):
+        objective = self.get_expected_objective(scenario_name)
         if not skip_validation:
             self.check_validation(scenario_name)
         self.run_and_check_objective(
@@ -537,6 +552,128 @@ class TestExamples(unittest.TestCase):
             ]
         )
 
+    def test_example_multi_stage_prod_cost_reimport_subproblem(self):
+        """
+        Check that re-importing the results of one subproblem of the
+        "multi_stage_prod_cost" example only deletes and re-inserts that
+        subproblem's results, and that process_results then only
+        re-aggregates that subproblem's results
+        :return:
+        """
+        scenario_name = "multi_stage_prod_cost"
+        # Write the scenario files to a temporary directory to leave the
+        # example's committed inputs and results untouched
+        scenario_location = tempfile.TemporaryDirectory()
+        self.addCleanup(scenario_location.cleanup)
+        args = [
+            "--database",
+            DB_PATH,
+            "--scenario",
+            scenario_name,
+            "--scenario_location",
+            scenario_location.name,
+            "--quiet",
+        ]
+        run_end_to_end.main(args + ["--mute_solver_output", "--testing"])
+
+        def get_rowids_and_flags():
+            conn = connect_to_database(db_path=DB_PATH)
+            scenario_id = conn.execute(
+                "SELECT scenario_id FROM scenarios WHERE scenario_name = ?",
+                (scenario_name,),
+            ).fetchone()[0]
+            rowids = {}
+            for table in [
+                "results_scenario",
+                "results_project_timepoint",
+                "results_project_dispatch_by_technology",
+            ]:
+                for subproblem, stage, rowid in conn.execute(
+                    f"""SELECT subproblem_id, stage_id, rowid
+                    FROM {table}
+                    WHERE scenario_id = ?""",
+                    (scenario_id,),
+                ):
+                    rowids.setdefault((subproblem, stage), set()).add((table, rowid))
+            flags = dict(
+                ((subproblem, stage), flag)
+                for subproblem, stage, flag in conn.execute(
+                    """SELECT subproblem_id, stage_id, results_processed
+                    FROM results_scenario
+                    WHERE scenario_id = ?""",
+                    (scenario_id,),
+                )
+            )
+            conn.close()
+            return rowids, flags
+
+        keys = [(subproblem, stage) for subproblem in [1, 2, 3] for stage in [1, 2, 3]]
+        imported_rowids, imported_flags = get_rowids_and_flags()
+        self.assertListEqual(sorted(imported_rowids.keys()), keys)
+        self.assertDictEqual(imported_flags, {key: 1 for key in keys})
+
+        # Re-import subproblem 2 only: the other subproblems' rows, including
+        # their results_scenario rows and flags, are left alone
+        import_scenario_results.main(args + ["--subproblems", "2"])
+        reimported_rowids, reimported_flags = get_rowids_and_flags()
+        self.assertDictEqual(
+            reimported_flags, {key: 0 if key[0] == 2 else 1 for key in keys}
+        )
+        # Subproblem 2 hasn't been re-aggregated yet
+        for key in keys:
+            tables = [table for (table, rowid) in reimported_rowids[key]]
+            if key[0] == 2:
+                self.assertNotIn("results_project_dispatch_by_technology", tables)
+                self.assertTrue(reimported_rowids[key].isdisjoint(imported_rowids[key]))
+            else:
+                self.assertSetEqual(reimported_rowids[key], imported_rowids[key])
+
+        # Only subproblem 2 is re-aggregated
+        process_results.main(args)
+        processed_rowids, processed_flags = get_rowids_and_flags()
+        self.assertDictEqual(processed_flags, {key: 1 for key in keys})
+        for key in keys:
+            if key[0] == 2:
+                self.assertSetEqual(
+                    set(table for (table, rowid) in processed_rowids[key]),
+                    set(table for (table, rowid) in imported_rowids[key]),
+                )
+                self.assertTrue(processed_rowids[key].isdisjoint(imported_rowids[key]))
+            else:
+                self.assertSetEqual(processed_rowids[key], imported_rowids[key])
+
+    def test_example_multi_stage_prod_cost_linked_subproblems_pipeline(self):
+        """
+        Check "multi_stage_prod_cost_linked_subproblems" example running the
+        get_inputs, run_scenario, and import_results steps as a pipeline; the
+        objective function values must be the same as when running the steps
+        one after another
+        :return:
+        """
+        scenario_name = "multi_stage_prod_cost_linked_subproblems"
+        # Write the scenario files to a temporary directory to leave the
+        # example's committed inputs and results untouched
+        scenario_location = tempfile.TemporaryDirectory()
+        self.addCleanup(scenario_location.cleanup)
+        actual_objective = run_end_to_end.main(
+            [
+                "--database",
+                DB_PATH,
+                "--scenario",
+                scenario_name,
+                "--scenario_location",
+                scenario_location.name,
+                "--pipeline",
+                "--quiet",
+                "--mute_solver_output",
+                "--testing",
+            ]
+        )
+
+        self.assertDictAlmostEqual(
+            self.get_expected_objective(scenario_name), actual_objective, places=1
+        )
+
     def test_example_multi_stage_prod_cost_w_hydro(self):
         """
         Check validation and objective function values of
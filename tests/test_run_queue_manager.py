@@ -0,0 +1,124 @@
+# Copyright 2016-2023 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sqlite3
+import unittest
+from unittest import mock
+
+import ui.server.run_queue_manager as module_to_test
+
+
+def mock_psutil(cpu_percent, available_memory_mb):
+    """
+    :param cpu_percent: float, the system-wide CPU utilization to report
+    :param available_memory_mb: float, the available memory to report
+    :return: a patch of the psutil module used by the run queue manager
+    """
+    psutil = mock.Mock()
+    psutil.cpu_percent.return_value = cpu_percent
+    psutil.virtual_memory.return_value.available = available_memory_mb * 1024**2
+
+    return mock.patch.object(module_to_test, "psutil", psutil)
+
+
+class TestRunQueueManager(unittest.TestCase):
+    """ """
+
+    def test_can_launch_scenario(self):
+        """
+        Check the concurrency limit and the CPU and memory admission checks
+        :return:
+        """
+        limits = dict(
+            max_concurrent_scenarios=3,
+            max_cpu_percent=80,
+            min_available_memory_mb=1000,
+        )
+
+        # Enough resources and room for another scenario
+        with mock_psutil(cpu_percent=50, available_memory_mb=2000):
+            self.assertTrue(
+                module_to_test.can_launch_scenario(n_running_scenarios=2, **limits)
+            )
+
+        # At the concurrency limit
+        with mock_psutil(cpu_percent=50, available_memory_mb=2000) as psutil:
+            self.assertFalse(
+                module_to_test.can_launch_scenario(n_running_scenarios=3, **limits)
+            )
+            # No need to check the resources
+            psutil.cpu_percent.assert_not_called()
+
+        # CPU utilization too high
+        with mock_psutil(cpu_percent=90, available_memory_mb=2000):
+            self.assertFalse(
+                module_to_test.can_launch_scenario(n_running_scenarios=1, **limits)
+            )
+
+        # Not enough memory available
+        with mock_psutil(cpu_percent=50, available_memory_mb=500):
+            self.assertFalse(
+                module_to_test.can_launch_scenario(n_running_scenarios=1, **limits)
+            )
+
+        # A scenario is always launched if none is running
+        with mock_psutil(cpu_percent=100, available_memory_mb=0) as psutil:
+            self.assertTrue(
+                module_to_test.can_launch_scenario(n_running_scenarios=0, **limits)
+            )
+            psutil.cpu_percent.assert_not_called()
+            psutil.virtual_memory.assert_not_called()
+
+    def test_get_next_scenario_to_run(self):
+        """
+        The next scenario is the first one in queue order that is not
+        running (or skipped)
+        :return:
+        """
+        conn = sqlite3.connect(":memory:")
+        c = conn.cursor()
+        c.execute(
+            """
+            CREATE TABLE scenarios (
+            scenario_id INTEGER PRIMARY KEY,
+            queue_order_id INTEGER
+            )
+            """
+        )
+        # Scenario 4 is not in the queue; the queue order is not the order
+        # of the scenario IDs
+        c.executemany(
+            "INSERT INTO scenarios VALUES (?, ?)",
+            [(1, 3), (2, 1), (3, 2), (4, None)],
+        )
+
+        self.assertEqual(
+            module_to_test.get_next_scenario_to_run(c=c, running_scenarios=set()), 2
+        )
+        self.assertEqual(
+            module_to_test.get_next_scenario_to_run(c=c, running_scenarios={2}), 3
+        )
+        self.assertEqual(
+            module_to_test.get_next_scenario_to_run(c=c, running_scenarios={2, 3}),
+            1,
+        )
+        self.assertIsNone(
+            module_to_test.get_next_scenario_to_run(c=c, running_scenarios={1, 2, 3})
+        )
+
+        conn.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
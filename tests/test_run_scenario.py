@@ -0,0 +1,87 @@
+# Copyright 2016-2023 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+import warnings
+
+from gridpath import run_scenario
+
+
+class TestRunScenario(unittest.TestCase):
+    def test_get_persistent_solver(self):
+        """
+        Fall back to the standard interface (None) if there is no persistent
+        interface for the solver; the lookup is done once per process
+        """
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            optimizer = run_scenario.get_persistent_solver(
+                solver_name="not_a_solver", solver_executable=None
+            )
+        self.assertIsNone(optimizer)
+        self.assertEqual(1, len(w))
+        self.assertIn(("not_a_solver", None, False), run_scenario._persistent_solvers)
+
+        # The second lookup uses the cached result and doesn't warn again
+        self.assertIsNone(
+            run_scenario.get_persistent_solver(
+                solver_name="not_a_solver", solver_executable=None
+            )
+        )
+
+    def test_persistent_solver_argument(self):
+        """
+        The persistent solver mode is opt-in
+        """
+        self.assertFalse(
+            run_scenario.parse_arguments(["--scenario", "test"]).persistent_solver
+        )
+        self.assertTrue(
+            run_scenario.parse_arguments(
+                ["--scenario", "test", "--persistent_solver"]
+            ).persistent_solver
+        )
+
+    def test_persistent_solver_fixed_vars_as_bounds_argument(self):
+        """
+        Keeping the fixed variables in the APPSI problems is opt-in
+        """
+        self.assertFalse(
+            run_scenario.parse_arguments(
+                ["--scenario", "test", "--persistent_solver"]
+            ).persistent_solver_fixed_vars_as_bounds
+        )
+        self.assertTrue(
+            run_scenario.parse_arguments(
+                [
+                    "--scenario",
+                    "test",
+                    "--persistent_solver",
+                    "--persistent_solver_fixed_vars_as_bounds",
+                ]
+            ).persistent_solver_fixed_vars_as_bounds
+        )
+
+    def test_profile_argument(self):
+        """
+        Profiling is opt-in
+        """
+        self.assertFalse(run_scenario.parse_arguments(["--scenario", "test"]).profile)
+        self.assertTrue(
+            run_scenario.parse_arguments(["--scenario", "test", "--profile"]).profile
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
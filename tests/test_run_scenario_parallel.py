@@ -13,6 +13,8 @@
 # limitations under the License.
 
 import os
+import pandas as pd
+import tempfile
 import unittest
 
 from gridpath import run_scenario_parallel
@@ -32,6 +34,35 @@ class TestRunScenarioParallel(unittest.TestCase):
             ["--scenarios_csv", scenarios_csv_path, "--n_parallel_scenarios", "2"]
         )
 
+    def test_task_timings(self):
+        """
+        Each scenario's (single) subproblem is a task and its wall time is
+        saved if requested
+        :return:
+        """
+        scenarios_csv_path = os.path.join(
+            os.getcwd(), "../tests/test_data/scenarios_to_run.csv"
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            task_timings_csv = os.path.join(tmp_dir, "task_timings.csv")
+            objective_values = run_scenario_parallel.main(
+                [
+                    "--scenarios_csv",
+                    scenarios_csv_path,
+                    "--n_parallel_scenarios",
+                    "2",
+                    "--task_timings_csv",
+                    task_timings_csv,
+                ]
+            )
+            timings_df = pd.read_csv(task_timings_csv)
+
+        self.assertListEqual(
+            sorted(timings_df["scenario"].tolist()), ["test", "test_w_hydro"]
+        )
+        self.assertTrue((timings_df["wall_time_s"] > 0).all())
+        self.assertListEqual(sorted(objective_values.keys()), ["test", "test_w_hydro"])
+
 
 if __name__ == "__main__":
     unittest.main()
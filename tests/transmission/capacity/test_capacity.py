@@ -122,6 +122,29 @@ class TestTxCapacity(unittest.TestCase):
 
         self.assertListEqual(expected_tx_op_p, actual_tx_op_p)
 
+        # TX_LINES_OPR_IN_TMP, TX_LINES_OPR_TO_LZ_IN_TMP,
+        # TX_LINES_OPR_FROM_LZ_IN_TMP
+        for tmp in instance.TMPS:
+            expected_tx_lines = sorted(
+                set(tx for (tx, t) in instance.TX_OPR_TMPS if t == tmp)
+            )
+            self.assertListEqual(
+                expected_tx_lines, list(instance.TX_LINES_OPR_IN_TMP[tmp])
+            )
+            for lz in instance.LOAD_ZONES:
+                self.assertListEqual(
+                    [tx for tx in expected_tx_lines if instance.load_zone_to[tx] == lz],
+                    list(instance.TX_LINES_OPR_TO_LZ_IN_TMP[lz, tmp]),
+                )
+                self.assertListEqual(
+                    [
+                        tx
+                        for tx in expected_tx_lines
+                        if instance.load_zone_from[tx] == lz
+                    ],
+                    list(instance.TX_LINES_OPR_FROM_LZ_IN_TMP[lz, tmp]),
+                )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,8 +1,9 @@
 from argparse import ArgumentParser
 import os
+import psutil
 import socketio
 import sys
-import time
+import threading
 
 from db.common_functions import connect_to_database, spin_on_database_lock
 
@@ -23,107 +24,121 @@ def exit_gracefully():
     spin_on_database_lock(conn=conn, cursor=c, sql=sql, data=(), many=False)
 
 
-def manage_queue(db_path):
-    while True:
-        try:
-            # Check if server is running
-            sio = socketio.Client()
-            sio.connect("http://127.0.0.1:8080")
-            print("Connection to server established")
-
-            conn = connect_to_database(db_path=db_path)
-            c = conn.cursor()
-
+def manage_queue(
+    db_path,
+    max_concurrent_scenarios=1,
+    max_cpu_percent=100,
+    min_available_memory_mb=0,
+    poll_interval=5,
+):
+    """
+    :param db_path: the database path
+    :param max_concurrent_scenarios: int, the maximum number of queued
+        scenarios to run at the same time
+    :param max_cpu_percent: float, don't launch a scenario if the system-wide
+        CPU utilization is above this percentage
+    :param min_available_memory_mb: float, don't launch a scenario if less
+        memory than this is available
+    :param poll_interval: seconds to wait between checks of the queue
+    :return:
+
+    Launch the queued scenarios in order, running up to
+    *max_concurrent_scenarios* at the same time as long as there are enough
+    CPU and memory resources available. We keep a single connection to the
+    server, which launches the scenario processes and tells us when a
+    process exits, so that we can launch the next scenario right away. A
+    scenario only counts as running once the server has acknowledged that
+    it launched its process; a scenario the server declines to launch
+    (e.g. because it is already running outside of the queue) is skipped
+    until the next scenario process exits.
+    """
+    sio = socketio.Client(reconnection=False)
+    # Scenario IDs of the scenarios running from the queue
+    running_scenarios = set()
+    # Scenario IDs of the queued scenarios the server declined to launch
+    declined_scenarios = set()
+    # Set when a scenario process exits or the server disconnects, so that
+    # we check the queue without waiting for the next poll
+    wake_up = threading.Event()
+
+    @sio.on("scenario_process_exited")
+    def on_scenario_process_exited(msg):
+        running_scenarios.discard(msg["scenario"])
+        # The exit may have freed up a declined scenario, so try them again
+        declined_scenarios.clear()
+        wake_up.set()
+
+    @sio.event
+    def disconnect():
+        wake_up.set()
+
+    try:
+        sio.connect("http://127.0.0.1:8080")
+        print("Connection to server established")
+    except socketio.exceptions.ConnectionError:
+        print("Server not responding, exiting")
+    else:
+        conn = connect_to_database(db_path=db_path)
+        c = conn.cursor()
+
+        # Scenarios from the queue that were already running when we
+        # started
+        running_scenarios.update(
+            scenario_id for scenario_id, _, _ in get_running_scenarios(c=c)
+        )
+
+        while sio.connected:
+            wake_up.clear()
             scenarios_in_queue = get_scenarios_in_queue(c=c)
-            running_scenarios = get_running_scenarios(c=c)
-
-            # If there are scenarios in the queue and none of them are running,
-            # get the next scenarios to run and launch it
-            if scenarios_in_queue:  # there are scenarios in the queue
-                if not running_scenarios:  # none of them is 'running'
-                    next_scenario_to_run = c.execute(
-                        """
-                        SELECT scenario_id, MIN(queue_order_id)
-                        FROM scenarios
-                        WHERE queue_order_id IS NOT NULL
-                        GROUP BY scenario_id
-                    """
-                    ).fetchone()
-
-                    # Get the requested solver
-                    solver_options_id = c.execute(
-                        """
-                        SELECT solver_options_id
-                            FROM scenarios
-                            WHERE scenario_id = {}
-                    """.format(
-                            next_scenario_to_run[0]
-                        )
-                    ).fetchone()[0]
-
-                    if solver_options_id is None:
-                        # TODO: we should specify the default solver as a
-                        #  global variable somewhere
-                        solver = "cbc"
-                    else:
-                        solver_query = c.execute(
-                            """
-                              SELECT DISTINCT solver_name
-                              FROM inputs_options_solver
-                              WHERE solver_options_id = {};
-                              """.format(
-                                solver_options_id
-                            )
-                        ).fetchone()
-                        # Check that there's only one solver specified for the
-                        # solver_options_id
-                        one_solver_check = c.execute(
-                            """
-                              SELECT COUNT()
-                              FROM (
-                                  SELECT DISTINCT solver_name
-                                  FROM inputs_options_solver
-                                  WHERE solver_options_id = {}
-                                  )
-                              ;
-                              """.format(
-                                solver_options_id
-                            )
-                        ).fetchone()[0]
-                        if one_solver_check > 1:
-                            raise ValueError(
-                                """
-                              Only one solver name can be specified per
-                              solver_options_id. Check the solver_options_id {}
-                              in the the inputs_options_solver table.
-                            """.format(
-                                    solver_options_id
-                                )
-                            )
-                        else:
-                            solver = solver_query[0]
-                    sio.emit(
-                        "launch_scenario_process",
-                        {
-                            "scenario": next_scenario_to_run[0],
-                            "solver": solver,
-                            "skipWarnings": False,
-                        },
-                    )
+
             # If there are no scenarios in the queue, tell the server to
             # reset the queue manager PID and exit the loop
             # TODO: is keeping track of the queue manager PID still needed
             #  now that the queue manager exits when it does not get a
             #  response from the server?
-            else:
+            if not scenarios_in_queue:
                 sio.emit("reset_queue_manager_pid")
                 break
 
-        except socketio.exceptions.ConnectionError:
-            print("Server not responding, exiting")
-            break
+            # Launch the next scenario in the queue if we have room for it;
+            # we launch at most one scenario per check, so that the
+            # resource use of the scenario is reflected in the next check
+            next_scenario_to_run = get_next_scenario_to_run(
+                c=c, running_scenarios=running_scenarios | declined_scenarios
+            )
+            if next_scenario_to_run is not None and can_launch_scenario(
+                n_running_scenarios=len(running_scenarios),
+                max_concurrent_scenarios=max_concurrent_scenarios,
+                max_cpu_percent=max_cpu_percent,
+                min_available_memory_mb=min_available_memory_mb,
+            ):
+                # Wait for the server to tell us whether it launched the
+                # scenario process
+                try:
+                    launched = sio.call(
+                        "launch_scenario_process",
+                        {
+                            "scenario": next_scenario_to_run,
+                            "solver": get_scenario_solver(
+                                c=c, scenario_id=next_scenario_to_run
+                            ),
+                            "skipWarnings": False,
+                        },
+                    )
+                except socketio.exceptions.SocketIOError:
+                    break
+                if launched:
+                    running_scenarios.add(next_scenario_to_run)
+                else:
+                    declined_scenarios.add(next_scenario_to_run)
+                    continue
+
+            wake_up.wait(poll_interval)
 
-        time.sleep(5)
+        if not sio.connected:
+            print("Server not responding, exiting")
+        conn.close()
+        sio.disconnect()
 
     # Need os._exit(0) to exit process, not just thread (sys.exit exits only
     # current thread)
@@ -134,6 +149,119 @@ def manage_queue(db_path):
     os._exit(0)
 
 
+def can_launch_scenario(
+    n_running_scenarios,
+    max_concurrent_scenarios,
+    max_cpu_percent,
+    min_available_memory_mb,
+):
+    """
+    :param n_running_scenarios: int, the number of scenarios running from
+        the queue
+    :param max_concurrent_scenarios: int
+    :param max_cpu_percent: float
+    :param min_available_memory_mb: float
+    :return: boolean, whether there is room to launch another scenario
+
+    Check the concurrency limit and whether the system has enough CPU and
+    memory available for another scenario. If no scenario is running, we
+    always launch one, so that the queue can't get stuck.
+    """
+    if n_running_scenarios == 0:
+        return True
+    if n_running_scenarios >= max_concurrent_scenarios:
+        return False
+    if psutil.cpu_percent(interval=1) > max_cpu_percent:
+        return False
+    if psutil.virtual_memory().available / 1024**2 < min_available_memory_mb:
+        return False
+
+    return True
+
+
+def get_next_scenario_to_run(c, running_scenarios):
+    """
+    :param c: database cursor
+    :param running_scenarios: set of the IDs of the scenarios to skip (the
+        running scenarios)
+    :return: the ID of the first scenario in the queue that is not skipped
+        or None if all are skipped
+    """
+    for (scenario_id,) in c.execute(
+        """
+        SELECT scenario_id
+        FROM scenarios
+        WHERE queue_order_id IS NOT NULL
+        ORDER BY queue_order_id
+        """
+    ).fetchall():
+        if scenario_id not in running_scenarios:
+            return scenario_id
+
+    return None
+
+
+def get_scenario_solver(c, scenario_id):
+    """
+    :param c: database cursor
+    :param scenario_id: the scenario ID
+    :return: the requested solver for the scenario
+    """
+    solver_options_id = c.execute(
+        """
+        SELECT solver_options_id
+            FROM scenarios
+            WHERE scenario_id = {}
+    """.format(
+            scenario_id
+        )
+    ).fetchone()[0]
+
+    if solver_options_id is None:
+        # TODO: we should specify the default solver as a
+        #  global variable somewhere
+        solver = "cbc"
+    else:
+        solver_query = c.execute(
+            """
+              SELECT DISTINCT solver_name
+              FROM inputs_options_solver
+              WHERE solver_options_id = {};
+              """.format(
+                solver_options_id
+            )
+        ).fetchone()
+        # Check that there's only one solver specified for the
+        # solver_options_id
+        one_solver_check = c.execute(
+            """
+              SELECT COUNT()
+              FROM (
+                  SELECT DISTINCT solver_name
+                  FROM inputs_options_solver
+                  WHERE solver_options_id = {}
+                  )
+              ;
+              """.format(
+                solver_options_id
+            )
+        ).fetchone()[0]
+        if one_solver_check > 1:
+            raise ValueError(
+                """
+              Only one solver name can be specified per
+              solver_options_id. Check the solver_options_id {}
+              in the the inputs_options_solver table.
+            """.format(
+                    solver_options_id
+                )
+            )
+        else:
+            solver = solver_query[0]
+
+    return solver
+
+
 def get_scenarios_in_queue(c):
     # Check if there are any scenarios in the queue
     scenarios_in_queue = c.execute(
@@ -222,6 +350,27 @@ def parse_arguments(args):
         default="../db/io.db",
         help="The database file path. Defaults to ../db/io.db " "if not specified",
     )
+    parser.add_argument(
+        "--max_concurrent_scenarios",
+        default=1,
+        type=int,
+        help="The maximum number of queued scenarios to run at the same time. "
+        "Defaults to 1.",
+    )
+    parser.add_argument(
+        "--max_cpu_percent",
+        default=100,
+        type=float,
+        help="Don't launch another scenario while the system-wide CPU "
+        "utilization is above this percentage. Defaults to 100.",
+    )
+    parser.add_argument(
+        "--min_available_memory_mb",
+        default=0,
+        type=float,
+        help="Don't launch another scenario while less memory than this (in "
+        "MB) is available. Defaults to 0.",
+    )
 
     parsed_arguments = parser.parse_args(args=args)
 
@@ -234,7 +383,12 @@ def main(args=None):
 
     parsed_args = parse_arguments(args)
 
-    manage_queue(db_path=parsed_args.database)
+    manage_queue(
+        db_path=parsed_args.database,
+        max_concurrent_scenarios=parsed_args.max_concurrent_scenarios,
+        max_cpu_percent=parsed_args.max_cpu_percent,
+        min_available_memory_mb=parsed_args.min_available_memory_mb,
+    )
 
 
 if __name__ == "__main__":
@@ -135,7 +135,8 @@ def socket_add_or_edit_new_scenario(msg):
 def socket_launch_scenario_process(client_message):
     """
     :param client_message:
-    :return:
+    :return: boolean, whether the scenario process was launched (sent to
+        clients that request an acknowledgement, e.g. the run queue manager)
     Launch and manage a scenario run process.
     """
     print(client_message)
@@ -154,26 +155,58 @@ def socket_launch_scenario_process(client_message):
 
     warn_user_boolean = False if skip_warnings else warn_user(scenario_id=scenario_id)
 
-    if not warn_user_boolean:
-        # Launch the process, get back the process object, scenario_id,
-        # and scenario_name
-        p, scenario_id, scenario_name = launch_scenario_process(
-            db_path=DATABASE_PATH,
-            scenarios_directory=SCENARIOS_DIRECTORY,
-            scenario_id=scenario_id,
-            solver=solver,
-            solver_executable=solver_executable,
-        )
-        # Needed to ensure child processes are terminated when server exits
-        atexit.register(p.terminate)
+    if warn_user_boolean:
+        return False
+
+    # Launch the process, get back the process object, scenario_id,
+    # and scenario_name (nothing is returned if the scenario is already
+    # running)
+    process = launch_scenario_process(
+        db_path=DATABASE_PATH,
+        scenarios_directory=SCENARIOS_DIRECTORY,
+        scenario_id=scenario_id,
+        solver=solver,
+        solver_executable=solver_executable,
+    )
+    if process is None:
+        return False
+    p, scenario_id, scenario_name = process
+    # Needed to ensure child processes are terminated when server exits
+    atexit.register(p.terminate)
+
+    # Save the scenario's process ID
+    SCENARIO_STATUS[scenario_id] = dict()
+    SCENARIO_STATUS[scenario_id]["scenario_name"] = scenario_name
+    SCENARIO_STATUS[scenario_id]["process_id"] = p.pid
+
+    # Tell the clients (including the run queue manager) when the
+    # process exits
+    socketio.start_background_task(
+        notify_scenario_process_exit, p=p, scenario_id=scenario_id
+    )
+
+    # Tell the client the process launched
+    emit("scenario_process_launched")
 
-        # Save the scenario's process ID
-        SCENARIO_STATUS[scenario_id] = dict()
-        SCENARIO_STATUS[scenario_id]["scenario_name"] = scenario_name
-        SCENARIO_STATUS[scenario_id]["process_id"] = p.pid
+    return True
 
-        # Tell the client the process launched
-        emit("scenario_process_launched")
+
+def notify_scenario_process_exit(p, scenario_id):
+    """
+    :param p: the scenario process (subprocess.Popen object)
+    :param scenario_id:
+    :return:
+
+    Wait for the scenario process to exit and broadcast its exit to the
+    clients.
+    """
+    while p.poll() is None:
+        socketio.sleep(1)
+
+    socketio.emit(
+        "scenario_process_exited",
+        {"scenario": scenario_id, "returncode": p.returncode},
+    )
 
 
 def warn_user(scenario_id):
@@ -286,8 +319,18 @@ def start_run_queue_manager():
         script_name="gridpath_run_queue_manager"
     )
 
+    # Pass the queue concurrency and resource limits if specified
+    queue_manager_args = [run_queue_manager_executable, "--database", DATABASE_PATH]
+    for env_variable, argument in [
+        ("GRIDPATH_MAX_CONCURRENT_SCENARIOS", "--max_concurrent_scenarios"),
+        ("GRIDPATH_MAX_CPU_PERCENT", "--max_cpu_percent"),
+        ("GRIDPATH_MIN_AVAILABLE_MEMORY_MB", "--min_available_memory_mb"),
+    ]:
+        if os.environ.get(env_variable):
+            queue_manager_args += [argument, os.environ[env_variable]]
+
     p = subprocess.Popen(
-        [run_queue_manager_executable, "--database", DATABASE_PATH],
+        queue_manager_args,
         shell=False,
     )
     print("Queue manager PID: ,", p.pid)